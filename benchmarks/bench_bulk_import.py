@@ -0,0 +1,103 @@
+"""
+Benchmark for the bulk import pipeline.
+
+Writes N test case export files, then compares:
+- a plain read of each file, parse_import_file() one file after another
+  (what the import does, on one worker thread) and parse_import_file() in a
+  thread pool (what it did before; slower, as parsing holds the GIL). All
+  must return the same records.
+- writing the imported test cases with one upsert per record versus one
+  LibraryRepository.write_changes() transaction.
+
+Usage:
+    python benchmarks/bench_bulk_import.py [--files 2000] [--workers 8]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.storage import LibraryRepository, parse_import_file
+
+
+def make_test_case(index):
+    steps = []
+    for n in range(15):
+        steps.append({
+            'name': f"Import Module: Module_{n}",
+            'type': 'module_import',
+            'module_name': f"Module_{n}",
+            'fields': [{'field_name': f"FIELD_{f}", 'action_type': 'Input', 'value': 'X' * 8} for f in range(5)],
+            'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+        })
+    return {'name': f"TC_{index}", 'description': f"Test case {index}", 'steps': steps}
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_paths = []
+        for index in range(args.files):
+            file_path = os.path.join(temp_dir, f"TC_{index}.json")
+            with open(file_path, 'w') as f:
+                json.dump(make_test_case(index), f, indent=4)
+            file_paths.append(file_path)
+        print(f"{args.files} export files\n")
+
+        def sequential():
+            records = {}
+            for file_path in file_paths:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                records[data['name']] = data
+            return records
+
+        def parsed():
+            records = {}
+            for file_path in file_paths:
+                records.update(parse_import_file(file_path, 'test_cases')[0])
+            return records
+
+        def pooled():
+            records = {}
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                for parsed, problems in executor.map(parse_import_file, file_paths, ['test_cases'] * len(file_paths)):
+                    records.update(parsed)
+            return records
+
+        expected = timed("plain read", sequential)
+        actual = timed("parse_import_file (+validation)", parsed)
+        legacy = timed(f"legacy: {args.workers} worker threads (+validation)", pooled)
+
+        repository = LibraryRepository(os.path.join(temp_dir, 'per_record.db'))
+        timed("one upsert per record", lambda: [repository.upsert('test_cases', n, r) for n, r in expected.items()])
+        repository.close()
+        repository = LibraryRepository(os.path.join(temp_dir, 'batch.db'))
+        timed("one write_changes transaction", lambda: repository.write_changes('test_cases', actual))
+        repository.close()
+
+    if actual != expected or legacy != expected:
+        print("\nMISMATCH between the parsed and the plainly read test cases")
+        return 1
+    print(f"\nequivalence: {len(actual)}/{len(expected)} test cases identical")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
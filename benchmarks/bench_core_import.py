@@ -0,0 +1,60 @@
+"""
+Benchmark for importing the core engine.
+
+Times importing each pcomm_core module, and the whole package, in fresh
+interpreters, and checks that none of them loads Qt, win32 or the other GUI
+and automation dependencies of the desktop application.
+
+Usage:
+    python benchmarks/bench_core_import.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = ['session', 'masking', 'reports', 'screen', 'codec', 'model', 'storage', 'synthetic', 'runlog', 'rundata']
+
+# Top-level packages the core must not import when it is loaded
+FORBIDDEN = ['PyQt6', 'win32api', 'win32gui', 'win32ui', 'win32con', 'win32com', 'pythoncom', 'pywintypes',
+             'winsound', 'pyautogui', 'pygetwindow', 'pyperclip', 'PIL', 'docx']
+
+
+def run(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    return result.stdout.strip().splitlines()[-1]
+
+
+def time_import(statement, runs):
+    """Returns the median time of running an import statement in a fresh interpreter."""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    return statistics.median(float(run(code)) for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    for module_name in CORE_MODULES:
+        elapsed = time_import(f"import pcomm_core.{module_name}", args.runs)
+        print(f"{'pcomm_core.' + module_name:<40} {elapsed * 1000:9.1f} ms")
+    everything = '; '.join(f"import pcomm_core.{module_name}" for module_name in CORE_MODULES)
+    print(f"{'all core modules':<40} {time_import(everything, args.runs) * 1000:9.1f} ms")
+
+    loaded = run(f"import sys; {everything}; "
+                 f"print(','.join(name for name in {FORBIDDEN!r} if name in sys.modules) or '-')")
+    if loaded != '-':
+        print(f"\nMISMATCH: importing the core loaded {loaded}")
+        return 1
+    print("\nequivalence: the core imports no Qt, win32 or GUI automation module")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
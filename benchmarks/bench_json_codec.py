@@ -0,0 +1,104 @@
+"""
+Benchmark for the JSON codec.
+
+Builds a synthetic library of N test cases (the shape of the old
+captured_test_cases.json) and compares saving and loading it as the old
+pretty-printed file (json, indent=4) against the compact and gzip modes of
+JsonCodec, with every available backend. Reports file sizes and checks that
+every mode loads back the same data.
+
+Usage:
+    python benchmarks/bench_json_codec.py [--records 5000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.codec import JsonCodec
+
+
+def make_test_case(index):
+    steps = []
+    for n in range(15):
+        steps.append({
+            'name': f"Import Module: Module_{(index + n) % 500}",
+            'type': 'module_import',
+            'module_name': f"Module_{(index + n) % 500}",
+            'module_version': f"{index * 7919 + n:08x}"[-8:],
+            'fields': [{'field_name': f"FIELD_{f}", 'internal_field_id': f"FIELD_{f}_{index}_{n}",
+                        'action_type': 'Input', 'value': 'X' * 8} for f in range(5)],
+            'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+        })
+    return {'description': f"Test case {index} – überprüfung", 'steps': steps}
+
+
+def time_it(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=5000)
+    args = parser.parse_args()
+
+    data = {f"TC_{i}": make_test_case(i) for i in range(args.records)}
+    backends = [name for name in JsonCodec.PREFERRED if JsonCodec.load_backend(name)]
+    print(f"{args.records} test cases, backends available: {', '.join(backends)} "
+          f"(default: {JsonCodec().backend})\n")
+    print(f"{'mode':<28} {'save':>9} {'load':>9} {'size':>10}")
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def legacy_save(path):
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=4)
+
+        def legacy_load(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+
+        legacy_path = os.path.join(temp_dir, 'legacy.json')
+        modes = [("legacy json indent=4", legacy_path, lambda: legacy_save(legacy_path), lambda: legacy_load(legacy_path))]
+        for backend in backends:
+            codec = JsonCodec(backend)
+            for compress in (False, True):
+                path = os.path.join(temp_dir, f"{backend}{'.json.gz' if compress else '.json'}")
+                modes.append((
+                    f"{backend} compact{' + gzip' if compress else ''}", path,
+                    lambda codec=codec, path=path, compress=compress: codec.write_file(path, data, compress=compress),
+                    lambda codec=codec, path=path: codec.read_file(path)
+                ))
+
+        for label, path, save, load in modes:
+            _, save_time = time_it(save)
+            loaded, load_time = time_it(load)
+            size = os.path.getsize(path)
+            print(f"{label:<28} {save_time * 1000:7.1f}ms {load_time * 1000:7.1f}ms {size / 1e6:8.1f}MB")
+            if loaded != data:
+                print(f"  MISMATCH: {label} did not load back the same data")
+                failures += 1
+
+        # The default codec must keep reading the old pretty-printed files
+        if JsonCodec().read_file(legacy_path) != data:
+            print("MISMATCH: the default codec cannot read the legacy file")
+            failures += 1
+
+    if failures:
+        return 1
+    print("\nequivalence: every mode loads back identical data, legacy files included")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark for library bundles.
+
+Builds a SQLite library with N modules (each with a screenshot file) and N
+test cases, exports it with LibraryBundle.write(), then imports the bundle
+into an empty library and again into the same one. Reports time and peak
+Python memory, checks that the imported records are identical to the
+originals, and checks that the second import finds nothing to read.
+
+Usage:
+    python benchmarks/bench_library_bundle.py [--records 5000] [--screenshot-kb 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.storage import LibraryBundle, LibraryRepository
+
+
+def make_module(index):
+    labels = [{'name': f"FIELD_{n}", 'row': n + 1, 'column': 10, 'length': 12} for n in range(20)]
+    return {'labels': labels, 'captured_text': ('SCREEN TEXT ' * 160)[:1920],
+            'screenshot': os.path.join('Modules Screenshots', f"Module_{index}.png")}
+
+
+def make_test_case(index, module_count):
+    steps = []
+    for n in range(15):
+        steps.append({
+            'name': f"Import Module: Module_{(index + n) % module_count}",
+            'type': 'module_import',
+            'module_name': f"Module_{(index + n) % module_count}",
+            'fields': [{'field_name': f"FIELD_{f}", 'action_type': 'Input', 'value': 'X' * 8} for f in range(5)],
+            'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+        })
+    return {'description': f"Test case {index}", 'steps': steps}
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+    return result
+
+
+def import_bundle(bundle_path, repository):
+    """Same incremental flow as PCOMMMainFrame.import_library_bundle, without the UI."""
+    read = 0
+    with LibraryBundle(bundle_path) as bundle:
+        for table in LibraryBundle.TABLES:
+            pending = [(name, digest) for name, digest in bundle.records(table).items()
+                       if repository.record_digest(table, name) != digest]
+            for start in range(0, len(pending), 500):
+                batch = {name: bundle.read_record(digest) for name, digest in pending[start:start + 500]}
+                repository.write_changes(table, batch)
+                read += len(batch)
+        for relative, digest in bundle.files().items():
+            target = os.path.normpath(relative)
+            if not os.path.exists(target) or LibraryBundle.file_digest(target) != digest:
+                bundle.extract_file(digest, target)
+                read += 1
+    return read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--screenshot-kb', type=int, default=200)
+    args = parser.parse_args()
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = os.path.join(temp_dir, 'source')
+        target_dir = os.path.join(temp_dir, 'target')
+        os.makedirs(os.path.join(source_dir, 'Modules Screenshots'))
+        os.makedirs(target_dir)
+        bundle_path = os.path.join(temp_dir, f"library{LibraryBundle.EXTENSION}")
+        try:
+            os.chdir(source_dir)
+            source = LibraryRepository('library.db')
+            modules = {f"Module_{i}": make_module(i) for i in range(args.records)}
+            source.write_changes('modules', modules)
+            source.write_changes('test_cases', {f"TC_{i}": make_test_case(i, args.records) for i in range(args.records)})
+            for module in modules.values():
+                with open(module['screenshot'], 'wb') as f:
+                    f.write(os.urandom(args.screenshot_kb * 1024))
+            del modules
+            library_mb = (os.path.getsize('library.db') + args.records * args.screenshot_kb * 1024) / 1e6
+            print(f"{args.records} modules, {args.records} test cases, {library_mb:.0f} MB with screenshots\n")
+
+            summary = measure("export whole library", lambda: LibraryBundle.write(
+                bundle_path, source, {'modules': None, 'test_cases': None, 'templates': None}))
+            print(f"{'':<36} {os.path.getsize(bundle_path) / 1e6:9.1f} MB bundle, {summary['files']} file(s)")
+
+            os.chdir(target_dir)
+            target = LibraryRepository('library.db')
+            first = measure("import into an empty library", lambda: import_bundle(bundle_path, target))
+            second = measure("import again (nothing changed)", lambda: import_bundle(bundle_path, target))
+            print(f"\nfirst import read {first} entries, second import read {second}")
+
+            mismatches = 0
+            for table in ('modules', 'test_cases'):
+                for (name, data, digest), (other_name, other_data, other_digest) in zip(
+                        source.iter_raw(table), target.iter_raw(table)):
+                    mismatches += (name, digest) != (other_name, other_digest)
+            for i in range(args.records):
+                path = os.path.join('Modules Screenshots', f"Module_{i}.png")
+                mismatches += LibraryBundle.file_digest(path) != LibraryBundle.file_digest(os.path.join(source_dir, path))
+            source.close()
+            target.close()
+        finally:
+            os.chdir(previous_dir)
+
+    if mismatches or second:
+        print(f"MISMATCH: {mismatches} differing entries, {second} re-read on the second import")
+        return 1
+    print("equivalence: imported library is identical to the exported one")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark for the library search index.
+
+Builds a SQLite library with N modules and N test cases, then times a few
+queries against LibraryRepository.search() and against the old approach of
+loading every test case and substring-matching its name and step names.
+Checks every indexed result against LibraryRepository.search_scan(), which
+answers the same query by reading every record.
+
+Usage:
+    python benchmarks/bench_library_search.py [--records 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.storage import LibraryRepository
+
+
+def make_module(index):
+    labels = [{'name': f"FIELD_{n}", 'row': n + 1, 'column': 10, 'length': 12} for n in range(20)]
+    return {'labels': labels, 'captured_text': ('SCREEN TEXT ' * 160)[:1920], 'screenshot': f"Module_{index}.png"}
+
+
+def make_test_case(index, module_count):
+    steps = []
+    for n in range(15):
+        module_name = f"Module_{(index + n) % module_count}"
+        steps.append({
+            'name': f"Import Module: {module_name}",
+            'type': 'module_import',
+            'module_name': module_name,
+            'fields': [{'field_name': f"FIELD_{f}", 'action_type': 'Validate' if f == 4 else 'Input',
+                        'value': f"{(index * 31 + n * 7 + f) % 100000:07d}"} for f in range(5)],
+            'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+        })
+    return {'description': f"Test case {index} opens account {index:07d}", 'steps': steps}
+
+
+def legacy_filter(repository, query):
+    """The old filter: hydrate every test case and substring-match the name and step names."""
+    query = query.strip().lower()
+    matches = set()
+    for name, record in repository.load_all('test_cases').items():
+        if query in name.lower() or any(query in step.get('name', '').lower() for step in record.get('steps', [])):
+            matches.add(name)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+
+    queries = [
+        ('test_cases', "field_2=000004"),
+        ('test_cases', "validate:module_12"),
+        ('test_cases', "tc_1234"),
+        ('test_cases', "0001234 step:wait"),
+        ('test_cases', "account 00012"),
+        ('modules', "label:field_1"),
+        ('modules', "module_99"),
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = LibraryRepository(os.path.join(temp_dir, 'library.db'))
+        modules = {f"Module_{i}": make_module(i) for i in range(args.records)}
+        test_cases = {f"TC_{i}": make_test_case(i, args.records) for i in range(args.records)}
+        start = time.perf_counter()
+        repository.write_changes('modules', modules)
+        repository.write_changes('test_cases', test_cases)
+        print(f"{args.records} modules and {args.records} test cases written and indexed "
+              f"in {time.perf_counter() - start:.1f} s\n")
+
+        start = time.perf_counter()
+        legacy_filter(repository, "module_12")
+        print(f"{'legacy: scan every test case':<40} {(time.perf_counter() - start) * 1000:9.1f} ms\n")
+
+        mismatches = 0
+        for table, query in queries:
+            start = time.perf_counter()
+            found = repository.search(table, query)
+            elapsed = time.perf_counter() - start
+            print(f"{table + ': ' + query:<40} {elapsed * 1000:9.1f} ms   {len(found):6d} match(es)")
+            if found != repository.search_scan(table, query):
+                print("  MISMATCH: the index and a scan of the records disagree")
+                mismatches += 1
+
+        # Incremental maintenance: an edit is searchable right after it is written
+        test_cases['TC_0']['steps'][0]['fields'][0]['value'] = 'ZZ-NEW-VALUE'
+        start = time.perf_counter()
+        repository.write_changes('test_cases', {'TC_0': test_cases['TC_0']})
+        elapsed = time.perf_counter() - start
+        found = repository.search('test_cases', "field_0=zz-new")
+        print(f"\n{'re-index one edited test case':<40} {elapsed * 1000:9.1f} ms   found: {sorted(found)}")
+        mismatches += found != {'TC_0'}
+        repository.close()
+
+    if mismatches:
+        return 1
+    print("\nequivalence: every indexed result matches a scan of the records")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark for library start-up.
+
+Builds a SQLite library with N modules and N test cases, then compares
+loading every record (the old start-up) with loading only the name index
+through LazyRecordStore, and hydrating a few records on demand. Reports time
+and peak Python memory for both.
+
+Usage:
+    python benchmarks/bench_library_startup.py [--records 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.storage import LazyRecordStore, LibraryRepository
+
+
+def make_module(index):
+    labels = [{'name': f"FIELD_{n}", 'row': n + 1, 'column': 10, 'length': 12} for n in range(20)]
+    return {'labels': labels, 'captured_text': ('SCREEN TEXT ' * 160)[:1920], 'screenshot': f"Module_{index}.png"}
+
+
+def make_test_case(index, module_count):
+    steps = []
+    for n in range(15):
+        steps.append({
+            'name': f"Import Module: Module_{(index + n) % module_count}",
+            'type': 'module_import',
+            'module_name': f"Module_{(index + n) % module_count}",
+            'fields': [{'field_name': f"FIELD_{f}", 'action_type': 'Input', 'value': 'X' * 8} for f in range(5)],
+            'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+        })
+    return {'description': f"Test case {index}", 'steps': steps}
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<36} {elapsed * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = LibraryRepository(os.path.join(temp_dir, 'library.db'))
+        repository.write_changes('modules', {f"Module_{i}": make_module(i) for i in range(args.records)})
+        repository.write_changes('test_cases', {f"TC_{i}": make_test_case(i, args.records) for i in range(args.records)})
+        print(f"{args.records} modules and {args.records} test cases\n")
+
+        measure("eager: load every record", lambda: (repository.load_all('modules'), repository.load_all('test_cases')))
+
+        def lazy_start():
+            return LazyRecordStore(repository, 'modules'), LazyRecordStore(repository, 'test_cases')
+
+        modules, test_cases = measure("lazy: load name index", lazy_start)
+
+        def open_some():
+            for i in range(0, args.records, max(args.records // 50, 1)):
+                test_case = test_cases[f"TC_{i}"]
+                for step in test_case['steps']:
+                    modules[step['module_name']]
+
+        measure("lazy: open 50 test cases", open_some)
+        print(f"\n{modules.cache_info()}\n{test_cases.cache_info()}")
+        repository.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
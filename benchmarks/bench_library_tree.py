@@ -0,0 +1,152 @@
+"""
+Benchmark for library tree refreshes.
+
+Builds a module store with N modules and compares the old refresh (clear the
+tree and recreate every item with a QWidget holding two QPushButtons, icons
+loaded from disk and style sheets parsed per row) with the delegate-drawn
+tree: a full rebuild, and the incremental updates that follow a save, a
+delete and a rename. Checks that the incrementally updated tree shows the
+same items as a full rebuild.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) unless a platform is set.
+
+Usage:
+    python benchmarks/bench_library_tree.py [--records 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (QApplication, QHBoxLayout, QLineEdit, QPushButton, QSizePolicy, QSpacerItem,
+                             QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget)
+
+from capture import LibraryTreeActionDelegate, PCOMMMainFrame
+from pcomm_core.storage import LazyRecordStore, LibraryRepository
+
+
+class ModuleTreeHost(QWidget):
+    """
+    The module tree part of PCOMMMainFrame, without the rest of the window. A
+    widget holding the tree, so the deferred build sees the tree as shown.
+    """
+
+    update_module_tree = PCOMMMainFrame.update_module_tree
+    create_module_tree_item = PCOMMMainFrame.create_module_tree_item
+    on_modules_changed = PCOMMMainFrame.on_modules_changed
+    apply_library_tree_change = PCOMMMainFrame.apply_library_tree_change
+    filter_modules = PCOMMMainFrame.filter_modules
+    defer_tree_build = PCOMMMainFrame.defer_tree_build
+
+    def __init__(self, modules):
+        super().__init__()
+        self.modules = modules
+        self._deferred_trees = {}
+        self.module_tree = QTreeWidget()
+        QVBoxLayout(self).addWidget(self.module_tree)
+        self.module_tree.setColumnCount(2)
+        self.module_tree.setItemDelegate(LibraryTreeActionDelegate(self.module_tree, lambda action, name: None))
+        self.module_tree_root = None
+        self.module_tree_items = {}
+        self.modules_search_bar = QLineEdit()
+        modules.add_listener(self.on_modules_changed)
+
+
+def legacy_refresh(tree, modules):
+    """The old update_module_tree: one widget, two buttons and two icon loads per row."""
+    tree.clear()
+    root = QTreeWidgetItem(tree, ["Modules"])
+    root.setExpanded(True)
+    for module_name in modules:
+        module_item = QTreeWidgetItem(root, [module_name])
+        button_widget = QWidget()
+        button_layout = QHBoxLayout(button_widget)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout.setSpacing(5)
+        for icon_file, size, icon_size in (("save.png", 17, 13), ("bin.png", 20, 16)):
+            button = QPushButton()
+            button.setIcon(QIcon(icon_file))
+            button.setIconSize(QSize(icon_size, icon_size))
+            button.setFixedSize(size, size)
+            button.setStyleSheet("QPushButton { border: none; background-color: transparent; padding: 2px; }"
+                                 "QPushButton:hover { background-color: #e0e0e0; border-radius: 4px; }")
+            button.setToolTip(f"Save '{module_name}' to a file.")
+            button_layout.addWidget(button)
+        button_layout.addItem(QSpacerItem(10, 0, QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Minimum))
+        tree.setItemWidget(module_item, 1, button_widget)
+
+
+def time_it(label, func, app):
+    start = time.perf_counter()
+    func()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def tree_names(host):
+    root = host.module_tree_root
+    return [root.child(i).text(0) for i in range(root.childCount())] if root else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=10000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = LibraryRepository(os.path.join(temp_dir, 'library.db'))
+        repository.write_changes('modules', {f"Module_{i}": {'labels': [], 'captured_text': ''}
+                                             for i in range(args.records)})
+        modules = LazyRecordStore(repository, 'modules')
+        print(f"{args.records} modules\n")
+
+        legacy_tree = QTreeWidget()
+        legacy_tree.setColumnCount(2)
+        legacy_tree.show()
+        time_it("legacy: clear and rebuild with widgets", lambda: legacy_refresh(legacy_tree, modules), app)
+
+        host = ModuleTreeHost(modules)
+        host.show()
+        time_it("delegate: full rebuild", host.update_module_tree, app)
+
+        def save_new():
+            modules[f"Module_{args.records}"] = {'labels': [], 'captured_text': ''}
+
+        def delete_one():
+            del modules[f"Module_{args.records // 2}"]
+
+        def rename_one():
+            modules.rename("Module_1", "Module_1_renamed")
+
+        print()
+        time_it("legacy: refresh after a save", lambda: legacy_refresh(legacy_tree, modules), app)
+        time_it("incremental: save a new module", save_new, app)
+        time_it("incremental: delete a module", delete_one, app)
+        time_it("incremental: rename a module", rename_one, app)
+        time_it("incremental: import 500 modules", lambda: modules.index_written(
+            [f"Imported_{i}" for i in range(500)]), app)
+
+        incremental = tree_names(host)
+        mapped = sorted(host.module_tree_items) == sorted(incremental)
+        host.update_module_tree()
+        rebuilt = tree_names(host)
+        repository.close()
+
+    if sorted(incremental) != sorted(rebuilt) or sorted(rebuilt) != sorted(modules) or not mapped:
+        print("MISMATCH: the incrementally updated tree differs from a full rebuild")
+        return 1
+    print("\nequivalence: incremental updates show the same items as a full rebuild")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
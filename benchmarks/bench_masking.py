@@ -0,0 +1,145 @@
+"""
+Micro-benchmark for screen text masking.
+
+Compares the previous per-pattern re.sub loop with the compiled single-pass
+MaskingEngine on synthetic 24x80 screens, and checks that both produce the
+same masked text.
+
+Usage:
+    python benchmarks/bench_masking.py [--patterns 60] [--screens 5000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.masking import MaskingEngine
+
+
+def legacy_apply_masking(text, masking_patterns):
+    """The original per-pattern masking loop, kept here as the reference."""
+    masked_text = text
+
+    for pattern_obj in masking_patterns:
+        regex = pattern_obj.get('regex')
+        mask_indices = pattern_obj.get('mask_indices')
+
+        if not regex or not mask_indices:
+            continue
+
+        try:
+            def mask_match(match):
+                original = match.group(0)
+                masked = list(original)
+                for idx in mask_indices:
+                    if 0 <= idx < len(masked):
+                        masked[idx] = 'x'
+                return ''.join(masked)
+
+            masked_text = re.sub(regex, mask_match, masked_text)
+        except re.error:
+            continue
+
+    return masked_text
+
+
+def convert_to_regex(sample_string):
+    """Same structural regex the masking dialog generates."""
+    regex = ""
+    digit_count = 0
+    for char in sample_string:
+        if char.isdigit():
+            digit_count += 1
+        else:
+            if digit_count > 0:
+                regex += f"\\d{{{digit_count}}}"
+                digit_count = 0
+            regex += re.escape(char)
+    if digit_count > 0:
+        regex += f"\\d{{{digit_count}}}"
+    return r"\b" + regex + r"\b"
+
+
+def make_patterns(count, rng):
+    """Builds distinct structural masking rules like the ones users configure."""
+    patterns = []
+    seen = set()
+    separators = ['-', '/', '.', ' ']
+    while len(patterns) < count:
+        groups = [rng.randint(2, 7) for _ in range(rng.randint(2, 4))]
+        separator = rng.choice(separators)
+        sample = separator.join(''.join(rng.choice('0123456789') for _ in range(n)) for n in groups)
+        regex = convert_to_regex(sample)
+        if regex in seen:
+            continue
+        seen.add(regex)
+        mask_indices = sorted(rng.sample(range(len(sample)), k=min(4, len(sample))))
+        patterns.append({'regex': regex, 'sample': sample, 'mask_indices': mask_indices})
+    return patterns
+
+
+def make_screens(count, patterns, rng):
+    """Builds 24x80 screens with labels, amounts, dates and a few masked values."""
+    screens = []
+    words = ['ACCOUNT', 'NAME', 'BALANCE', 'STATUS', 'ACTIVE', 'DATE', 'TXN', 'BRANCH', 'SORT', 'CODE']
+    for _ in range(count):
+        rows = []
+        for _ in range(24):
+            parts = []
+            while sum(len(p) + 1 for p in parts) < 60:
+                roll = rng.random()
+                if roll < 0.02:
+                    sample = rng.choice(patterns)['sample']
+                    parts.append(''.join(rng.choice('0123456789') if c.isdigit() else c for c in sample))
+                elif roll < 0.12:
+                    parts.append(f"{rng.randint(0, 99999)}.{rng.randint(0, 99):02d}")
+                else:
+                    parts.append(rng.choice(words) + ':')
+            rows.append(' '.join(parts)[:80].ljust(80))
+        screens.append(''.join(rows))
+    return screens
+
+
+def time_it(label, func, screens):
+    start = time.perf_counter()
+    results = [func(screen) for screen in screens]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms  ({elapsed / len(screens) * 1e6:8.1f} us/screen)")
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--patterns', type=int, default=60)
+    parser.add_argument('--screens', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patterns = make_patterns(args.patterns, rng)
+    screens = make_screens(args.screens, patterns, rng)
+    print(f"{len(patterns)} patterns, {len(screens)} screens\n")
+
+    legacy_results, legacy_time = time_it("legacy re.sub loop", lambda t: legacy_apply_masking(t, patterns), screens)
+
+    start = time.perf_counter()
+    MaskingEngine._cache.clear()
+    MaskingEngine.for_patterns(patterns)
+    print(f"{'engine compile':<28} {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+    engine_results, engine_time = time_it(
+        "MaskingEngine (cached)", lambda t: MaskingEngine.for_patterns(patterns).apply(t), screens
+    )
+
+    mismatches = sum(1 for a, b in zip(legacy_results, engine_results) if a != b)
+    print(f"\nspeed-up: {legacy_time / engine_time:.1f}x")
+    print(f"equivalence: {len(screens) - mismatches}/{len(screens)} screens identical")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark for showing module details.
+
+Flicks through N modules (each a 24x80 captured screen with labels) twice
+and compares the old rendering with the new one. The default N fits in the
+preview cache, as when flicking among recent modules. The old rendering ran
+setHtml on every click, built a QPushButton with an icon and a style sheet
+per label, and selected each label by moving the cursor one row or
+character at a time. The new one swaps in a cached QTextDocument, paints
+the delete column with LabelsTableDelegate and selects by absolute
+document position. Checks that both select the same text for every label.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) unless a platform is set.
+
+Usage:
+    python benchmarks/bench_module_preview.py [--modules 30] [--labels 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QIcon, QTextCursor
+from PyQt6.QtWidgets import QApplication, QPushButton, QTableWidget, QTableWidgetItem
+
+from capture import CustomPCOMMTextEdit, LabelsTableDelegate, PCOMMMainFrame, PreviewDocumentCache
+
+
+def make_module(index, label_count):
+    lines = [(f"SCREEN {index:04d} ROW {row:02d} " + "a " * 8 + "FIELD DATA ").ljust(80)[:80] for row in range(24)]
+    labels = [{'name': f"FIELD_{n}", 'row': n % 24 + 1, 'column': 10 + n % 40, 'length': 8} for n in range(label_count)]
+    return {'captured_text': '\n'.join(lines), 'labels': labels}
+
+
+def fill_table(table, labels, legacy):
+    table.setRowCount(len(labels))
+    for i, label in enumerate(labels):
+        table.setItem(i, 0, QTableWidgetItem(label['name']))
+        table.setItem(i, 1, QTableWidgetItem(str(label['row'])))
+        table.setItem(i, 2, QTableWidgetItem(str(label['column'])))
+        table.setItem(i, 3, QTableWidgetItem(str(label['length'])))
+        if legacy:
+            button = QPushButton()
+            button.setIcon(QIcon("bin.png"))
+            button.setIconSize(QSize(16, 16))
+            button.setFixedSize(20, 20)
+            button.setStyleSheet("QPushButton { border: none; border-radius: 3px; background-color: transparent; }"
+                                 "QPushButton:hover { background-color: #fee2e2; }")
+            table.setCellWidget(i, 4, button)
+
+
+def legacy_select(edit, row, column, length):
+    cursor = edit.textCursor()
+    cursor.movePosition(QTextCursor.MoveOperation.Start)
+    for _ in range(row - 1):
+        cursor.movePosition(QTextCursor.MoveOperation.Down)
+    for _ in range(column - 1):
+        cursor.movePosition(QTextCursor.MoveOperation.Right)
+    for _ in range(length):
+        cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor)
+    edit.setTextCursor(cursor)
+    return cursor.selectedText()
+
+
+class PreviewHost:
+    """The preview part of PCOMMMainFrame, without the rest of the window."""
+
+    select_text_in_preview = PCOMMMainFrame.select_text_in_preview
+
+    def __init__(self):
+        self.pcomm_canvas_text_edit = CustomPCOMMTextEdit()
+        self.preview_cache = PreviewDocumentCache(self.pcomm_canvas_text_edit, PCOMMMainFrame.preview_html)
+
+    def select(self, row, column, length):
+        self.select_text_in_preview(row, column, length)
+        return self.pcomm_canvas_text_edit.textCursor().selectedText()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modules', type=int, default=30)
+    parser.add_argument('--labels', type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    modules = [make_module(i, args.labels) for i in range(args.modules)]
+    print(f"{args.modules} modules with {args.labels} labels, shown twice\n")
+
+    legacy_edit = CustomPCOMMTextEdit()
+    legacy_table = QTableWidget(0, 5)
+    legacy_edit.show()
+    legacy_table.show()
+    legacy_selected = []
+    start = time.perf_counter()
+    for module in modules * 2:
+        legacy_edit.setHtml(PCOMMMainFrame.preview_html(module['captured_text']))
+        fill_table(legacy_table, module['labels'], legacy=True)
+        label = module['labels'][-1]
+        legacy_selected.append(legacy_select(legacy_edit, label['row'], label['column'], label['length']))
+        app.processEvents()
+    legacy_time = time.perf_counter() - start
+    print(f"{'legacy: setHtml, buttons, cursor moves':<44} {legacy_time * 1000 / (2 * args.modules):7.2f} ms/module")
+
+    host = PreviewHost()
+    table = QTableWidget(0, 5)
+    table.setItemDelegate(LabelsTableDelegate(table, lambda row: None))
+    host.pcomm_canvas_text_edit.show()
+    table.show()
+    selected = []
+    start = time.perf_counter()
+    for module in modules * 2:
+        host.pcomm_canvas_text_edit.show_document(host.preview_cache.document(module['captured_text']))
+        fill_table(table, module['labels'], legacy=False)
+        label = module['labels'][-1]
+        selected.append(host.select(label['row'], label['column'], label['length']))
+        app.processEvents()
+    cached_time = time.perf_counter() - start
+    print(f"{'cached documents, delegate, positions':<44} {cached_time * 1000 / (2 * args.modules):7.2f} ms/module"
+          f"   ({host.preview_cache.hits} hit(s), {host.preview_cache.misses} miss(es))")
+
+    mismatches = sum(a != b for a, b in zip(legacy_selected, selected))
+    for label in modules[0]['labels']:
+        host.pcomm_canvas_text_edit.show_document(host.preview_cache.document(modules[0]['captured_text']))
+        legacy_edit.setHtml(PCOMMMainFrame.preview_html(modules[0]['captured_text']))
+        mismatches += host.select(label['row'], label['column'], label['length']) != legacy_select(
+            legacy_edit, label['row'], label['column'], label['length'])
+    if mismatches:
+        print(f"MISMATCH: {mismatches} label selection(s) differ")
+        return 1
+    print("\nequivalence: every label selects the same text as the cursor-move selection")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
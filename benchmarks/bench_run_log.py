@@ -0,0 +1,210 @@
+"""
+Benchmark for the run log behind the run console.
+
+Simulates a long run: N executor messages (logged with RunLog.log(), as the
+executors do) spread over tests and timed steps, against printing the same
+lines to a console stream. Reports the cost per message, checks with
+tracemalloc that memory stays flat once the ring buffer is full, and appends
+from a worker thread while a reader polls the new entries, as the console
+does. Checks that the buffer holds exactly the last capacity entries, that
+every polled entry was seen once and in order, and that the slowest steps
+match a sort of every step duration. Also checks that a RunLogStream
+installed by a run only captures the prints of that run's thread, restores
+sys.stdout afterwards and takes severities from explicit markers only.
+
+Usage:
+    python benchmarks/bench_run_log.py [--messages 1000000] [--capacity 20000]
+"""
+import argparse
+import heapq
+import io
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.runlog import RunLog, RunLogStream
+
+MESSAGES = [
+    "Step {step}: Import Module: Module_{module}",
+    "   Setting field ACCT_NO at row 5, col 22 to '{value}'",
+    "   ✅ Enter Key completed in 0.{value}s",
+    "   Validating field STATUS: expected 'A', found 'A'",
+    "Step {step}.1: Wait: 1 second(s)",
+]
+
+
+def simulate(log, messages, steps_per_test=15, lines_per_step=6, seed=1):
+    """
+    Runs a simulated suite against the log.
+
+    Returns:
+        list: Duration of every step, in order
+    """
+    rng = random.Random(seed)
+    durations = []
+    test = step = 0
+    for n in range(messages):
+        if n % (steps_per_test * lines_per_step) == 0:
+            test += 1
+            step = 0
+            log.begin_test(f"TC_{test:05d}")
+        if n % lines_per_step == 0:
+            step += 1
+            log.begin_step(step)
+            # Fake the step time, so the slowest steps can be checked
+            log._step_started -= rng.random() * 10
+        line = MESSAGES[n % len(MESSAGES)].format(step=step, module=n % 500, value=n % 97)
+        log.log('info', line)
+        if n % lines_per_step == lines_per_step - 1:
+            log.finish_step()
+            durations.append(log._entries[-1].duration)
+    log.end_test()
+    return durations
+
+
+def time_print(messages):
+    """Prints the same lines to an in-memory console, as before."""
+    console = io.StringIO()
+    start = time.perf_counter()
+    for n in range(messages):
+        print(MESSAGES[n % len(MESSAGES)].format(step=n // 6, module=n % 500, value=n % 97), file=console)
+        if console.tell() > 1 << 24:
+            console.seek(0)
+            console.truncate()
+    return time.perf_counter() - start
+
+
+def measure_memory(capacity, messages):
+    """Returns the traced memory after each quarter of a run of messages, in KB."""
+    log = RunLog(capacity=capacity)
+    quarter = messages // 4
+    tracemalloc.start()
+    samples = []
+    for _ in range(4):
+        simulate(log, quarter)
+        samples.append(tracemalloc.get_traced_memory()[0] / 1024)
+    tracemalloc.stop()
+    return samples
+
+
+def poll_while_appending(capacity, messages):
+    """
+    Appends from a worker thread while this thread polls like the console.
+
+    Returns:
+        tuple: (entries polled, out-of-order or repeated entries, entries dropped before a poll)
+    """
+    log = RunLog(capacity=capacity)
+    worker = threading.Thread(target=simulate, args=(log, messages))
+    seen = 0
+    polled = 0
+    disorder = 0
+    worker.start()
+    while True:
+        alive = worker.is_alive()
+        seq = log.last_seq
+        for entry in log.entries(since=seen):
+            if entry.seq > seq:
+                break
+            disorder += entry.seq <= seen
+            seen = entry.seq
+            polled += 1
+        if not alive:
+            break
+        time.sleep(0.005)
+    worker.join()
+    return polled, disorder, log.last_seq - polled
+
+
+def check_stream():
+    """
+    Installs a stream for a simulated run while another thread prints.
+
+    Returns:
+        list: Mismatches found
+    """
+    log = RunLog(capacity=1000)
+    console = io.StringIO()
+    mismatches = []
+    previous = sys.stdout
+    sys.stdout = console
+    try:
+        with RunLogStream(log):
+            other = threading.Thread(target=lambda: print("Saved library.json"))
+            other.start()
+            other.join()
+            print("Step 2: 0 failed, Errors: 0")
+            print("❌ Validation failed at Step 2")
+            print("   ⚠️ Enter Key timeout after 30.00s")
+            sys.stdout.write("partial ")
+            sys.stdout.write("line")
+        restored = sys.stdout is console
+    finally:
+        sys.stdout = previous
+    if not restored:
+        mismatches.append("sys.stdout was not restored after the run")
+    if console.getvalue() != "Saved library.json\n":
+        mismatches.append(f"another thread's print did not reach the console: {console.getvalue()!r}")
+    got = [(entry.severity, entry.step, entry.message.strip()) for entry in log.entries()]
+    expected = [('info', '2', "Step 2: 0 failed, Errors: 0"),
+                ('error', '2', "❌ Validation failed at Step 2"),
+                ('warning', None, "⚠️ Enter Key timeout after 30.00s"),
+                ('info', None, "partial line")]
+    if got != expected:
+        mismatches.append(f"captured entries {got} != {expected}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=1000000)
+    parser.add_argument('--capacity', type=int, default=20000)
+    args = parser.parse_args()
+    print(f"{args.messages} messages, capacity {args.capacity}\n")
+
+    elapsed = time_print(args.messages)
+    print(f"{'print to memory (a console is slower)':<40} {elapsed * 1e6 / args.messages:7.2f} µs/message")
+
+    log = RunLog(capacity=args.capacity)
+    start = time.perf_counter()
+    durations = simulate(log, args.messages)
+    elapsed = time.perf_counter() - start
+    print(f"{'run_log.log()':<40} {elapsed * 1e6 / args.messages:7.2f} µs/message"
+          f"   ({log.last_seq} entries, {log.dropped} dropped)")
+
+    samples = measure_memory(args.capacity, args.messages)
+    print(f"{'traced memory by quarter of the run':<40} " + ", ".join(f"{kb:,.0f} KB" for kb in samples))
+
+    polled, disorder, missed = poll_while_appending(args.capacity, args.messages // 4)
+    print(f"{'polled while appending from a thread':<40} {polled} entries ({missed} dropped before a poll)")
+
+    mismatches = []
+    entries = log.entries()
+    if len(entries) != min(args.capacity, log.last_seq) or \
+            [entry.seq for entry in entries] != list(range(log.last_seq - len(entries) + 1, log.last_seq + 1)):
+        mismatches.append("the buffer does not hold the last capacity entries")
+    expected = heapq.nlargest(log.slowest_size, durations)
+    if [entry.duration for entry in log.slowest_steps()] != expected:
+        mismatches.append("the slowest steps differ from a sort of every step")
+    if args.messages >= 8 * args.capacity and samples[-1] > samples[1] * 1.1:
+        mismatches.append(f"memory grew from {samples[1]:,.0f} KB to {samples[-1]:,.0f} KB after the buffer filled")
+    if disorder:
+        mismatches.append(f"{disorder} polled entries were repeated or out of order")
+    mismatches.extend(check_stream())
+
+    for mismatch in mismatches:
+        print(f"MISMATCH: {mismatch}")
+    if mismatches:
+        return 1
+    print("\nequivalence: the buffer holds the last entries, the slowest steps match a full sort, "
+          "memory stays flat, polling sees every new entry once and the run stream only captures its thread")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark for the golden-screen regression diff.
+
+Builds two synthetic runs of 24x80 screens where every screen carries a date
+and time (volatile) and a fraction of screens has real changes, then times
+ScreenDiffEngine.diff_runs() and checks its result against a naive
+character-by-character comparison.
+
+Usage:
+    python benchmarks/bench_screen_diff.py [--tests 500] [--steps 10] [--changed 0.1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.screen import ScreenDiffEngine
+
+
+def naive_diff(engine, baseline_text, current_text):
+    """Reference diff: compares every character of every row."""
+    baseline = engine.normalize(baseline_text)
+    current = engine.normalize(current_text)
+    changes = []
+    for row in range(engine.rows):
+        spans = []
+        span_start = None
+        for col in range(engine.cols):
+            index = row * engine.cols + col
+            if baseline[index] != current[index]:
+                if span_start is None:
+                    span_start = col
+            elif span_start is not None:
+                spans.append((span_start, col))
+                span_start = None
+        if span_start is not None:
+            spans.append((span_start, engine.cols))
+        if spans:
+            changes.append((row, spans))
+    return changes
+
+
+def make_screen(rng, day):
+    """Builds a 24x80 screen with a header date/time and some account data."""
+    rows = [f"ACCT INQUIRY      DATE: 2026-10-{day:02d}   TIME: {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00".ljust(80)]
+    for row in range(1, 24):
+        rows.append(f"FIELD {row:02d}: {rng.randint(0, 10 ** 8):08d}  STATUS: ACTIVE".ljust(80))
+    return ''.join(rows)
+
+
+def make_runs(tests, steps, changed, rng):
+    baseline = {}
+    current = {}
+    for test in range(tests):
+        name = f"TC_{test:04d}"
+        baseline[name] = []
+        current[name] = []
+        for step in range(1, steps + 1):
+            screen = make_screen(rng, 1)
+            # The compared run has a different date/time on every screen
+            new_screen = screen[:24] + '2026-10-19   TIME: 12:34:56' + screen[51:]
+            if rng.random() < changed:
+                row = rng.randint(1, 23) * 80
+                new_screen = new_screen[:row + 10] + 'CHANGED!' + new_screen[row + 18:]
+            baseline[name].append({'step': step, 'screen_text': screen})
+            current[name].append({'step': step, 'screen_text': new_screen})
+    return baseline, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tests', type=int, default=500)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--changed', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    baseline, current = make_runs(args.tests, args.steps, args.changed, rng)
+    engine = ScreenDiffEngine()
+
+    start = time.perf_counter()
+    diff = engine.diff_runs(baseline, current)
+    elapsed = time.perf_counter() - start
+    print(f"{diff['compared']} screen pairs: {diff['identical']} identical, {len(diff['changed'])} changed")
+    print(f"diff_runs: {elapsed * 1000:.1f} ms ({elapsed / max(diff['compared'], 1) * 1e6:.1f} us/pair)")
+
+    start = time.perf_counter()
+    expected = {}
+    for name, screenshots in baseline.items():
+        for baseline_shot, current_shot in zip(screenshots, current[name]):
+            changes = naive_diff(engine, baseline_shot['screen_text'], current_shot['screen_text'])
+            if changes:
+                expected[(name, str(baseline_shot['step']))] = changes
+    naive_elapsed = time.perf_counter() - start
+    print(f"naive diff: {naive_elapsed * 1000:.1f} ms")
+
+    actual = {(entry['test'], entry['step']): entry['changes'] for entry in diff['changed']}
+    if actual != expected:
+        print("MISMATCH between diff_runs and the naive diff")
+        return 1
+    print("equivalence: diff_runs matches the naive diff")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark for the live screen mirror.
+
+Replays a simulated session on a ScreenBufferSession: mostly idle polls,
+polls where one field was typed or the cursor moved, and polls after a new
+screen arrived. It compares re-rendering the whole preview on every poll
+with ScreenMirror, which diffs the frame by row hash and rewrites only the
+changed rows, with the labels of a module and the host cursor drawn over
+the screen. Checks after every poll that the mirror shows exactly the
+session's screen.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) unless a platform is set.
+
+Usage:
+    python benchmarks/bench_screen_mirror.py [--polls 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from capture import CustomPCOMMTextEdit, ScreenMirror
+from pcomm_core.session import ScreenBufferSession
+
+ROWS, COLS = 24, 80
+
+
+def make_screen(index):
+    return ''.join((f"SCREEN {index:04d} ROW {row:02d} " + "FIELD DATA " * 5).ljust(COLS)[:COLS] for row in range(ROWS))
+
+
+def make_events(polls, seed=7):
+    """One event per poll: idle (60%), a typed field (25%), a cursor move (10%) or a new screen (5%)."""
+    rng = random.Random(seed)
+    return [rng.choices(['idle', 'type', 'cursor', 'screen'], [60, 25, 10, 5])[0] for _ in range(polls)]
+
+
+def apply_event(session, event, step, rng):
+    if event == 'type':
+        session.SetText(f"{step:08d}", rng.randint(1, ROWS), rng.randint(1, COLS - 8))
+    elif event == 'cursor':
+        session.SetCursorPos(rng.randint(1, ROWS), rng.randint(1, COLS))
+    elif event == 'screen':
+        session.load_screen(make_screen(step))
+
+
+def screen_rows(session):
+    text = session.GetText(1, ROWS * COLS)
+    return '\n'.join(text[start:start + COLS] for start in range(0, ROWS * COLS, COLS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--polls', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    events = make_events(args.polls)
+    labels = [{'name': f"FIELD_{n}", 'row': n + 1, 'column': 20, 'length': 10} for n in range(20)]
+    print(f"{args.polls} polls: {events.count('idle')} idle, {events.count('type')} typed field(s), "
+          f"{events.count('cursor')} cursor move(s), {events.count('screen')} new screen(s)\n")
+
+    session = ScreenBufferSession(ROWS, COLS, make_screen(0))
+    legacy_edit = CustomPCOMMTextEdit()
+    legacy_edit.show()
+    rng = random.Random(1)
+    elapsed = 0.0
+    for step, event in enumerate(events):
+        apply_event(session, event, step, rng)
+        start = time.perf_counter()
+        legacy_edit.setPlainText(screen_rows(session))
+        app.processEvents()
+        elapsed += time.perf_counter() - start
+    print(f"{'legacy: re-render the whole screen':<40} {elapsed * 1000 / args.polls:7.3f} ms/poll")
+
+    session = ScreenBufferSession(ROWS, COLS, make_screen(0))
+    edit = CustomPCOMMTextEdit()
+    edit.show()
+    mirror = ScreenMirror(edit, lambda: session)
+    mirror.set_labels(labels)
+    mirror.start()
+    rng = random.Random(1)
+    elapsed = 0.0
+    mismatches = 0
+    for step, event in enumerate(events):
+        apply_event(session, event, step, rng)
+        start = time.perf_counter()
+        mirror.poll()
+        app.processEvents()
+        elapsed += time.perf_counter() - start
+        mismatches += mirror.document.toPlainText() != screen_rows(session)
+        mismatches += mirror.cursor_position != session.cursor
+    mirror.stop()
+    print(f"{'mirror: row diff, overlay':<40} {elapsed * 1000 / args.polls:7.3f} ms/poll   ({mirror.report()})")
+
+    if mismatches:
+        print(f"MISMATCH: the mirror differed from the session screen after {mismatches} poll(s)")
+        return 1
+    print("\nequivalence: after every poll the mirror shows the session's screen and cursor")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
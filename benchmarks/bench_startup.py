@@ -0,0 +1,74 @@
+"""
+Benchmark for startup imports.
+
+Times `import capture` in fresh interpreters and, for comparison, importing
+the automation, Win32, imaging and sound modules that capture.py used to
+import at startup and now loads on first use (LazyModule). Checks that none
+of them is imported by `import capture` itself.
+
+The per-phase startup times of the real application (imports, window
+constructed, library loaded, first paint) are printed on every start and
+appended to startup_profile.jsonl.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported at startup before they were made lazy
+DEFERRED_MODULES = ['pyautogui', 'pygetwindow', 'pyperclip', 'win32gui', 'win32ui', 'win32con', 'PIL.Image',
+                    'win32com.client', 'pythoncom', 'winsound', 'docx', 'docx.shared', 'docx.enum.text']
+
+
+def time_import(statement, runs):
+    """Returns the median time of running an import statement in a fresh interpreter, or None if it fails."""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    capture_time = time_import("import capture", args.runs)
+    if capture_time is None:
+        print("import capture failed (are PyQt6 and the other dependencies installed?)")
+        return 1
+    print(f"{'import capture':<40} {capture_time * 1000:9.1f} ms\n")
+
+    total = 0.0
+    for module_name in DEFERRED_MODULES:
+        elapsed = time_import(f"import {module_name}", args.runs)
+        if elapsed is None:
+            print(f"{'  ' + module_name:<40} {'not installed':>12}")
+            continue
+        total += elapsed
+        print(f"{'  ' + module_name:<40} {elapsed * 1000:9.1f} ms")
+    print(f"{'deferred until first use (sum)':<40} {total * 1000:9.1f} ms")
+
+    check = ("import sys, capture; "
+             f"print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True)
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+    if result.returncode != 0 or loaded:
+        print(f"\nMISMATCH: imported at startup: {loaded or result.stderr.strip()}")
+        return 1
+    print("\nequivalence: none of the deferred modules is imported by 'import capture'")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Benchmark for the test case editor's main step list.
+
+Builds a test case with N steps and compares the old update_steps_list
+(clear both lists and recreate a QWidget with a label and buttons per step,
+icons loaded from disk and style sheets parsed per row) with the
+delegate-painted list. It measures the first fill and the updates that
+follow a field edit, a move, an add and a delete, which only touch the
+changed rows. Checks that the updated list shows the same rows as a fresh
+fill.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) unless a platform is set.
+
+Usage:
+    python benchmarks/bench_step_list.py [--steps 400]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+                             QPushButton, QSizePolicy, QWidget)
+
+from capture import CustomStepsListWidget, EditTestCaseDialog, StepItemDelegate
+
+
+class StepListHost:
+    """The main step list part of EditTestCaseDialog, without the rest of the dialog."""
+
+    update_steps_list = EditTestCaseDialog.update_steps_list
+    step_list_name = EditTestCaseDialog.step_list_name
+    update_step_combo_options = EditTestCaseDialog.update_step_combo_options
+
+    def __init__(self, steps):
+        self.added_steps = steps
+        self.steps_list_widget = CustomStepsListWidget(self)
+        self.steps_list_widget.setItemDelegate(StepItemDelegate(self.steps_list_widget, lambda action, row: None))
+        self.utility_steps_list_widget = QListWidget()
+        self.start_step_combo = QComboBox()
+        self.end_step_combo = QComboBox()
+        self._step_combo_layout = None
+
+    def _check_step_module_version(self, step_data):
+        return step_data.get('outdated', False)
+
+
+def make_step(index):
+    if index % 5 == 4:
+        return {'type': 'special_key', 'key_value': '[enter]', 'utility_steps': []}
+    action_type = 'Validate' if index % 7 == 0 else 'Input'
+    return {
+        'type': 'module_import',
+        'module_name': f"Module_{index % 50}",
+        'outdated': index % 11 == 0,
+        'fields': [{'field_name': f"FIELD_{f}", 'action_type': action_type, 'value': 'X'} for f in range(5)],
+        'utility_steps': [{'name': 'Wait: 1 second(s)', 'type': 'wait', 'seconds': 1}]
+    }
+
+
+def legacy_update(host):
+    """The old update_steps_list: one widget with a label and up to two buttons per step."""
+    host.steps_list_widget.clear()
+    host.utility_steps_list_widget.clear()
+    host.update_step_combo_options()
+    for i, step in enumerate(host.added_steps):
+        step_name = host.step_list_name(i, step)
+        list_item = QListWidgetItem()
+        item_widget = QWidget()
+        item_layout = QHBoxLayout(item_widget)
+        item_layout.setContentsMargins(4, 2, 8, 2)
+        item_layout.setSpacing(8)
+        name_label = QLabel(step_name)
+        name_label.setMinimumWidth(300)
+        name_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        item_layout.addWidget(name_label, 1)
+        item_layout.addStretch()
+        if step.get('outdated'):
+            refresh_button = QPushButton("🔄")
+            refresh_button.setFixedSize(24, 24)
+            refresh_button.setStyleSheet("QPushButton { background-color: #fbbf24; border-radius: 4px; }")
+            item_layout.addWidget(refresh_button)
+        delete_button = QPushButton()
+        delete_button.setIcon(QIcon("bin.png"))
+        delete_button.setIconSize(QSize(16, 16))
+        delete_button.setFixedSize(20, 20)
+        delete_button.setStyleSheet("QPushButton { border: none; background-color: transparent; padding: 0px; }"
+                                    "QPushButton:hover { background-color: #fee2e2; border-radius: 3px; }")
+        item_layout.addWidget(delete_button)
+        host.steps_list_widget.addItem(list_item)
+        host.steps_list_widget.setItemWidget(list_item, item_widget)
+        list_item.setSizeHint(item_widget.sizeHint())
+
+
+def time_it(label, func, app):
+    start = time.perf_counter()
+    func()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def list_rows(host):
+    widget = host.steps_list_widget
+    return [widget.item(i).data(StepItemDelegate.RowRole) for i in range(widget.count())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=400)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{args.steps} steps\n")
+
+    legacy = StepListHost([make_step(i) for i in range(args.steps)])
+    legacy.steps_list_widget.show()
+    time_it("legacy: first fill", lambda: legacy_update(legacy), app)
+    time_it("legacy: update after an edit", lambda: legacy_update(legacy), app)
+
+    host = StepListHost([make_step(i) for i in range(args.steps)])
+    host.steps_list_widget.show()
+    print()
+    time_it("delegate: first fill", host.update_steps_list, app)
+
+    def edit_one():
+        host.added_steps[10]['outdated'] = False
+        host.update_steps_list()
+
+    def move_one():
+        steps = host.added_steps
+        steps[20], steps[21] = steps[21], steps[20]
+        host.update_steps_list()
+
+    def add_one():
+        host.added_steps.append(make_step(args.steps))
+        host.update_steps_list()
+
+    def delete_one():
+        del host.added_steps[args.steps // 2]
+        host.update_steps_list()
+
+    time_it("delegate: update after an edit", edit_one, app)
+    time_it("delegate: move a step down", move_one, app)
+    time_it("delegate: add a step at the end", add_one, app)
+    time_it("delegate: delete a middle step", delete_one, app)
+
+    updated = list_rows(host)
+    fresh = StepListHost(host.added_steps)
+    fresh.update_steps_list()
+    if updated != list_rows(fresh):
+        print("MISMATCH: the incrementally updated list differs from a fresh fill")
+        return 1
+    print("\nequivalence: incremental updates show the same rows as a fresh fill")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
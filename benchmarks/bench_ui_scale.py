@@ -0,0 +1,231 @@
+"""
+UI scalability benchmark on synthetic libraries.
+
+For each scale, writes a synthetic library (see generate_library.py) into a
+temporary folder and starts the real main window there, then times:
+first start (migrating the JSON files into library.db), warm start, tree
+builds, library searches, opening the test case editor, populating the
+execution list, and saves. Checks that every phase shows what was generated
+(tree and list counts, search results against a scan of the records, saved
+records read back).
+
+Prints one column per scale; --report writes the timings as JSON and
+--baseline compares them with an earlier report.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) unless a platform is set. Needs
+PyQt6 only: capture imports its Windows modules (win32, ctypes.windll,
+pyautogui) on first use, and none of them is used here, so the benchmark
+runs on any platform.
+
+Usage:
+    python benchmarks/bench_ui_scale.py [--scales small,medium] [--report out.json] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from capture import EditTestCaseDialog, PCOMMMainFrame, TestExecutionDialog
+from generate_library import SCALES
+from pcomm_core.synthetic import SyntheticLibrary
+
+SEARCHES = [
+    ('modules', "label:acct_no"),
+    ('modules', "module_1"),
+    ('test_cases', "tc_001"),
+    ('test_cases', "validate:module_1"),
+    ('test_cases', "step:wait"),
+]
+
+
+class PhaseTimer:
+    """Times the phases of one scale and collects the equivalence failures."""
+
+    def __init__(self, app):
+        self.app = app
+        self.timings = {}
+        self.mismatches = []
+
+    def run(self, phase, func):
+        start = time.perf_counter()
+        result = func()
+        self.app.processEvents()
+        self.timings[phase] = (time.perf_counter() - start) * 1000
+        return result
+
+    def check(self, phase, ok, detail):
+        if not ok:
+            self.mismatches.append(f"{phase}: {detail}")
+
+
+def visible_children(root):
+    return sum(not root.child(i).isHidden() for i in range(root.childCount())) if root else 0
+
+
+def run_scale(app, library, timer):
+    """Runs every phase on a library written into the current folder."""
+    window = timer.run("first start (migrate)", PCOMMMainFrame)
+    window.close()
+    window.library.close()
+    window.deleteLater()
+    app.processEvents()
+
+    window = timer.run("warm start", PCOMMMainFrame)
+    timer.run("show window", window.show)
+    timer.check("warm start", len(window.modules) == library.module_count
+                and len(window.test_cases) == library.test_case_count, "library counts differ from the generated ones")
+
+    for phase, widget, build, root in (
+            ("tree build: modules", window.modules_widget, window.update_module_tree, lambda: window.module_tree_root),
+            ("tree build: test cases", window.test_cases_widget, window.update_test_case_tree,
+             lambda: window.test_case_tree_root)):
+        window.libraries_tabs.setCurrentWidget(widget)
+        app.processEvents()
+        timer.run(phase, build)
+        count = root().childCount() if root() else 0
+        timer.check(phase, count == len(window.modules if 'modules' in phase else window.test_cases),
+                    f"{count} tree item(s)")
+    timer.run("tree build: templates", window.update_template_tree)
+
+    for table, query in SEARCHES:
+        phase = f"search {table}: {query}"
+        if table == 'modules':
+            window.libraries_tabs.setCurrentWidget(window.modules_widget)
+            timer.run(phase, lambda: window.filter_modules(query))
+            shown = visible_children(window.module_tree_root)
+        else:
+            window.libraries_tabs.setCurrentWidget(window.test_cases_widget)
+            timer.run(phase, lambda: window.filter_test_cases(query))
+            shown = visible_children(window.test_case_tree_root)
+        expected = window.library.search_scan(table, query)
+        timer.check(phase, shown == len(expected) and window.library.search(table, query) == expected,
+                    f"{shown} shown, {len(expected)} expected")
+    window.filter_modules("")
+    window.filter_test_cases("")
+
+    name = next(iter(library.test_cases()))
+    record = window.test_cases[name]
+
+    def open_editor():
+        dialog = EditTestCaseDialog(record.get('steps', []), window.modules, window, name,
+                                    record.get('description', ''), record.get('assumptions', ''),
+                                    record.get('prerequisites', []), record.get('additional_info_fields', []),
+                                    record.get('additional_info_values', {}))
+        dialog.show()
+        return dialog
+
+    editor = timer.run("open test case editor", open_editor)
+    timer.check("open test case editor", editor.steps_list_widget.count() == len(record['steps']),
+                f"{editor.steps_list_widget.count()} step row(s)")
+    editor.reject()
+
+    def open_execution():
+        dialog = TestExecutionDialog(window, test_cases_data=[])
+        dialog.show()
+        return dialog
+
+    execution = timer.run("execution list: load saved", open_execution)
+    execution_data = library.execution_data()
+    listed = sum(len(project['test_cases']) for project in execution_data['projects'].values())
+    rows = sum(1 for _ in execution.test_case_model.test_rows())
+    timer.check("execution list: load saved", rows == listed + len(execution_data['standalone']), f"{rows} row(s)")
+
+    timer.run("execution list: add library", execution.populate_test_cases)
+    rows = sum(1 for _ in execution.test_case_model.test_rows())
+    expected = listed + len(set(execution_data['standalone']) | set(window.test_cases))
+    timer.check("execution list: add library", rows == expected, f"{rows} row(s), {expected} expected")
+
+    def save_execution():
+        execution.save_execution_data()
+        window.persistence.flush()
+
+    timer.run("save: execution list", save_execution)
+    execution.reject()
+
+    def save_test_case():
+        record['description'] += " (edited)"
+        window.test_cases[name] = record
+        window.save_test_cases_to_file()
+
+    timer.run("save: one test case", save_test_case)
+    saved = window.library.load_record('test_cases', name)
+    timer.check("save: one test case", saved['description'].endswith("(edited)"), "the edit was not written")
+
+    window.close()
+    window.library.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='small,medium', help=f"Comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument('--report', help="Write the timings to this JSON file")
+    parser.add_argument('--baseline', help="Compare with a report written earlier")
+    args = parser.parse_args()
+
+    scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    mismatches = []
+    cwd = os.getcwd()
+    for scale in scales:
+        library = SyntheticLibrary(**SCALES[scale])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            start = time.perf_counter()
+            sizes = library.write(temp_dir)
+            print(f"{scale}: {library.module_count} modules, {library.test_case_count} test cases, "
+                  f"{sum(sizes.values()) / 1024 / 1024:.0f} MB written in {time.perf_counter() - start:.1f} s")
+            timer = PhaseTimer(app)
+            os.chdir(temp_dir)
+            try:
+                run_scale(app, library, timer)
+            finally:
+                os.chdir(cwd)
+        results[scale] = {'parameters': SCALES[scale], 'timings_ms': timer.timings}
+        mismatches += [f"{scale}: {mismatch}" for mismatch in timer.mismatches]
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f).get('scales', {})
+
+    phases = list(dict.fromkeys(phase for result in results.values() for phase in result['timings_ms']))
+    print(f"\n{'phase (ms)':<40}" + ''.join(f"{scale:>22}" for scale in scales))
+    for phase in phases:
+        line = f"{phase:<40}"
+        for scale in scales:
+            elapsed = results[scale]['timings_ms'].get(phase)
+            before = baseline.get(scale, {}).get('timings_ms', {}).get(phase)
+            cell = f"{elapsed:9.1f}" if elapsed is not None else f"{'-':>9}"
+            if elapsed is not None and before:
+                cell += f" ({(elapsed - before) / before * 100:+5.0f}%)"
+            line += f"{cell:>22}"
+        print(line)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'scales': results, 'created': time.strftime('%Y-%m-%d %H:%M:%S')}, f, indent=2)
+        print(f"\nreport written to {args.report}")
+
+    if mismatches:
+        for mismatch in mismatches:
+            print(f"MISMATCH: {mismatch}")
+        return 1
+    print("\nequivalence: every phase shows the generated library (counts, search results, saved records)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Writes a synthetic library (captured_modules.json, captured_test_cases.json,
+templates.json and test_execution_data.json) for reproducing big-library
+slowdowns. Start the application in the output folder to use it; the
+library tables are migrated into library.db on first start.
+
+Usage:
+    python benchmarks/generate_library.py OUTPUT_DIR [--scale large] [--modules 5000] [--labels 30] ...
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pcomm_core.synthetic import SyntheticLibrary
+
+# Library sizes used by bench_ui_scale.py; any parameter can be overridden
+SCALES = {
+    'small': dict(modules=200, labels=20, test_cases=300, steps=10, utility_steps=2, projects=5,
+                  tests_per_project=10, standalone=20, templates=5),
+    'medium': dict(modules=1000, labels=20, test_cases=1500, steps=12, utility_steps=2, projects=20,
+                   tests_per_project=25, standalone=100, templates=20),
+    'large': dict(modules=5000, labels=20, test_cases=5000, steps=12, utility_steps=3, projects=50,
+                  tests_per_project=40, standalone=300, templates=50),
+}
+PARAMETERS = ['modules', 'labels', 'test_cases', 'steps', 'utility_steps', 'projects', 'tests_per_project',
+              'standalone', 'templates', 'template_rows', 'seed']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    for name in PARAMETERS:
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int)
+    args = parser.parse_args()
+
+    parameters = dict(SCALES[args.scale])
+    parameters.update({name: getattr(args, name) for name in PARAMETERS if getattr(args, name) is not None})
+    start = time.perf_counter()
+    sizes = SyntheticLibrary(**parameters).write(args.output_dir)
+    print(', '.join(f"{name}={value}" for name, value in parameters.items()))
+    for file_name, size in sizes.items():
+        print(f"{file_name:<32} {size / 1024 / 1024:9.1f} MB")
+    print(f"written to {args.output_dir} in {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,9 @@ import os
 import re # <-- Make sure this is present
 import re
 import copy
+import dataclasses
+import importlib
+import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QDockWidget, QTabWidget, QTabBar, QFrame, QMenuBar,
@@ -11,133 +14,278 @@ from PyQt6.QtWidgets import (
     QSplitter, QTableWidget, QTableWidgetItem, QMessageBox, QStyle, QMenu,
     QFileDialog, QTextEdit, QSizePolicy, QDialog, QLineEdit, QFormLayout, QDialogButtonBox,
     QSpacerItem, QComboBox, QLineEdit, QListWidget, QListWidgetItem,
-    QCheckBox, QRadioButton, QToolButton, QSlider, QStackedWidget, QInputDialog,QSpinBox, QScrollArea, QButtonGroup
+    QCheckBox, QRadioButton, QToolButton, QSlider, QStackedWidget, QInputDialog,QSpinBox, QScrollArea, QButtonGroup,
+    QListView, QAbstractItemView, QStyledItemDelegate, QStyleOptionButton, QStyleOptionComboBox, QToolTip,
+    QTableView, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt, QSize, QByteArray, QPoint, QTimer, QPropertyAnimation, QEasingCurve, pyqtSignal
-from PyQt6.QtGui import QPixmap, QIcon, QAction, QFont, QFontMetrics, QTextCursor, QIntValidator, QPalette, QColor, QTextTableFormat, QTextFrameFormat, QTextCharFormat, QTextCursor
-import pyautogui
-import pygetwindow as gw
-import pyperclip
+from PyQt6.QtCore import Qt, QSize, QByteArray, QPoint, QTimer, QPropertyAnimation, QEasingCurve, pyqtSignal, QAbstractListModel, QModelIndex, QRect, QEvent, QAbstractTableModel, QThread, QEventLoop, QObject
+from PyQt6.QtGui import QPixmap, QIcon, QAction, QFont, QFontMetrics, QTextCursor, QIntValidator, QPalette, QColor, QTextTableFormat, QTextFrameFormat, QTextCharFormat, QTextCursor, QPainter, QCursor, QTextDocument
 import time
 
+
+# --- NEW: Startup Profiling and Lazy Imports ---
+class StartupProfiler:
+    """
+    Records how long each startup phase takes (imports, window construction,
+    library load, first paint) and the time spent importing lazily loaded
+    modules, so startup regressions show up in the console and in
+    startup_profile.jsonl (one JSON line per start).
+    """
+
+    LOG_FILE = 'startup_profile.jsonl'
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []  # [(phase, seconds)]
+        self.imports = []  # [(module, seconds)] for lazy imports
+        self.finished = False
+
+    def mark(self, phase):
+        """Ends a phase: records the time since the previous mark."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def record_import(self, module_name, seconds):
+        self.imports.append((module_name, seconds))
+
+    def report(self):
+        """Returns a one-line summary of the phases."""
+        phases = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases)
+        return f"Startup {(self.last - self.start) * 1000:.0f} ms: {phases}"
+
+    def finish(self, phase='first paint'):
+        """Marks the last phase, prints the summary and appends it to LOG_FILE."""
+        if self.finished:
+            return
+        self.finished = True
+        self.mark(phase)
+        print(self.report())
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'total_ms': round((self.last - self.start) * 1000),
+            'phases': {phase: round(seconds * 1000) for phase, seconds in self.phases},
+            'lazy_imports': {name: round(seconds * 1000) for name, seconds in self.imports}
+        }
+        try:
+            with open(self.LOG_FILE, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"Could not write startup profile: {e}")
+
+
+startup_profiler = StartupProfiler()
+
+
+class LazyModule:
+    """
+    Stands in for a module that is only imported when one of its attributes
+    is first used, so heavy or platform-specific dependencies (automation,
+    Win32, imaging, sound) do not slow down startup.
+    """
+
+    def __init__(self, name, import_name=None, attribute=None):
+        """
+        Args:
+            name: Module the attributes are read from (e.g. 'win32com')
+            import_name: Module to import, if different (e.g. 'win32com.client')
+            attribute: Module attribute to stand in for instead of the module
+                       (e.g. 'windll' of 'ctypes', which only exists on Windows)
+        """
+        self._name = name
+        self._import_name = import_name or name
+        self._attribute = attribute
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            importlib.import_module(self._import_name)
+            module = sys.modules[self._name]
+            self._module = getattr(module, self._attribute) if self._attribute else module
+            startup_profiler.record_import(self._import_name, time.perf_counter() - start)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._import_name}' ({state})>"
+
+
+# ✅ CHANGED: Imported on first use instead of at startup
+pyautogui = LazyModule('pyautogui')
+gw = LazyModule('pygetwindow')
+pyperclip = LazyModule('pyperclip')
+
 # --- New Imports for Win32 API ---
-import win32gui
-import win32ui
-import win32con
-from ctypes import windll
-from PIL import Image
-import win32com.client
-import pythoncom
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+win32gui = LazyModule('win32gui')
+win32ui = LazyModule('win32ui')
+win32con = LazyModule('win32con')
+windll = LazyModule('ctypes', attribute='windll')  # ✅ CHANGED: Resolved on first use (Windows only)
+Image = LazyModule('PIL.Image')
+win32com = LazyModule('win32com', 'win32com.client')
+pythoncom = LazyModule('pythoncom')
+# python-docx is imported where documents are written
 from datetime import datetime
-import winsound
+winsound = LazyModule('winsound')
 # ---------------------------------
 
-# --- NEW: Smart PCOMM Wait Functions ---
-def get_screen_content(autECLPS, rows=24, cols=80):
-    """
-    Gets the current screen content as a string.
-    
-    Args:
-        autECLPS: The PCOMM session object
-        rows: Number of rows (default 24)
-        cols: Number of columns (default 80)
-    
-    Returns:
-        str: Screen content or None if error
-    """
-    try:
-        screen_size = rows * cols
-        screen_text = autECLPS.GetText(1, screen_size)
-        return screen_text
-    except Exception as e:
-        print(f"Error reading screen: {e}")
-        return None
+# --- NEW: Core Engine ---
+# Session helpers, masking, reports, screen diff, the JSON codec, the step
+# model and the library storage live in the pcomm_core package, which imports
+# neither Qt nor win32 when it is loaded.
+from pcomm_core.session import (
+    get_screen_content, wait_for_pcomm_ready_smart, complete_pcomm_wait, connect_pcomm_session)
+from pcomm_core.masking import MaskingEngine
+from pcomm_core.reports import (build_test_case_docx, build_execution_summary_docx, capture_time_of,
+                                 consolidated_report_writer)
+from pcomm_core.rundata import run_file_name, load_run_data, rerender_run
+from pcomm_core.screen import DEFAULT_VOLATILE_PATTERNS, ScreenDiffEngine, ScreenFrameTracker
+from pcomm_core.runlog import SEVERITIES, RunLogStream, run_log
+from pcomm_core.codec import json_codec, atomic_write_text, atomic_write_json
+from pcomm_core.model import rebuild_module_step_fields, UtilityStep, Step, ModuleIndex
+from pcomm_core.storage import (
+    LIBRARY_SEARCH_HELP, LibraryRepository, LazyRecordStore, validate_test_case_record,
+    validate_module_record, parse_import_file, LibraryBundle)
+
 
-def wait_for_screen_change(autECLPS, initial_screen, timeout=30, min_wait=0.3, check_interval=0.1):
+# --- NEW: Library Search ---
+LIBRARY_SEARCH_DELAY_MS = 150  # Typing pause before a search runs
+
+
+# --- NEW: Write-Behind Persistence ---
+class PersistenceSignals(QObject):
+    """Signals of PersistenceService; emitted from its writer thread, delivered on the UI thread."""
+    save_failed = pyqtSignal(str, str)  # (path, error)
+
+
+class PersistenceService:
     """
-    Waits for the screen content to change (indicates PCOMM finished processing).
+    Coalescing write-behind persistence for configuration and execution state.
     
-    Args:
-        autECLPS: The PCOMM session object
-        initial_screen: The screen content before sending the command
-        timeout: Maximum seconds to wait (default 30)
-        min_wait: Minimum seconds to wait before checking (default 0.3)
-        check_interval: How often to check in seconds (default 0.1)
+    request_save() only marks a file dirty and (re)starts a short debounce
+    timer, so a burst of saves becomes one write. When the timer fires, the
+    state is serialized on the UI thread (where it is safe to read) and the
+    atomic file write runs on a background thread. flush() writes everything
+    pending synchronously; it runs on exit, from atexit and on an unhandled
+    exception, which then goes on to crash the app as it did before.
     
-    Returns:
-        tuple: (bool: success, float: elapsed_time)
+    A failed serialization or write is reported through the save_failed
+    signal (path, error), which is delivered on the UI thread.
     """
-    from datetime import datetime
-    import time
     
-    start_time = time.time()
-    
-    # Wait minimum time first (let PCOMM start processing)
-    time.sleep(min_wait)
-    
-    while time.time() - start_time < timeout:
-        current_screen = get_screen_content(autECLPS)
+    def __init__(self, debounce_ms=500):
+        """
+        Args:
+            debounce_ms: Quiet period after the last save request before writing
+        """
+        import atexit
+        import queue
         
-        if current_screen is None:
-            return False, time.time() - start_time
+        self.debounce_ms = debounce_ms
+        self.requested = 0
+        self.coalesced = 0  # Requests merged into an already pending write
+        self.written = 0
+        self.failed = 0
+        self._pending = {}  # {path: (produce, indent)}
+        self._queue = queue.Queue()
         
-        # Check if screen has changed
-        if current_screen != initial_screen:
-            elapsed = time.time() - start_time
-            return True, elapsed
+        # ✅ NEW: Write failures reach the UI thread through a queued signal
+        self._signals = PersistenceSignals()
+        self.save_failed = self._signals.save_failed
         
-        time.sleep(check_interval)
-    
-    # Timeout
-    return False, time.time() - start_time
-
-def wait_for_pcomm_ready_smart(autECLPS, action_description="", timeout=30):
-    """
-    Smart wait that captures screen before/after and waits for changes.
-    Use this BEFORE sending keys that will change the screen.
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._serialize_pending)
+        
+        self._worker = threading.Thread(target=self._write_loop, name="PersistenceWriter", daemon=True)
+        self._worker.start()
+        
+        atexit.register(self.flush)
+        previous_hook = sys.excepthook
+        
+        def flush_on_crash(exc_type, exc_value, exc_traceback):
+            try:
+                self.flush()
+            finally:
+                previous_hook(exc_type, exc_value, exc_traceback)
+                # ✅ CHANGED: Installing a hook turns off PyQt6's abort on an unhandled
+                # exception; abort as it would have, instead of running on in a broken state
+                if previous_hook is sys.__excepthook__:
+                    from PyQt6.QtCore import qFatal
+                    qFatal("Unhandled Python exception")
+        
+        sys.excepthook = flush_on_crash
     
-    Args:
-        autECLPS: The PCOMM session object
-        action_description: Description for logging (e.g., "Enter Key")
-        timeout: Maximum seconds to wait
+    def request_save(self, path, produce, indent=4):
+        """
+        Marks a file dirty. The write happens after the debounce period.
+        
+        Args:
+            path: Target file
+            produce: Callable returning the JSON-serializable state; called on
+                     the UI thread when the debounce period ends
+            indent: JSON indentation (None for compact output)
+        """
+        self.requested += 1
+        if path in self._pending:
+            self.coalesced += 1
+        self._pending[path] = (produce, indent)
+        self._timer.start(self.debounce_ms)
     
-    Returns:
-        tuple: (before_screen, success, elapsed_time)
-    """
-    # Capture screen before action
-    before_screen = get_screen_content(autECLPS)
-    return before_screen
-
-def complete_pcomm_wait(autECLPS, before_screen, action_description="", timeout=30):
-    """
-    Completes the wait after an action was performed.
-    Use this AFTER sending keys.
+    def discard(self, path):
+        """Drops a pending save (e.g. before the file is deleted)."""
+        self._pending.pop(path, None)
+        self._queue.join()
     
-    Args:
-        autECLPS: The PCOMM session object
-        before_screen: Screen content captured before the action
-        action_description: Description for logging  # ✅ Must be named parameter
-        timeout: Maximum seconds to wait
+    def _serialize_pending(self):
+        pending, self._pending = self._pending, {}
+        for path, (produce, indent) in pending.items():
+            try:
+                text = json_codec.dumps(produce(), indent=indent)
+            except Exception as e:
+                self.failed += 1
+                print(f"Error serializing '{path}': {e}")
+                self._report_failure(path, e)
+                continue
+            self._queue.put((path, text))
     
-    Returns:
-        tuple: (bool: success, float: elapsed_time)
-    """
-    if before_screen is None:
-        print(f"⚠️ Could not capture screen before {action_description}, using fixed wait")
-        time.sleep(2.0)
-        return True, 2.0
+    def _write_loop(self):
+        while True:
+            path, text = self._queue.get()
+            try:
+                atomic_write_text(path, text)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error saving '{path}': {e}")
+                self._report_failure(path, e)
+            finally:
+                self._queue.task_done()
     
-    success, elapsed = wait_for_screen_change(autECLPS, before_screen, timeout)
+    def _report_failure(self, path, error):
+        try:
+            self.save_failed.emit(path, str(error))
+        except RuntimeError:
+            pass  # Signal object already deleted during interpreter shutdown
     
-    if success:
-        print(f"✅ {action_description} completed in {elapsed:.2f}s")
-    else:
-        print(f"⚠️ {action_description} timeout after {elapsed:.2f}s")
+    def flush(self):
+        """Writes all pending state now and waits for the writes to finish."""
+        try:
+            self._timer.stop()
+        except RuntimeError:
+            pass  # Timer already deleted during interpreter shutdown
+        self._serialize_pending()
+        self._queue.join()
     
-    return success, elapsed
+    def report(self):
+        """Returns a one-line summary of the save statistics."""
+        return (f"{self.requested} save request(s), {self.written} write(s), "
+                f"{self.coalesced} coalesced, {self.failed} failed")
+
 
 class AddLabelDialog(QDialog):
     """
@@ -1453,6 +1601,50 @@ class SettingsDialog(QDialog):
 
         layout.addSpacing(15)
 
+        # ✅ NEW: Consolidated Suite Report Toggle
+        self.consolidated_report_checkbox = QCheckBox("Generate Consolidated Suite Report")
+        self.consolidated_report_checkbox.setChecked(self.main_window.document_config.get('consolidated_report', False))
+        self.consolidated_report_checkbox.setStyleSheet("font-weight: bold; font-size: 11pt; color: #6B2C91;")
+        layout.addWidget(self.consolidated_report_checkbox)
+
+        layout.addSpacing(10)
+
+        consolidated_info_label = QLabel("When enabled, executing selected test cases also writes one report with a linked summary and the evidence of every test.")
+        consolidated_info_label.setStyleSheet("color: #6b7280; font-size: 9pt; font-style: italic;")
+        consolidated_info_label.setWordWrap(True)
+        layout.addWidget(consolidated_info_label)
+
+        layout.addSpacing(15)
+
+        # ✅ NEW: Compact, compressed run data files
+        self.compress_run_records_checkbox = QCheckBox("Compress Run Data (gzip)")
+        self.compress_run_records_checkbox.setChecked(self.main_window.document_config.get('compress_run_records', False))
+        self.compress_run_records_checkbox.setStyleSheet("font-weight: bold; font-size: 11pt; color: #6B2C91;")
+        layout.addWidget(self.compress_run_records_checkbox)
+
+        layout.addSpacing(10)
+
+        compress_info_label = QLabel("When enabled, the recorded run data used by Re-render Reports and Compare Runs is saved as .json.gz files. Existing runs stay readable either way.")
+        compress_info_label.setStyleSheet("color: #6b7280; font-size: 9pt; font-style: italic;")
+        compress_info_label.setWordWrap(True)
+        layout.addWidget(compress_info_label)
+
+        layout.addSpacing(15)
+
+        # ✅ NEW: Volatile fields ignored by Compare Runs
+        volatile_label = QLabel("Volatile Fields for Compare Runs (one regex per line):")
+        volatile_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(volatile_label)
+
+        self.volatile_patterns_edit = QTextEdit()
+        self.volatile_patterns_edit.setAcceptRichText(False)
+        self.volatile_patterns_edit.setFixedHeight(70)
+        self.volatile_patterns_edit.setPlainText("\n".join(
+            self.main_window.document_config.get('volatile_patterns', DEFAULT_VOLATILE_PATTERNS)))
+        layout.addWidget(self.volatile_patterns_edit)
+
+        layout.addSpacing(15)
+
         # Separator
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
@@ -1971,6 +2163,15 @@ class SettingsDialog(QDialog):
         
         form_layout.addRow("Window Title:", self.pcomm_title_input)
         
+        # ✅ NEW: How often the live screen mirror (Window menu) reads the screen
+        self.mirror_interval_spin = QSpinBox()
+        self.mirror_interval_spin.setRange(ScreenMirror.MIN_INTERVAL_MS, 5000)
+        self.mirror_interval_spin.setSingleStep(50)
+        self.mirror_interval_spin.setSuffix(" ms")
+        self.mirror_interval_spin.setValue(self.main_window.mirror_interval_ms)
+        self.mirror_interval_spin.setToolTip("Time between two reads of the PCOMM screen by the live screen mirror.")
+        form_layout.addRow("Live Mirror Refresh:", self.mirror_interval_spin)
+        
         layout.addLayout(form_layout)
         
         layout.addStretch()
@@ -1989,6 +2190,11 @@ class SettingsDialog(QDialog):
         self.main_window.document_config['generate_documentation'] = self.generate_documentation_checkbox.isChecked()
         self.main_window.document_config['highlight_color'] = self.highlight_color_combo.currentText()
         self.main_window.document_config['capture_screen_flow'] = self.capture_screen_flow_checkbox.isChecked()  # ✅ NEW
+        self.main_window.document_config['consolidated_report'] = self.consolidated_report_checkbox.isChecked()  # ✅ NEW
+        self.main_window.document_config['compress_run_records'] = self.compress_run_records_checkbox.isChecked()  # ✅ NEW
+        self.main_window.document_config['volatile_patterns'] = [  # ✅ NEW
+            line.strip() for line in self.volatile_patterns_edit.toPlainText().splitlines() if line.strip()
+        ]
         self.main_window.save_document_config()
         
         # Save Masking Settings
@@ -1999,7 +2205,10 @@ class SettingsDialog(QDialog):
         new_title = self.pcomm_title_input.text().strip()
         if new_title:
             self.main_window.pcomm_window_title = new_title
-            self.main_window.save_pcomm_window_config()
+        self.main_window.mirror_interval_ms = self.mirror_interval_spin.value()  # ✅ NEW
+        self.main_window.save_pcomm_window_config()
+        self.main_window.screen_mirror.set_interval(self.main_window.mirror_interval_ms)
+        self.main_window.screen_mirror.reconnect()
         
         QMessageBox.information(self, "Success", "All settings saved successfully.")
         self.accept()
@@ -2181,6 +2390,684 @@ class TextElementDialog(QDialog):
             'italic': self.italic_checkbox.isChecked()
         }
 
+# --- NEW: Model/View Test Execution List ---
+@dataclasses.dataclass(slots=True)
+class ExecutionRow:
+    """One row of the Test Execution list: a project header or a test case."""
+    kind: str  # 'project' or 'test_case'
+    name: str
+    project: str = None
+    checked: bool = False
+    status: str = 'Not Run'
+    selected_step: int = 0  # Index into the step choices
+    duration: str = ''
+    playing: bool = False
+    expanded: bool = True  # Project headers only
+    step_choices: list = None  # [(label, start step)], built on first use
+
+
+class ExecutionListModel(QAbstractListModel):
+    """
+    Rows of the Test Execution list.
+
+    Rows are plain ExecutionRow records painted by ExecutionItemDelegate, so
+    no widgets are created per row. A (name, project) -> row index makes
+    status, step and check updates O(1), and only the changed row is
+    repainted. The start-step choices of a test case are built the first time
+    the row is shown or asked for.
+    """
+
+    RowRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, get_test_case_data, parent=None):
+        """
+        Args:
+            get_test_case_data: Callable(name, project) returning the test case data
+            parent: Owning QObject
+        """
+        super().__init__(parent)
+        self._get_test_case_data = get_test_case_data
+        self.rows = []
+        self._index = {}  # {(name, project): row}
+        self._first = {}  # {name: first test case row with that name}
+        self._projects = {}  # {project name: header row}
+        self.checked_count = 0
+        self.test_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.name
+        if role == self.RowRole:
+            return entry
+        if role == Qt.ItemDataRole.ToolTipRole and entry.kind == 'test_case':
+            # Built on hover instead of for every row up front
+            test_case_data = self._get_test_case_data(entry.name, entry.project) or {}
+            assumptions_html = test_case_data.get('assumptions', '')
+            return f"<b>Assumptions:</b><br>{assumptions_html}" if assumptions_html else "No assumptions defined"
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if self.rows[index.row()].kind == 'test_case':
+            flags |= Qt.ItemFlag.ItemIsDragEnabled
+        return flags
+
+    def supportedDragActions(self):
+        return Qt.DropAction.MoveAction | Qt.DropAction.CopyAction
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction | Qt.DropAction.CopyAction
+
+    def _reindex(self):
+        self._index = {}
+        self._first = {}
+        self._projects = {}
+        self.checked_count = 0
+        self.test_count = 0
+        for row, entry in enumerate(self.rows):
+            if entry.kind == 'project':
+                self._projects[entry.name] = row
+            else:
+                self._index[(entry.name, entry.project)] = row
+                self._first.setdefault(entry.name, row)
+                self.test_count += 1
+                self.checked_count += entry.checked
+
+    def set_rows(self, rows):
+        """Replaces all rows (one model reset)."""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self._reindex()
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Appends rows at the end of the list."""
+        if not rows:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self.rows.extend(rows)
+        self._reindex()
+        self.endInsertRows()
+
+    def move_row(self, source, destination):
+        """
+        Moves one row so that it ends up before the row currently at
+        destination (len(rows) moves it to the end).
+
+        Returns:
+            bool: True if the row moved
+        """
+        if destination in (source, source + 1):
+            return False
+        if not self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination):
+            return False
+        entry = self.rows.pop(source)
+        self.rows.insert(destination - 1 if destination > source else destination, entry)
+        self._reindex()
+        self.endMoveRows()
+        return True
+
+    def row_of(self, name, project=None, any_project=True):
+        """
+        Returns the row of a test case, or -1.
+
+        Args:
+            name: Test case name
+            project: Project of the test case (None for standalone)
+            any_project: Match the first row with that name, whatever its project
+        """
+        if any_project:
+            return self._first.get(name, -1)
+        return self._index.get((name, project), -1)
+
+    def project_row(self, project_name):
+        """Returns the row of a project header, or -1."""
+        return self._projects.get(project_name, -1)
+
+    def entry(self, row):
+        return self.rows[row]
+
+    def test_rows(self):
+        """Yields (row, entry) for the test case rows in display order."""
+        for row, entry in enumerate(self.rows):
+            if entry.kind == 'test_case':
+                yield row, entry
+
+    def update_row(self, row, **changes):
+        """Changes fields of one row and repaints only that row."""
+        entry = self.rows[row]
+        if 'checked' in changes:
+            self.checked_count += bool(changes['checked']) - entry.checked
+        for key, value in changes.items():
+            setattr(entry, key, value)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_all_checked(self, checked):
+        """Checks or unchecks every test case with a single repaint."""
+        for _, entry in self.test_rows():
+            entry.checked = checked
+        self.checked_count = self.test_count if checked else 0
+        if self.rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self.rows) - 1))
+
+    def step_choices(self, row):
+        """Returns the start-step choices of a test case row, building them on first use."""
+        entry = self.rows[row]
+        if entry.step_choices is None:
+            test_case_data = self._get_test_case_data(entry.name, entry.project)
+            choices = []
+            if test_case_data and 'steps' in test_case_data:
+                # Main steps and their utility sub-steps (3.1, 3.2, etc.), like the Edit Test Case window
+                for idx, step in enumerate(test_case_data['steps'], start=1):
+                    choices.append((f"Step {idx}", idx))
+                    for sub_idx in range(1, len(step.get('utility_steps', [])) + 1):
+                        choices.append((f"Step {idx}.{sub_idx}", (idx, sub_idx)))
+            else:
+                choices.append(("Step 1", None))
+            entry.step_choices = choices
+            if entry.selected_step >= len(choices):
+                entry.selected_step = 0
+        return entry.step_choices
+
+
+class ExecutionItemDelegate(QStyledItemDelegate):
+    """
+    Paints the Test Execution rows and handles clicks on their controls
+    (checkbox, start step, play/stop, refresh, delete and the project
+    buttons), so the list needs no widgets per row.
+    """
+
+    ROW_HEIGHT = 40
+    STATUS_STYLES = {
+        'Not Run': ('#6B2C91', False),
+        'Passed': ('green', True),
+        'Failed': ('red', True),
+        'Stopped': ('orange', True)
+    }
+    REFRESH_ICON_SVG = """<svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+            <path d="M21 10C21 10 18.995 7.26822 17.3662 5.63824C15.7373 4.00827 13.4864 3 11 3C6.02944 3 2 7.02944 2 12C2 16.9706 6.02944 21 11 21C15.1031 21 18.5649 18.2543 19.6482 14.5M21 10V4M21 10H15" stroke="#6B2C91" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
+        </svg>"""
+    IMPORT_ICON_SVG = """
+        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+            <path d="M14 2H6C5.44772 2 5 2.44772 5 3V19C5 19.5523 5.44772 20 6 20H18C18.5523 20 19 19.5523 19 19V8L14 2Z" stroke="#6B2C91" stroke-width="2"/>
+            <path d="M12 11V18M9 14L12 11L15 14" stroke="#6B2C91" stroke-width="2" stroke-linecap="round"/>
+        </svg>
+        """
+    # Controls that react to a click, and the dialog action they trigger
+    CLICKABLE = ('checkbox', 'step', 'play', 'refresh', 'delete', 'expand', 'import', 'delete_project')
+
+    def __init__(self, dialog):
+        """
+        Args:
+            dialog: The TestExecutionDialog owning the list
+        """
+        super().__init__(dialog)
+        self.dialog = dialog
+        style = dialog.main_window.style()
+        self.play_icon = style.standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
+        self.stop_icon = style.standardIcon(QStyle.StandardPixmap.SP_MediaStop)
+        self.bin_icon = QIcon("bin.png")
+        self.refresh_icon = self._svg_icon(self.REFRESH_ICON_SVG)
+        self.import_icon = self._svg_icon(self.IMPORT_ICON_SVG)
+
+    @staticmethod
+    def _svg_icon(svg):
+        pixmap = QPixmap()
+        pixmap.loadFromData(QByteArray(svg.encode('utf-8')))
+        icon = QIcon()
+        icon.addPixmap(pixmap, QIcon.Mode.Normal, QIcon.State.Off)
+        return icon
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def control_rects(self, rect, entry):
+        """Returns {control name: QRect} for a row; the same layout is used to paint and to hit-test."""
+        rects = {}
+        center_y = rect.center().y()
+        right = rect.right() - 8
+
+        def take(name, width, height):
+            nonlocal right
+            right -= width
+            rects[name] = QRect(right, center_y - height // 2, width, height)
+            right -= 5
+
+        if entry.kind == 'project':
+            take('delete_project', 20, 20)
+            take('import', 24, 24)
+            rects['expand'] = QRect(rect.left() + 2, center_y - 8, 16, 16)
+            left = rect.left() + 21
+        else:
+            take('delete', 20, 20)
+            take('refresh', 30, 30)
+            take('play', 30, 30)
+            take('status', 60, 24)
+            take('step', 120, 22)
+            take('step_label', 70, 22)
+            take('duration', 120, 22)
+            left = rect.left() + (30 if entry.project else 0) + 4
+            rects['checkbox'] = QRect(left, center_y - 8, 16, 16)
+            left += 21
+        rects['name'] = QRect(left, rect.top(), max(right - left, 0), rect.height())
+        return rects
+
+    def paint(self, painter, option, index):
+        entry = index.data(ExecutionListModel.RowRole)
+        if entry is None:
+            return
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        rects = self.control_rects(option.rect, entry)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, QColor('#ede9fe'))
+
+        if entry.kind == 'project':
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#f3f4f6'))
+            painter.drawRoundedRect(option.rect.adjusted(0, 2, 0, -2), 4, 4)
+            painter.setPen(QColor('black'))
+            painter.drawText(rects['expand'], Qt.AlignmentFlag.AlignCenter, "▼" if entry.expanded else "▶")
+
+            font = QFont(option.font)
+            font.setBold(True)
+            font.setPointSize(9)
+            painter.setFont(font)
+            painter.setPen(QColor('#6B2C91'))
+            text = QFontMetrics(font).elidedText(f"📁 {entry.name}", Qt.TextElideMode.ElideRight, rects['name'].width())
+            painter.drawText(rects['name'], Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+            self.import_icon.paint(painter, rects['import'].adjusted(4, 4, -4, -4))
+            self.bin_icon.paint(painter, rects['delete_project'].adjusted(2, 2, -2, -2))
+        else:
+            checkbox = QStyleOptionButton()
+            checkbox.rect = rects['checkbox']
+            checkbox.state = QStyle.StateFlag.State_Enabled | (
+                QStyle.StateFlag.State_On if entry.checked else QStyle.StateFlag.State_Off)
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorCheckBox, checkbox, painter, widget)
+
+            painter.setFont(option.font)
+            painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+            text = QFontMetrics(option.font).elidedText(entry.name, Qt.TextElideMode.ElideRight, rects['name'].width())
+            painter.drawText(rects['name'], Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+            if entry.duration:
+                font = QFont(option.font)
+                font.setPointSize(8)
+                font.setItalic(True)
+                font.setBold(True)
+                painter.setFont(font)
+                painter.setPen(QColor('#dc2626'))
+                painter.drawText(rects['duration'], Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, entry.duration)
+
+            font = QFont(option.font)
+            font.setPointSize(9)
+            painter.setFont(font)
+            painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+            painter.drawText(rects['step_label'], Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, "Start from:")
+
+            choices = index.model().step_choices(index.row())
+            combo = QStyleOptionComboBox()
+            combo.rect = rects['step']
+            combo.state = QStyle.StateFlag.State_Enabled
+            combo.currentText = choices[entry.selected_step][0] if choices else ""
+            combo.editable = False
+            style.drawComplexControl(QStyle.ComplexControl.CC_ComboBox, combo, painter, widget)
+            style.drawControl(QStyle.ControlElement.CE_ComboBoxLabel, combo, painter, widget)
+
+            color, bold = self.STATUS_STYLES.get(entry.status, ('black', False))
+            font = QFont(option.font)
+            font.setBold(bold)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(rects['status'], Qt.AlignmentFlag.AlignCenter, entry.status)
+
+            (self.stop_icon if entry.playing else self.play_icon).paint(painter, rects['play'].adjusted(7, 7, -7, -7))
+            self.refresh_icon.paint(painter, rects['refresh'].adjusted(7, 7, -7, -7))
+            self.bin_icon.paint(painter, rects['delete'].adjusted(2, 2, -2, -2))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        entry = model.entry(index.row())
+        rects = self.control_rects(option.rect, entry)
+        position = event.position().toPoint()
+        control = next((name for name in self.CLICKABLE if name in rects and rects[name].contains(position)), None)
+        if control is None:
+            return False
+
+        if control == 'checkbox':
+            model.update_row(index.row(), checked=not entry.checked)
+            self.dialog.update_select_all_state()
+            return True
+
+        global_position = option.widget.viewport().mapToGlobal(rects['step'].bottomLeft()) if control == 'step' else None
+        # Run after the event returns: most actions rebuild the list or run a test
+        QTimer.singleShot(0, lambda: self.dialog.on_row_control_clicked(control, entry.name, entry.project, global_position))
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        entry = index.data(ExecutionListModel.RowRole)
+        if entry is not None:
+            rects = self.control_rects(option.rect, entry)
+            tooltips = {'refresh': "Refresh test case", 'import': f"Import test cases to '{entry.name}'"}
+            for name, tooltip in tooltips.items():
+                if name in rects and rects[name].contains(event.pos()):
+                    QToolTip.showText(event.globalPos(), tooltip, view)
+                    return True
+        return super().helpEvent(event, view, option, index)
+
+
+class ExecutionListView(QListView):
+    """
+    List view of the Test Execution rows. Dropping a dragged test case moves
+    its row in the model; project headers cannot be dragged.
+    """
+
+    def dropEvent(self, event):
+        model = self.model()
+        source = self.currentIndex()
+        if event.source() is not self or not source.isValid() or model.entry(source.row()).kind != 'test_case':
+            event.ignore()
+            return
+
+        target = self.indexAt(event.position().toPoint())
+        destination = model.rowCount()
+        if target.isValid():
+            destination = target.row()
+            if self.dropIndicatorPosition() == QAbstractItemView.DropIndicatorPosition.BelowItem:
+                destination += 1
+        model.move_row(source.row(), destination)
+
+        # Reported as a copy so the view does not also remove the (already moved) source row
+        event.setDropAction(Qt.DropAction.CopyAction)
+        event.accept()
+        self.stopAutoScroll()
+        self.setState(QAbstractItemView.State.NoState)
+        self.viewport().update()
+
+
+# --- NEW: Run Console ---
+class RunLogTableModel(QAbstractTableModel):
+    """
+    Rows of the run console: run log entries, appended as they arrive and
+    dropped from the top beyond the log's capacity, so the view never holds
+    more than the ring buffer does.
+    """
+
+    COLUMNS = ["Time", "Severity", "Test", "Step", "Duration", "Message"]
+    SEVERITY_COLORS = {'error': QColor('#dc2626'), 'warning': QColor('#b45309'), 'debug': QColor('#6b7280')}
+
+    def __init__(self, capacity, parent=None):
+        """
+        Args:
+            capacity: Maximum number of rows kept
+            parent: Owning QObject
+        """
+        super().__init__(parent)
+        self.capacity = capacity
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return time.strftime('%H:%M:%S', time.localtime(entry.timestamp))
+            if column == 1:
+                return entry.severity
+            if column == 2:
+                return entry.test or ""
+            if column == 3:
+                return entry.step or ""
+            if column == 4:
+                return f"{entry.duration:.2f}s" if entry.duration is not None else ""
+            return entry.message
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.SEVERITY_COLORS.get(entry.severity)
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 5:
+            return entry.message
+        return None
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.rows = list(entries[-self.capacity:])
+        self.endResetModel()
+
+    def append_entries(self, entries):
+        """Appends new entries, dropping the oldest rows beyond capacity."""
+        if not entries:
+            return
+        entries = entries[-self.capacity:]
+        overflow = len(self.rows) + len(entries) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self.rows[:overflow]
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(entries) - 1)
+        self.rows.extend(entries)
+        self.endInsertRows()
+
+
+class RunConsoleDialog(QDialog):
+    """
+    In-app console over the run log (see pcomm_core.runlog): the executors'
+    messages, host screen waits and step durations, filtered by test, step,
+    severity and duration, and the slowest steps of the run. It reads the log
+    on a timer while it is shown and only fetches what is new, so it never
+    slows the executor down.
+    """
+
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run Console")
+        self.setMinimumSize(900, 500)
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)
+        self.setModal(False)
+        self._seen_seq = 0
+        self._tests = []
+        self._filters_changed = True
+
+        layout = QVBoxLayout(self)
+
+        # Filters
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Test:"))
+        self.test_filter_combo = QComboBox()
+        self.test_filter_combo.setMinimumWidth(200)
+        self.test_filter_combo.addItem("All tests", None)
+        self.test_filter_combo.currentIndexChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.test_filter_combo)
+
+        filter_layout.addWidget(QLabel("Step:"))
+        self.step_filter_input = QLineEdit()
+        self.step_filter_input.setPlaceholderText("e.g. 3 or 3.1")
+        self.step_filter_input.setFixedWidth(90)
+        self.step_filter_input.textChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.step_filter_input)
+
+        filter_layout.addWidget(QLabel("Severity:"))
+        self.severity_filter_combo = QComboBox()
+        self.severity_filter_combo.addItem("All", None)
+        for severity in SEVERITIES[1:]:
+            self.severity_filter_combo.addItem(f"{severity.capitalize()} and above", severity)
+        self.severity_filter_combo.currentIndexChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.severity_filter_combo)
+
+        filter_layout.addWidget(QLabel("Slower than:"))
+        self.duration_filter_spin = QDoubleSpinBox()
+        self.duration_filter_spin.setRange(0, 3600)
+        self.duration_filter_spin.setDecimals(1)
+        self.duration_filter_spin.setSingleStep(0.5)
+        self.duration_filter_spin.setSuffix(" s")
+        self.duration_filter_spin.setSpecialValueText("Off")
+        self.duration_filter_spin.valueChanged.connect(self.on_filters_changed)
+        filter_layout.addWidget(self.duration_filter_spin)
+
+        filter_layout.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear_log)
+        filter_layout.addWidget(clear_button)
+        layout.addLayout(filter_layout)
+
+        tabs = QTabWidget()
+
+        self.log_model = RunLogTableModel(run_log.capacity, self)
+        self.log_view = QTableView()
+        self.log_view.setModel(self.log_model)
+        self.log_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.log_view.setWordWrap(False)
+        self.log_view.verticalHeader().setVisible(False)
+        self.log_view.verticalHeader().setDefaultSectionSize(20)
+        self.log_view.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate([70, 70, 160, 50, 70]):
+            self.log_view.setColumnWidth(column, width)
+        tabs.addTab(self.log_view, "Log")
+
+        self.slowest_table = QTableWidget(0, 4)
+        self.slowest_table.setHorizontalHeaderLabels(["Duration", "Test", "Step", "Finished"])
+        self.slowest_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.slowest_table.verticalHeader().setVisible(False)
+        self.slowest_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.slowest_table.cellDoubleClicked.connect(self.show_slowest_step)
+        tabs.addTab(self.slowest_table, "Slowest Steps")
+        layout.addWidget(tabs, 1)
+
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #6b7280;")
+        layout.addWidget(self.summary_label)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def filters(self):
+        """Returns the run log filters of the current selections."""
+        return {
+            'test': self.test_filter_combo.currentData(),
+            'step': self.step_filter_input.text().strip() or None,
+            'min_severity': self.severity_filter_combo.currentData(),
+            'min_duration': self.duration_filter_spin.value() or None
+        }
+
+    def on_filters_changed(self, *_):
+        self._filters_changed = True
+        self.refresh()
+
+    def clear_log(self):
+        run_log.clear()
+        self._filters_changed = True
+        self.refresh()
+
+    def refresh(self):
+        """Shows what was logged since the last refresh (everything again after a filter change)."""
+        seq = run_log.last_seq
+        if seq == self._seen_seq and not self._filters_changed:
+            return
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+
+        if self._filters_changed:
+            self.log_model.set_entries(run_log.entries(**self.filters()))
+            self._filters_changed = False
+        else:
+            # Entries logged after seq was read are fetched on the next refresh
+            new = run_log.entries(since=self._seen_seq, **self.filters())
+            self.log_model.append_entries([entry for entry in new if entry.seq <= seq])
+        self._seen_seq = seq
+        if at_bottom:
+            self.log_view.scrollToBottom()
+
+        self.refresh_tests()
+        self.refresh_slowest()
+        self.summary_label.setText(
+            f"{self.log_model.rowCount()} shown - {len(run_log)} of {run_log.capacity} kept"
+            + (f", {run_log.dropped} older dropped" if run_log.dropped else ""))
+
+    def refresh_tests(self):
+        tests = run_log.tests()
+        if tests == self._tests:
+            return
+        self._tests = tests
+        current = self.test_filter_combo.currentData()
+        self.test_filter_combo.blockSignals(True)
+        self.test_filter_combo.clear()
+        self.test_filter_combo.addItem("All tests", None)
+        for test in tests:
+            self.test_filter_combo.addItem(test, test)
+        if current is not None and current not in tests:
+            self.test_filter_combo.addItem(current, current)  # Keep the filter while its entries age out
+        self.test_filter_combo.setCurrentIndex(max(0, self.test_filter_combo.findData(current)))
+        self.test_filter_combo.blockSignals(False)
+
+    def refresh_slowest(self):
+        slowest = run_log.slowest_steps()
+        self.slowest_table.setRowCount(len(slowest))
+        for row, entry in enumerate(slowest):
+            for column, text in enumerate([f"{entry.duration:.2f}s", entry.test or "", entry.step or "",
+                                           time.strftime('%H:%M:%S', time.localtime(entry.timestamp))]):
+                item = QTableWidgetItem(text)
+                item.setData(Qt.ItemDataRole.UserRole, (entry.test, entry.step))
+                self.slowest_table.setItem(row, column, item)
+
+    def show_slowest_step(self, row, column):
+        """Filters the log on the test and step of a double-clicked slowest step."""
+        item = self.slowest_table.item(row, 0)
+        if not item:
+            return
+        test, step = item.data(Qt.ItemDataRole.UserRole)
+        self.test_filter_combo.blockSignals(True)
+        index = self.test_filter_combo.findData(test)
+        if index < 0:
+            self.test_filter_combo.addItem(test, test)
+            index = self.test_filter_combo.count() - 1
+        self.test_filter_combo.setCurrentIndex(index)
+        self.test_filter_combo.blockSignals(False)
+        self.step_filter_input.blockSignals(True)
+        self.step_filter_input.setText(step or "")
+        self.step_filter_input.blockSignals(False)
+        self.on_filters_changed()
+
+
 class TestExecutionDialog(QDialog):
 
     def __init__(self, parent=None, test_cases_data=None):
@@ -2198,6 +3085,10 @@ class TestExecutionDialog(QDialog):
         # ✅ NEW: Projects dictionary to store project structure
         self.projects = {}  # {project_name: {test_cases: {}, expanded: True}}
         
+        # ✅ NEW: Listed test case data known to equal a library version:
+        # {id(data): (data, library content hash)} (see track_library_copy)
+        self.library_copies = {}
+        
         self.setup_ui()
         self.load_execution_data()
 
@@ -2245,6 +3136,11 @@ class TestExecutionDialog(QDialog):
 
         top_layout.addStretch()
 
+        # ✅ NEW: Run console (the dialog is modal, so it is opened from here during a run)
+        run_console_button = QPushButton("Run Console")
+        run_console_button.clicked.connect(self.show_run_console)
+        top_layout.addWidget(run_console_button)
+
         # ✅ NEW: Add Project button
         add_project_button = QPushButton("➕ Add Project")
         add_project_button.clicked.connect(self.add_project)
@@ -2271,12 +3167,19 @@ class TestExecutionDialog(QDialog):
         main_layout.addLayout(top_layout)
 
         # --- Test Case List Section ---
-        self.test_case_list = QListWidget()
+        # ✅ CHANGED: Model/view list with painted rows instead of a widget per row
+        self.test_case_model = ExecutionListModel(self.get_row_test_case_data, self)
+        self.test_case_list = ExecutionListView()
+        self.test_case_list.setModel(self.test_case_model)
+        self.test_case_list.setItemDelegate(ExecutionItemDelegate(self))
+        self.test_case_list.setUniformItemSizes(True)
+        self.test_case_list.setMouseTracking(True)
         main_layout.addWidget(self.test_case_list)
         
         self.test_case_list.setDragEnabled(True)
         self.test_case_list.setAcceptDrops(True)
-        self.test_case_list.setDragDropMode(QListWidget.DragDropMode.InternalMove)
+        self.test_case_list.setDropIndicatorShown(True)
+        self.test_case_list.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
         self.test_case_list.setDefaultDropAction(Qt.DropAction.MoveAction)
 
         # --- Bottom Control Section ---
@@ -2295,7 +3198,7 @@ class TestExecutionDialog(QDialog):
         self.close_button.clicked.connect(self.reject)
         bottom_layout.addWidget(self.close_button)
         
-        self.test_case_list.model().rowsMoved.connect(self.on_rows_moved)
+        self.test_case_model.rowsMoved.connect(self.on_rows_moved)
         main_layout.addLayout(bottom_layout)
 
     def add_project(self):
@@ -2334,213 +3237,72 @@ class TestExecutionDialog(QDialog):
 
     def add_project_header(self, project_name):
         """Adds a collapsible project header to the list."""
-        item = QListWidgetItem(self.test_case_list)
+        # ✅ CHANGED: A painted row (see ExecutionItemDelegate) instead of a widget
+        self.test_case_model.append_rows([
+            ExecutionRow('project', project_name, expanded=self.projects[project_name].get('expanded', True))
+        ])
+
+    def toggle_project_expansion(self, project_name):
+        """Toggles the expansion state of a project."""
+        self.projects[project_name]['expanded'] = not self.projects[project_name]['expanded']
         
-        # ✅ NEW: Disable dragging for project headers
-        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsDragEnabled)
+        # ✅ CHANGED: Don't call refresh_test_case_list, manually handle expansion
+        row = self.test_case_model.project_row(project_name)
+        if row >= 0:
+            self.test_case_model.update_row(row, expanded=self.projects[project_name]['expanded'])
+            self.apply_row_visibility()
         
-        item_widget = QWidget()
-        item_layout = QHBoxLayout(item_widget)
-        item_layout.setContentsMargins(0, 4, 8, 4)
-        item_layout.setSpacing(3)
+        self.save_execution_data()
+
+    def delete_project(self, project_name):
+        """Deletes a project and all its test cases."""
+        reply = QMessageBox.question(
+            self,
+            "Delete Project",
+            f"Are you sure you want to delete project '{project_name}' and all its test cases?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
         
-        # Expand/Collapse button
-        expand_button = QPushButton("▼" if self.projects[project_name]['expanded'] else "▶")
-        expand_button.setFixedSize(QSize(16, 16))
-        expand_button.setObjectName("expand_button")
-        expand_button.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background-color: transparent;
-                font-size: 8pt;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                background-color: #e5e7eb;
-                border-radius: 2px;
-            }
-        """)
-        expand_button.clicked.connect(lambda: self.toggle_project_expansion(project_name))
-        item_layout.addWidget(expand_button, 0, Qt.AlignmentFlag.AlignVCenter)
-    
+        if reply == QMessageBox.StandardButton.Yes:
+            del self.projects[project_name]
+            self.refresh_test_case_list()
+            self.save_execution_data()
+            QMessageBox.information(self, "Deleted", f"Project '{project_name}' deleted.")
 
+    def import_to_project(self, project_name):
+        """Shows import options for a specific project."""
+        menu = QMenu(self)
         
-        # Project name label (bold and slightly larger)
-        name_label = QLabel(f"📁 {project_name}")
-        name_label.setStyleSheet("font-weight: bold; font-size: 9pt; color: #6B2C91; padding: 0px 0px;")  # ✅ CHANGED: Added padding
-        name_label.setMinimumWidth(200)
-        name_label.setMinimumHeight(24)  # ✅ NEW: Set minimum height for the label
-        name_label.setWordWrap(True)
-        name_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-        item_layout.addWidget(name_label, 1, Qt.AlignmentFlag.AlignVCenter)
+        from_library = QAction("Import from Library", self)
+        from_library.triggered.connect(lambda: self.import_from_library(project_name))
         
-        # Import button for this project
-        import_icon_svg = """
-        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-            <path d="M14 2H6C5.44772 2 5 2.44772 5 3V19C5 19.5523 5.44772 20 6 20H18C18.5523 20 19 19.5523 19 19V8L14 2Z" stroke="#6B2C91" stroke-width="2"/>
-            <path d="M12 11V18M9 14L12 11L15 14" stroke="#6B2C91" stroke-width="2" stroke-linecap="round"/>
-        </svg>
-        """
-        import_icon = QIcon()
-        import_pixmap = QPixmap()
-        import_pixmap.loadFromData(QByteArray(import_icon_svg.encode('utf-8')))
-        import_icon.addPixmap(import_pixmap, QIcon.Mode.Normal, QIcon.State.Off)
-        
-        import_button = QPushButton()
-        import_button.setIcon(import_icon)
-        import_button.setFixedSize(QSize(24, 24))
-        import_button.setToolTip(f"Import test cases to '{project_name}'")
-        import_button.setStyleSheet("""
-            QPushButton {
-                border: none;
-                border-radius: 3px;
-                background-color: transparent;
-                padding: 2px;
-            }
-            QPushButton:hover {
-                background-color: #e5e7eb;
-            }
-        """)
-        import_button.clicked.connect(lambda: self.import_to_project(project_name))
-        item_layout.addWidget(import_button, 0, Qt.AlignmentFlag.AlignVCenter)
+        from_device = QAction("Import from Device", self)
+        from_device.triggered.connect(lambda: self.import_from_device(project_name))
+        
+        menu.addAction(from_library)
+        menu.addAction(from_device)
         
-        # Delete project button
-        delete_button = QPushButton()
-
-        # Load the bin.png icon
-        bin_icon = QIcon("bin.png")
-        delete_button.setIcon(bin_icon)
-        delete_button.setIconSize(QSize(16, 16))  # Icon size slightly smaller than button
-
-        delete_button.setFixedSize(20, 20)
-
-        delete_button.setStyleSheet("""
-            QPushButton {
-                border: none;
-                background-color: transparent;
-                padding: 0px;
-            }
-            QPushButton:hover {
-                background-color: #fee2e2;
-                border-radius: 3px;
-            }
-            QPushButton:pressed {
-                background-color: #fecaca;
-            }
-        """)
-        delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        delete_button.clicked.connect(lambda: self.delete_project(project_name))
-        item_layout.addWidget(delete_button, 0, Qt.AlignmentFlag.AlignVCenter)
-        
-        item_widget.setLayout(item_layout)
-        item_widget.setStyleSheet("background-color: #f3f4f6; border-radius: 4px;")
-        item_widget.setMinimumHeight(35)  # ✅ NEW: Set minimum height for the entire widget
-        
-        self.test_case_list.addItem(item)
-        self.test_case_list.setItemWidget(item, item_widget)
-        
-        # ✅ NEW: Calculate proper size hint based on content
-        size_hint = item_widget.sizeHint()
-        size_hint.setHeight(max(40, size_hint.height()))  # Ensure at least 40px height
-        item.setSizeHint(size_hint)
-        
-        # Store reference to project header item
-        item.setData(Qt.ItemDataRole.UserRole, {'type': 'project', 'name': project_name})
-
-    def toggle_project_expansion(self, project_name):
-        """Toggles the expansion state of a project."""
-        self.projects[project_name]['expanded'] = not self.projects[project_name]['expanded']
-        
-        # ✅ CHANGED: Don't call refresh_test_case_list, manually handle expansion
-        is_expanded = self.projects[project_name]['expanded']
-        
-        # Find the project header item
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'project' and item_data.get('name') == project_name:
-                # Update the expand/collapse button icon
-                widget = self.test_case_list.itemWidget(item)
-                expand_button = widget.findChild(QPushButton, "expand_button")
-                if expand_button:
-                    expand_button.setText("▼" if is_expanded else "▶")
-                
-                # Show/hide test cases under this project
-                j = i + 1
-                while j < self.test_case_list.count():
-                    next_item = self.test_case_list.item(j)
-                    next_item_data = next_item.data(Qt.ItemDataRole.UserRole)
-                    
-                    # Stop if we hit another project header
-                    if next_item_data and next_item_data.get('type') == 'project':
-                        break
-                    
-                    # Show/hide test case items belonging to this project
-                    if next_item_data and next_item_data.get('type') == 'test_case' and next_item_data.get('project') == project_name:
-                        next_item.setHidden(not is_expanded)
-                    
-                    j += 1
-                
-                break
-        
-        self.save_execution_data()
-
-    def delete_project(self, project_name):
-        """Deletes a project and all its test cases."""
-        reply = QMessageBox.question(
-            self,
-            "Delete Project",
-            f"Are you sure you want to delete project '{project_name}' and all its test cases?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            del self.projects[project_name]
-            self.refresh_test_case_list()
-            self.save_execution_data()
-            QMessageBox.information(self, "Deleted", f"Project '{project_name}' deleted.")
-
-    def import_to_project(self, project_name):
-        """Shows import options for a specific project."""
-        menu = QMenu(self)
-        
-        from_library = QAction("Import from Library", self)
-        from_library.triggered.connect(lambda: self.import_from_library(project_name))
-        
-        from_device = QAction("Import from Device", self)
-        from_device.triggered.connect(lambda: self.import_from_device(project_name))
-        
-        menu.addAction(from_library)
-        menu.addAction(from_device)
-        
-        # Show menu at cursor position
-        menu.exec(self.cursor().pos())
+        # Show menu at cursor position
+        menu.exec(self.cursor().pos())
 
     def filter_by_status(self, status_filter):
         """Filters test cases by status."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            # Don't hide project headers
-            if item_data and item_data.get('type') == 'project':
-                item.setHidden(False)
-                continue
-            
-            # Filter test cases
-            if item_data and item_data.get('type') == 'test_case':
-                widget = self.test_case_list.itemWidget(item)
-                if widget:
-                    status_label = widget.findChild(QLabel, "status_label")
-                    
-                    if status_label:
-                        current_status = status_label.text()
-                        if status_filter == "All":
-                            item.setHidden(False)
-                        else:
-                            item.setHidden(current_status != status_filter)
+        self.apply_row_visibility()
+
+    def apply_row_visibility(self):
+        """
+        Hides the test cases of collapsed projects and those not matching the
+        status filter. Project headers are always shown.
+        """
+        status_filter = self.status_filter_combo.currentText()
+        collapsed = {name for name, project_data in self.projects.items() if not project_data.get('expanded', True)}
+        for row, entry in enumerate(self.test_case_model.rows):
+            hidden = entry.kind == 'test_case' and (
+                entry.project in collapsed or (status_filter != "All" and entry.status != status_filter)
+            )
+            if self.test_case_list.isRowHidden(row) != hidden:
+                self.test_case_list.setRowHidden(row, hidden)
 
     def populate_test_cases(self, new_cases=None):
         """Adds test cases to the dialog's list, handling duplicates."""
@@ -2553,185 +3315,65 @@ class TestExecutionDialog(QDialog):
         for name, data in cases_to_add.items():
             if name not in self.displayed_test_cases:
                 self.displayed_test_cases[name] = data
-                self.add_list_item(name)
+                if new_cases is None:
+                    self.track_library_copy(name, data, library_copy=True)
     
-        self.test_case_list.sortItems()
+        self.refresh_test_case_list()
 
     def add_list_item(self, name, project_name=None):
-        """Creates a test case item - updated to support indentation for project tests."""
-        item = QListWidgetItem(self.test_case_list)  # ✅ CHANGED: Use test_case_list
-        item_widget = QWidget()
-        item_layout = QHBoxLayout(item_widget)
-        
-        # Add left margin for project test cases
-        if project_name:
-            item_layout.setContentsMargins(30, 1, 8, 6)
-        else:
-            item_layout.setContentsMargins(0, 1, 8, 6)
-        
-        item_layout.setSpacing(5)
-        
-        checkbox = QCheckBox()
-        # ✅ FIXED: Use blockSignals to prevent triggering update_select_all_state during initialization
-        checkbox.blockSignals(True)
-        checkbox.setCheckState(Qt.CheckState.Unchecked)
-        checkbox.blockSignals(False)
-        
-        # ✅ FIXED: Connect directly to stateChanged, not the select_all method
-        checkbox.stateChanged.connect(self.update_select_all_state)
-        item_layout.addWidget(checkbox, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        name_label = QLabel(name)
-        name_label.setMinimumWidth(150)
-        name_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        """Adds a test case row (indented when it belongs to a project)."""
+        # ✅ CHANGED: A painted row (see ExecutionItemDelegate); the step choices and
+        # the assumptions tooltip are built when the row is first shown
+        self.test_case_model.append_rows([self.create_row(name, project_name)])
+
+    def create_row(self, name, project_name=None):
+        """Creates the ExecutionRow of a test case."""
+        return ExecutionRow(
+            'test_case', name, project_name,
+            duration=self.execution_times.get(name, {}).get('duration', '')
+        )
 
-        # ✅ NEW: Add tooltip showing assumptions
+    def get_row_test_case_data(self, name, project_name):
+        """Returns the data of a listed test case (from its project, or standalone)."""
         if project_name:
-            test_case_data = self.projects[project_name]['test_cases'].get(name)
-        else:
-            test_case_data = self.displayed_test_cases.get(name)
-
-        if test_case_data:
-            assumptions_html = test_case_data.get('assumptions', '')
-            if assumptions_html:
-                # Keep HTML formatting for rich text tooltip (tables will render properly)
-                name_label.setToolTip(f"<b>Assumptions:</b><br>{assumptions_html}")
-                # Enable rich text rendering for the label
-                name_label.setTextFormat(Qt.TextFormat.RichText)
-            else:
-                name_label.setToolTip("No assumptions defined")
-
-        item_layout.addWidget(name_label, 0, Qt.AlignmentFlag.AlignVCenter)
+            return self.projects.get(project_name, {}).get('test_cases', {}).get(name)
+        return self.displayed_test_cases.get(name)
+
+    def on_row_control_clicked(self, control, name, project_name, global_position=None):
+        """Runs the action of a control clicked in a list row (see ExecutionItemDelegate)."""
+        if control == 'expand':
+            self.toggle_project_expansion(name)
+        elif control == 'import':
+            self.import_to_project(name)
+        elif control == 'delete_project':
+            self.delete_project(name)
+        elif control == 'play':
+            self.toggle_play_stop(name)
+        elif control == 'refresh':
+            self.refresh_test_case(name)
+        elif control == 'delete':
+            self.delete_single_test(name)
+        elif control == 'step':
+            self.choose_start_step(name, project_name, global_position)
+
+    def choose_start_step(self, name, project_name, global_position):
+        """Shows the start step choices of a test case as a menu."""
+        row = self.test_case_model.row_of(name, project_name, any_project=False)
+        if row < 0:
+            return
+        choices = self.test_case_model.step_choices(row)
+        selected = self.test_case_model.entry(row).selected_step
         
-        item_layout.addStretch()
-
-        # Get test case data
-        if project_name:
-            test_case_data = self.projects[project_name]['test_cases'].get(name)
-        else:
-            test_case_data = self.displayed_test_cases.get(name)
-
-        # ✅ NEW: Show execution time if test has been executed
-        execution_time_label = QLabel("")
-        execution_time_label.setObjectName("execution_time_label")
-        execution_time_label.setStyleSheet("font-size: 8pt; color: #dc2626; font-style: italic; font-weight: bold;")
-        execution_time_label.setFixedWidth(120)
-        execution_time_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-
-        if name in self.execution_times and 'duration' in self.execution_times[name]:
-            duration = self.execution_times[name]['duration']
-            execution_time_label.setText(duration)
-
-        item_layout.addWidget(execution_time_label, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        # Step selector
-        # Step selector
-        step_label = QLabel("Start from:")
-        step_label.setStyleSheet("font-size: 9pt;")
-        item_layout.addWidget(step_label, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        step_combo = QComboBox()
-        step_combo.setObjectName("step_combo")
-        step_combo.setFixedWidth(120)
-        step_combo.setFixedHeight(22)
-        step_combo.setStyleSheet("font-size: 9pt; margin-bottom: 8px;")
-
-        if test_case_data and 'steps' in test_case_data:
-            steps = test_case_data['steps']
-            
-            # ✅ NEW: Dynamically generate step numbers with utility sub-steps (like Edit Test Case window)
-            for idx, step in enumerate(steps, start=1):
-                # Add main step
-                step_combo.addItem(f"Step {idx}", idx)
-                
-                # ✅ Add utility sub-steps (3.1, 3.2, etc.)
-                utility_steps = step.get('utility_steps', [])
-                for sub_idx in range(1, len(utility_steps) + 1):
-                    step_combo.addItem(f"Step {idx}.{sub_idx}", (idx, sub_idx))
-        else:
-            step_combo.addItem("Step 1")
-
-        step_combo.setCurrentIndex(0)
-        item_layout.addWidget(step_combo, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        
-        # Status Label
-        status_label = QLabel("Not Run")
-        status_label.setFixedWidth(60)
-        status_label.setFixedHeight(24)
-        status_label.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        status_label.setObjectName("status_label")
-        status_label.setStyleSheet("color: #6B2C91; font-weight: normal;")
-        item_layout.addWidget(status_label, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        # Play/Stop button
-        play_stop_button = QPushButton()
-        play_stop_button.setIcon(self.main_window.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
-        play_stop_button.setFixedSize(QSize(30, 30))
-        play_stop_button.setObjectName("play_stop_button")
-        play_stop_button.clicked.connect(lambda: self.toggle_play_stop(name))
-        play_stop_button.setStyleSheet("margin-bottom: 0px;")
-        item_layout.addWidget(play_stop_button, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        # Refresh button
-        refresh_icon_svg = """<svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-            <path d="M21 10C21 10 18.995 7.26822 17.3662 5.63824C15.7373 4.00827 13.4864 3 11 3C6.02944 3 2 7.02944 2 12C2 16.9706 6.02944 21 11 21C15.1031 21 18.5649 18.2543 19.6482 14.5M21 10V4M21 10H15" stroke="#6B2C91" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
-        </svg>"""
-        refresh_icon = QIcon()
-        refresh_pixmap = QPixmap()
-        refresh_pixmap.loadFromData(QByteArray(refresh_icon_svg.encode('utf-8')))
-        refresh_icon.addPixmap(refresh_pixmap, QIcon.Mode.Normal, QIcon.State.Off)
-        
-        refresh_button = QPushButton()
-        refresh_button.setIcon(refresh_icon)
-        refresh_button.setFixedSize(QSize(30, 30))
-        refresh_button.setStyleSheet("""
-            QPushButton { border: none; border-radius: 4px; background-color: transparent; margin-bottom: 0px; }
-            QPushButton:hover { background-color: #e5e7eb; }
-        """)
-        refresh_button.setToolTip("Refresh test case")
-        refresh_button.clicked.connect(lambda: self.refresh_test_case(name))
-        item_layout.addWidget(refresh_button, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        # Delete button
-        delete_button = QPushButton()
-
-        # Load the bin.png icon
-        bin_icon = QIcon("bin.png")
-        delete_button.setIcon(bin_icon)
-        delete_button.setIconSize(QSize(16, 16))  # Icon size slightly smaller than button
-
-        delete_button.setFixedSize(20, 20)
-
-        delete_button.setStyleSheet("""
-            QPushButton { 
-                border: none; 
-                background-color: transparent; 
-                padding: 0px; 
-            }
-            QPushButton:hover { 
-                background-color: #fee2e2; 
-                border-radius: 3px; 
-            }
-            QPushButton:pressed {
-                background-color: #fecaca;
-            }
-        """)
-        delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-        delete_button.clicked.connect(lambda: self.delete_single_test(name))
-        item_layout.addWidget(delete_button, 0, Qt.AlignmentFlag.AlignVCenter)
-
-        item_widget.setLayout(item_layout)
-        self.test_case_list.addItem(item)  # ✅ CHANGED: Use test_case_list
-        self.test_case_list.setItemWidget(item, item_widget)  # ✅ CHANGED: Use test_case_list
-        item.setSizeHint(item_widget.sizeHint())
-        
-        # Store metadata
-        item.setData(Qt.ItemDataRole.UserRole, {
-            'type': 'test_case',
-            'name': name,
-            'project': project_name
-        })
+        menu = QMenu(self)
+        for choice_index, (label, _) in enumerate(choices):
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(choice_index == selected)
+            action.setData(choice_index)
+        chosen = menu.exec(global_position)
+        if chosen is not None:
+            self.test_case_model.update_row(row, selected_step=chosen.data())
+            self.save_execution_data()
         
     def get_test_case_data(self, test_case_name):
         """Helper method to get test case data from either projects or standalone."""
@@ -2745,45 +3387,40 @@ class TestExecutionDialog(QDialog):
         
     def get_start_step_index(self, test_case_name):
         """Gets the selected start step index and utility sub-index if applicable."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                widget = self.test_case_list.itemWidget(item)
-                step_combo = widget.findChild(QComboBox, "step_combo")
-                if step_combo:
-                    # Get the data stored with the current item
-                    step_data = step_combo.currentData()
-                    if isinstance(step_data, tuple):
-                        # It's a utility step: (main_step_index, utility_sub_index)
-                        return step_data
-                    else:
-                        # It's a main step: return the step index (1-based)
-                        return step_data if step_data is not None else 1
-                break
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            choices = self.test_case_model.step_choices(row)
+            if choices:
+                # Get the data stored with the current choice
+                step_data = choices[self.test_case_model.entry(row).selected_step][1]
+                if isinstance(step_data, tuple):
+                    # It's a utility step: (main_step_index, utility_sub_index)
+                    return step_data
+                else:
+                    # It's a main step: return the step index (1-based)
+                    return step_data if step_data is not None else 1
         return 1  # Default to step 1
     
+    def set_execution_time(self, test_case_name, duration):
+        """Shows the execution time of a test case in its row."""
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            self.test_case_model.update_row(row, duration=duration)
+
     def update_status(self, test_case_name, status):
         """Updates status for a test case."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                widget = self.test_case_list.itemWidget(item)
-                status_label = widget.findChild(QLabel, "status_label")
-                if status_label:
-                    status_label.setText(status)
-                    if status == "Passed":
-                        status_label.setStyleSheet("color: green; font-weight: bold;")
-                    elif status == "Failed":
-                        status_label.setStyleSheet("color: red; font-weight: bold;")
-                    elif status == "Stopped":
-                        status_label.setStyleSheet("color: orange; font-weight: bold;")
-                    else:
-                        status_label.setStyleSheet("color: black;")
-                break
+        # ✅ CHANGED: O(1) row lookup; only this row is repainted
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            self.test_case_model.update_row(row, status=status)
+            if self.status_filter_combo.currentText() != "All":
+                self.apply_row_visibility()
+        
+        # ✅ NEW: Test boundaries of the run log (both executors report through here)
+        if status == "Running":
+            run_log.begin_test(test_case_name)
+        elif status in ("Passed", "Failed", "Stopped"):
+            run_log.end_test(test_case_name, status)
         
         self.save_execution_data()
 
@@ -2791,14 +3428,9 @@ class TestExecutionDialog(QDialog):
         """Deletes a test case from projects or standalone."""
         # ✅ FIXED: First find which project (if any) this test case belongs to
         belongs_to_project = None
-        
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                belongs_to_project = item_data.get('project')
-                break
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            belongs_to_project = self.test_case_model.entry(row).project
         
         reply = QMessageBox.question(
             self, "Delete Test Case",
@@ -2823,19 +3455,8 @@ class TestExecutionDialog(QDialog):
 
     def select_all_test_cases(self, state):
         """Selects/deselects all test case checkboxes."""
-        # ✅ FIXED: Block signals during bulk operation to prevent infinite loops
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            # Only process test case items, not project headers
-            if item_data and item_data.get('type') == 'test_case':
-                widget = self.test_case_list.itemWidget(item)
-                checkbox = widget.findChild(QCheckBox)
-                if checkbox:
-                    checkbox.blockSignals(True)  # ✅ Block signals
-                    checkbox.setCheckState(Qt.CheckState(state))
-                    checkbox.blockSignals(False)  # ✅ Unblock signals
+        # ✅ CHANGED: One model update and one repaint for all rows
+        self.test_case_model.set_all_checked(Qt.CheckState(state) == Qt.CheckState.Checked)
 
 
     def update_select_all_state(self):
@@ -2844,20 +3465,9 @@ class TestExecutionDialog(QDialog):
         if self.select_all_checkbox.signalsBlocked():
             return
         
-        checked_count = 0
-        total_count = 0
-        
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            # Only count test case items
-            if item_data and item_data.get('type') == 'test_case':
-                total_count += 1
-                widget = self.test_case_list.itemWidget(item)
-                checkbox = widget.findChild(QCheckBox)
-                if checkbox and checkbox.isChecked():
-                    checked_count += 1
+        # ✅ CHANGED: The model keeps the counts, no need to walk the rows
+        checked_count = self.test_case_model.checked_count
+        total_count = self.test_case_model.test_count
         
         if total_count == 0:
             self.select_all_checkbox.setCheckState(Qt.CheckState.Unchecked)
@@ -2890,7 +3500,8 @@ class TestExecutionDialog(QDialog):
         layout = QVBoxLayout(selection_dialog)
         
         search_bar = QLineEdit()
-        search_bar.setPlaceholderText("Search test cases...")
+        search_bar.setPlaceholderText("Search test cases, steps, fields, values...")
+        search_bar.setToolTip(LIBRARY_SEARCH_HELP)
         layout.addWidget(search_bar)
         
         list_widget = QListWidget()
@@ -2902,14 +3513,30 @@ class TestExecutionDialog(QDialog):
             item.setCheckState(Qt.CheckState.Unchecked)
             list_widget.addItem(item)
         
-        def filter_test_cases(query):
-            query = query.strip().lower()
+        # ✅ CHANGED: Debounced search through the library search index, so a query
+        # like 'acct=0012345' can pick the test cases to run
+        def filter_test_cases():
+            query = search_bar.text()
+            matches = self.main_window.library.search('test_cases', query) if query.strip() else None
             for i in range(list_widget.count()):
                 item = list_widget.item(i)
-                item_text = item.text().lower()
-                item.setHidden(query not in item_text)
+                item.setHidden(matches is not None and item.text() not in matches)
+        
+        search_timer = QTimer(selection_dialog)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(LIBRARY_SEARCH_DELAY_MS)
+        search_timer.timeout.connect(filter_test_cases)
+        search_bar.textChanged.connect(lambda _: search_timer.start())
         
-        search_bar.textChanged.connect(filter_test_cases)
+        def check_shown():
+            for i in range(list_widget.count()):
+                item = list_widget.item(i)
+                if not item.isHidden():
+                    item.setCheckState(Qt.CheckState.Checked)
+        
+        check_shown_button = QPushButton("Check All Shown")
+        check_shown_button.clicked.connect(check_shown)
+        layout.addWidget(check_shown_button)
             
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         button_box.accepted.connect(selection_dialog.accept)
@@ -2926,6 +3553,7 @@ class TestExecutionDialog(QDialog):
                     # ✅ FIXED: Deep copy the test case data to avoid reference issues
                     if test_case_data:
                         selected_cases[test_case_name] = copy.deepcopy(test_case_data)
+                        self.track_library_copy(test_case_name, selected_cases[test_case_name], library_copy=True)
             
             if selected_cases:
                 if project_name:
@@ -2964,26 +3592,16 @@ class TestExecutionDialog(QDialog):
         )
         
         if file_paths:  # ✅ CHANGED: file_paths is now a list
-            imported_cases = {}
-            failed_imports = []
+            # ✅ CHANGED: Files are parsed and validated on a worker thread
+            entries, failed_imports = self.main_window.parse_import_files(file_paths, 'test_cases')
             
-            for file_path in file_paths:  # ✅ NEW: Loop through all selected files
-                try:
-                    with open(file_path, 'r') as f:
-                        imported_data = json.load(f)
-                    
-                    # Handle single test case format
-                    if isinstance(imported_data, dict) and 'name' in imported_data and 'steps' in imported_data:
-                        test_case_name = imported_data['name']
-                        imported_cases[test_case_name] = copy.deepcopy(imported_data)
-                    # Handle multiple test cases format
-                    elif isinstance(imported_data, dict):
-                        for key, value in imported_data.items():
-                            if isinstance(value, dict) and 'steps' in value:
-                                imported_cases[key] = copy.deepcopy(value)
-                    
-                except Exception as e:
-                    failed_imports.append(f"{os.path.basename(file_path)}: {str(e)}")
+            existing = self.projects.get(project_name, {}).get('test_cases', {}) if project_name else self.displayed_test_cases
+            imported_cases = {}
+            replaced = []
+            for test_case_name, test_case_data, file_name in entries:
+                if test_case_name in imported_cases or test_case_name in existing:
+                    replaced.append(f"{file_name}: '{test_case_name}' replaced the existing entry")
+                imported_cases[test_case_name] = test_case_data
             
             if imported_cases:
                 if project_name:
@@ -3007,104 +3625,51 @@ class TestExecutionDialog(QDialog):
                 
                 self.refresh_test_case_list()
                 self.save_execution_data()
-                
-                # ✅ NEW: Show detailed success/failure message
-                message = f"Successfully imported {len(imported_cases)} test case(s)."
-                if failed_imports:
-                    message += f"\n\nFailed imports ({len(failed_imports)}):\n" + "\n".join(failed_imports)
-                
-                QMessageBox.information(self, "Import Complete", message)
-            else:
-                if failed_imports:
-                    error_msg = "All imports failed:\n" + "\n".join(failed_imports)
-                    QMessageBox.critical(self, "Import Failed", error_msg)
-                else:
-                    QMessageBox.warning(self, "Import Failed", "No valid test cases found in selected files.")
+            
+            # ✅ CHANGED: One summary for the whole batch
+            self.main_window.show_import_summary(
+                "test case", len(imported_cases), len(file_paths), replaced, failed_imports, parent=self
+            )
 
                 
     def refresh_test_case_list(self):
         """Refreshes the entire test case list with projects and standalone tests."""
-        # ✅ NEW: Store current status before refresh
-        current_statuses = {}
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case':
-                test_name = item_data.get('name')
-                project = item_data.get('project')
-                widget = self.test_case_list.itemWidget(item)
-                status_label = widget.findChild(QLabel, "status_label")
-                step_combo = widget.findChild(QComboBox, "step_combo")
-                
-                if status_label and test_name:
-                    key = (test_name, project)  # Use tuple of (name, project) as key
-                    current_statuses[key] = {
-                        'status': status_label.text(),
-                        'status_style': status_label.styleSheet(),
-                        'selected_step': step_combo.currentIndex() if step_combo else 0
-                    }
-        
-        self.test_case_list.clear()
+        # ✅ CHANGED: Rows are rebuilt as records and set with one model reset,
+        # keeping the status and selected step of the rows that stay
+        previous_rows = {
+            (entry.name, entry.project): entry for _, entry in self.test_case_model.test_rows()
+        }
         
+        rows = []
         # Add projects first
         for project_name, project_data in self.projects.items():
-            self.add_project_header(project_name)
-            
-            # ✅ CRITICAL FIX: Always add test cases to the list, even if collapsed
-            # They will be hidden by the toggle_project_expansion logic
-            is_expanded = project_data.get('expanded', True)
-            
-            for test_name, test_data in project_data.get('test_cases', {}).items():
-                self.add_list_item(test_name, project_name)
-                
-                # ✅ NEW: If project is collapsed, hide the item immediately after adding it
-                if not is_expanded:
-                    # Find the item we just added and hide it
-                    for i in range(self.test_case_list.count() - 1, -1, -1):
-                        item = self.test_case_list.item(i)
-                        item_data = item.data(Qt.ItemDataRole.UserRole)
-                        
-                        if (item_data and item_data.get('type') == 'test_case' and 
-                            item_data.get('name') == test_name and 
-                            item_data.get('project') == project_name):
-                            item.setHidden(True)
-                            break
+            rows.append(ExecutionRow('project', project_name, expanded=project_data.get('expanded', True)))
+            # Test cases of collapsed projects are added too and hidden by apply_row_visibility()
+            for test_name in project_data.get('test_cases', {}):
+                rows.append(self.create_row(test_name, project_name))
         
         # Add standalone test cases
         for test_name in self.displayed_test_cases.keys():
-            self.add_list_item(test_name, None)
+            rows.append(self.create_row(test_name, None))
         
-        # ✅ NEW: Restore status after refresh
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case':
-                test_name = item_data.get('name')
-                project = item_data.get('project')
-                key = (test_name, project)
-                
-                if key in current_statuses:
-                    widget = self.test_case_list.itemWidget(item)
-                    status_label = widget.findChild(QLabel, "status_label")
-                    step_combo = widget.findChild(QComboBox, "step_combo")
-                    
-                    if status_label:
-                        saved_data = current_statuses[key]
-                        status_label.setText(saved_data['status'])
-                        status_label.setStyleSheet(saved_data['status_style'])
-                    
-                    if step_combo:
-                        saved_step = saved_data.get('selected_step', 0)
-                        if saved_step < step_combo.count():
-                            step_combo.setCurrentIndex(saved_step)
+        for entry in rows:
+            previous = previous_rows.get((entry.name, entry.project))
+            if previous is not None:
+                entry.status = previous.status
+                entry.selected_step = previous.selected_step
+                entry.playing = previous.playing
+        
+        self.test_case_model.set_rows(rows)
+        self.apply_row_visibility()
+        self.update_select_all_state()
 
 
     # In the TestExecutionDialog class, update the execute_single_test method:
 
     def execute_single_test(self, test_case_name):
         """Executes a single test case."""
+        # ✅ NEW: Prints of the helpers this run calls go to the run log until it ends
+        run_stream = RunLogStream(run_log).install()
         try:
             from datetime import datetime
             start_time = datetime.now()
@@ -3157,11 +3722,8 @@ class TestExecutionDialog(QDialog):
 
             # Initialize COM once for the entire test case
             # NEW CODE:
-            pythoncom.CoInitialize()
-            autECLSession = win32com.client.Dispatch("PCOMM.autECLSession")
             connection_name = self.main_window.get_connection_name_from_title(self.main_window.pcomm_window_title)
-            autECLSession.SetConnectionByName(connection_name)
-            autECLPS = autECLSession.autECLPS
+            autECLSession, autECLPS = connect_pcomm_session(connection_name)  # ✅ CHANGED: See pcomm_core.session
 
             # Track validation results and captured data
             validation_failures = []
@@ -3193,10 +3755,11 @@ class TestExecutionDialog(QDialog):
             while current_step_index < len(all_steps):
                 step_index = current_step_index + 1  # Display as 1-based
                 step = all_steps[current_step_index]
+                run_log.begin_step(step_index)  # ✅ NEW: Times the step in the run log
                 
                 # ✅ Check if stop was requested
                 if self.stop_execution:
-                    print(f"Execution stopped by user at step {step_index}")
+                    run_log.log('warning', f"Execution stopped by user at step {step_index}")
                     break
                 
                 QApplication.processEvents()  # ✅ Allow UI to update
@@ -3233,19 +3796,21 @@ class TestExecutionDialog(QDialog):
                 # (around line 1100) with this code:
 
                 step_type = step.get("type")
+
+                step_model = Step.from_dict(step)  # ✅ NEW: Typed view, aliases and coordinates resolved once
                 
                 # ✅ NEW: Determine if we should skip main step execution (like preview function)
                 skip_main_step = False
                 if isinstance(start_step_data, tuple) and current_step_index == (start_step_data[0] - 1):
                     # Starting from a utility step on this main step - skip main execution
                     skip_main_step = True
-                    print(f"Step {step_index}: Skipping main step execution, starting from utility step {start_from_utility}")
+                    run_log.log('info', f"Step {step_index}: Skipping main step execution, starting from utility step {start_from_utility}")
                 
                 # ✅ Only execute main step if not skipping
                 if not skip_main_step:
                     if step_type == "break":
                         message = step.get("message", "")
-                        print(f"Step {step_index}: Break point reached")
+                        run_log.log('info', f"Step {step_index}: Break point reached")
                         
                         self.play_sound_signal('break')
                         # Show break dialog
@@ -3262,13 +3827,13 @@ class TestExecutionDialog(QDialog):
                         action = break_dialog.result_action
                         
                         if action == BreakExecutionDialog.STOP:
-                            print("User chose to stop execution at break point")
+                            run_log.log('info', "User chose to stop execution at break point")
                             self.stop_execution = True
                             break_dialog.close()
                             break
                         
                         elif action == BreakExecutionDialog.EDIT:
-                            print("User chose to edit test case at break point")
+                            run_log.log('info', "User chose to edit test case at break point")
                             
                             # ✅ NEW: Reset the action so the dialog can be used again
                             break_dialog.result_action = None
@@ -3306,12 +3871,13 @@ class TestExecutionDialog(QDialog):
                             
                             # Save to file
                             self.main_window.save_test_cases_to_file()
+                            self.track_library_copy(test_case_name, test_case_data)  # ✅ NEW: Edited in place
                             
                             # ✅ CRITICAL FIX: Refresh the all_steps list with updated data
                             all_steps = test_case_data.get("steps", [])
                             
-                            print(f"Test case '{test_case_name}' updated during execution")
-                            print(f"Total steps after update: {len(all_steps)}")
+                            run_log.log('info', f"Test case '{test_case_name}' updated during execution")
+                            run_log.log('info', f"Total steps after update: {len(all_steps)}")
                             
                             # ✅ NEW: Show message in the break dialog instead of separate popup
                             QMessageBox.information(
@@ -3342,7 +3908,7 @@ class TestExecutionDialog(QDialog):
                                 # Continue to next step
                         
                         elif action == BreakExecutionDialog.RESUME:
-                            print("User chose to resume execution")
+                            run_log.log('info', "User chose to resume execution")
                             break_dialog.close()
                             # Continue to next step
                         
@@ -3364,63 +3930,60 @@ class TestExecutionDialog(QDialog):
                                 before_filename = f"{test_case_name}_Step {step_index}_Before.jpg"
                                 before_path = os.path.join(screen_flow_dir, before_filename)
                                 
-                                if self.main_window.capture_pcomm_screen_as_jpeg(before_path):
-                                    print(f"Step {step_index}: Captured 'Before' screen flow: {before_filename}")
+                                if self.main_window.capture_pcomm_screen_as_jpeg(before_path, autECLPS):
+                                    run_log.log('info', f"Step {step_index}: Captured 'Before' screen flow: {before_filename}")
                             except Exception as e:
-                                print(f"Error capturing before screenshot: {e}")
+                                run_log.log('error', f"Error capturing before screenshot: {e}")
                         
                         # Process module fields for Input
-                        for field in step.get("fields", []):
+                        for field in step_model.fields:
                             if self.stop_execution:
                                 break
                                 
-                            action_type = field.get("action_type", "Input")
-                            value = str(field.get("value", "")).strip()                    
+                            action_type = field.action_type
+                            value = field.value                    
                             
                             if action_type == "Input":
                                 if not value:
                                     continue
                                 
-                                if module_name in self.main_window.modules:
-                                    module_data = self.main_window.modules[module_name]
-                                    labels = module_data.get("labels", [])
-                                    
-                                    field_name = field.get("field_name")
-                                    for label in labels:
-                                        label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                        if label_name == field_name:
-                                            row = int(label.get("row", 1))
-                                            col = int(label.get("column", 1))
-                                            
-                                            # Substitute variables in the value before sending
-                                            substituted_value = self.substitute_execution_variables(value, test_case_name)
-                                             
-                                            autECLPS.SetCursorPos(row, col)
-                                            try:
-                                                autECLPS.SendKeys(substituted_value)
-                                            except Exception as send_error:
-                                                self.play_sound_signal('error')
-                                                error_msg = (
-                                                    f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
-                                                    f"Value: {substituted_value}\n"
-                                                    f"Position: Row {row}, Column {col}\n\n"
-                                                    f"Error: {str(send_error)}\n\n"
-                                                    f"This usually means:\n"
-                                                    f"1. Field is protected/read-only\n"
-                                                    f"2. Screen is locked or in error state\n"
-                                                    f"3. Invalid cursor position"
-                                                )
-                                                QMessageBox.critical(self, "Send Keys Error", error_msg)
-                                                validation_failures.append({
-                                                    "step": step_index,
-                                                    "field": "Random Input",
-                                                    "expected": f"Send: {substituted_value}",
-                                                    "actual": f"Error: {str(send_error)}"
-                                                })
-                                                break
-                                            time.sleep(0.1)
+                                module_model = self.main_window.get_module_model(module_name)
+                                
+                                if module_model is not None:
+                                    field_name = field.field_name
+                                    for label in module_model.labels_named(field_name):
+                                        row = label.row
+                                        col = label.column
+                                        
+                                        # Substitute variables in the value before sending
+                                        substituted_value = self.substitute_execution_variables(value, test_case_name)
+                                         
+                                        autECLPS.SetCursorPos(row, col)
+                                        try:
+                                            autECLPS.SendKeys(substituted_value)
+                                        except Exception as send_error:
+                                            self.play_sound_signal('error')
+                                            error_msg = (
+                                                f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
+                                                f"Value: {substituted_value}\n"
+                                                f"Position: Row {row}, Column {col}\n\n"
+                                                f"Error: {str(send_error)}\n\n"
+                                                f"This usually means:\n"
+                                                f"1. Field is protected/read-only\n"
+                                                f"2. Screen is locked or in error state\n"
+                                                f"3. Invalid cursor position"
+                                            )
+                                            QMessageBox.critical(self, "Send Keys Error", error_msg)
+                                            validation_failures.append({
+                                                "step": step_index,
+                                                "field": "Random Input",
+                                                "expected": f"Send: {substituted_value}",
+                                                "actual": f"Error: {str(send_error)}"
+                                            })
                                             break
-                        
+                                        time.sleep(0.1)
+                                        break
+                    
                         # ✅ NEW: Capture "After" screenshot with smart wait if Screen Flow is enabled
                         if capture_screen_flow:
                             try:
@@ -3431,93 +3994,92 @@ class TestExecutionDialog(QDialog):
                                 # Small delay to ensure screen is updated
                                 time.sleep(0.5)
                                 
-                                if self.main_window.capture_pcomm_screen_as_jpeg(after_path):
-                                    print(f"Step {step_index}: Captured 'After' screen flow: {after_filename}")
+                                if self.main_window.capture_pcomm_screen_as_jpeg(after_path, autECLPS):
+                                    run_log.log('info', f"Step {step_index}: Captured 'After' screen flow: {after_filename}")
                             except Exception as e:
-                                print(f"Error capturing after screenshot: {e}")
+                                run_log.log('error', f"Error capturing after screenshot: {e}")
                         
                         # Process validation actions for module fields
-                        for field in step.get("fields", []):
+                        for field in step_model.fields:
                             # Check for stop during field processing
                             QApplication.processEvents()
                             if self.stop_execution:
                                 test_was_stopped = True
                                 break
                             
-                            action_type = field.get("action_type", "Input")
-                            value = str(field.get("value", "")).strip()
+                            action_type = field.action_type
+                            value = field.value
                             
                             if action_type == "Validate":
                                 if not value:
                                     continue
                                 
-                                if module_name in self.main_window.modules:
-                                    module_data = self.main_window.modules[module_name]
-                                    labels = module_data.get("labels", [])
-                                    
-                                    field_name = field.get("field_name")
-                                    for label in labels:
-                                        label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                        if label_name == field_name:
-                                            row = int(label.get("row", 1))
-                                            col = int(label.get("column", 1))
-                                            length = int(label.get("length", len(value)))
-                                            
-                                            # ✅ ADD: Substitute variables in expected value
-                                            expected_value = self.substitute_execution_variables(value, test_case_name)
-                                                                      
-                                            try:
-                                                actual_value = autECLPS.GetText(row, col, length)
-                                            except Exception as get_text_error:
-                                                self.play_sound_signal('error')
-                                                error_msg = (
-                                                    f"Error reading screen at {self.get_step_description(step_index, step)}\n\n"
-                                                    f"Field: {field_name}\n"
-                                                    f"Position: Row {row}, Column {col}, Length {length}\n\n"
-                                                    f"Error: {str(get_text_error)}\n\n"
-                                                    f"This usually means:\n"
-                                                    f"1. Invalid screen coordinates (beyond 24x80)\n"
-                                                    f"2. Screen is not ready/locked\n"
-                                                    f"3. Field position is incorrect in module definition"
-                                                )
-                                                QMessageBox.critical(self, "Screen Read Error", error_msg)
+                                module_model = self.main_window.get_module_model(module_name)
+                                
+                                if module_model is not None:
+                                    field_name = field.field_name
+                                    for label in module_model.labels_named(field_name):
+                                        row = label.row
+                                        col = label.column
+                                        length = label.length if label.length is not None else len(value)
+                                        
+                                        # ✅ ADD: Substitute variables in expected value
+                                        expected_value = self.substitute_execution_variables(value, test_case_name)
+                                                                  
+                                        try:
+                                            actual_value = autECLPS.GetText(row, col, length)
+                                        except Exception as get_text_error:
+                                            self.play_sound_signal('error')
+                                            error_msg = (
+                                                f"Error reading screen at {self.get_step_description(step_index, step)}\n\n"
+                                                f"Field: {field_name}\n"
+                                                f"Position: Row {row}, Column {col}, Length {length}\n\n"
+                                                f"Error: {str(get_text_error)}\n\n"
+                                                f"This usually means:\n"
+                                                f"1. Invalid screen coordinates (beyond 24x80)\n"
+                                                f"2. Screen is not ready/locked\n"
+                                                f"3. Field position is incorrect in module definition"
+                                            )
+                                            QMessageBox.critical(self, "Screen Read Error", error_msg)
+                                            validation_failures.append({
+                                                "step": step_index,
+                                                "field": field_name,
+                                                "expected": "Read screen data",
+                                                "actual": f"Error: {str(get_text_error)}"
+                                            })
+                                            break
+                                        
+                                        # ✅ Use substituted expected_value
+                                        validation_passed = self.validate_field_value(actual_value, expected_value)
+                                        
+                                        if not validation_passed:
+                                            # ✅ NEW: Failure details are persisted, so only keep the masked value
+                                            actual_value = self.main_window.apply_masking_to_text(actual_value)
+                                            self.play_sound_signal('error')
+                                            if expected_value.lower() == '{blank}':  # ✅ CHANGED
                                                 validation_failures.append({
                                                     "step": step_index,
                                                     "field": field_name,
-                                                    "expected": "Read screen data",
-                                                    "actual": f"Error: {str(get_text_error)}"
+                                                    "expected": '<blank>',
+                                                    "actual": f"'{actual_value.strip()}'" if actual_value.strip() else '<blank>'
                                                 })
-                                                break
-                                            
-                                            # ✅ Use substituted expected_value
-                                            validation_passed = self.validate_field_value(actual_value, expected_value)
-                                            
-                                            if not validation_passed:
-                                                self.play_sound_signal('error')
-                                                if expected_value.lower() == '{blank}':  # ✅ CHANGED
-                                                    validation_failures.append({
-                                                        "step": step_index,
-                                                        "field": field_name,
-                                                        "expected": '<blank>',
-                                                        "actual": f"'{actual_value.strip()}'" if actual_value.strip() else '<blank>'
-                                                    })
-                                                else:
-                                                    validation_failures.append({
-                                                        "step": step_index,
-                                                        "field": field_name,
-                                                        "expected": expected_value,  # ✅ CHANGED
-                                                        "actual": actual_value.strip()
-                                                    })
-                                                # Stop execution immediately on validation failure
-                                                print(f"❌ Validation failed at Step {step_index} - Field '{field_name}': Expected '{value}', Got '{actual_value}'")
-                                                break
-                                            
-                                            time.sleep(0.1)
+                                            else:
+                                                validation_failures.append({
+                                                    "step": step_index,
+                                                    "field": field_name,
+                                                    "expected": expected_value,  # ✅ CHANGED
+                                                    "actual": actual_value.strip()
+                                                })
+                                            # Stop execution immediately on validation failure
+                                            run_log.log('error', self.main_window.apply_masking_to_text(f"❌ Validation failed at Step {step_index} - Field '{field_name}': Expected '{value}', Got '{actual_value}'"))  # ✅ CHANGED: Masked, the run log is shown and echoed
                                             break
-                                
+                                        
+                                        time.sleep(0.1)
+                                        break
+                            
                                 # Check if validation failed and stop test execution
                                 if validation_failures:
-                                    print(f"🛑 Stopping test execution due to validation failure at Step {step_index}")
+                                    run_log.log('warning', f"🛑 Stopping test execution due to validation failure at Step {step_index}")
                                     break  # Break out of fields loop
 
                         # Check if validation failed and stop processing steps
@@ -3525,7 +4087,7 @@ class TestExecutionDialog(QDialog):
                             break  # Break out of steps loop
                     
                     elif step_type == "special_key":
-                        key_value = step.get("key_value", "")
+                        key_value = step_model.key_value
                         
                         key_mapping = {
                             "Enter Key": "[enter]",
@@ -3555,7 +4117,7 @@ class TestExecutionDialog(QDialog):
                             
                             # Send the key
                             autECLPS.SendKeys(pcomm_key)
-                            print(f"Step {step_index}: Sent {key_value}")
+                            run_log.log('info', f"Step {step_index}: Sent {key_value}")
                             
                             # ✅ FIXED: Pass key_value as a string, not variable reference
                             success, elapsed = complete_pcomm_wait(
@@ -3578,9 +4140,9 @@ class TestExecutionDialog(QDialog):
                         if self.stop_execution:
                             break
                             
-                        print(f"Step {step_index}: Capturing screen text...")
+                        run_log.log('info', f"Step {step_index}: Capturing screen text...")
                         screen_size = screen_rows * screen_cols
-                        full_screen_text = autECLPS.GetText(1, screen_size)
+                        full_screen_text = self.read_screen_snapshot(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                         
                         captured_text_lines = []
                         for row_num in range(screen_rows):
@@ -3592,7 +4154,7 @@ class TestExecutionDialog(QDialog):
                         header = f"--- Step {step_index}: Screen Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
                         full_capture_string = header + "\n" + "\n".join(captured_text_lines)
                         text_captures.append(full_capture_string)
-                        print(f"Step {step_index}: Screen text captured successfully")
+                        run_log.log('info', f"Step {step_index}: Screen text captured successfully")
                     
                     elif step_type == "capture_screenshot":
                         if self.stop_execution:
@@ -3600,53 +4162,51 @@ class TestExecutionDialog(QDialog):
                         
                         # ✅ NEW: Check if documentation generation is enabled
                         if not self.main_window.document_config.get('generate_documentation', True):
-                            print(f"Step {step_index}: Screenshot capture skipped (documentation disabled)")
+                            run_log.log('info', f"Step {step_index}: Screenshot capture skipped (documentation disabled)")
                             continue
                             
-                        print(f"Step {step_index}: Capturing screenshot for DOCX...")
+                        run_log.log('info', f"Step {step_index}: Capturing screenshot for DOCX...")
                         screen_size = screen_rows * screen_cols
-                        full_screen_text = autECLPS.GetText(1, screen_size)
+                        full_screen_text, masking_version = self.read_screen_capture(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                         
                         # ✅ NEW: Get highlight information for this screenshot
                         highlight_info = {}
                         reference_module = step.get('reference_module')
                         
-                        if reference_module and reference_module in self.main_window.modules:
-                            module_data = self.main_window.modules[reference_module]
-                            labels = module_data.get('labels', [])
-                            
+                        module_model = self.main_window.get_module_model(reference_module) if reference_module else None
+                        
+                        if module_model is not None:
                             # Get highlight flags from step fields
-                            for field in step.get('fields', []):
-                                if field.get('highlight', False):
-                                    field_name = field.get('field_name')
+                            for field in step_model.fields:
+                                if field.highlight:
+                                    field_name = field.field_name
                                     # Find the corresponding label
-                                    for label in labels:
-                                        label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                        if label_name == field_name:
-                                            highlight_info[field_name] = {
-                                                'row': label.get('row', 1),
-                                                'column': label.get('column', 1),
-                                                'length': label.get('length', 10)
-                                            }
-                                            break
-                        
+                                    for label in module_model.labels_named(field_name):
+                                        highlight_info[field_name] = {
+                                            'row': label.row,
+                                            'column': label.column,
+                                            'length': label.length if label.length is not None else 10
+                                        }
+                                        break
+                    
                         from datetime import datetime
                         docx_screenshots.append({
                             'step': step_index,
                             'screen_text': full_screen_text,
                             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'highlight_info': highlight_info  # ✅ NEW: Add highlight info
+                            'highlight_info': highlight_info,  # ✅ NEW: Add highlight info
+                            'masking': masking_version  # ✅ CHANGED: Patterns screen_text was masked with (None if unmasked)
                         })
-                        print(f"Step {step_index}: Screenshot captured for DOCX")
+                        run_log.log('info', f"Step {step_index}: Screenshot captured for DOCX")
                         
                     elif step_type == "random_input":
                         if self.stop_execution:
                             break
                             
-                        row = int(step.get("row", 1))
-                        col = int(step.get("column", 1))
-                        value = str(step.get("value", "")).strip()
-                        is_special_key = step.get("is_special_key", False)
+                        row = step_model.row
+                        col = step_model.column
+                        value = step_model.value
+                        is_special_key = step_model.is_special_key
                         
                         if value:
                             autECLPS.SetCursorPos(row, col)
@@ -3660,7 +4220,7 @@ class TestExecutionDialog(QDialog):
                                 }
                                 pcomm_key = key_mapping.get(value, value)
                                 autECLPS.SendKeys(pcomm_key)
-                                print(f"Step {step_index}: Sent special key '{value}' to position ({row}, {col})")
+                                run_log.log('info', f"Step {step_index}: Sent special key '{value}' to position ({row}, {col})")
                                 time.sleep(1.0)
                             else:
                                 # ✅ NEW: Substitute variables before sending
@@ -3686,17 +4246,17 @@ class TestExecutionDialog(QDialog):
                                         "actual": f"Error: {str(send_error)}"
                                     })
                                     break
-                                print(f"Step {step_index}: Sent '{substituted_value}' (from '{value}') to position ({row}, {col})")
+                                run_log.log('info', f"Step {step_index}: Sent '{substituted_value}' (from '{value}') to position ({row}, {col})")
                             
                     elif step_type == "wait":
                         if self.stop_execution:
                             break
                             
-                        seconds = float(step.get("seconds", 0))
+                        seconds = step_model.seconds
                         if seconds > 0:
-                            print(f"Step {step_index}: Waiting for {seconds} second(s)...")
+                            run_log.log('info', f"Step {step_index}: Waiting for {seconds} second(s)...")
                             time.sleep(seconds)
-                            print(f"Step {step_index}: Wait completed")
+                            run_log.log('info', f"Step {step_index}: Wait completed")
                 # ✅ END of "if not skip_main_step:" block
                 
                 
@@ -3717,16 +4277,18 @@ class TestExecutionDialog(QDialog):
                         actual_sub_index = sub_index + 1  # Convert to 1-based for display
                         
                         if self.stop_execution:
-                            print(f"Execution stopped at utility step {step_index}.{actual_sub_index}")
+                            run_log.log('warning', f"Execution stopped at utility step {step_index}.{actual_sub_index}", step=f"{step_index}.{actual_sub_index}")
                             break
                         
                         QApplication.processEvents()
                         
                         utility_type = utility_step.get("type")
-                        print(f"Executing utility step {step_index}.{actual_sub_index}: {utility_step.get('name', 'Unknown')}")
+                        
+                        utility_model = UtilityStep.from_dict(utility_step)  # ✅ NEW: Typed view
+                        run_log.log('info', f"Executing utility step {step_index}.{actual_sub_index}: {utility_step.get('name', 'Unknown')}", step=f"{step_index}.{actual_sub_index}")
                         
                         if utility_type == "special_key":
-                            key_value = utility_step.get("key_value", "")
+                            key_value = utility_model.key_value
                             
                             key_mapping = {
                                 "Enter Key": "[enter]",
@@ -3751,7 +4313,7 @@ class TestExecutionDialog(QDialog):
                             if key_value in action_keys or "+" in key_value:
                                 before_screen = wait_for_pcomm_ready_smart(autECLPS, f"Utility {key_value}")
                                 autECLPS.SendKeys(pcomm_key)
-                                print(f"Step {step_index}.{sub_index}: Sent utility special key '{key_value}'")
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Sent utility special key '{key_value}'", step=f"{step_index}.{sub_index}")
                                 
                                 # ✅ FIXED: Pass action_description as a string
                                 success, elapsed = complete_pcomm_wait(
@@ -3762,63 +4324,61 @@ class TestExecutionDialog(QDialog):
                                 )
                                 
                                 if not success:
-                                    print(f"⚠️ Utility {key_value} timeout at step {step_index}.{sub_index}")
+                                    run_log.log('warning', f"⚠️ Utility {key_value} timeout at step {step_index}.{sub_index}", step=f"{step_index}.{sub_index}")
                             else:
                                 autECLPS.SendKeys(pcomm_key)
                                 time.sleep(0.5)
                         
                         elif utility_type == "wait":
-                            seconds = float(utility_step.get("seconds", 0))
+                            seconds = utility_model.seconds
                             if seconds > 0:
-                                print(f"Step {step_index}.{sub_index}: Utility wait for {seconds} second(s)...")
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Utility wait for {seconds} second(s)...", step=f"{step_index}.{sub_index}")
                                 time.sleep(seconds)
-                                print(f"Step {step_index}.{sub_index}: Utility wait completed")
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Utility wait completed", step=f"{step_index}.{sub_index}")
                         
                         elif utility_type == "capture_screenshot":
                             if not self.main_window.document_config.get('generate_documentation', True):
-                                print(f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)")
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)", step=f"{step_index}.{sub_index}")
                                 continue
                             
-                            print(f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...")
+                            run_log.log('info', f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...", step=f"{step_index}.{sub_index}")
                             screen_size = screen_rows * screen_cols
-                            full_screen_text = autECLPS.GetText(1, screen_size)
+                            full_screen_text, masking_version = self.read_screen_capture(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                             
                             # ✅ FIXED: Get highlight information for utility screenshot
                             highlight_info = {}
                             reference_module = utility_step.get('reference_module')
                             
-                            if reference_module and reference_module in self.main_window.modules:
-                                module_data = self.main_window.modules[reference_module]
-                                labels = module_data.get('labels', [])
-                                
+                            module_model = self.main_window.get_module_model(reference_module) if reference_module else None
+                            
+                            if module_model is not None:
                                 # Get highlight flags from utility step fields
-                                for field in utility_step.get('fields', []):
-                                    if field.get('highlight', False):
-                                        field_name = field.get('field_name')
+                                for field in utility_model.fields:
+                                    if field.highlight:
+                                        field_name = field.field_name
                                         # Find the corresponding label
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                highlight_info[field_name] = {
-                                                    'row': label.get('row', 1),
-                                                    'column': label.get('column', 1),
-                                                    'length': label.get('length', 10)
-                                                }
-                                                break
-                            
+                                        for label in module_model.labels_named(field_name):
+                                            highlight_info[field_name] = {
+                                                'row': label.row,
+                                                'column': label.column,
+                                                'length': label.length if label.length is not None else 10
+                                            }
+                                            break
+                        
                             from datetime import datetime
                             docx_screenshots.append({
                                 'step': f"{step_index}.{sub_index}",
                                 'screen_text': full_screen_text,
                                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'highlight_info': highlight_info  # ✅ FIXED: Add highlight info
+                                'highlight_info': highlight_info,  # ✅ FIXED: Add highlight info
+                                'masking': masking_version  # ✅ CHANGED: Patterns screen_text was masked with (None if unmasked)
                             })
-                            print(f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)")
+                            run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)", step=f"{step_index}.{sub_index}")
                         
                         elif utility_type == "capture_screen_text":
-                            print(f"Step {step_index}.{sub_index}: Capturing utility screen text...")
+                            run_log.log('info', f"Step {step_index}.{sub_index}: Capturing utility screen text...", step=f"{step_index}.{sub_index}")
                             screen_size = screen_rows * screen_cols
-                            full_screen_text = autECLPS.GetText(1, screen_size)
+                            full_screen_text = self.read_screen_snapshot(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                             
                             captured_text_lines = []
                             for row_num in range(screen_rows):
@@ -3830,13 +4390,13 @@ class TestExecutionDialog(QDialog):
                             header = f"--- Step {step_index}.{sub_index}: Utility Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
                             full_capture_string = header + "\n" + "\n".join(captured_text_lines)
                             text_captures.append(full_capture_string)
-                            print(f"Step {step_index}.{sub_index}: Utility screen text captured successfully")
+                            run_log.log('info', f"Step {step_index}.{sub_index}: Utility screen text captured successfully", step=f"{step_index}.{sub_index}")
 
                         elif utility_type == "random_input":
-                            row = int(utility_step.get('row', 1))
-                            col = int(utility_step.get('column', 1))
-                            value = str(utility_step.get('value', '')).strip()
-                            is_special_key = utility_step.get('is_special_key', False)
+                            row = utility_model.row
+                            col = utility_model.column
+                            value = utility_model.value
+                            is_special_key = utility_model.is_special_key
                             
                             if value:
                                 autECLPS.SetCursorPos(row, col)
@@ -3850,7 +4410,7 @@ class TestExecutionDialog(QDialog):
                                     }
                                     pcomm_key = key_mapping.get(value, value)
                                     autECLPS.SendKeys(pcomm_key)
-                                    print(f"Step {step_index}.{sub_index}: Sent special key '{value}' to position ({row}, {col})")
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Sent special key '{value}' to position ({row}, {col})", step=f"{step_index}.{sub_index}")
                                     time.sleep(1.0)
                                 else:
                                     substituted_value = self.substitute_execution_variables(value, test_case_name)
@@ -3875,147 +4435,144 @@ class TestExecutionDialog(QDialog):
                                             "actual": f"Error: {str(send_error)}"
                                         })
                                         break
-                                    print(f"Step {step_index}.{sub_index}: Sent '{substituted_value}' to position ({row}, {col})")
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Sent '{substituted_value}' to position ({row}, {col})", step=f"{step_index}.{sub_index}")
                             
                         elif utility_type == "module_import":
                             # ✅ FIXED: Handle module import utility step (for both Input and Validation)
                             module_name = utility_step.get('module_name')
                             
-                            if module_name in self.main_window.modules:
-                                module_data = self.main_window.modules[module_name]
-                                labels = module_data.get("labels", [])
-                                
+                            module_model = self.main_window.get_module_model(module_name)
+                            
+                            if module_model is not None:
                                 # ✅ FIXED: Process Input fields FIRST
-                                for field in utility_step.get('fields', []):
+                                for field in utility_model.fields:
                                     if self.stop_execution:
                                         test_was_stopped = True
                                         break
                                     
-                                    action_type = field.get('action_type', 'Input')
-                                    value = str(field.get('value', '')).strip()
+                                    action_type = field.action_type
+                                    value = field.value
                                     
                                     if action_type == 'Input' and value:
-                                        field_name = field.get('field_name')
+                                        field_name = field.field_name
                                         
                                         # Find the label for this field
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get('row', 1))
-                                                col = int(label.get('column', 1))
-                                                
-                                                # Substitute variables before sending
-                                                substituted_value = self.substitute_execution_variables(value, test_case_name)
-                                                
-                                                autECLPS.SetCursorPos(row, col)
-                                                try:
-                                                    autECLPS.SendKeys(substituted_value)
-                                                except Exception as send_error:
-                                                    error_msg = (
-                                                        f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
-                                                        f"Value: {substituted_value}\n"
-                                                        f"Position: Row {row}, Column {col}\n\n"
-                                                        f"Error: {str(send_error)}\n\n"
-                                                        f"This usually means:\n"
-                                                        f"1. Field is protected/read-only\n"
-                                                        f"2. Screen is locked or in error state\n"
-                                                        f"3. Invalid cursor position"
-                                                    )
-                                                    QMessageBox.critical(self, "Send Keys Error", error_msg)
-                                                    validation_failures.append({
-                                                        "step": step_index,
-                                                        "field": "Random Input",
-                                                        "expected": f"Send: {substituted_value}",
-                                                        "actual": f"Error: {str(send_error)}"
-                                                    })
-                                                    break
-                                                print(f"Step {step_index}.{sub_index}: Sent utility input '{substituted_value}' to {field_name}")
-                                                time.sleep(0.1)
+                                        for label in module_model.labels_named(field_name):
+                                            row = label.row
+                                            col = label.column
+                                            
+                                            # Substitute variables before sending
+                                            substituted_value = self.substitute_execution_variables(value, test_case_name)
+                                            
+                                            autECLPS.SetCursorPos(row, col)
+                                            try:
+                                                autECLPS.SendKeys(substituted_value)
+                                            except Exception as send_error:
+                                                error_msg = (
+                                                    f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
+                                                    f"Value: {substituted_value}\n"
+                                                    f"Position: Row {row}, Column {col}\n\n"
+                                                    f"Error: {str(send_error)}\n\n"
+                                                    f"This usually means:\n"
+                                                    f"1. Field is protected/read-only\n"
+                                                    f"2. Screen is locked or in error state\n"
+                                                    f"3. Invalid cursor position"
+                                                )
+                                                QMessageBox.critical(self, "Send Keys Error", error_msg)
+                                                validation_failures.append({
+                                                    "step": step_index,
+                                                    "field": "Random Input",
+                                                    "expected": f"Send: {substituted_value}",
+                                                    "actual": f"Error: {str(send_error)}"
+                                                })
                                                 break
-                                
+                                            run_log.log('info', f"Step {step_index}.{sub_index}: Sent utility input '{substituted_value}' to {field_name}", step=f"{step_index}.{sub_index}")
+                                            time.sleep(0.1)
+                                            break
+                            
                                 # ✅ FIXED: Process Validation fields AFTER inputs
-                                for field in utility_step.get('fields', []):
+                                for field in utility_model.fields:
                                     if self.stop_execution:
                                         test_was_stopped = True
                                         break
                                     
-                                    action_type = field.get('action_type', 'Validate')
-                                    value = str(field.get('value', '')).strip()
+                                    action_type = field.action_type
+                                    value = field.value
                                     
                                     if action_type == 'Validate' and value:
-                                        field_name = field.get('field_name')
+                                        field_name = field.field_name
                                         
                                         # Find the label for this field
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get('row', 1))
-                                                col = int(label.get('column', 1))
-                                                
-                                                # ✅ ADD: Substitute variables in expected value FIRST
-                                                expected_value = self.substitute_execution_variables(value, test_case_name)
-                                                length = int(label.get('length', len(expected_value)))  # ✅ Use substituted length
-                                                
-                                                # Read actual value from screen
-                                                try:
-                                                    actual_value = autECLPS.GetText(row, col, length)
-                                                except Exception as get_text_error:
-                                                    error_msg = (
-                                                        f"Error reading screen at {self.get_step_description(step_index, step)}\n\n"
-                                                        f"Field: {field_name}\n"
-                                                        f"Position: Row {row}, Column {col}, Length {length}\n\n"
-                                                        f"Error: {str(get_text_error)}\n\n"
-                                                        f"This usually means:\n"
-                                                        f"1. Invalid screen coordinates (beyond 24x80)\n"
-                                                        f"2. Screen is not ready/locked\n"
-                                                        f"3. Field position is incorrect in module definition"
-                                                    )
-                                                    QMessageBox.critical(self, "Screen Read Error", error_msg)
+                                        for label in module_model.labels_named(field_name):
+                                            row = label.row
+                                            col = label.column
+                                            
+                                            # ✅ ADD: Substitute variables in expected value FIRST
+                                            expected_value = self.substitute_execution_variables(value, test_case_name)
+                                            length = label.length if label.length is not None else len(expected_value)  # ✅ Use substituted length
+                                            
+                                            # Read actual value from screen
+                                            try:
+                                                actual_value = autECLPS.GetText(row, col, length)
+                                            except Exception as get_text_error:
+                                                error_msg = (
+                                                    f"Error reading screen at {self.get_step_description(step_index, step)}\n\n"
+                                                    f"Field: {field_name}\n"
+                                                    f"Position: Row {row}, Column {col}, Length {length}\n\n"
+                                                    f"Error: {str(get_text_error)}\n\n"
+                                                    f"This usually means:\n"
+                                                    f"1. Invalid screen coordinates (beyond 24x80)\n"
+                                                    f"2. Screen is not ready/locked\n"
+                                                    f"3. Field position is incorrect in module definition"
+                                                )
+                                                QMessageBox.critical(self, "Screen Read Error", error_msg)
+                                                validation_failures.append({
+                                                    "step": step_index,
+                                                    "field": field_name,
+                                                    "expected": "Read screen data",
+                                                    "actual": f"Error: {str(get_text_error)}"
+                                                })
+                                                break
+                                            
+                                            # ✅ Use substituted expected_value
+                                            validation_passed = self.validate_field_value(actual_value, expected_value)
+                                            
+                                            if not validation_passed:
+                                                # ✅ NEW: Failure details are persisted, so only keep the masked value
+                                                actual_value = self.main_window.apply_masking_to_text(actual_value)
+                                                # ✅ ENHANCED: Better error message for {blank} validation
+                                                if expected_value.lower() == '{blank}':  # ✅ CHANGED from value
                                                     validation_failures.append({
-                                                        "step": step_index,
+                                                        "step": f"{step_index}.{sub_index}",
                                                         "field": field_name,
-                                                        "expected": "Read screen data",
-                                                        "actual": f"Error: {str(get_text_error)}"
+                                                        "expected": '<blank>',
+                                                        "actual": f"'{actual_value.strip()}'" if actual_value.strip() else '<blank>'
                                                     })
-                                                    break
-                                                
-                                                # ✅ Use substituted expected_value
-                                                validation_passed = self.validate_field_value(actual_value, expected_value)
-                                                
-                                                if not validation_passed:
-                                                    # ✅ ENHANCED: Better error message for {blank} validation
-                                                    if expected_value.lower() == '{blank}':  # ✅ CHANGED from value
-                                                        validation_failures.append({
-                                                            "step": f"{step_index}.{sub_index}",
-                                                            "field": field_name,
-                                                            "expected": '<blank>',
-                                                            "actual": f"'{actual_value.strip()}'" if actual_value.strip() else '<blank>'
-                                                        })
-                                                    else:
-                                                        validation_failures.append({
-                                                            "step": f"{step_index}.{sub_index}",
-                                                            "field": field_name,
-                                                            "expected": expected_value,  # ✅ CHANGED from value
-                                                            "actual": actual_value.strip()
-                                                        })
-                                                    # ✅ Stop execution immediately on validation failure
-                                                    print(f"❌ Utility validation failed at Step {step_index}.{sub_index} - Field '{field_name}': Expected '{expected_value}', Got '{actual_value}'")  # ✅ CHANGED from value
-                                                    break
-                                                
-                                                print(f"Step {step_index}.{sub_index}: Validated {field_name} - Expected: '{expected_value}', Actual: '{actual_value}'")  # ✅ CHANGED from value
-                                                time.sleep(0.1)
+                                                else:
+                                                    validation_failures.append({
+                                                        "step": f"{step_index}.{sub_index}",
+                                                        "field": field_name,
+                                                        "expected": expected_value,  # ✅ CHANGED from value
+                                                        "actual": actual_value.strip()
+                                                    })
+                                                # ✅ Stop execution immediately on validation failure
+                                                run_log.log('error', self.main_window.apply_masking_to_text(f"❌ Utility validation failed at Step {step_index}.{sub_index} - Field '{field_name}': Expected '{expected_value}', Got '{actual_value}'"), step=f"{step_index}.{sub_index}")  # ✅ CHANGED: Masked, the run log is shown and echoed
                                                 break
                                             
+                                            run_log.log('info', self.main_window.apply_masking_to_text(f"Step {step_index}.{sub_index}: Validated {field_name} - Expected: '{expected_value}', Actual: '{actual_value}'"), step=f"{step_index}.{sub_index}")  # ✅ CHANGED: Masked, the run log is shown and echoed
+                                            time.sleep(0.1)
+                                            break
+                                        
                                         # ✅ Check if validation failed and stop utility steps
                                         if validation_failures:
-                                            print(f"🛑 Stopping utility steps due to validation failure at Step {step_index}.{sub_index}")
+                                            run_log.log('warning', f"🛑 Stopping utility steps due to validation failure at Step {step_index}.{sub_index}", step=f"{step_index}.{sub_index}")
                                             break
                                     
                                     # ✅ Check if validation failed and stop processing this step's utilities
                                     if validation_failures:
                                         break
                             else:
-                                print(f"Warning: Module '{module_name}' not found for utility step")                                                
+                                run_log.log('warning', f"Warning: Module '{module_name}' not found for utility step")                                                
                       
                       
                         
@@ -4023,7 +4580,7 @@ class TestExecutionDialog(QDialog):
 
                 # âœ… NEW: Check if validation failed in utility steps and stop main loop
                 if validation_failures:
-                    print(f"ðŸ›' Stopping test execution due to utility validation failure")
+                    run_log.log('warning', f"ðŸ›' Stopping test execution due to utility validation failure")
                     break  # Break out of main steps while loop
                 
                 time.sleep(0.1)                
@@ -4074,16 +4631,20 @@ class TestExecutionDialog(QDialog):
                 with open(filename, "w", encoding="utf-8") as f:
                     f.write("\n\n\n".join(text_captures))
                 
-                print(f"All screen text for '{test_case_name}' saved to '{filename}'.")
+                run_log.log('info', f"All screen text for '{test_case_name}' saved to '{filename}'.")
             
+            # âœ… Create execution summary for single test case
+            from datetime import datetime
+            execution_timestamp = datetime.now().strftime('%Y-%m-%d %H-%M-%S')
+
             # Create single DOCX with all screenshots
             docx_path = None
             if docx_screenshots:
                 try:
                     docx_path = self.main_window.create_test_case_docx(test_case_name, docx_screenshots)
-                    print(f"DOCX document created: '{docx_path}' with {len(docx_screenshots)} screenshot(s)")
+                    run_log.log('info', f"DOCX document created: '{docx_path}' with {len(docx_screenshots)} screenshot(s)")
                 except Exception as e:
-                    print(f"Error creating DOCX: {e}")
+                    run_log.log('error', f"Error creating DOCX: {e}")
                     validation_failures.append({
                         "step": "DOCX Generation",
                         "field": "Document Creation",
@@ -4091,9 +4652,8 @@ class TestExecutionDialog(QDialog):
                         "actual": f"Error: {str(e)}"
                     })
 
-            # âœ… Create execution summary for single test case
-            from datetime import datetime
-            execution_timestamp = datetime.now().strftime('%Y-%m-%d %H-%M-%S')
+            # ✅ NEW: Record captures so the documents can be re-rendered offline
+            self.save_run_captures(execution_timestamp, test_case_name, test_project, docx_screenshots, docx_path)
             
             # Check if there were any validation failures
             if validation_failures:
@@ -4111,16 +4671,7 @@ class TestExecutionDialog(QDialog):
                 }
                 
                 # âœ… Update UI
-                for i in range(self.test_case_list.count()):
-                    item = self.test_case_list.item(i)
-                    item_data = item.data(Qt.ItemDataRole.UserRole)
-                    
-                    if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                        widget = self.test_case_list.itemWidget(item)
-                        time_label = widget.findChild(QLabel, "execution_time_label")
-                        if time_label:
-                            time_label.setText(f"{duration_str}")
-                        break
+                self.set_execution_time(test_case_name, duration_str)
                 
                 self.update_status(test_case_name, "Failed")
                 
@@ -4163,16 +4714,7 @@ class TestExecutionDialog(QDialog):
                 }
                 
                 # âœ… Update the execution time label in the UI
-                for i in range(self.test_case_list.count()):
-                    item = self.test_case_list.item(i)
-                    item_data = item.data(Qt.ItemDataRole.UserRole)
-                    
-                    if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                        widget = self.test_case_list.itemWidget(item)
-                        time_label = widget.findChild(QLabel, "execution_time_label")
-                        if time_label:
-                            time_label.setText(f"{duration_str}")
-                        break
+                self.set_execution_time(test_case_name, duration_str)
                 
                 # Update status to Passed
                 # Update status to Passed
@@ -4235,6 +4777,7 @@ class TestExecutionDialog(QDialog):
         finally:
             # âœ… Always change button back to play icon
             self.set_play_stop_button_state(test_case_name, False)
+            run_stream.uninstall()
 
 
     def execute_selected_tests(self):
@@ -4242,29 +4785,31 @@ class TestExecutionDialog(QDialog):
         selected_tests = []
         selected_names = []
         
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            # Only process test case items
-            if item_data and item_data.get('type') == 'test_case':
-                widget = self.test_case_list.itemWidget(item)
-                checkbox = widget.findChild(QCheckBox)
-                
-                if checkbox and checkbox.isChecked():
-                    test_name = item_data['name']
-                    selected_tests.append(test_name)
-                    selected_names.append(test_name)
+        for _, entry in self.test_case_model.test_rows():
+            if entry.checked:
+                selected_tests.append(entry.name)
+                selected_names.append(entry.name)
 
         if not selected_tests:
             QMessageBox.warning(self, "No Selection", "Please select at least one test case to execute.")
             return
 
         # Confirm execution
+        message = f"Execute {len(selected_tests)} test case(s)?\n\n" + "\n".join(selected_names)
+        
+        # ✅ NEW: Warn about steps built against an older module definition (indexed query, no records loaded)
+        stale_lines = []
+        for test_name in selected_tests:
+            stale_count = len(self.main_window.library.stale_steps(test_name))
+            if stale_count:
+                stale_lines.append(f"{test_name}: {stale_count} step(s)")
+        if stale_lines:
+            message += "\n\n⚠️ Steps using an outdated module definition:\n" + "\n".join(stale_lines)
+        
         reply = QMessageBox.question(
             self, 
             "Confirm Execution",
-            f"Execute {len(selected_tests)} test case(s)?\n\n" + "\n".join(selected_names),
+            message,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
@@ -4303,252 +4848,257 @@ class TestExecutionDialog(QDialog):
         from datetime import datetime
         execution_timestamp = datetime.now().strftime('%Y-%m-%d %H-%M-%S')
         
-        for test_case_name in selected_tests:
-            # ✅ IMPORTANT: Allow UI to process events (including stop button clicks)
-            QApplication.processEvents()
+        # ✅ NEW: Stream one consolidated report while the suite runs
+        report_writer = None
+        if self.main_window.document_config.get('consolidated_report', False):
+            report_writer = self.main_window.create_consolidated_report_writer(execution_timestamp)
+        
+        # ✅ NEW: Prints of the helpers this run calls go to the run log until the loop ends,
+        # however it ends
+        run_stream = RunLogStream(run_log).install()
+        
+        try:
+            for test_case_name in selected_tests:
+                # ✅ IMPORTANT: Allow UI to process events (including stop button clicks)
+                QApplication.processEvents()
             
-            # Initialize test_project variable
-            test_project = None
-            for project_name, project_data in self.projects.items():
-                if test_case_name in project_data['test_cases']:
-                    test_project = project_name
-                    break
+                # Initialize test_project variable
+                test_project = None
+                for project_name, project_data in self.projects.items():
+                    if test_case_name in project_data['test_cases']:
+                        test_project = project_name
+                        break
             
-            # ✅ NEW: Initialize test_was_stopped flag for this test case
-            test_was_stopped = False
+                # ✅ NEW: Initialize test_was_stopped flag for this test case
+                test_was_stopped = False
             
-            # ✅ Check if stop was requested BEFORE starting this test case
-            if self.stop_execution:
-                print(f"\n⚠️ Execution stopped by user before test case '{test_case_name}'")
-                # Mark remaining tests as stopped
-                for remaining_test in selected_tests[selected_tests.index(test_case_name):]:
-                    self.update_status(remaining_test, "Stopped")
-                    stopped_count += 1
-                    results_summary.append(f"⏸️ {remaining_test}: Stopped by user")
+                # ✅ Check if stop was requested BEFORE starting this test case
+                if self.stop_execution:
+                    run_log.log('warning', f"⚠️ Execution stopped by user before test case '{test_case_name}'")
+                    # Mark remaining tests as stopped
+                    for remaining_test in selected_tests[selected_tests.index(test_case_name):]:
+                        self.update_status(remaining_test, "Stopped")
+                        stopped_count += 1
+                        results_summary.append(f"⏸️ {remaining_test}: Stopped by user")
                    
-                    execution_results.append({
-                        'name': remaining_test,
-                        'status': 'Stopped',
-                        'project': test_project,
-                        'error': 'Execution stopped by user before test started'
-                    })
-                break  # Exit the for loop completely
-            
-            print(f"\n{'='*60}")
-            # âœ… Track test case execution time
-            test_start_time = datetime.now()
-            test_start_time_str = test_start_time.strftime('%Y-%m-%d %H:%M:%S')
-            print(f"Executing Test Case: {test_case_name}")
-            print(f"{'='*60}\n")
-            
-            # ✅ Check prerequisites first
-            # In the execute_selected_tests method, find this section:
-
-            # ✅ Check prerequisites first
-            can_run, reason = self.check_prerequisites(test_case_name)
-            if not can_run:
-                self.play_sound_signal('warning')
-                # ✅ CHANGED: Custom message box with Override option
-                msg_box = QMessageBox(self)
-                msg_box.setIcon(QMessageBox.Icon.Warning)
-                msg_box.setWindowTitle("Prerequisites Not Met")
-                msg_box.setText(f"Cannot execute '{test_case_name}':\n\n{reason}\n\nWhat would you like to do?")
+                        execution_results.append({
+                            'name': remaining_test,
+                            'status': 'Stopped',
+                            'project': test_project,
+                            'error': 'Execution stopped by user before test started'
+                        })
+                    break  # Exit the for loop completely
+            
+                # âœ… Track test case execution time
+                test_start_time = datetime.now()
+                test_start_time_str = test_start_time.strftime('%Y-%m-%d %H:%M:%S')
+                run_log.log('info', f"Executing Test Case: {test_case_name}")
+            
+                # ✅ Check prerequisites first
+                # In the execute_selected_tests method, find this section:
+
+                # ✅ Check prerequisites first
+                can_run, reason = self.check_prerequisites(test_case_name)
+                if not can_run:
+                    self.play_sound_signal('warning')
+                    # ✅ CHANGED: Custom message box with Override option
+                    msg_box = QMessageBox(self)
+                    msg_box.setIcon(QMessageBox.Icon.Warning)
+                    msg_box.setWindowTitle("Prerequisites Not Met")
+                    msg_box.setText(f"Cannot execute '{test_case_name}':\n\n{reason}\n\nWhat would you like to do?")
                 
-                # Add custom buttons
-                skip_button = msg_box.addButton("Skip This Test", QMessageBox.ButtonRole.RejectRole)
-                override_button = msg_box.addButton("Override && Execute", QMessageBox.ButtonRole.AcceptRole)
-                stop_button = msg_box.addButton("Stop All", QMessageBox.ButtonRole.DestructiveRole)
+                    # Add custom buttons
+                    skip_button = msg_box.addButton("Skip This Test", QMessageBox.ButtonRole.RejectRole)
+                    override_button = msg_box.addButton("Override && Execute", QMessageBox.ButtonRole.AcceptRole)
+                    stop_button = msg_box.addButton("Stop All", QMessageBox.ButtonRole.DestructiveRole)
                 
-                msg_box.setDefaultButton(skip_button)
-                msg_box.exec()
+                    msg_box.setDefaultButton(skip_button)
+                    msg_box.exec()
                 
-                # Check which button was clicked
-                if msg_box.clickedButton() == stop_button:
-                    # Stop all remaining tests
-                    self.stop_execution = True
-                    for remaining_test in selected_tests[selected_tests.index(test_case_name):]:
-                        self.update_status(remaining_test, "Stopped")
-                        stopped_count += 1
-                        results_summary.append(f"⏸️ {remaining_test}: Stopped by user")
+                    # Check which button was clicked
+                    if msg_box.clickedButton() == stop_button:
+                        # Stop all remaining tests
+                        self.stop_execution = True
+                        for remaining_test in selected_tests[selected_tests.index(test_case_name):]:
+                            self.update_status(remaining_test, "Stopped")
+                            stopped_count += 1
+                            results_summary.append(f"⏸️ {remaining_test}: Stopped by user")
+                            execution_results.append({
+                                'name': remaining_test,
+                                'status': 'Stopped',
+                                'project': test_project,
+                                'error': 'Execution stopped by user'
+                            })
+                            self.uncheck_test_case(remaining_test)
+                        break
+                    elif msg_box.clickedButton() == skip_button:
+                        # Skip this test and mark as failed
+                        self.update_status(test_case_name, "Failed")
+                        failed_count += 1
+                        results_summary.append(f"❌ {test_case_name}: Prerequisites not met - {reason}")
                         execution_results.append({
-                            'name': remaining_test,
-                            'status': 'Stopped',
+                            'name': test_case_name,
+                            'status': 'Failed',
                             'project': test_project,
-                            'error': 'Execution stopped by user'
+                            'error': f"Prerequisites not met: {reason}"
                         })
-                        self.uncheck_test_case(remaining_test)
-                    break
-                elif msg_box.clickedButton() == skip_button:
-                    # Skip this test and mark as failed
+                        run_log.log('error', f"❌ Test '{test_case_name}' SKIPPED: {reason}")
+                        self.uncheck_test_case(test_case_name)
+                        continue
+                    # If override_button was clicked, continue execution normally
+            
+                # Update status to "Running"
+                self.update_status(test_case_name, "Running")
+                QApplication.processEvents()  # ✅ Update UI
+            
+                # Get test case data
+                # ✅ FIXED: Get test case data from either projects or standalone
+                test_case_data = self.get_test_case_data(test_case_name)
+                if not test_case_data:
                     self.update_status(test_case_name, "Failed")
                     failed_count += 1
-                    results_summary.append(f"❌ {test_case_name}: Prerequisites not met - {reason}")
+                    results_summary.append(f"❌ {test_case_name}: Test case not found")
+                
                     execution_results.append({
                         'name': test_case_name,
                         'status': 'Failed',
                         'project': test_project,
-                        'error': f"Prerequisites not met: {reason}"
+                        'error': 'Test case not found'
                     })
-                    print(f"❌ Test '{test_case_name}' SKIPPED: {reason}")
-                    self.uncheck_test_case(test_case_name)
                     continue
-                # If override_button was clicked, continue execution normally
-            
-            # Update status to "Running"
-            self.update_status(test_case_name, "Running")
-            QApplication.processEvents()  # ✅ Update UI
-            
-            # Get test case data
-            # ✅ FIXED: Get test case data from either projects or standalone
-            test_case_data = self.get_test_case_data(test_case_name)
-            if not test_case_data:
-                self.update_status(test_case_name, "Failed")
-                failed_count += 1
-                results_summary.append(f"❌ {test_case_name}: Test case not found")
-                
-                execution_results.append({
-                    'name': test_case_name,
-                    'status': 'Failed',
-                    'project': test_project,
-                    'error': 'Test case not found'
-                })
-                continue
 
-            # Track validation results and captured data for this test
-            validation_failures = []
-            text_captures = []
-            docx_screenshots = []
-            screen_rows = 24
-            screen_cols = 80
+                # Track validation results and captured data for this test
+                validation_failures = []
+                text_captures = []
+                docx_screenshots = []
+                screen_rows = 24
+                screen_cols = 80
 
-            try:
-                # Initialize COM for THIS test case
-                # NEW CODE:
-                pythoncom.CoInitialize()
-                autECLSession = win32com.client.Dispatch("PCOMM.autECLSession")
-                connection_name = self.main_window.get_connection_name_from_title(self.main_window.pcomm_window_title)
-                autECLSession.SetConnectionByName(connection_name)
-                autECLPS = autECLSession.autECLPS
+                try:
+                    # Initialize COM for THIS test case
+                    # NEW CODE:
+                    connection_name = self.main_window.get_connection_name_from_title(self.main_window.pcomm_window_title)
+                    autECLSession, autECLPS = connect_pcomm_session(connection_name)  # ✅ CHANGED: See pcomm_core.session
                 
-                # Get the selected start step (0-based index)
-                # Get the selected start step (0-based index)
-                # Get the selected start step (0-based index)
-                start_step_data = self.get_start_step_index(test_case_name)
-
-                # Flag to track if this test was stopped
-                test_was_stopped = False
-
-                # ✅ FIXED: Properly handle utility step starting point
-                all_steps = test_case_data.get("steps", [])
-                if isinstance(start_step_data, tuple):
-                    # Starting from a utility step: (main_step_index, utility_sub_index)
-                    start_main_step, start_utility_step = start_step_data
-                    current_step_index = start_main_step - 1  # Convert to 0-based
-                    start_from_utility = start_utility_step  # This is already 1-based from the dropdown
-                else:
-                    # Starting from a main step
-                    current_step_index = start_step_data - 1  # Convert to 0-based
-                    start_from_utility = None
+                    # Get the selected start step (0-based index)
+                    # Get the selected start step (0-based index)
+                    # Get the selected start step (0-based index)
+                    start_step_data = self.get_start_step_index(test_case_name)
+
+                    # Flag to track if this test was stopped
+                    test_was_stopped = False
+
+                    # ✅ FIXED: Properly handle utility step starting point
+                    all_steps = test_case_data.get("steps", [])
+                    if isinstance(start_step_data, tuple):
+                        # Starting from a utility step: (main_step_index, utility_sub_index)
+                        start_main_step, start_utility_step = start_step_data
+                        current_step_index = start_main_step - 1  # Convert to 0-based
+                        start_from_utility = start_utility_step  # This is already 1-based from the dropdown
+                    else:
+                        # Starting from a main step
+                        current_step_index = start_step_data - 1  # Convert to 0-based
+                        start_from_utility = None
 
-                # ✅ NEW: Flag to skip main step execution if starting from utility
-                skip_main_step_execution = (start_from_utility is not None)
+                    # ✅ NEW: Flag to skip main step execution if starting from utility
+                    skip_main_step_execution = (start_from_utility is not None)
 
-                while current_step_index < len(all_steps):
-                    step_index = current_step_index + 1  # Display as 1-based
-                    step = all_steps[current_step_index]
+                    while current_step_index < len(all_steps):
+                        step_index = current_step_index + 1  # Display as 1-based
+                        step = all_steps[current_step_index]
+                        run_log.begin_step(step_index)  # ✅ NEW: Times the step in the run log
                     
-                    # ✅ CRITICAL: Allow UI to process events before each step
-                    QApplication.processEvents()
+                        # ✅ CRITICAL: Allow UI to process events before each step
+                        QApplication.processEvents()
                     
-                    # ✅ Check if stop was requested during step execution
-                    if self.stop_execution:
-                        print(f"Execution stopped by user at step {step_index}")
-                        test_was_stopped = True
-                        break  # Break out of the step loop
+                        # ✅ Check if stop was requested during step execution
+                        if self.stop_execution:
+                            run_log.log('warning', f"Execution stopped by user at step {step_index}")
+                            test_was_stopped = True
+                            break  # Break out of the step loop
                     
-                    # ✅ NEW: Add a small delay and check if screen is ready before each step
-                    time.sleep(0.2)
+                        # ✅ NEW: Add a small delay and check if screen is ready before each step
+                        time.sleep(0.2)
                     
-                    # ✅ NEW: Verify PCOMM is ready before executing step
-                    try:
-                        # Check if we can read screen status
-                        _ = autECLPS.Started
-                    except Exception as screen_error:
-                        self.play_sound_signal('error')
-                        error_msg = (
-                            f"PCOMM Connection Error at {self.get_step_description(step_index, step)}\n\n"
-                            f"The PCOMM session appears to be disconnected or not responding.\n\n"
-                            f"Error: {str(screen_error)}\n\n"
-                            f"Please check:\n"
-                            f"1. PCOMM session is still connected\n"
-                            f"2. Screen is not locked or in an error state\n"
-                            f"3. Connection is stable"
-                        )
-                        QMessageBox.critical(self, "PCOMM Connection Error", error_msg)
-                        validation_failures.append({
-                            "step": step_index,
-                            "field": "PCOMM Connection",
-                            "expected": "Connected",
-                            "actual": f"Error: {str(screen_error)}"
-                        })
-                        break
+                        # ✅ NEW: Verify PCOMM is ready before executing step
+                        try:
+                            # Check if we can read screen status
+                            _ = autECLPS.Started
+                        except Exception as screen_error:
+                            self.play_sound_signal('error')
+                            error_msg = (
+                                f"PCOMM Connection Error at {self.get_step_description(step_index, step)}\n\n"
+                                f"The PCOMM session appears to be disconnected or not responding.\n\n"
+                                f"Error: {str(screen_error)}\n\n"
+                                f"Please check:\n"
+                                f"1. PCOMM session is still connected\n"
+                                f"2. Screen is not locked or in an error state\n"
+                                f"3. Connection is stable"
+                            )
+                            QMessageBox.critical(self, "PCOMM Connection Error", error_msg)
+                            validation_failures.append({
+                                "step": step_index,
+                                "field": "PCOMM Connection",
+                                "expected": "Connected",
+                                "actual": f"Error: {str(screen_error)}"
+                            })
+                            break
                     
-                    step_type = step.get("type")
+                        step_type = step.get("type")
                     
-                    skip_main_step = False
-                    if isinstance(start_step_data, tuple) and current_step_index == (start_step_data[0] - 1):
-                        # Starting from a utility step on this main step - skip main execution
-                        skip_main_step = True
-                        print(f"Step {step_index}: Skipping main step execution, starting from utility step {start_from_utility}")
+                        step_model = Step.from_dict(step)  # ✅ NEW: Typed view, aliases and coordinates resolved once
                     
-                    if not skip_main_step:
-                        if step_type == "module_import":
-                            import os
+                        skip_main_step = False
+                        if isinstance(start_step_data, tuple) and current_step_index == (start_step_data[0] - 1):
+                            # Starting from a utility step on this main step - skip main execution
+                            skip_main_step = True
+                            run_log.log('info', f"Step {step_index}: Skipping main step execution, starting from utility step {start_from_utility}")
+                    
+                        if not skip_main_step:
+                            if step_type == "module_import":
+                                import os
                             
-                            # Process module fields FIRST
-                            module_name = step.get("module_name")
+                                # Process module fields FIRST
+                                module_name = step.get("module_name")
                             
-                            # ✅ NEW: Capture "Before" screenshot if Screen Flow is enabled
-                            capture_screen_flow = self.main_window.document_config.get('capture_screen_flow', False)
-                            if capture_screen_flow:
-                                try:
-                                    screen_flow_dir = os.path.join(self.main_window.default_results_location, 'Screen Flows')
-                                    os.makedirs(screen_flow_dir, exist_ok=True)
+                                # ✅ NEW: Capture "Before" screenshot if Screen Flow is enabled
+                                capture_screen_flow = self.main_window.document_config.get('capture_screen_flow', False)
+                                if capture_screen_flow:
+                                    try:
+                                        screen_flow_dir = os.path.join(self.main_window.default_results_location, 'Screen Flows')
+                                        os.makedirs(screen_flow_dir, exist_ok=True)
                                     
-                                    before_filename = f"{test_case_name}_Step {step_index}_Before.jpg"
-                                    before_path = os.path.join(screen_flow_dir, before_filename)
+                                        before_filename = f"{test_case_name}_Step {step_index}_Before.jpg"
+                                        before_path = os.path.join(screen_flow_dir, before_filename)
                                     
-                                    if self.main_window.capture_pcomm_screen_as_jpeg(before_path):
-                                        print(f"Step {step_index}: Captured 'Before' screen flow: {before_filename}")
-                                except Exception as e:
-                                    print(f"Error capturing before screenshot: {e}")
+                                        if self.main_window.capture_pcomm_screen_as_jpeg(before_path, autECLPS):
+                                            run_log.log('info', f"Step {step_index}: Captured 'Before' screen flow: {before_filename}")
+                                    except Exception as e:
+                                        run_log.log('error', f"Error capturing before screenshot: {e}")
                             
-                            # Process module fields for Input
-                            for field in step.get("fields", []):
-                                if self.stop_execution:
-                                    break
+                                # Process module fields for Input
+                                for field in step_model.fields:
+                                    if self.stop_execution:
+                                        break
                                     
-                                action_type = field.get("action_type", "Input")
-                                value = str(field.get("value", "")).strip()
+                                    action_type = field.action_type
+                                    value = field.value
                                 
-                                if action_type == "Input":
-                                    if not value:
-                                        continue
+                                    if action_type == "Input":
+                                        if not value:
+                                            continue
                                     
-                                    if module_name in self.main_window.modules:
-                                        module_data = self.main_window.modules[module_name]
-                                        labels = module_data.get("labels", [])
-                                        
-                                        field_name = field.get("field_name")
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get("row", 1))
-                                                col = int(label.get("column", 1))
-                                                
+                                        module_model = self.main_window.get_module_model(module_name)
+                                    
+                                        if module_model is not None:
+                                            field_name = field.field_name
+                                            for label in module_model.labels_named(field_name):
+                                                row = label.row
+                                                col = label.column
+                                            
                                                 # Substitute variables in the value before sending
                                                 substituted_value = self.substitute_execution_variables(value, test_case_name)
-                                                
+                                            
                                                 autECLPS.SetCursorPos(row, col)
                                                 try:
                                                     autECLPS.SendKeys(substituted_value)
@@ -4574,52 +5124,49 @@ class TestExecutionDialog(QDialog):
                                                     break
                                                 time.sleep(0.1)
                                                 break
-                            
-                            # ✅ NEW: Capture "After" screenshot with smart wait if Screen Flow is enabled
-                            if capture_screen_flow:
-                                try:
-                                    screen_flow_dir = os.path.join(self.main_window.default_results_location, 'Screen Flows')
-                                    after_filename = f"{test_case_name}_Step {step_index}_After.jpg"
-                                    after_path = os.path.join(screen_flow_dir, after_filename)
+                        
+                                # ✅ NEW: Capture "After" screenshot with smart wait if Screen Flow is enabled
+                                if capture_screen_flow:
+                                    try:
+                                        screen_flow_dir = os.path.join(self.main_window.default_results_location, 'Screen Flows')
+                                        after_filename = f"{test_case_name}_Step {step_index}_After.jpg"
+                                        after_path = os.path.join(screen_flow_dir, after_filename)
                                     
-                                    # Small delay to ensure screen is updated
-                                    time.sleep(0.5)
+                                        # Small delay to ensure screen is updated
+                                        time.sleep(0.5)
                                     
-                                    if self.main_window.capture_pcomm_screen_as_jpeg(after_path):
-                                        print(f"Step {step_index}: Captured 'After' screen flow: {after_filename}")
-                                except Exception as e:
-                                    print(f"Error capturing after screenshot: {e}")
+                                        if self.main_window.capture_pcomm_screen_as_jpeg(after_path, autECLPS):
+                                            run_log.log('info', f"Step {step_index}: Captured 'After' screen flow: {after_filename}")
+                                    except Exception as e:
+                                        run_log.log('error', f"Error capturing after screenshot: {e}")
                             
-                            # Process validation actions for module fields
-                            for field in step.get("fields", []):
-                                # Check for stop during field processing
-                                QApplication.processEvents()
-                                if self.stop_execution:
-                                    test_was_stopped = True
-                                    break
+                                # Process validation actions for module fields
+                                for field in step_model.fields:
+                                    # Check for stop during field processing
+                                    QApplication.processEvents()
+                                    if self.stop_execution:
+                                        test_was_stopped = True
+                                        break
                                 
-                                action_type = field.get("action_type", "Input")
-                                value = str(field.get("value", "")).strip()
+                                    action_type = field.action_type
+                                    value = field.value
                                 
-                                if action_type == "Validate":
-                                    if not value:
-                                        continue
+                                    if action_type == "Validate":
+                                        if not value:
+                                            continue
                                     
-                                    if module_name in self.main_window.modules:
-                                        module_data = self.main_window.modules[module_name]
-                                        labels = module_data.get("labels", [])
-                                        
-                                        field_name = field.get("field_name")
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get("row", 1))
-                                                col = int(label.get("column", 1))
-                                                length = int(label.get("length", len(value)))
-                                                
+                                        module_model = self.main_window.get_module_model(module_name)
+                                    
+                                        if module_model is not None:
+                                            field_name = field.field_name
+                                            for label in module_model.labels_named(field_name):
+                                                row = label.row
+                                                col = label.column
+                                                length = label.length if label.length is not None else len(value)
+                                            
                                                 # ✅ ADD: Substitute variables in expected value
                                                 expected_value = self.substitute_execution_variables(value, test_case_name)
-                                                                          
+                                                                      
                                                 try:
                                                     actual_value = autECLPS.GetText(row, col, length)
                                                 except Exception as get_text_error:
@@ -4642,11 +5189,13 @@ class TestExecutionDialog(QDialog):
                                                         "actual": f"Error: {str(get_text_error)}"
                                                     })
                                                     break
-                                                
+                                            
                                                 # ✅ Use substituted expected_value
                                                 validation_passed = self.validate_field_value(actual_value, expected_value)
-                                                
+                                            
                                                 if not validation_passed:
+                                                    # ✅ NEW: Failure details are persisted, so only keep the masked value
+                                                    actual_value = self.main_window.apply_masking_to_text(actual_value)
                                                     if expected_value.lower() == '{blank}':  # ✅ CHANGED
                                                         validation_failures.append({
                                                             "step": step_index,
@@ -4662,487 +5211,483 @@ class TestExecutionDialog(QDialog):
                                                             "actual": actual_value.strip()
                                                         })
                                                     # Stop execution immediately on validation failure
-                                                    print(f"❌ Validation failed at Step {step_index} - Field '{field_name}': Expected '{value}', Got '{actual_value}'")
+                                                    run_log.log('error', self.main_window.apply_masking_to_text(f"❌ Validation failed at Step {step_index} - Field '{field_name}': Expected '{value}', Got '{actual_value}'"))  # ✅ CHANGED: Masked, the run log is shown and echoed
                                                     break
-                                                
+                                            
                                                 time.sleep(0.1)
                                                 break
-                                    
-                                    # Check if validation failed and stop test execution
-                                    if validation_failures:
-                                        print(f"🛑 Stopping test execution due to validation failure at Step {step_index}")
-                                        break  # Break out of fields loop
+                                
+                                        # Check if validation failed and stop test execution
+                                        if validation_failures:
+                                            run_log.log('warning', f"🛑 Stopping test execution due to validation failure at Step {step_index}")
+                                            break  # Break out of fields loop
 
-                            # Check if validation failed and stop processing steps
-                            if validation_failures:
-                                break  # Break out of steps loop
+                                # Check if validation failed and stop processing steps
+                                if validation_failures:
+                                    break  # Break out of steps loop
                         
-                        elif step_type == "special_key":
-                            key_value = step.get("key_value", "")
+                            elif step_type == "special_key":
+                                key_value = step_model.key_value
                             
-                            key_mapping = {
-                                "Enter Key": "[enter]",
-                                "Clear Key": "[clear]",
-                                "End Key": "[EraseEof]",
-                                "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
-                                "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
-                                "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
-                                "F13": "[pf13]", "F14": "[pf14]", "F15": "[pf15]", "F16": "[pf16]",
-                                "F17": "[pf17]", "F18": "[pf18]", "F19": "[pf19]", "F20": "[pf20]",
-                                "F21": "[pf21]", "F22": "[pf22]", "F23": "[pf23]", "F24": "[pf24]",
-                            }
+                                key_mapping = {
+                                    "Enter Key": "[enter]",
+                                    "Clear Key": "[clear]",
+                                    "End Key": "[EraseEof]",
+                                    "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
+                                    "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
+                                    "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
+                                    "F13": "[pf13]", "F14": "[pf14]", "F15": "[pf15]", "F16": "[pf16]",
+                                    "F17": "[pf17]", "F18": "[pf18]", "F19": "[pf19]", "F20": "[pf20]",
+                                    "F21": "[pf21]", "F22": "[pf22]", "F23": "[pf23]", "F24": "[pf24]",
+                                }
                             
-                            # Check if it's a combo key (contains + sign)
-                            if "+" in key_value:
-                                pcomm_key = self.main_window.convert_combo_key_to_pcomm(key_value)
-                            else:
-                                pcomm_key = key_mapping.get(key_value, key_value)
+                                # Check if it's a combo key (contains + sign)
+                                if "+" in key_value:
+                                    pcomm_key = self.main_window.convert_combo_key_to_pcomm(key_value)
+                                else:
+                                    pcomm_key = key_mapping.get(key_value, key_value)
                             
-                            # ✅ FIXED: Smart wait for special keys
-                            # Keys that typically cause screen changes
-                            action_keys = ["Enter Key"] + [f"F{i}" for i in range(1, 25)]
+                                # ✅ FIXED: Smart wait for special keys
+                                # Keys that typically cause screen changes
+                                action_keys = ["Enter Key"] + [f"F{i}" for i in range(1, 25)]
                             
-                            if key_value in action_keys or "+" in key_value:
-                                # Capture screen before action
-                                before_screen = wait_for_pcomm_ready_smart(autECLPS, key_value)
+                                if key_value in action_keys or "+" in key_value:
+                                    # Capture screen before action
+                                    before_screen = wait_for_pcomm_ready_smart(autECLPS, key_value)
                                 
-                                # Send the key
-                                autECLPS.SendKeys(pcomm_key)
-                                print(f"Step {step_index}: Sent {key_value}")
+                                    # Send the key
+                                    autECLPS.SendKeys(pcomm_key)
+                                    run_log.log('info', f"Step {step_index}: Sent {key_value}")
                                 
-                                # ✅ FIXED: Pass key_value as a string, not variable reference
-                                success, elapsed = complete_pcomm_wait(
-                                    autECLPS, 
-                                    before_screen, 
-                                    action_description=f"Special Key: {key_value}",  # ✅ Fixed here
-                                    timeout=30
-                                )
+                                    # ✅ FIXED: Pass key_value as a string, not variable reference
+                                    success, elapsed = complete_pcomm_wait(
+                                        autECLPS, 
+                                        before_screen, 
+                                        action_description=f"Special Key: {key_value}",  # ✅ Fixed here
+                                        timeout=30
+                                    )
                                 
-                                if not success:
-                                    QMessageBox.warning(self, "Timeout Warning", 
-                                        f"Step {step_index}: {key_value} did not complete within 30 seconds.\n\n"
-                                        "The test will continue, but results may be unreliable.")
-                            else:
-                                # Non-action keys (just send with small delay)
-                                autECLPS.SendKeys(pcomm_key)
-                                time.sleep(0.5)
+                                    if not success:
+                                        QMessageBox.warning(self, "Timeout Warning", 
+                                            f"Step {step_index}: {key_value} did not complete within 30 seconds.\n\n"
+                                            "The test will continue, but results may be unreliable.")
+                                else:
+                                    # Non-action keys (just send with small delay)
+                                    autECLPS.SendKeys(pcomm_key)
+                                    time.sleep(0.5)
                         
-                        elif step_type == "capture_screen_text":
-                            print(f"Step {step_index}: Capturing screen text...")
-                            screen_size = screen_rows * screen_cols
-                            full_screen_text = autECLPS.GetText(1, screen_size)
+                            elif step_type == "capture_screen_text":
+                                run_log.log('info', f"Step {step_index}: Capturing screen text...")
+                                screen_size = screen_rows * screen_cols
+                                full_screen_text = self.read_screen_snapshot(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                             
-                            captured_text_lines = []
-                            for row_num in range(screen_rows):
-                                start_index_text = row_num * screen_cols
-                                line_text = full_screen_text[start_index_text:start_index_text + screen_cols]
-                                captured_text_lines.append(line_text)
+                                captured_text_lines = []
+                                for row_num in range(screen_rows):
+                                    start_index_text = row_num * screen_cols
+                                    line_text = full_screen_text[start_index_text:start_index_text + screen_cols]
+                                    captured_text_lines.append(line_text)
                             
-                            from datetime import datetime
-                            header = f"--- Step {step_index}: Screen Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
-                            full_capture_string = header + "\n" + "\n".join(captured_text_lines)
-                            text_captures.append(full_capture_string)
-                            print(f"Step {step_index}: Screen text captured successfully")
+                                from datetime import datetime
+                                header = f"--- Step {step_index}: Screen Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
+                                full_capture_string = header + "\n" + "\n".join(captured_text_lines)
+                                text_captures.append(full_capture_string)
+                                run_log.log('info', f"Step {step_index}: Screen text captured successfully")
                         
-                        elif step_type == "capture_screenshot":
-                            if not self.main_window.document_config.get('generate_documentation', True):
-                                print(f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)")
-                                continue
+                            elif step_type == "capture_screenshot":
+                                if not self.main_window.document_config.get('generate_documentation', True):
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)")
+                                    continue
                             
-                            print(f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...")
-                            screen_size = screen_rows * screen_cols
-                            full_screen_text = autECLPS.GetText(1, screen_size)
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...")
+                                screen_size = screen_rows * screen_cols
+                                full_screen_text, masking_version = self.read_screen_capture(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                             
-                            # ✅ FIXED: Get highlight information for utility screenshot
-                            highlight_info = {}
-                            reference_module = utility_step.get('reference_module')
+                                # ✅ FIXED: Get highlight information for utility screenshot
+                                highlight_info = {}
+                                reference_module = step.get('reference_module')
                             
-                            if reference_module and reference_module in self.main_window.modules:
-                                module_data = self.main_window.modules[reference_module]
-                                labels = module_data.get('labels', [])
-                                
-                                # Get highlight flags from utility step fields
-                                for field in utility_step.get('fields', []):
-                                    if field.get('highlight', False):
-                                        field_name = field.get('field_name')
-                                        # Find the corresponding label
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
+                                module_model = self.main_window.get_module_model(reference_module) if reference_module else None
+                            
+                                if module_model is not None:
+                                    # Get highlight flags from step fields
+                                    for field in step_model.fields:
+                                        if field.highlight:
+                                            field_name = field.field_name
+                                            # Find the corresponding label
+                                            for label in module_model.labels_named(field_name):
                                                 highlight_info[field_name] = {
-                                                    'row': label.get('row', 1),
-                                                    'column': label.get('column', 1),
-                                                    'length': label.get('length', 10)
+                                                    'row': label.row,
+                                                    'column': label.column,
+                                                    'length': label.length if label.length is not None else 10
                                                 }
                                                 break
-                            
-                            from datetime import datetime
-                            docx_screenshots.append({
-                                'step': f"{step_index}.{sub_index}",
-                                'screen_text': full_screen_text,
-                                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'highlight_info': highlight_info  # ✅ FIXED: Add highlight info
-                            })
-                            print(f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)")
                         
-                        elif step_type == "random_input":
-                            # Handle random input steps
-                            row = int(step.get("row", 1))
-                            col = int(step.get("column", 1))
-                            value = str(step.get("value", "")).strip()
-                            is_special_key = step.get("is_special_key", False)
+                                from datetime import datetime
+                                docx_screenshots.append({
+                                    'step': f"{step_index}.{sub_index}",
+                                    'screen_text': full_screen_text,
+                                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                    'highlight_info': highlight_info,  # ✅ FIXED: Add highlight info
+                                    'masking': masking_version  # ✅ CHANGED: Patterns screen_text was masked with (None if unmasked)
+                                })
+                                run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)")
+                        
+                            elif step_type == "random_input":
+                                # Handle random input steps
+                                row = step_model.row
+                                col = step_model.column
+                                value = step_model.value
+                                is_special_key = step_model.is_special_key
                             
-                            if value:
-                                # Set cursor position
-                                autECLPS.SetCursorPos(row, col)
+                                if value:
+                                    # Set cursor position
+                                    autECLPS.SetCursorPos(row, col)
                                 
-                                if is_special_key:
-                                    # Map to PCOMM key code
-                                    key_mapping = {
-                                        "Enter Key": "[enter]",
-                                        "Clear Key": "[clear]",
-                                        "End Key": "[EraseEof]",
-                                        "F1": "[pf1]",
-                                        "F2": "[pf2]",
-                                        "F3": "[pf3]",
-                                        "F4": "[pf4]",
-                                        "F5": "[pf5]",
-                                        "F6": "[pf6]",
-                                        "F7": "[pf7]",
-                                        "F8": "[pf8]",
-                                        "F9": "[pf9]",
-                                        "F10": "[pf10]",
-                                        "F11": "[pf11]",
-                                        "F12": "[pf12]",
-                                    }
-                                    pcomm_key = key_mapping.get(value, value)
-                                    autECLPS.SendKeys(pcomm_key)
-                                    print(f"Step {step_index}: Sent special key '{value}' to position ({row}, {col})")
-                                    time.sleep(1.0)
-                                else:
-                                    # Send text value
-                                    autECLPS.SendKeys(value)
-                                    print(f"Step {step_index}: Sent '{value}' to position ({row}, {col})")
+                                    if is_special_key:
+                                        # Map to PCOMM key code
+                                        key_mapping = {
+                                            "Enter Key": "[enter]",
+                                            "Clear Key": "[clear]",
+                                            "End Key": "[EraseEof]",
+                                            "F1": "[pf1]",
+                                            "F2": "[pf2]",
+                                            "F3": "[pf3]",
+                                            "F4": "[pf4]",
+                                            "F5": "[pf5]",
+                                            "F6": "[pf6]",
+                                            "F7": "[pf7]",
+                                            "F8": "[pf8]",
+                                            "F9": "[pf9]",
+                                            "F10": "[pf10]",
+                                            "F11": "[pf11]",
+                                            "F12": "[pf12]",
+                                        }
+                                        pcomm_key = key_mapping.get(value, value)
+                                        autECLPS.SendKeys(pcomm_key)
+                                        run_log.log('info', f"Step {step_index}: Sent special key '{value}' to position ({row}, {col})")
+                                        time.sleep(1.0)
+                                    else:
+                                        # Send text value
+                                        autECLPS.SendKeys(value)
+                                        run_log.log('info', f"Step {step_index}: Sent '{value}' to position ({row}, {col})")
                         
-                        elif step_type == "wait":
-                            seconds = float(step.get("seconds", 0))
-                            if seconds > 0:
-                                print(f"Step {step_index}: Waiting for {seconds} second(s)...")
-                                # ✅ Break wait into smaller chunks to allow stop checking
-                                wait_chunks = int(seconds * 10)  # Check every 0.1 seconds
-                                for _ in range(wait_chunks):
-                                    QApplication.processEvents()
-                                    if self.stop_execution:
-                                        test_was_stopped = True
-                                        break
-                                    time.sleep(0.1)
+                            elif step_type == "wait":
+                                seconds = step_model.seconds
+                                if seconds > 0:
+                                    run_log.log('info', f"Step {step_index}: Waiting for {seconds} second(s)...")
+                                    # ✅ Break wait into smaller chunks to allow stop checking
+                                    wait_chunks = int(seconds * 10)  # Check every 0.1 seconds
+                                    for _ in range(wait_chunks):
+                                        QApplication.processEvents()
+                                        if self.stop_execution:
+                                            test_was_stopped = True
+                                            break
+                                        time.sleep(0.1)
                                 
-                                if not test_was_stopped:
-                                    print(f"Step {step_index}: Wait completed")
+                                    if not test_was_stopped:
+                                        run_log.log('info', f"Step {step_index}: Wait completed")
                         
-                        elif step_type == "break":
-                            message = step.get("message", "")
-                            print(f"Step {step_index}: Break point reached")
-                            self.play_sound_signal('break')
-                            # Show break dialog
-                            break_dialog = BreakExecutionDialog(message, self)
-                            break_dialog.show()
+                            elif step_type == "break":
+                                message = step.get("message", "")
+                                run_log.log('info', f"Step {step_index}: Break point reached")
+                                self.play_sound_signal('break')
+                                # Show break dialog
+                                break_dialog = BreakExecutionDialog(message, self)
+                                break_dialog.show()
                             
-                            # Wait for user action in an event loop
-                            while break_dialog.result_action is None:
-                                QApplication.processEvents()
-                                time.sleep(0.1)
+                                # Wait for user action in an event loop
+                                while break_dialog.result_action is None:
+                                    QApplication.processEvents()
+                                    time.sleep(0.1)
                             
-                            action = break_dialog.result_action
+                                action = break_dialog.result_action
                             
-                            if action == BreakExecutionDialog.STOP:
-                                print("User chose to stop execution at break point")
-                                self.stop_execution = True
-                                break_dialog.close()
-                                test_was_stopped = True
-                                break
+                                if action == BreakExecutionDialog.STOP:
+                                    run_log.log('info', "User chose to stop execution at break point")
+                                    self.stop_execution = True
+                                    break_dialog.close()
+                                    test_was_stopped = True
+                                    break
                             
-                            elif action == BreakExecutionDialog.EDIT:
-                                print("User chose to edit test case at break point")
-                                break_dialog.result_action = None
+                                elif action == BreakExecutionDialog.EDIT:
+                                    run_log.log('info', "User chose to edit test case at break point")
+                                    break_dialog.result_action = None
                                 
-                                # Get current test case data
-                                existing_steps = test_case_data.get('steps', [])
-                                test_case_description = test_case_data.get('description', '')
-                                test_case_assumptions = test_case_data.get('assumptions', '')
+                                    # Get current test case data
+                                    existing_steps = test_case_data.get('steps', [])
+                                    test_case_description = test_case_data.get('description', '')
+                                    test_case_assumptions = test_case_data.get('assumptions', '')
                                 
-                                # Open edit dialog
-                                edit_dialog = EditTestCaseDialog(
-                                    existing_steps, 
-                                    self.main_window.modules, 
-                                    self.main_window,
-                                    test_case_name, 
-                                    test_case_description, 
-                                    test_case_assumptions
-                                )
-                                edit_dialog.setParent(break_dialog, edit_dialog.windowFlags())
-                                edit_dialog.exec()
+                                    # Open edit dialog
+                                    edit_dialog = EditTestCaseDialog(
+                                        existing_steps, 
+                                        self.main_window.modules, 
+                                        self.main_window,
+                                        test_case_name, 
+                                        test_case_description, 
+                                        test_case_assumptions
+                                    )
+                                    edit_dialog.setParent(break_dialog, edit_dialog.windowFlags())
+                                    edit_dialog.exec()
                                 
-                                # Get updated data
-                                updated_steps = edit_dialog.get_updated_steps()
-                                updated_description = edit_dialog.get_test_case_description()
-                                updated_assumptions = edit_dialog.get_test_case_assumptions()
-                                updated_prerequisites = edit_dialog.get_prerequisites()
+                                    # Get updated data
+                                    updated_steps = edit_dialog.get_updated_steps()
+                                    updated_description = edit_dialog.get_test_case_description()
+                                    updated_assumptions = edit_dialog.get_test_case_assumptions()
+                                    updated_prerequisites = edit_dialog.get_prerequisites()
                                 
-                                # Update in-memory test case data
-                                test_case_data['steps'] = updated_steps
-                                test_case_data['description'] = updated_description
-                                test_case_data['assumptions'] = updated_assumptions
-                                test_case_data['prerequisites'] = updated_prerequisites
+                                    # Update in-memory test case data
+                                    test_case_data['steps'] = updated_steps
+                                    test_case_data['description'] = updated_description
+                                    test_case_data['assumptions'] = updated_assumptions
+                                    test_case_data['prerequisites'] = updated_prerequisites
                                 
-                                # Save to file
-                                self.main_window.save_test_cases_to_file()
+                                    # Save to file
+                                    self.main_window.save_test_cases_to_file()
+                                    self.track_library_copy(test_case_name, test_case_data)  # ✅ NEW: Edited in place
                                 
-                                # Refresh the all_steps list
-                                all_steps = test_case_data.get("steps", [])
+                                    # Refresh the all_steps list
+                                    all_steps = test_case_data.get("steps", [])
                                 
-                                print(f"Test case '{test_case_name}' updated during execution")
-                                print(f"Total steps after update: {len(all_steps)}")
+                                    run_log.log('info', f"Test case '{test_case_name}' updated during execution")
+                                    run_log.log('info', f"Total steps after update: {len(all_steps)}")
                                 
-                                QMessageBox.information(
-                                break_dialog,
-                                "Test Case Updated",
-                                f"Test case '{test_case_name}' has been updated.\n"
-                                f"Total steps: {len(all_steps)}\n"
-                                f"Press 'Resume Execution' to continue from Step {step_index}."
-                                )
+                                    QMessageBox.information(
+                                    break_dialog,
+                                    "Test Case Updated",
+                                    f"Test case '{test_case_name}' has been updated.\n"
+                                    f"Total steps: {len(all_steps)}\n"
+                                    f"Press 'Resume Execution' to continue from Step {step_index}."
+                                    )
                                 
-                                break_dialog.raise_()
-                                break_dialog.activateWindow()
+                                    break_dialog.raise_()
+                                    break_dialog.activateWindow()
                                 
-                                # Continue waiting for the next action (Resume or Stop)
-                                while break_dialog.result_action is None:
-                                    QApplication.processEvents()
-                                    time.sleep(0.1)
+                                    # Continue waiting for the next action (Resume or Stop)
+                                    while break_dialog.result_action is None:
+                                        QApplication.processEvents()
+                                        time.sleep(0.1)
                                 
-                                action = break_dialog.result_action
+                                    action = break_dialog.result_action
                                 
-                                if action == BreakExecutionDialog.STOP:
-                                    self.stop_execution = True
-                                    break_dialog.close()
-                                    test_was_stopped = True
-                                    break
+                                    if action == BreakExecutionDialog.STOP:
+                                        self.stop_execution = True
+                                        break_dialog.close()
+                                        test_was_stopped = True
+                                        break
+                                    elif action == BreakExecutionDialog.RESUME:
+                                        break_dialog.close()
+                            
                                 elif action == BreakExecutionDialog.RESUME:
+                                    run_log.log('info', "User chose to resume execution")
                                     break_dialog.close()
-                            
-                            elif action == BreakExecutionDialog.RESUME:
-                                print("User chose to resume execution")
-                                break_dialog.close()
                         
-                    # ✅ NEW: Process utility steps for this main step
-                    # Find this section in both execution methods:
-                    if 'utility_steps' in step:
-                        utility_steps_list = step['utility_steps']
+                        # ✅ NEW: Process utility steps for this main step
+                        # Find this section in both execution methods:
+                        if 'utility_steps' in step:
+                            utility_steps_list = step['utility_steps']
                         
-                        # ✅ Determine starting point for utility steps
-                        if start_from_utility is not None and current_step_index == (start_step_data[0] - 1 if isinstance(start_step_data, tuple) else -1):
-                            # Start from specific utility step
-                            utility_start_index = start_from_utility - 1
-                            start_from_utility = None  # Reset so we don't skip utility steps in subsequent main steps
-                        else:
-                            # Start from first utility step
-                            utility_start_index = 0
+                            # ✅ Determine starting point for utility steps
+                            if start_from_utility is not None and current_step_index == (start_step_data[0] - 1 if isinstance(start_step_data, tuple) else -1):
+                                # Start from specific utility step
+                                utility_start_index = start_from_utility - 1
+                                start_from_utility = None  # Reset so we don't skip utility steps in subsequent main steps
+                            else:
+                                # Start from first utility step
+                                utility_start_index = 0
                         
-                        for sub_index in range(utility_start_index, len(utility_steps_list)):
-                            utility_step = utility_steps_list[sub_index]
-                            actual_sub_index = sub_index + 1  # Convert to 1-based for display
+                            for sub_index in range(utility_start_index, len(utility_steps_list)):
+                                utility_step = utility_steps_list[sub_index]
+                                actual_sub_index = sub_index + 1  # Convert to 1-based for display
                             
-                            if self.stop_execution:
-                                print(f"Execution stopped at utility step {step_index}.{actual_sub_index}")
-                                break
+                                if self.stop_execution:
+                                    run_log.log('warning', f"Execution stopped at utility step {step_index}.{actual_sub_index}", step=f"{step_index}.{actual_sub_index}")
+                                    break
                             
-                            QApplication.processEvents()
+                                QApplication.processEvents()
                             
-                            utility_type = utility_step.get("type")
-                            print(f"Executing utility step {step_index}.{actual_sub_index}: {utility_step.get('name', 'Unknown')}")
+                                utility_type = utility_step.get("type")
+                            
+                                utility_model = UtilityStep.from_dict(utility_step)  # ✅ NEW: Typed view
+                                run_log.log('info', f"Executing utility step {step_index}.{actual_sub_index}: {utility_step.get('name', 'Unknown')}", step=f"{step_index}.{actual_sub_index}")
                             
                    
                             
-                            if utility_type == "special_key":
-                                key_value = utility_step.get("key_value", "")
+                                if utility_type == "special_key":
+                                    key_value = utility_model.key_value
                                 
-                                key_mapping = {
-                                    "Enter Key": "[enter]",
-                                    "Clear Key": "[clear]",
-                                    "End Key": "[EraseEof]",
-                                    "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
-                                    "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
-                                    "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
-                                    "F13": "[pf13]", "F14": "[pf14]", "F15": "[pf15]", "F16": "[pf16]",
-                                    "F17": "[pf17]", "F18": "[pf18]", "F19": "[pf19]", "F20": "[pf20]",
-                                    "F21": "[pf21]", "F22": "[pf22]", "F23": "[pf23]", "F24": "[pf24]",
-                                }
+                                    key_mapping = {
+                                        "Enter Key": "[enter]",
+                                        "Clear Key": "[clear]",
+                                        "End Key": "[EraseEof]",
+                                        "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
+                                        "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
+                                        "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
+                                        "F13": "[pf13]", "F14": "[pf14]", "F15": "[pf15]", "F16": "[pf16]",
+                                        "F17": "[pf17]", "F18": "[pf18]", "F19": "[pf19]", "F20": "[pf20]",
+                                        "F21": "[pf21]", "F22": "[pf22]", "F23": "[pf23]", "F24": "[pf24]",
+                                    }
                                 
-                                if "+" in key_value:
-                                    pcomm_key = self.main_window.convert_combo_key_to_pcomm(key_value)
-                                else:
-                                    pcomm_key = key_mapping.get(key_value, key_value)
+                                    if "+" in key_value:
+                                        pcomm_key = self.main_window.convert_combo_key_to_pcomm(key_value)
+                                    else:
+                                        pcomm_key = key_mapping.get(key_value, key_value)
                                 
-                                # ✅ FIXED: Smart wait for utility special keys
-                                action_keys = ["Enter Key"] + [f"F{i}" for i in range(1, 25)]
+                                    # ✅ FIXED: Smart wait for utility special keys
+                                    action_keys = ["Enter Key"] + [f"F{i}" for i in range(1, 25)]
                                 
-                                if key_value in action_keys or "+" in key_value:
-                                    before_screen = wait_for_pcomm_ready_smart(autECLPS, f"Utility {key_value}")
-                                    autECLPS.SendKeys(pcomm_key)
-                                    print(f"Step {step_index}.{sub_index}: Sent utility special key '{key_value}'")
+                                    if key_value in action_keys or "+" in key_value:
+                                        before_screen = wait_for_pcomm_ready_smart(autECLPS, f"Utility {key_value}")
+                                        autECLPS.SendKeys(pcomm_key)
+                                        run_log.log('info', f"Step {step_index}.{sub_index}: Sent utility special key '{key_value}'", step=f"{step_index}.{sub_index}")
                                     
-                                    # ✅ FIXED: Pass action_description as a string
-                                    success, elapsed = complete_pcomm_wait(
-                                        autECLPS, 
-                                        before_screen, 
-                                        action_description=f"Utility Special Key: {key_value}",  # ✅ Fixed here
-                                        timeout=30
-                                    )
+                                        # ✅ FIXED: Pass action_description as a string
+                                        success, elapsed = complete_pcomm_wait(
+                                            autECLPS, 
+                                            before_screen, 
+                                            action_description=f"Utility Special Key: {key_value}",  # ✅ Fixed here
+                                            timeout=30
+                                        )
                                     
-                                    if not success:
-                                        print(f"⚠️ Utility {key_value} timeout at step {step_index}.{sub_index}")
-                                else:
-                                    autECLPS.SendKeys(pcomm_key)
-                                    time.sleep(0.5)
+                                        if not success:
+                                            run_log.log('warning', f"⚠️ Utility {key_value} timeout at step {step_index}.{sub_index}", step=f"{step_index}.{sub_index}")
+                                    else:
+                                        autECLPS.SendKeys(pcomm_key)
+                                        time.sleep(0.5)
                             
-                            elif utility_type == "wait":
-                                seconds = float(utility_step.get("seconds", 0))
-                                if seconds > 0:
-                                    print(f"Step {step_index}.{sub_index}: Utility wait for {seconds} second(s)...")
-                                    time.sleep(seconds)
-                                    print(f"Step {step_index}.{sub_index}: Utility wait completed")
+                                elif utility_type == "wait":
+                                    seconds = utility_model.seconds
+                                    if seconds > 0:
+                                        run_log.log('info', f"Step {step_index}.{sub_index}: Utility wait for {seconds} second(s)...", step=f"{step_index}.{sub_index}")
+                                        time.sleep(seconds)
+                                        run_log.log('info', f"Step {step_index}.{sub_index}: Utility wait completed", step=f"{step_index}.{sub_index}")
                             
-                            elif utility_type == "capture_screenshot":
-                                if not self.main_window.document_config.get('generate_documentation', True):
-                                    print(f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)")
-                                    continue
+                                elif utility_type == "capture_screenshot":
+                                    if not self.main_window.document_config.get('generate_documentation', True):
+                                        run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot skipped (documentation disabled)", step=f"{step_index}.{sub_index}")
+                                        continue
                                 
-                                print(f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...")
-                                screen_size = screen_rows * screen_cols
-                                full_screen_text = autECLPS.GetText(1, screen_size)
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Capturing utility screenshot for DOCX...", step=f"{step_index}.{sub_index}")
+                                    screen_size = screen_rows * screen_cols
+                                    full_screen_text, masking_version = self.read_screen_capture(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                                 
-                                # Get highlight information for utility screenshot
-                                highlight_info = {}
-                                reference_module = utility_step.get('reference_module')
+                                    # Get highlight information for utility screenshot
+                                    highlight_info = {}
+                                    reference_module = utility_step.get('reference_module')
                                 
-                                if reference_module and reference_module in self.main_window.modules:
-                                    module_data = self.main_window.modules[reference_module]
-                                    labels = module_data.get('labels', [])
-                                    
-                                    for field in utility_step.get('fields', []):
-                                        if field.get('highlight', False):
-                                            field_name = field.get('field_name')
-                                            for label in labels:
-                                                label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                                if label_name == field_name:
+                                    module_model = self.main_window.get_module_model(reference_module) if reference_module else None
+                                
+                                    if module_model is not None:
+                                        for field in utility_model.fields:
+                                            if field.highlight:
+                                                field_name = field.field_name
+                                                for label in module_model.labels_named(field_name):
                                                     highlight_info[field_name] = {
-                                                        'row': label.get('row', 1),
-                                                        'column': label.get('column', 1),
-                                                        'length': label.get('length', 10)
+                                                        'row': label.row,
+                                                        'column': label.column,
+                                                        'length': label.length if label.length is not None else 10
                                                     }
                                                     break
-                                
-                                from datetime import datetime
-                                docx_screenshots.append({
-                                    'step': f"{step_index}.{sub_index}",
-                                    'screen_text': full_screen_text,
-                                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                    'highlight_info': highlight_info
-                                })
-                                print(f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)")
                             
-                            elif utility_type == "capture_screen_text":
-                                print(f"Step {step_index}.{sub_index}: Capturing utility screen text...")
-                                screen_size = screen_rows * screen_cols
-                                full_screen_text = autECLPS.GetText(1, screen_size)
+                                    from datetime import datetime
+                                    docx_screenshots.append({
+                                        'step': f"{step_index}.{sub_index}",
+                                        'screen_text': full_screen_text,
+                                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                                        'highlight_info': highlight_info,
+                                        'masking': masking_version  # ✅ CHANGED: Patterns screen_text was masked with (None if unmasked)
+                                    })
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Utility screenshot captured for DOCX with {len(highlight_info)} highlighted field(s)", step=f"{step_index}.{sub_index}")
+                            
+                                elif utility_type == "capture_screen_text":
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Capturing utility screen text...", step=f"{step_index}.{sub_index}")
+                                    screen_size = screen_rows * screen_cols
+                                    full_screen_text = self.read_screen_snapshot(autECLPS, screen_size)  # ✅ CHANGED: Masked once at capture time
                                 
-                                captured_text_lines = []
-                                for row_num in range(screen_rows):
-                                    start_index_text = row_num * screen_cols
-                                    line_text = full_screen_text[start_index_text:start_index_text + screen_cols]
-                                    captured_text_lines.append(line_text)
+                                    captured_text_lines = []
+                                    for row_num in range(screen_rows):
+                                        start_index_text = row_num * screen_cols
+                                        line_text = full_screen_text[start_index_text:start_index_text + screen_cols]
+                                        captured_text_lines.append(line_text)
                                 
-                                from datetime import datetime
-                                header = f"--- Step {step_index}.{sub_index}: Utility Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
-                                full_capture_string = header + "\n" + "\n".join(captured_text_lines)
-                                text_captures.append(full_capture_string)
-                                print(f"Step {step_index}.{sub_index}: Utility screen text captured successfully")
+                                    from datetime import datetime
+                                    header = f"--- Step {step_index}.{sub_index}: Utility Text Capture at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---"
+                                    full_capture_string = header + "\n" + "\n".join(captured_text_lines)
+                                    text_captures.append(full_capture_string)
+                                    run_log.log('info', f"Step {step_index}.{sub_index}: Utility screen text captured successfully", step=f"{step_index}.{sub_index}")
                             
-                            elif utility_type == "random_input":
-                                row = int(utility_step.get('row', 1))
-                                col = int(utility_step.get('column', 1))
-                                value = str(utility_step.get('value', '')).strip()
-                                is_special_key = utility_step.get('is_special_key', False)
+                                elif utility_type == "random_input":
+                                    row = utility_model.row
+                                    col = utility_model.column
+                                    value = utility_model.value
+                                    is_special_key = utility_model.is_special_key
                                 
-                                if value:
-                                    autECLPS.SetCursorPos(row, col)
+                                    if value:
+                                        autECLPS.SetCursorPos(row, col)
                                     
-                                    if is_special_key:
-                                        key_mapping = {
-                                            "Enter Key": "[enter]", "Clear Key": "[clear]", "End Key": "[EraseEof]",
-                                            "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
-                                            "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
-                                            "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
-                                        }
-                                        pcomm_key = key_mapping.get(value, value)
-                                        autECLPS.SendKeys(pcomm_key)
-                                        print(f"Step {step_index}.{sub_index}: Sent special key '{value}' to position ({row}, {col})")
-                                        time.sleep(1.0)
-                                    else:
-                                        substituted_value = self.substitute_execution_variables(value, test_case_name)
-                                        try:
-                                            autECLPS.SendKeys(substituted_value)
-                                        except Exception as send_error:
-                                            error_msg = (
-                                                f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
-                                                f"Value: {substituted_value}\n"
-                                                f"Position: Row {row}, Column {col}\n\n"
-                                                f"Error: {str(send_error)}\n\n"
-                                                f"This usually means:\n"
-                                                f"1. Field is protected/read-only\n"
-                                                f"2. Screen is locked or in error state\n"
-                                                f"3. Invalid cursor position"
-                                            )
-                                            QMessageBox.critical(self, "Send Keys Error", error_msg)
-                                            validation_failures.append({
-                                                "step": step_index,
-                                                "field": "Random Input",
-                                                "expected": f"Send: {substituted_value}",
-                                                "actual": f"Error: {str(send_error)}"
-                                            })
-                                            break
-                                        print(f"Step {step_index}.{sub_index}: Sent '{substituted_value}' to position ({row}, {col})")                            
+                                        if is_special_key:
+                                            key_mapping = {
+                                                "Enter Key": "[enter]", "Clear Key": "[clear]", "End Key": "[EraseEof]",
+                                                "F1": "[pf1]", "F2": "[pf2]", "F3": "[pf3]", "F4": "[pf4]",
+                                                "F5": "[pf5]", "F6": "[pf6]", "F7": "[pf7]", "F8": "[pf8]",
+                                                "F9": "[pf9]", "F10": "[pf10]", "F11": "[pf11]", "F12": "[pf12]",
+                                            }
+                                            pcomm_key = key_mapping.get(value, value)
+                                            autECLPS.SendKeys(pcomm_key)
+                                            run_log.log('info', f"Step {step_index}.{sub_index}: Sent special key '{value}' to position ({row}, {col})", step=f"{step_index}.{sub_index}")
+                                            time.sleep(1.0)
+                                        else:
+                                            substituted_value = self.substitute_execution_variables(value, test_case_name)
+                                            try:
+                                                autECLPS.SendKeys(substituted_value)
+                                            except Exception as send_error:
+                                                error_msg = (
+                                                    f"Error sending data at {self.get_step_description(step_index, step)}\n\n"
+                                                    f"Value: {substituted_value}\n"
+                                                    f"Position: Row {row}, Column {col}\n\n"
+                                                    f"Error: {str(send_error)}\n\n"
+                                                    f"This usually means:\n"
+                                                    f"1. Field is protected/read-only\n"
+                                                    f"2. Screen is locked or in error state\n"
+                                                    f"3. Invalid cursor position"
+                                                )
+                                                QMessageBox.critical(self, "Send Keys Error", error_msg)
+                                                validation_failures.append({
+                                                    "step": step_index,
+                                                    "field": "Random Input",
+                                                    "expected": f"Send: {substituted_value}",
+                                                    "actual": f"Error: {str(send_error)}"
+                                                })
+                                                break
+                                            run_log.log('info', f"Step {step_index}.{sub_index}: Sent '{substituted_value}' to position ({row}, {col})", step=f"{step_index}.{sub_index}")                            
                             
-                            elif utility_type == "module_import":
-                                # âœ… FIXED: Handle module import utility step (for both Input and Validation)
-                                module_name = utility_step.get('module_name')
+                                elif utility_type == "module_import":
+                                    # âœ… FIXED: Handle module import utility step (for both Input and Validation)
+                                    module_name = utility_step.get('module_name')
                                 
-                                if module_name in self.main_window.modules:
-                                    module_data = self.main_window.modules[module_name]
-                                    labels = module_data.get("labels", [])
-                                    
-                                    # âœ… FIXED: Process Input fields FIRST
-                                    for field in utility_step.get('fields', []):
-                                        if self.stop_execution:
-                                            test_was_stopped = True
-                                            break
+                                    module_model = self.main_window.get_module_model(module_name)
+                                
+                                    if module_model is not None:
+                                        # âœ… FIXED: Process Input fields FIRST
+                                        for field in utility_model.fields:
+                                            if self.stop_execution:
+                                                test_was_stopped = True
+                                                break
                                         
-                                        action_type = field.get('action_type', 'Input')
-                                        value = str(field.get('value', '')).strip()
+                                            action_type = field.action_type
+                                            value = field.value
                                         
-                                        if action_type == 'Input' and value:
-                                            field_name = field.get('field_name')
+                                            if action_type == 'Input' and value:
+                                                field_name = field.field_name
                                             
-                                            # Find the label for this field
-                                            for label in labels:
-                                                label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                                if label_name == field_name:
-                                                    row = int(label.get('row', 1))
-                                                    col = int(label.get('column', 1))
-                                                    
+                                                # Find the label for this field
+                                                for label in module_model.labels_named(field_name):
+                                                    row = label.row
+                                                    col = label.column
+                                                
                                                     # Substitute variables before sending
                                                     substituted_value = self.substitute_execution_variables(value, test_case_name)
-                                                    
+                                                
                                                     autECLPS.SetCursorPos(row, col)
                                                     try:
                                                         autECLPS.SendKeys(substituted_value)
@@ -5165,33 +5710,31 @@ class TestExecutionDialog(QDialog):
                                                             "actual": f"Error: {str(send_error)}"
                                                         })
                                                         break
-                                                    print(f"Step {step_index}.{sub_index}: Sent utility input '{substituted_value}' to {field_name}")
+                                                    run_log.log('info', f"Step {step_index}.{sub_index}: Sent utility input '{substituted_value}' to {field_name}", step=f"{step_index}.{sub_index}")
                                                     time.sleep(0.1)
                                                     break
-                                    
-                                    # ✅ FIXED: Process Validation fields AFTER inputs
-                                    for field in utility_step.get('fields', []):
-                                        if self.stop_execution:
-                                            test_was_stopped = True
-                                            break
+                                
+                                        # ✅ FIXED: Process Validation fields AFTER inputs
+                                        for field in utility_model.fields:
+                                            if self.stop_execution:
+                                                test_was_stopped = True
+                                                break
                                         
-                                        action_type = field.get('action_type', 'Validate')
-                                        value = str(field.get('value', '')).strip()
+                                            action_type = field.action_type
+                                            value = field.value
                                         
-                                        if action_type == 'Validate' and value:
-                                            field_name = field.get('field_name')
+                                            if action_type == 'Validate' and value:
+                                                field_name = field.field_name
                                             
-                                            # Find the label for this field
-                                            for label in labels:
-                                                label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                                if label_name == field_name:
-                                                    row = int(label.get('row', 1))
-                                                    col = int(label.get('column', 1))
-                                                    
+                                                # Find the label for this field
+                                                for label in module_model.labels_named(field_name):
+                                                    row = label.row
+                                                    col = label.column
+                                                
                                                     # ✅ ADD: Substitute variables in expected value FIRST
                                                     expected_value = self.substitute_execution_variables(value, test_case_name)
-                                                    length = int(label.get('length', len(expected_value)))  # ✅ Use substituted length
-                                                    
+                                                    length = label.length if label.length is not None else len(expected_value)  # ✅ Use substituted length
+                                                
                                                     # Read actual value from screen
                                                     try:
                                                         actual_value = autECLPS.GetText(row, col, length)
@@ -5214,11 +5757,13 @@ class TestExecutionDialog(QDialog):
                                                             "actual": f"Error: {str(get_text_error)}"
                                                         })
                                                         break
-                                                    
+                                                
                                                     # ✅ Use substituted expected_value
                                                     validation_passed = self.validate_field_value(actual_value, expected_value)
-                                                    
+                                                
                                                     if not validation_passed:
+                                                        # ✅ NEW: Failure details are persisted, so only keep the masked value
+                                                        actual_value = self.main_window.apply_masking_to_text(actual_value)
                                                         # ✅ ENHANCED: Better error message for {blank} validation
                                                         self.play_sound_signal('error')
                                                         if expected_value.lower() == '{blank}':  # ✅ CHANGED from value
@@ -5236,192 +5781,196 @@ class TestExecutionDialog(QDialog):
                                                                 "actual": actual_value.strip()
                                                             })
                                                         # ✅ Stop execution immediately on validation failure
-                                                        print(f"❌ Utility validation failed at Step {step_index}.{sub_index} - Field '{field_name}': Expected '{expected_value}', Got '{actual_value}'")  # ✅ CHANGED from value
+                                                        run_log.log('error', self.main_window.apply_masking_to_text(f"❌ Utility validation failed at Step {step_index}.{sub_index} - Field '{field_name}': Expected '{expected_value}', Got '{actual_value}'"), step=f"{step_index}.{sub_index}")  # ✅ CHANGED: Masked, the run log is shown and echoed
                                                         break
-                                                    
-                                                    print(f"Step {step_index}.{sub_index}: Validated {field_name} - Expected: '{expected_value}', Actual: '{actual_value}'")  # ✅ CHANGED from value
+                                                
+                                                    run_log.log('info', self.main_window.apply_masking_to_text(f"Step {step_index}.{sub_index}: Validated {field_name} - Expected: '{expected_value}', Actual: '{actual_value}'"), step=f"{step_index}.{sub_index}")  # ✅ CHANGED: Masked, the run log is shown and echoed
                                                     time.sleep(0.1)
                                                     break
-                                            
-                                            # âœ… Check if validation failed and stop utility steps
+                                        
+                                                # âœ… Check if validation failed and stop utility steps
+                                                if validation_failures:
+                                                    run_log.log('warning', f"ðŸ›' Stopping utility steps due to validation failure at Step {step_index}.{sub_index}", step=f"{step_index}.{sub_index}")
+                                                    break
+                                        
+                                            # âœ… Check if validation failed and stop processing this step's utilities
                                             if validation_failures:
-                                                print(f"ðŸ›' Stopping utility steps due to validation failure at Step {step_index}.{sub_index}")
                                                 break
-                                        
-                                        # âœ… Check if validation failed and stop processing this step's utilities
-                                        if validation_failures:
-                                            break
-                                else:
-                                    print(f"Warning: Module '{module_name}' not found for utility step")
+                                    else:
+                                        run_log.log('warning', f"Warning: Module '{module_name}' not found for utility step")
                           
                             
-                            time.sleep(0.1)
+                                time.sleep(0.1)
 
-                    # âœ… NEW: Check if validation failed in utility steps and stop main loop
-                    if validation_failures:
-                        print(f"ðŸ›' Stopping test execution due to utility validation failure")
-                        break  # Break out of main steps while loop
+                        # âœ… NEW: Check if validation failed in utility steps and stop main loop
+                        if validation_failures:
+                            run_log.log('warning', f"ðŸ›' Stopping test execution due to utility validation failure")
+                            break  # Break out of main steps while loop
                     
-                    time.sleep(0.1)                
-                    current_step_index += 1
+                        time.sleep(0.1)                
+                        current_step_index += 1
 
 
                 
-                # Handle if test was stopped during execution
-                # Handle if test was stopped during execution
-                if test_was_stopped:
-                    self.update_status(test_case_name, "Stopped")
-                    stopped_count += 1
-                    results_summary.append(f"⏸️ {test_case_name}: Stopped by user")
+                    # Handle if test was stopped during execution
+                    # Handle if test was stopped during execution
+                    if test_was_stopped:
+                        self.update_status(test_case_name, "Stopped")
+                        stopped_count += 1
+                        results_summary.append(f"⏸️ {test_case_name}: Stopped by user")
                     
-                    execution_results.append({
-                        'name': test_case_name,
-                        'status': 'Stopped',
-                        'project': test_project,
-                        'error': 'Execution stopped by user during test'
-                    })
-                    print(f"⏸️ Test '{test_case_name}' STOPPED")
+                        execution_results.append({
+                            'name': test_case_name,
+                            'status': 'Stopped',
+                            'project': test_project,
+                            'error': 'Execution stopped by user during test'
+                        })
+                        run_log.log('warning', f"⏸️ Test '{test_case_name}' STOPPED")
                     
-                    # ✅ ADD: Uncheck the test case
-                    self.uncheck_test_case(test_case_name)
+                        # ✅ ADD: Uncheck the test case
+                        self.uncheck_test_case(test_case_name)
                     
-                    continue  # Skip to next test case
+                        continue  # Skip to next test case
 
-                # Everything below only runs if test was NOT stopped
+                    # Everything below only runs if test was NOT stopped
                 
-                # Save captured text to file if any captures were made
-                if text_captures:
-                    import os
-                    project_name = getattr(self.main_window, 'current_project_id', None)
-                    if project_name and project_name in self.main_window.projects:
-                        project_name = self.main_window.projects[project_name]['name']
+                    # Save captured text to file if any captures were made
+                    if text_captures:
+                        import os
+                        project_name = getattr(self.main_window, 'current_project_id', None)
+                        if project_name and project_name in self.main_window.projects:
+                            project_name = self.main_window.projects[project_name]['name']
                     
-                    output_dir = os.path.join(self.main_window.default_results_location, 'Results', project_name if project_name else 'Master')
-                    os.makedirs(output_dir, exist_ok=True)
+                        output_dir = os.path.join(self.main_window.default_results_location, 'Results', project_name if project_name else 'Master')
+                        os.makedirs(output_dir, exist_ok=True)
                     
-                    filename = os.path.join(output_dir, f"{test_case_name}.txt")
+                        filename = os.path.join(output_dir, f"{test_case_name}.txt")
                     
-                    with open(filename, "w", encoding="utf-8") as f:
-                        f.write("\n\n\n".join(text_captures))
+                        with open(filename, "w", encoding="utf-8") as f:
+                            f.write("\n\n\n".join(text_captures))
                     
-                    print(f"All screen text for '{test_case_name}' saved to '{filename}'.")
+                        run_log.log('info', f"All screen text for '{test_case_name}' saved to '{filename}'.")
                 
-                # Create single DOCX with all screenshots
-                docx_path = None
-                if docx_screenshots:
-                    try:
-                        docx_path = self.main_window.create_test_case_docx(test_case_name, docx_screenshots)
-                        print(f"DOCX document created: '{docx_path}' with {len(docx_screenshots)} screenshot(s)")
-                    except Exception as e:
-                        print(f"Error creating DOCX: {e}")
-                        validation_failures.append({
-                            "step": "DOCX Generation",
-                            "field": "Document Creation",
-                            "expected": "Success",
-                            "actual": f"Error: {str(e)}"
-                        })
+                    # Create single DOCX with all screenshots
+                    docx_path = None
+                    if docx_screenshots:
+                        try:
+                            docx_path = self.main_window.create_test_case_docx(test_case_name, docx_screenshots)
+                            run_log.log('info', f"DOCX document created: '{docx_path}' with {len(docx_screenshots)} screenshot(s)")
+                        except Exception as e:
+                            run_log.log('error', f"Error creating DOCX: {e}")
+                            validation_failures.append({
+                                "step": "DOCX Generation",
+                                "field": "Document Creation",
+                                "expected": "Success",
+                                "actual": f"Error: {str(e)}"
+                            })
 
-                # Check results
-                if validation_failures:
-                    self.play_sound_signal('error')
-                    self.update_status(test_case_name, "Failed")
-                    failed_count += 1
+                    # ✅ NEW: Record captures so the documents can be re-rendered offline
+                    self.save_run_captures(execution_timestamp, test_case_name, test_project, docx_screenshots, docx_path)
+
+                    # Check results
+                    if validation_failures:
+                        self.play_sound_signal('error')
+                        self.update_status(test_case_name, "Failed")
+                        failed_count += 1
                     
-                    failure_summary = f"❌ {test_case_name}: {len(validation_failures)} validation(s) failed"
-                    results_summary.append(failure_summary)
+                        failure_summary = f"❌ {test_case_name}: {len(validation_failures)} validation(s) failed"
+                        results_summary.append(failure_summary)
                    
-                    execution_results.append({
-                        'name': test_case_name,
-                        'status': 'Failed',
-                        'project': test_project,
-                        'validation_failures': validation_failures
-                    })
+                        execution_results.append({
+                            'name': test_case_name,
+                            'status': 'Failed',
+                            'project': test_project,
+                            'validation_failures': validation_failures
+                        })
                     
-                    print(f"\n⚠️ Test '{test_case_name}' FAILED with {len(validation_failures)} validation error(s)")
-                    for failure in validation_failures:
-                        print(f"  Step {failure['step']} - {failure['field']}: Expected '{failure['expected']}', Got '{failure['actual']}'")
-                    self.uncheck_test_case(test_case_name)
+                        run_log.log('error', f"⚠️ Test '{test_case_name}' FAILED with {len(validation_failures)} validation error(s)")
+                        for failure in validation_failures:
+                            run_log.log('error', f"  Step {failure['step']} - {failure['field']}: Expected '{failure['expected']}', Got '{failure['actual']}'")
+                        self.uncheck_test_case(test_case_name)
                 
-                else:
-                    # âœ… Calculate execution time
-                    test_end_time = datetime.now()
-                    test_end_time_str = test_end_time.strftime('%Y-%m-%d %H:%M:%S')
-                    test_duration = test_end_time - test_start_time
-                    test_duration_str = str(test_duration).split('.')[0]
+                    else:
+                        # âœ… Calculate execution time
+                        test_end_time = datetime.now()
+                        test_end_time_str = test_end_time.strftime('%Y-%m-%d %H:%M:%S')
+                        test_duration = test_end_time - test_start_time
+                        test_duration_str = str(test_duration).split('.')[0]
                     
-                    # âœ… Store execution time
-                    self.execution_times[test_case_name] = {
-                        'start_time': test_start_time_str,
-                        'end_time': test_end_time_str,
-                        'duration': test_duration_str
-                    }
+                        # âœ… Store execution time
+                        self.execution_times[test_case_name] = {
+                            'start_time': test_start_time_str,
+                            'end_time': test_end_time_str,
+                            'duration': test_duration_str
+                        }
                     
-                    # âœ… Update UI
-                    # Update the UI
-                    for i in range(self.test_case_list.count()):
-                        item = self.test_case_list.item(i)
-                        item_data = item.data(Qt.ItemDataRole.UserRole)
-                        
-                        if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                            widget = self.test_case_list.itemWidget(item)
-                            time_label = widget.findChild(QLabel, "execution_time_label")
-                            if time_label:
-                                time_label.setText(f"{test_duration_str}")
-                            break
+                        # âœ… Update UI
+                        # Update the UI
+                        self.set_execution_time(test_case_name, test_duration_str)
 
-                    self.update_status(test_case_name, "Passed")
-                    passed_count += 1
+                        self.update_status(test_case_name, "Passed")
+                        passed_count += 1
 
-                    result_text = f"✅ {test_case_name}: Passed"
+                        result_text = f"✅ {test_case_name}: Passed"
 
-                    # Add info about captured files
-                    file_info = []
-                    if text_captures:
-                        file_info.append(f"{len(text_captures)} text screenshot(s)")
-                    if docx_path:
-                        file_info.append(f"DOCX: {len(docx_screenshots)} screenshots")
-                    elif not self.main_window.document_config.get('generate_documentation', True):
-                        file_info.append("Documentation disabled")
+                        # Add info about captured files
+                        file_info = []
+                        if text_captures:
+                            file_info.append(f"{len(text_captures)} text screenshot(s)")
+                        if docx_path:
+                            file_info.append(f"DOCX: {len(docx_screenshots)} screenshots")
+                        elif not self.main_window.document_config.get('generate_documentation', True):
+                            file_info.append("Documentation disabled")
+
+                        if file_info:
+                            result_text += f" ({', '.join(file_info)})"
+
+                        results_summary.append(result_text)
+                    
 
-                    if file_info:
-                        result_text += f" ({', '.join(file_info)})"
 
-                    results_summary.append(result_text)
+                        execution_results.append({
+                            'name': test_case_name,
+                            'status': 'Passed',
+                            'project': test_project,
+                            'start_time': test_start_time_str,
+                            'end_time': test_end_time_str,
+                            'duration': test_duration_str
+                        })
                     
+                        run_log.log('info', f"✅ Test '{test_case_name}' PASSED")
+                        self.uncheck_test_case(test_case_name)
+                except Exception as e:
+                    self.update_status(test_case_name, "Failed")
+                    failed_count += 1
+                    results_summary.append(f"❌ {test_case_name}: Error - {str(e)}")
 
 
                     execution_results.append({
                         'name': test_case_name,
-                        'status': 'Passed',
+                        'status': 'Failed',
                         'project': test_project,
-                        'start_time': test_start_time_str,
-                        'end_time': test_end_time_str,
-                        'duration': test_duration_str
+                        'error': str(e)
                     })
-                    
-                    print(f"✅ Test '{test_case_name}' PASSED")
+                
+                    run_log.log('error', f"❌ Test '{test_case_name}' FAILED with error: {str(e)}")
                     self.uncheck_test_case(test_case_name)
-            except Exception as e:
-                self.update_status(test_case_name, "Failed")
-                failed_count += 1
-                results_summary.append(f"❌ {test_case_name}: Error - {str(e)}")
-
-
-                execution_results.append({
-                    'name': test_case_name,
-                    'status': 'Failed',
-                    'project': test_project,
-                    'error': str(e)
-                })
+                finally:
+                    # ✅ NEW: Add the finished test's evidence section to the consolidated report
+                    if report_writer and execution_results and execution_results[-1]['name'] == test_case_name:
+                        try:
+                            report_writer.add_test(execution_results[-1], docx_screenshots)
+                        except Exception as e:
+                            run_log.log('error', f"Error adding '{test_case_name}' to consolidated report: {e}")
                 
-                print(f"❌ Test '{test_case_name}' FAILED with error: {str(e)}")
-                self.uncheck_test_case(test_case_name)
-            finally:
-                # Clean up COM after EACH test case
-                try:
-                    pythoncom.CoUninitialize()
-                except:
-                    pass
+                    # Clean up COM after EACH test case
+                    try:
+                        pythoncom.CoUninitialize()
+                    except:
+                        pass
+        finally:
+            run_log.end_test()  # ✅ NEW: Closes a test left open by an unexpected exit from the loop
+            run_stream.uninstall()
         
         # Restore button to original state after ALL tests complete or stopped
         try:
@@ -5434,14 +5983,8 @@ class TestExecutionDialog(QDialog):
         self.execute_button.setEnabled(True)
 
         # Show final summary
-        print(f"\n{'='*60}")
-        print(f"EXECUTION SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total Tests: {len(selected_tests)}")
-        print(f"Passed: {passed_count}")
-        print(f"Failed: {failed_count}")
-        print(f"Stopped: {stopped_count}")
-        print(f"{'='*60}\n")
+        run_log.log('info', f"Execution summary: {len(selected_tests)} test(s), {passed_count} passed, "
+                            f"{failed_count} failed, {stopped_count} stopped")
 
         summary_message = f"Execution Complete!\n\n"
         summary_message += f"Total: {len(selected_tests)} | Passed: {passed_count} | Failed: {failed_count} | Stopped: {stopped_count}\n\n"
@@ -5451,7 +5994,16 @@ class TestExecutionDialog(QDialog):
         docx_summary_path = self.create_execution_summary_docx(execution_results, execution_timestamp)
         if docx_summary_path:
             summary_message += f"\n\nExecution summary saved to:\n{docx_summary_path}"
-            print(f"Execution summary saved to: {docx_summary_path}")
+            run_log.log('info', f"Execution summary saved to: {docx_summary_path}")
+
+        # ✅ NEW: Finish the consolidated report
+        if report_writer:
+            try:
+                report_path = report_writer.close(execution_results)
+                summary_message += f"\n\nConsolidated report saved to:\n{report_path}"
+                run_log.log('info', f"Consolidated report saved to: {report_path}")
+            except Exception as e:
+                run_log.log('error', f"Error creating consolidated report: {e}")
 
         if stopped_count > 0:
             QMessageBox.warning(self, "Execution Stopped", summary_message)
@@ -5462,18 +6014,9 @@ class TestExecutionDialog(QDialog):
          
     def uncheck_test_case(self, test_case_name):
         """Unchecks a test case checkbox after execution completes."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                widget = self.test_case_list.itemWidget(item)
-                checkbox = widget.findChild(QCheckBox)
-                if checkbox:
-                    checkbox.blockSignals(True)  # Block signals to prevent triggering update
-                    checkbox.setChecked(False)
-                    checkbox.blockSignals(False)
-                break
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            self.test_case_model.update_row(row, checked=False)
         
         # Update the "Select All" checkbox state
         self.update_select_all_state()
@@ -5484,6 +6027,15 @@ class TestExecutionDialog(QDialog):
         self.execute_button.setEnabled(False)  # Disable button after stop is requested
         print("⏸️ Stop requested by user...")
 
+    # --- NEW: Run Console ---
+    def show_run_console(self):
+        """Shows the run console over this (modal) dialog, created on first use."""
+        if getattr(self, 'run_console', None) is None:
+            self.run_console = RunConsoleDialog(self)
+        self.run_console.show()
+        self.run_console.raise_()
+        self.run_console.activateWindow()
+
     def create_execution_summary_docx(self, execution_results, timestamp):
         """
         Creates a DOCX file with test execution summary.
@@ -5492,137 +6044,96 @@ class TestExecutionDialog(QDialog):
             execution_results: List of dicts with test case results
             timestamp: Timestamp string for the filename
         """
+        # ✅ NEW: Keep the results with the run data so the summary can be re-rendered
+        self.save_run_manifest(execution_results, timestamp)
+        return self.main_window.create_execution_summary_docx(execution_results, timestamp)
+
+    def read_screen_snapshot(self, autECLPS, screen_size):
+        """
+        Reads the host screen and masks it once at capture time.
+        
+        Every consumer (text captures, DOCX screenshots, run data) shares the
+        returned buffer, so unmasked host data is never persisted.
+        
+        Args:
+            autECLPS: The PCOMM presentation space object
+            screen_size: Number of characters to read from row 1
+        
+        Returns:
+            str: The masked screen text
+        """
+        return self.read_screen_capture(autECLPS, screen_size)[0]
+
+    def read_screen_capture(self, autECLPS, screen_size):
+        """
+        Reads and masks the host screen like read_screen_snapshot(), for a
+        DOCX screenshot record that must say which patterns it was masked with.
+        
+        Returns:
+            tuple: (masked screen text, masking version or None if unmasked)
+        """
+        screen_text = autECLPS.GetText(1, screen_size)
+        return self.main_window.mask_screen_text(screen_text)
+
+    def get_run_data_dir(self, execution_timestamp):
+        """Returns the folder holding the recorded data of one execution run."""
+        return os.path.join(self.main_window.default_results_location, 'Run Data', execution_timestamp)
+
+    def save_run_captures(self, execution_timestamp, test_case_name, test_project, docx_screenshots, docx_path=None):
+        """
+        Records the screenshots captured for a test case so that its evidence
+        document can be rebuilt later without running the test again.
+        """
+        if not docx_screenshots:
+            return
+        
         try:
-            from docx import Document
-            from docx.shared import Pt, Inches, RGBColor
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            from docx.oxml.shared import OxmlElement
-            from docx.oxml.ns import qn
-            
-            # Create a new document
-            doc = Document()
-            
-            # Set document margins
-            sections = doc.sections
-            for section in sections:
-                section.top_margin = Inches(1)
-                section.bottom_margin = Inches(1)
-                section.left_margin = Inches(1)
-                section.right_margin = Inches(1)
-            
-            # Add title
-            title = doc.add_paragraph()
-            title_run = title.add_run("Test Execution Summary")
-            title_run.font.size = Pt(18)
-            title_run.font.bold = True
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title.paragraph_format.space_after = Pt(12)
-            
-            # Add timestamp
-            time_para = doc.add_paragraph()
-            time_run = time_para.add_run(f"Execution Time: {timestamp}")
-            time_run.font.size = Pt(12)
-            time_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            time_para.paragraph_format.space_after = Pt(20)
-            
-            # Calculate summary statistics
-            total_tests = len(execution_results)
-            passed_tests = sum(1 for r in execution_results if r['status'] == 'Passed')
-            failed_tests = sum(1 for r in execution_results if r['status'] == 'Failed')
-            
-            # Add summary statistics
-            summary_para = doc.add_paragraph()
-            summary_para.add_run("Summary:\n").font.bold = True
-            summary_para.add_run(f"Total Test Cases: {total_tests}\n")
-            
-            passed_run = summary_para.add_run(f"Passed: {passed_tests}\n")
-            passed_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-            passed_run.font.bold = True
-            
-            failed_run = summary_para.add_run(f"Failed: {failed_tests}\n")
-            failed_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-            failed_run.font.bold = True
-            
-            summary_para.paragraph_format.space_after = Pt(20)
-            
-            # Add detailed results
-            details_heading = doc.add_paragraph()
-            details_heading.add_run("Detailed Results:").font.bold = True
-            details_heading.paragraph_format.space_after = Pt(10)
-            
-            # Add each test case result
-            for idx, result in enumerate(execution_results, 1):
-                # Test case name and status
-                result_para = doc.add_paragraph()
-                
-                # âœ… Add project information if available
-                project_info = ""
-                if result.get('project'):
-                    project_info = f"[Project: {result['project']}] "
-                
-                result_para.add_run(f"{idx}. {project_info}{result['name']}: ").font.bold = True
-                
-                status_run = result_para.add_run(result['status'])
-                status_run.font.bold = True
-                if result['status'] == 'Passed':
-                    status_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
-                else:
-                    status_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
-                
-                # âœ… NEW: Add execution time details
-                if 'start_time' in result and 'end_time' in result and 'duration' in result:
-                    time_para = doc.add_paragraph()
-                    time_para.paragraph_format.left_indent = Inches(0.5)
-                    time_run = time_para.add_run(
-                        f"Start Time: {result['start_time']}  |  "
-                        f"End Time: {result['end_time']}  |  "
-                        f"Duration: {result['duration']}"
-                    )
-                    time_run.font.size = Pt(9)
-                    time_run.font.italic = True
-                    time_run.font.color.rgb = RGBColor(75, 85, 99)  # Gray
-                
-                # Add error details if failed
-                if result['status'] == 'Failed' and 'error' in result:
-                    error_para = doc.add_paragraph()
-                    error_para.paragraph_format.left_indent = Inches(0.5)
-                    error_run = error_para.add_run(f"Error: {result['error']}")
-                    error_run.font.size = Pt(10)
-                    error_run.font.color.rgb = RGBColor(139, 0, 0)  # Dark red
-                
-                # Add validation failures if any
-                if 'validation_failures' in result and result['validation_failures']:
-                    failures_para = doc.add_paragraph()
-                    failures_para.paragraph_format.left_indent = Inches(0.5)
-                    failures_para.add_run("Validation Failures:\n").font.bold = True
-                    
-                    for failure in result['validation_failures']:
-                        failure_detail = doc.add_paragraph()
-                        failure_detail.paragraph_format.left_indent = Inches(0.75)
-                        failure_detail.add_run(
-                            f"Step {failure['step']} - {failure['field']}:\n"
-                            f"  Expected: '{failure['expected']}'\n"
-                            f"  Actual: '{failure['actual']}'\n"
-                        ).font.size = Pt(9)
-                
-                # Add spacing between test cases
-                result_para.paragraph_format.space_after = Pt(12)
-            
-            # Create output directory
-            output_dir = os.path.join(self.main_window.default_results_location, 'Test Execution Summary')
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Create filename with timestamp
-            filename = os.path.join(output_dir, f"Test Execution - {timestamp}.docx")
-            
-            # Save the document
-            doc.save(filename)
-            
-            return filename
+            run_dir = self.get_run_data_dir(execution_timestamp)
+            os.makedirs(run_dir, exist_ok=True)
             
+            record = {
+                'name': test_case_name,
+                'project': test_project,
+                'docx_path': docx_path,
+                'screenshots': docx_screenshots
+            }
+            # ✅ CHANGED: A safe, unique file name instead of the raw test case name
+            self.write_run_file(run_dir, run_file_name(test_case_name, test_project), record)
         except Exception as e:
-            print(f"Error creating execution summary DOCX: {e}")
-            return None
+            print(f"Error saving run captures for '{test_case_name}': {e}")
+
+
+    def save_run_manifest(self, execution_results, execution_timestamp):
+        """Records the execution results of a run next to its captures."""
+        try:
+            run_dir = self.get_run_data_dir(execution_timestamp)
+            os.makedirs(run_dir, exist_ok=True)
+            
+            # ✅ NEW: Which file holds the captures of which test case
+            files = {}
+            for result in execution_results:
+                base_name = run_file_name(result['name'], result.get('project'))
+                for file_name in (f"{base_name}.json", f"{base_name}.json.gz"):
+                    if os.path.exists(os.path.join(run_dir, file_name)):
+                        files[file_name] = {'name': result['name'], 'project': result.get('project')}
+            
+            manifest = {
+                'timestamp': execution_timestamp,
+                'results': execution_results,
+                'files': files
+            }
+            self.write_run_file(run_dir, 'run', manifest)
+        except Exception as e:
+            print(f"Error saving run manifest: {e}")
+
+    def write_run_file(self, run_dir, name, data):
+        """
+        Writes one run data file: compact JSON, gzip-compressed ('.json.gz')
+        when enabled in the document layout settings.
+        """
+        compress = self.main_window.document_config.get('compress_run_records', False)
+        file_name = f"{name}.json.gz" if compress else f"{name}.json"
+        json_codec.write_file(os.path.join(run_dir, file_name), data, compress=compress)
         
     def check_prerequisites(self, test_case_name):
         """Checks if prerequisites are met."""
@@ -5638,16 +6149,9 @@ class TestExecutionDialog(QDialog):
         
         for prereq_name in prerequisites:
             prereq_status = None
-            for i in range(self.test_case_list.count()):
-                item = self.test_case_list.item(i)
-                item_data = item.data(Qt.ItemDataRole.UserRole)
-                
-                if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == prereq_name:
-                    widget = self.test_case_list.itemWidget(item)
-                    status_label = widget.findChild(QLabel, "status_label")
-                    if status_label:
-                        prereq_status = status_label.text()
-                    break
+            row = self.test_case_model.row_of(prereq_name)
+            if row >= 0:
+                prereq_status = self.test_case_model.entry(row).status
             
             if prereq_status is None:
                 return False, f"Prerequisite '{prereq_name}' is not in the execution list"
@@ -5662,7 +6166,13 @@ class TestExecutionDialog(QDialog):
         return True, ""
         
     def save_execution_data(self):
-        """Saves execution data including projects."""
+        """Saves execution data including projects (coalesced, written in the background)."""
+        # ✅ CHANGED: Bursts of status changes become one atomic write; compact JSON.
+        # The data is collected once, when the write happens, not on every change.
+        self.main_window.persistence.request_save(self.execution_data_file, self.collect_execution_data, indent=None)
+
+    def collect_execution_data(self):
+        """Collects the projects, standalone test cases and their status from the list."""
         # ✅ FIXED: Save complete test case data with projects
         for project_name, project_data in self.projects.items():
             # Ensure test_cases dictionary exists
@@ -5675,64 +6185,117 @@ class TestExecutionDialog(QDialog):
             
             for test_name in list(project_data['test_cases'].keys()):
                 # Find and update status for this test case
-                for i in range(self.test_case_list.count()):
-                    item = self.test_case_list.item(i)
-                    item_data = item.data(Qt.ItemDataRole.UserRole)
-                    
-                    if (item_data and item_data.get('type') == 'test_case' and 
-                        item_data.get('name') == test_name and 
-                        item_data.get('project') == project_name):
-                        
-                        widget = self.test_case_list.itemWidget(item)
-                        status_label = widget.findChild(QLabel, "status_label")
-                        step_combo = widget.findChild(QComboBox, "step_combo")
-                        
-                        # Store status in a separate dict (not in test_case_data itself)
-                        project_data['status_data'][test_name] = {
-                            'status': status_label.text() if status_label else "Not Run",
-                            'selected_step': step_combo.currentIndex() if step_combo else 0
-                        }
-                        break
+                row = self.test_case_model.row_of(test_name, project_name, any_project=False)
+                if row >= 0:
+                    entry = self.test_case_model.entry(row)
+                    # Store status in a separate dict (not in test_case_data itself)
+                    project_data['status_data'][test_name] = {
+                        'status': entry.status,
+                        'selected_step': entry.selected_step
+                    }
+        
+        # ✅ CHANGED: Test cases matching the library are stored as references, diverged ones as snapshots
+        projects = {}
+        for project_name, project_data in self.projects.items():
+            saved_project = {key: value for key, value in project_data.items() if key != 'test_cases'}
+            saved_project['test_cases'] = {
+                test_name: self.library_reference(test_name, test_case_data) or test_case_data
+                for test_name, test_case_data in project_data['test_cases'].items()
+            }
+            projects[project_name] = saved_project
         
         execution_data = {
-            'projects': self.projects,
+            'format': 2,
+            'projects': projects,
             'standalone': {}
         }
         
         # Save standalone test cases with status
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and not item_data.get('project'):
-                widget = self.test_case_list.itemWidget(item)
-                status_label = widget.findChild(QLabel, "status_label")
-                step_combo = widget.findChild(QComboBox, "step_combo")
-                
-                test_name = item_data['name']
+        for _, row_entry in self.test_case_model.test_rows():
+            if not row_entry.project:
+                test_name = row_entry.name
                 
                 # ✅ CRITICAL FIX: Always get test case data from displayed_test_cases
                 if test_name in self.displayed_test_cases:
-                    execution_data['standalone'][test_name] = {
-                        'status': status_label.text() if status_label else "Not Run",
-                        'selected_step': step_combo.currentIndex() if step_combo else 0,
-                        'test_case_data': self.displayed_test_cases[test_name]
+                    test_case_data = self.displayed_test_cases[test_name]
+                    entry = {
+                        'status': row_entry.status,
+                        'selected_step': row_entry.selected_step
                     }
+                    reference = self.library_reference(test_name, test_case_data)
+                    if reference:
+                        entry.update(reference)
+                    else:
+                        entry['test_case_data'] = test_case_data
+                    execution_data['standalone'][test_name] = entry
         
-        try:
-            with open(self.execution_data_file, 'w') as f:
-                json.dump(execution_data, f, indent=4)
-        except Exception as e:
-            print(f"Error saving: {e}")
+        return execution_data
+
+    def library_reference(self, test_name, test_case_data):
+        """
+        Returns the reference stored for a test case that is identical to its
+        library record: {'$ref': name, 'hash': content hash}. Returns None when
+        the test case is not in the library or has diverged from it, in which
+        case the caller stores a full snapshot.
+        """
+        # ✅ CHANGED: Compares content hashes tracked when the data was listed or edited
+        # instead of loading the library record and comparing it field by field
+        tracked = self.library_copies.get(id(test_case_data))
+        if tracked is None or tracked[0] is not test_case_data:
+            return None
+        digest = self.main_window.library.record_digest('test_cases', test_name)
+        if digest is None or digest != tracked[1]:
+            return None  # Not in the library, or the library changed since
+        return {'$ref': test_name, 'hash': digest}
+
+    def track_library_copy(self, test_name, test_case_data, library_copy=False):
+        """
+        Records whether listed test case data equals its library record, so
+        saves can store a reference without loading the record. Called when
+        the data is listed and after it is edited in place.
+        
+        Args:
+            test_name: Library name of the test case
+            test_case_data: The listed data
+            library_copy: True if the data was just taken from the library (no
+                          hashing needed); otherwise its JSON is hashed once
+        """
+        self.library_copies.pop(id(test_case_data), None)
+        library = self.main_window.library
+        digest = library.record_digest('test_cases', test_name)
+        if digest is None:
+            return
+        if not library_copy and library.is_changed('test_cases', test_name, test_case_data):
+            return  # Diverged from the library: saved as a snapshot
+        self.library_copies[id(test_case_data)] = (test_case_data, digest)
+
+    def resolve_library_reference(self, test_name, entry):
+        """
+        Returns the test case data for a saved execution entry: a private copy
+        of the library record for a reference, or the entry itself for a
+        snapshot. Returns None if the referenced test case no longer exists.
+        """
+        if not isinstance(entry, dict) or '$ref' not in entry:
+            return entry
+        
+        library_test_case = self.main_window.test_cases.get(entry['$ref'])
+        if library_test_case is None:
+            print(f"Execution entry '{test_name}': test case '{entry['$ref']}' no longer exists in the library")
+            return None
+        if entry.get('hash') != self.main_window.library.record_digest('test_cases', entry['$ref']):
+            print(f"Execution entry '{test_name}': library test case changed since it was added, using the current version")
+        test_case_data = copy.deepcopy(library_test_case)
+        self.track_library_copy(entry['$ref'], test_case_data, library_copy=True)
+        return test_case_data
 
     def load_execution_data(self):
         """Loads execution data including projects."""
+        self.main_window.persistence.flush()  # ✅ NEW: Make sure pending saves are on disk
         if not os.path.exists(self.execution_data_file):
             return
         
         try:
-            with open(self.execution_data_file, 'r') as f:
-                execution_data = json.load(f)
+            execution_data = json_codec.read_file(self.execution_data_file)
             
             # Load projects
             self.projects = execution_data.get('projects', {})
@@ -5750,11 +6313,22 @@ class TestExecutionDialog(QDialog):
                 # ✅ CRITICAL FIX: Ensure test_cases is a dict with proper structure
                 if not isinstance(project_data['test_cases'], dict):
                     project_data['test_cases'] = {}
+                
+                # ✅ NEW: Resolve library references
+                resolved = {}
+                for test_name, entry in project_data['test_cases'].items():
+                    test_case_data = self.resolve_library_reference(test_name, entry)
+                    if test_case_data is not None:
+                        resolved[test_name] = test_case_data
+                project_data['test_cases'] = resolved
             
             # Load standalone test cases
             standalone_data = execution_data.get('standalone', {})
             for test_name, data in standalone_data.items():
-                test_case_data = data.get('test_case_data')
+                if '$ref' in data:
+                    test_case_data = self.resolve_library_reference(test_name, data)
+                else:
+                    test_case_data = data.get('test_case_data')
                 if test_case_data:
                     self.displayed_test_cases[test_name] = test_case_data
             
@@ -5768,67 +6342,29 @@ class TestExecutionDialog(QDialog):
             
     def restore_test_case_status(self, execution_data):
         """Restores the status and selected step for all test cases."""
+        # ✅ CHANGED: O(1) row lookups and one repaint instead of a list walk per test case
+        model = self.test_case_model
+        restored = []
+        
         # Restore project test case status
         for project_name, project_data in self.projects.items():
-            status_data = project_data.get('status_data', {})
-            for test_name, status_info in status_data.items():
-                for i in range(self.test_case_list.count()):
-                    item = self.test_case_list.item(i)
-                    item_data = item.data(Qt.ItemDataRole.UserRole)
-                    
-                    if (item_data and item_data.get('type') == 'test_case' and 
-                        item_data.get('name') == test_name and 
-                        item_data.get('project') == project_name):
-                        
-                        widget = self.test_case_list.itemWidget(item)
-                        status_label = widget.findChild(QLabel, "status_label")
-                        step_combo = widget.findChild(QComboBox, "step_combo")
-                        
-                        if status_label:
-                            saved_status = status_info.get('status', 'Not Run')
-                            status_label.setText(saved_status)
-                            if saved_status == "Passed":
-                                status_label.setStyleSheet("color: green; font-weight: bold;")
-                            elif saved_status == "Failed":
-                                status_label.setStyleSheet("color: red; font-weight: bold;")
-                            elif saved_status == "Stopped":
-                                status_label.setStyleSheet("color: orange; font-weight: bold;")
-                        
-                        if step_combo:
-                            saved_step = status_info.get('selected_step', 0)
-                            if saved_step < step_combo.count():
-                                step_combo.setCurrentIndex(saved_step)
-                        break
+            for test_name, status_info in project_data.get('status_data', {}).items():
+                restored.append((model.row_of(test_name, project_name, any_project=False), status_info))
         
         # Restore standalone test case status
-        standalone_data = execution_data.get('standalone', {})
-        for test_name, data in standalone_data.items():
-            for i in range(self.test_case_list.count()):
-                item = self.test_case_list.item(i)
-                item_data = item.data(Qt.ItemDataRole.UserRole)
-                
-                if (item_data and item_data.get('type') == 'test_case' and 
-                    item_data.get('name') == test_name and not item_data.get('project')):
-                    
-                    widget = self.test_case_list.itemWidget(item)
-                    status_label = widget.findChild(QLabel, "status_label")
-                    step_combo = widget.findChild(QComboBox, "step_combo")
-                    
-                    if status_label:
-                        saved_status = data.get('status', 'Not Run')
-                        status_label.setText(saved_status)
-                        if saved_status == "Passed":
-                            status_label.setStyleSheet("color: green; font-weight: bold;")
-                        elif saved_status == "Failed":
-                            status_label.setStyleSheet("color: red; font-weight: bold;")
-                        elif saved_status == "Stopped":
-                            status_label.setStyleSheet("color: orange; font-weight: bold;")
-                    
-                    if step_combo:
-                        saved_step = data.get('selected_step', 0)
-                        if saved_step < step_combo.count():
-                            step_combo.setCurrentIndex(saved_step)
-                    break
+        for test_name, data in execution_data.get('standalone', {}).items():
+            restored.append((model.row_of(test_name, None, any_project=False), data))
+        
+        for row, status_info in restored:
+            if row >= 0:
+                entry = model.entry(row)
+                entry.status = status_info.get('status', 'Not Run')
+                # Checked against the step choices when they are built
+                entry.selected_step = status_info.get('selected_step', 0)
+        
+        if model.rows:
+            model.dataChanged.emit(model.index(0), model.index(len(model.rows) - 1))
+        self.apply_row_visibility()
     
     def clear_all_test_cases(self):
         """Clears all projects and standalone test cases."""
@@ -5842,8 +6378,10 @@ class TestExecutionDialog(QDialog):
         if reply == QMessageBox.StandardButton.Yes:
             self.projects.clear()
             self.displayed_test_cases.clear()
-            self.test_case_list.clear()
+            self.test_case_model.set_rows([])
+            self.update_select_all_state()
             
+            self.main_window.persistence.discard(self.execution_data_file)  # ✅ NEW: Drop pending saves first
             if os.path.exists(self.execution_data_file):
                 os.remove(self.execution_data_file)
             
@@ -5851,41 +6389,21 @@ class TestExecutionDialog(QDialog):
 
     def toggle_play_stop(self, test_case_name):
         """Toggles between play and stop."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                widget = self.test_case_list.itemWidget(item)
-                button = widget.findChild(QPushButton, "play_stop_button")
-                if button:
-                    current_icon = button.icon()
-                    play_icon = self.main_window.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay)
-                    
-                    if current_icon.pixmap(QSize(16, 16)).toImage() == play_icon.pixmap(QSize(16, 16)).toImage():
-                        self.stop_execution = False
-                        self.execute_single_test(test_case_name)
-                    else:
-                        self.stop_execution = True
-                        self.update_status(test_case_name, "Stopped")
-                        button.setIcon(play_icon)
-                break
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            if not self.test_case_model.entry(row).playing:
+                self.stop_execution = False
+                self.execute_single_test(test_case_name)
+            else:
+                self.stop_execution = True
+                self.update_status(test_case_name, "Stopped")
+                self.test_case_model.update_row(row, playing=False)
                 
     def set_play_stop_button_state(self, test_case_name, is_playing):
         """Changes the play/stop button icon."""
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case' and item_data.get('name') == test_case_name:
-                widget = self.test_case_list.itemWidget(item)
-                button = widget.findChild(QPushButton, "play_stop_button")
-                if button:
-                    if is_playing:
-                        button.setIcon(self.main_window.style().standardIcon(QStyle.StandardPixmap.SP_MediaStop))
-                    else:
-                        button.setIcon(self.main_window.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
-                break
+        row = self.test_case_model.row_of(test_case_name)
+        if row >= 0:
+            self.test_case_model.update_row(row, playing=is_playing)
 
     def refresh_test_case(self, test_case_name):
         """Refreshes a test case from the library."""
@@ -5895,6 +6413,7 @@ class TestExecutionDialog(QDialog):
             return
         
         latest_test_case = self.main_window.test_cases[test_case_name]
+        self.track_library_copy(test_case_name, latest_test_case, library_copy=True)
         
         # ✅ FIXED: Find which project this test case belongs to (or if it's standalone)
         updated = False
@@ -5914,39 +6433,11 @@ class TestExecutionDialog(QDialog):
             updated = True
         
         if updated:
-            # Update the step combo box for this specific test case
-            for i in range(self.test_case_list.count()):
-                item = self.test_case_list.item(i)
-                item_data = item.data(Qt.ItemDataRole.UserRole)
-                
-                # ✅ FIXED: Match both name AND project to find the correct item
-                if (item_data and item_data.get('type') == 'test_case' and 
-                    item_data.get('name') == test_case_name and
-                    item_data.get('project') == belongs_to_project):
-                    
-                    widget = self.test_case_list.itemWidget(item)
-                    step_combo = widget.findChild(QComboBox, "step_combo")
-                    if step_combo:
-                        current_index = step_combo.currentIndex()
-                        step_combo.clear()
-                        
-                        # ✅ NEW: Populate with main steps AND utility sub-steps (like add_list_item does)
-                        steps = latest_test_case.get('steps', [])
-                        for idx, step in enumerate(steps, start=1):
-                            # Add main step
-                            step_combo.addItem(f"Step {idx}", idx)
-                            
-                            # ✅ Add utility sub-steps (3.1, 3.2, etc.)
-                            utility_steps = step.get('utility_steps', [])
-                            for sub_idx in range(1, len(utility_steps) + 1):
-                                step_combo.addItem(f"Step {idx}.{sub_idx}", (idx, sub_idx))
-                        
-                        # Restore previous selection if valid
-                        if current_index < step_combo.count():
-                            step_combo.setCurrentIndex(current_index)
-                        else:
-                            step_combo.setCurrentIndex(0)
-                    break
+            # ✅ CHANGED: Rebuild the step choices of this row; the previous selection
+            # is kept if it is still valid (see ExecutionListModel.step_choices)
+            row = self.test_case_model.row_of(test_case_name, belongs_to_project, any_project=False)
+            if row >= 0:
+                self.test_case_model.update_row(row, step_choices=None)
             
             self.save_execution_data()
             QMessageBox.information(self, "Refreshed", 
@@ -5955,79 +6446,6 @@ class TestExecutionDialog(QDialog):
             QMessageBox.warning(self, "Not Found", 
                               f"Test case '{test_case_name}' not found in execution list.")
    
-    def dropEvent(self, event):
-        """
-        Override dropEvent to prevent moving project headers and their test cases.
-        Only allow reordering of test cases within their projects.
-        """
-        source_item = self.test_case_list.currentItem()
-        
-        if not source_item:
-            event.ignore()
-            return
-        
-        source_data = source_item.data(Qt.ItemDataRole.UserRole)
-        
-        # ✅ PREVENT: Don't allow dragging project headers
-        if source_data and source_data.get('type') == 'project':
-            event.ignore()
-            QMessageBox.warning(
-                self,
-                "Cannot Move",
-                "Project headers cannot be moved. Only test cases can be reordered."
-            )
-            return
-        
-        # Allow default drop behavior for test cases
-        super().dropEvent(event)   
-        
-    def reorder_internal_data_after_drag(self, source_row, dest_row):
-        """
-        Reorders the internal data structures (projects and standalone test cases)
-        to match the visual order after a drag-and-drop operation.
-        """
-        if source_row == dest_row or source_row < 0 or dest_row < 0:
-            return
-        
-        # Collect all test case data in current visual order
-        ordered_data = []
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-            
-            if item_data and item_data.get('type') == 'test_case':
-                test_name = item_data.get('name')
-                project = item_data.get('project')
-                
-                # Get the actual test case data
-                if project:
-                    test_data = self.projects[project]['test_cases'].get(test_name)
-                else:
-                    test_data = self.displayed_test_cases.get(test_name)
-                
-                if test_data:
-                    ordered_data.append({
-                        'name': test_name,
-                        'project': project,
-                        'data': test_data
-                    })
-        
-        # Rebuild data structures in new order
-        # Clear existing data
-        for project_data in self.projects.values():
-            project_data['test_cases'].clear()
-        self.displayed_test_cases.clear()
-        
-        # Re-add in new order
-        for item in ordered_data:
-            if item['project']:
-                self.projects[item['project']]['test_cases'][item['name']] = item['data']
-            else:
-                self.displayed_test_cases[item['name']] = item['data']
-        
-        # Save the updated order
-        self.save_execution_data()  
-
     def on_rows_moved(self, parent, start, end, destination, row):
         """
         Signal handler for when rows are moved via drag-and-drop.
@@ -6038,37 +6456,33 @@ class TestExecutionDialog(QDialog):
 
     def sync_data_with_visual_order(self):
         """
-        Synchronizes internal data structures with the current visual order
-        of items in the list widget.
+        Synchronizes internal data structures with the current order
+        of rows in the list model.
         """
         # Collect all test case data in current visual order
         ordered_test_cases = []
         
-        for i in range(self.test_case_list.count()):
-            item = self.test_case_list.item(i)
-            item_data = item.data(Qt.ItemDataRole.UserRole)
+        for _, entry in self.test_case_model.test_rows():
+            test_name = entry.name
+            project = entry.project
             
-            if item_data and item_data.get('type') == 'test_case':
-                test_name = item_data.get('name')
-                project = item_data.get('project')
-                
-                # Get the actual test case data
-                if project:
-                    if project in self.projects and test_name in self.projects[project]['test_cases']:
-                        test_data = copy.deepcopy(self.projects[project]['test_cases'][test_name])
-                        ordered_test_cases.append({
-                            'name': test_name,
-                            'project': project,
-                            'data': test_data
-                        })
-                else:
-                    if test_name in self.displayed_test_cases:
-                        test_data = copy.deepcopy(self.displayed_test_cases[test_name])
-                        ordered_test_cases.append({
-                            'name': test_name,
-                            'project': None,
-                            'data': test_data
-                        })
+            # Get the actual test case data
+            if project:
+                if project in self.projects and test_name in self.projects[project]['test_cases']:
+                    test_data = copy.deepcopy(self.projects[project]['test_cases'][test_name])
+                    ordered_test_cases.append({
+                        'name': test_name,
+                        'project': project,
+                        'data': test_data
+                    })
+            else:
+                if test_name in self.displayed_test_cases:
+                    test_data = copy.deepcopy(self.displayed_test_cases[test_name])
+                    ordered_test_cases.append({
+                        'name': test_name,
+                        'project': None,
+                        'data': test_data
+                    })
         
         # Clear and rebuild data structures
         for project_data in self.projects.values():
@@ -6088,7 +6502,7 @@ class TestExecutionDialog(QDialog):
     def substitute_execution_variables(self, text, test_case_name):
         """
         Substitutes variables during test execution.
-        Similar to main window's substitute_variables but focused on execution time.
+        Similar to pcomm_core.reports.substitute_variables but focused on execution time.
         """
         from datetime import datetime
         
@@ -6136,12 +6550,138 @@ class TestExecutionDialog(QDialog):
         except Exception as e:
             print(f"Could not play sound: {e}")
 
+# --- NEW: Step List Delegate ---
+class StepItemDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of the test case editor's main step list (step name,
+    refresh button for outdated module steps, delete button) and handles
+    clicks on the buttons, so the list holds plain items instead of a widget
+    per step and only the visible rows are ever drawn.
+    """
+
+    RowRole = Qt.ItemDataRole.UserRole + 3  # (step name, is outdated module step, is validate step)
+    ROW_HEIGHT = 32
+
+    def __init__(self, list_widget, on_action):
+        """
+        Args:
+            list_widget: The steps QListWidget
+            on_action: Callable(action, row) run when 'refresh' or 'delete' is clicked
+        """
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self.on_action = on_action
+        self.bin_icon = QIcon("bin.png")
+        self._hover_rect = QRect()
+        list_widget.setMouseTracking(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def button_rects(self, rect, is_outdated):
+        """Returns {button: QRect} for a row; the same layout is used to paint and to hit-test."""
+        center_y = rect.center().y()
+        rects = {'delete': QRect(rect.right() - 28, center_y - 10, 20, 20)}
+        if is_outdated:
+            rects['refresh'] = QRect(rects['delete'].left() - 32, center_y - 12, 24, 24)
+        return rects
+
+    def paint(self, painter, option, index):
+        row = index.data(self.RowRole)
+        if row is None:
+            super().paint(painter, option, index)
+            return
+        step_name, is_outdated, is_validate_step = row
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        rects = self.button_rects(option.rect, is_outdated)
+        mouse = self.list_widget.viewport().mapFromGlobal(QCursor.pos())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if is_validate_step:
+            painter.fillRect(option.rect, QColor('#fffacd'))
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+
+        # The current step is shown in bold
+        font = QFont(option.font)
+        font.setBold(index.row() == self.list_widget.currentRow())
+        painter.setFont(font)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.setPen(option.palette.color(
+            QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text))
+        left = option.rect.left() + 8
+        right = min(rect.left() for rect in rects.values()) - 8
+        name_rect = QRect(left, option.rect.top(), max(right - left, 0), option.rect.height())
+        text = QFontMetrics(font).elidedText(step_name, Qt.TextElideMode.ElideRight, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+
+        if 'refresh' in rects:
+            rect = rects['refresh']
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#f59e0b' if rect.contains(mouse) else '#fbbf24'))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor('white'))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "🔄")
+        rect = rects['delete']
+        if rect.contains(mouse):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#fee2e2'))
+            painter.drawRoundedRect(rect, 3, 3)
+        self.bin_icon.paint(painter, rect.adjusted(2, 2, -2, -2))
+        painter.restore()
+
+    def button_at(self, option, index, position):
+        row = index.data(self.RowRole)
+        if row is None:
+            return None
+        return next((button for button, rect in self.button_rects(option.rect, row[1]).items()
+                     if rect.contains(position)), None)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                                QEvent.Type.MouseButtonDblClick, QEvent.Type.MouseMove):
+            return False
+        button = self.button_at(option, index, event.position().toPoint())
+        if event.type() == QEvent.Type.MouseMove:
+            viewport = self.list_widget.viewport()
+            if button:
+                viewport.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                viewport.unsetCursor()
+            # Repaint the hover highlight of the row left and of the row entered
+            if option.rect != self._hover_rect:
+                viewport.update(self._hover_rect)
+                self._hover_rect = QRect(option.rect)
+            viewport.update(option.rect)
+            return False
+        if button is None:
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            row = index.row()
+            # Run after the event returns: delete removes the clicked row
+            QTimer.singleShot(0, lambda: self.on_action(button, row))
+        # Presses on a button do not change the selection, like the old QPushButtons
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        button = self.button_at(option, index, event.pos())
+        if button == 'refresh':
+            QToolTip.showText(event.globalPos(), "Refresh to latest module definition", view)
+            return True
+        if button == 'delete':
+            QToolTip.showText(event.globalPos(), f"Delete '{index.data(self.RowRole)[0]}'", view)
+            return True
+        return super().helpEvent(event, view, option, index)
+
+
 class CustomStepsListWidget(QListWidget):
     """Custom QListWidget that handles drag-and-drop for converting steps to utility steps."""
     
     def __init__(self, parent_dialog):
         super().__init__()
         self.parent_dialog = parent_dialog
+        self.setUniformItemSizes(True)  # ✅ NEW: Rows are painted by StepItemDelegate, all the same height
         self.setDragEnabled(True)
         self.setAcceptDrops(True)
         self.setDragDropMode(QListWidget.DragDropMode.NoDragDrop)  # ✅ CHANGED: Disable default behavior
@@ -6195,7 +6735,6 @@ class EditTestCaseDialog(QDialog):
         )
 
         self.modules = modules
-        self.module_versions = self._calculate_module_versions()
         self.added_steps = existing_steps
         self.selected_module_name = ""
         self.current_utility_step = None
@@ -6497,6 +7036,8 @@ class EditTestCaseDialog(QDialog):
         main_steps_layout.addWidget(left_label)
         
         self.steps_list_widget = CustomStepsListWidget(self)  # ✅ Use custom widget
+        self.steps_list_widget.setItemDelegate(StepItemDelegate(self.steps_list_widget, self.on_step_row_action))  # ✅ NEW
+        self._step_combo_layout = None  # ✅ NEW: Utility step counts the start/end combos were built for
         self.steps_list_widget.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         self.steps_list_widget.setSelectionBehavior(QListWidget.SelectionBehavior.SelectRows)
         self.steps_list_widget.currentItemChanged.connect(self.display_module_details)
@@ -6783,53 +7324,13 @@ class EditTestCaseDialog(QDialog):
             for prereq in existing_prereqs:
                 self.add_prerequisite_chip(prereq)
 
-    def _calculate_module_versions(self):
-        """
-        Calculates a version hash for each module based on its field structure.
-        This helps detect when a module has been modified.
-        """
-        import hashlib
-        import json
-        
-        versions = {}
-        for module_name, module_data in self.modules.items():
-            # Create a hash based on field names and positions
-            labels = module_data.get('labels', [])
-            field_signature = json.dumps([
-                {
-                    'name': label.get('name') or label.get('label') or label.get('text', ''),
-                    'row': label.get('row'),
-                    'col': label.get('column')
-                }
-                for label in labels
-            ], sort_keys=True)
-            
-            version_hash = hashlib.md5(field_signature.encode()).hexdigest()[:8]
-            versions[module_name] = version_hash
-        
-        return versions
-
     def _check_step_module_version(self, step_data):
         """
         Checks if a step's module version matches the current module definition.
         Returns True if outdated, False if current.
         """
-        if step_data.get('type') != 'module_import':
-            return False
-        
-        module_name = step_data.get('module_name')
-        if not module_name or module_name not in self.modules:
-            return False
-        
-        # Get stored version from step (if exists)
-        step_version = step_data.get('module_version', None)
-        current_version = self.module_versions.get(module_name)
-        
-        # If no version stored, assume outdated
-        if step_version is None:
-            return True
-        
-        return step_version != current_version
+        # ✅ CHANGED: Versions are maintained at write time, no per-editor hashing
+        return self.main_window.module_index.is_stale(step_data)
 
     def refresh_step_module(self, step_index, show_message=True):
         """
@@ -6854,50 +7355,16 @@ class EditTestCaseDialog(QDialog):
             QMessageBox.warning(self, "Module Not Found", f"Module '{module_name}' not found.")
             return
         
-        # Get current module definition
-        module_data = self.modules[module_name]
-        new_labels = module_data.get('labels', [])
-        
-        # Build a map of existing field values by field name
-        existing_values = {}
-        for field in step_data.get('fields', []):
-            field_name = field.get('field_name')
-            if field_name:
-                existing_values[field_name] = field.get('value', '')
-        
         # Get action type from existing fields
         action_type = 'Input'
         if step_data.get('fields'):
             action_type = step_data['fields'][0].get('action_type', 'Input')
         
-        # Create new fields list based on current module definition
-        import time
-        import random
-        
-        new_fields = []
-        step_number = step_index + 1
-        
-        for idx, label_data in enumerate(new_labels):
-            field_name = label_data.get('label') or label_data.get('text') or label_data.get('name', 'N/A')
-            
-            # Generate unique ID
-            unique_timestamp = int(time.time() * 1000000)
-            random_suffix = random.randint(100000, 999999)
-            unique_field_id = f"{field_name}_{module_name}_M{step_number}_REFRESH_{unique_timestamp}_{random_suffix}_{idx}"
-            
-            # Preserve existing value if field name matches
-            preserved_value = existing_values.get(field_name, '')
-            
-            new_fields.append({
-                "field_name": field_name,
-                "internal_field_id": unique_field_id,
-                "action_type": action_type,
-                "value": preserved_value,
-            })
-        
-        # Update step data
-        step_data['fields'] = new_fields
-        step_data['module_version'] = self.module_versions.get(module_name)
+        # Create new fields list based on current module definition, preserving values by field name
+        new_fields, existing_values = rebuild_module_step_fields(
+            step_data, self.modules[module_name], action_type, f"{module_name}_M{step_index + 1}"
+        )
+        step_data['module_version'] = self.main_window.module_index.version(module_name)
         
         # Refresh UI
         self.update_steps_list()
@@ -6944,47 +7411,16 @@ class EditTestCaseDialog(QDialog):
             QMessageBox.warning(self, "Module Not Found", f"Module '{module_name}' not found.")
             return
         
-        # Get current module definition
-        module_data = self.modules[module_name]
-        new_labels = module_data.get('labels', [])
-        
-        # Build a map of existing field values
-        existing_values = {}
-        for field in utility_step.get('fields', []):
-            field_name = field.get('field_name')
-            if field_name:
-                existing_values[field_name] = field.get('value', '')
-        
         # Get action type
         action_type = utility_step.get('action_type', 'Input')
         
         # Create new fields
-        import time
-        import random
-        
-        new_fields = []
         step_number = main_step_index + 1
         utility_number = utility_step_index + 1
-        
-        for idx, label_data in enumerate(new_labels):
-            field_name = label_data.get('label') or label_data.get('text') or label_data.get('name', 'N/A')
-            
-            unique_timestamp = int(time.time() * 1000000)
-            random_suffix = random.randint(100000, 999999)
-            unique_field_id = f"{field_name}_U{step_number}_{utility_number}_REFRESH_{unique_timestamp}_{random_suffix}_{idx}"
-            
-            preserved_value = existing_values.get(field_name, '')
-            
-            new_fields.append({
-                "field_name": field_name,
-                "internal_field_id": unique_field_id,
-                "action_type": action_type,
-                "value": preserved_value,
-            })
-        
-        # Update utility step
-        utility_step['fields'] = new_fields
-        utility_step['module_version'] = self.module_versions.get(module_name)
+        new_fields, existing_values = rebuild_module_step_fields(
+            utility_step, self.modules[module_name], action_type, f"U{step_number}_{utility_number}"
+        )
+        utility_step['module_version'] = self.main_window.module_index.version(module_name)
         
         # Refresh utility steps list
         # Refresh utility steps list while preserving selection
@@ -7387,13 +7823,9 @@ class EditTestCaseDialog(QDialog):
                     is_validate_utility = True
                 
                 # Check if utility module is outdated
-                module_name = utility_step.get('module_name')
-                if module_name and module_name in self.modules:
-                    utility_version = utility_step.get('module_version')
-                    current_version = self.module_versions.get(module_name)
-                    if utility_version is None or utility_version != current_version:
-                        numbered_name += " ⚠️"
-                        is_outdated = True
+                if self.main_window.module_index.is_stale(utility_step):
+                    numbered_name += " ⚠️"
+                    is_outdated = True
             
             # Create custom widget with delete button
             list_item = QListWidgetItem()
@@ -7893,7 +8325,7 @@ class EditTestCaseDialog(QDialog):
                 "fields": fields,
                 "utility_steps": []
             }
-            new_step['module_version'] = self.module_versions.get(selected_item)
+            new_step['module_version'] = self.main_window.module_index.version(selected_item)
             # Check if this is a Validate step and add utility wait
             is_validate = action_type == 'Validate'
             if is_validate:
@@ -8172,134 +8604,88 @@ class EditTestCaseDialog(QDialog):
         
     def update_steps_list(self):
         """
-        Clears and repopulates the steps list widget with the current steps.
+        Brings the main steps list in line with self.added_steps.
         ✅ UPDATED: Adds refresh button for outdated module steps
+        ✅ CHANGED: Rows are plain items painted by StepItemDelegate. Existing
+        items are reused and only the rows whose name or flags changed are
+        updated; rows are added or removed at the end.
         """
         
         current_row = self.steps_list_widget.currentRow()
-        
-        self.steps_list_widget.clear()
-        self.utility_steps_list_widget.clear()
-        self.update_step_combo_options()
-        
-        for i, step in enumerate(self.added_steps):
-            step_type = step.get('type')
-            step_name = f"Step {i + 1}: "
-            
-            is_validate_step = False
-            if step.get('fields') and step['fields'][0].get('action_type') == 'Validate':
-                is_validate_step = True
-            
-            # ✅ NEW: Check if module is outdated
-            is_outdated = self._check_step_module_version(step)
-
-            if step_type == 'module_import':
-                module_name = step.get('module_name', 'Unknown Module')
-                step_name += module_name
-                if is_outdated:
-                    step_name += " ⚠️"  # Add warning icon
-            elif step_type == 'special_key':
-                key_value = step.get('key_value', 'Unknown Key')
-                step_name += f"Special Key: {key_value}"
-            elif step_type == 'capture_screen_text':
-                step_name += "Capture Text Screenshot"
-            elif step_type == 'capture_screenshot':
-                step_name += "Capture Screenshot (DOCX)"
-            elif step_type == 'random_input':
-                row = step.get('row', '?')
-                col = step.get('column', '?')
-                value = step.get('value', '?')
-                step_name += f"Random Input (Row: {row}, Col: {col}, Value: {value})"
-            elif step_type == 'wait':
-                seconds = step.get('seconds', '?')
-                step_name += f"Wait: {seconds} second(s)"
-            elif step_type == 'break':
-                step_name += "Break: Review & Decision Point"
-            else:
-                step_name += "Unknown Step"
-
-            # Create custom widget with buttons
-            list_item = QListWidgetItem()
-            item_widget = QWidget()
-            item_layout = QHBoxLayout(item_widget)
-            item_layout.setContentsMargins(4, 2, 8, 2)
-            item_layout.setSpacing(8)
-            
-            # Step name label
-            name_label = QLabel(step_name)
-            name_label.setMinimumWidth(300)
-            name_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
-            name_label.setWordWrap(False)
-            item_layout.addWidget(name_label, 1)
-            
-            item_layout.addStretch()
-            
-            # ✅ NEW: Add refresh button for outdated module steps
-            if step_type == 'module_import' and is_outdated:
-                refresh_button = QPushButton("🔄")
-                refresh_button.setFixedSize(24, 24)
-                refresh_button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #fbbf24;
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        font-size: 14px;
-                        font-weight: bold;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #f59e0b;
-                    }
-                    QPushButton:pressed {
-                        background-color: #d97706;
-                    }
-                """)
-                refresh_button.setToolTip(f"Refresh to latest module definition")
-                refresh_button.clicked.connect(lambda checked, idx=i: self.refresh_step_module(idx))
-                item_layout.addWidget(refresh_button)
-            
-            # Delete button
-            delete_button = QPushButton()
-
-            # Load the bin.png icon
-            bin_icon = QIcon("bin.png")
-            delete_button.setIcon(bin_icon)
-            delete_button.setIconSize(QSize(16, 16))  # Icon size slightly smaller than button
-
-            delete_button.setFixedSize(20, 20)
-
-            delete_button.setStyleSheet("""
-                QPushButton {
-                    border: none;
-                    background-color: transparent;
-                    padding: 0px;
-                }
-                QPushButton:hover {
-                    background-color: #fee2e2;
-                    border-radius: 3px;
-                }
-                QPushButton:pressed {
-                    background-color: #fecaca;
-                }
-            """)
-            delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-            delete_button.setToolTip(f"Delete '{step_name}'")
-            delete_button.clicked.connect(lambda checked, idx=i: self.delete_step_by_index(idx))
-            item_layout.addWidget(delete_button)
-            
-            if is_validate_step:
-                item_widget.setStyleSheet("background-color: #fffacd;")
+        
+        # Deselect like the old clear() did, so the details of the re-selected step are rebuilt
+        self.steps_list_widget.setCurrentRow(-1)
+        self.steps_list_widget.clearSelection()
+        self.utility_steps_list_widget.clear()
+        
+        # ✅ CHANGED: The start/end step combos only depend on the step and utility step counts
+        combo_layout = [len(step.get('utility_steps', [])) for step in self.added_steps]
+        if combo_layout != self._step_combo_layout:
+            self.update_step_combo_options()
+            self._step_combo_layout = combo_layout
+        
+        rows = []
+        for i, step in enumerate(self.added_steps):
+            is_validate_step = bool(step.get('fields') and step['fields'][0].get('action_type') == 'Validate')
             
-            self.steps_list_widget.addItem(list_item)
-            self.steps_list_widget.setItemWidget(list_item, item_widget)
-            size_hint = item_widget.sizeHint()
-            size_hint.setHeight(max(32, size_hint.height()))
-            list_item.setSizeHint(size_hint)
+            # ✅ NEW: Check if module is outdated
+            is_outdated = step.get('type') == 'module_import' and self._check_step_module_version(step)
+            step_name = self.step_list_name(i, step)
+            if is_outdated:
+                step_name += " ⚠️"  # Add warning icon
+            rows.append((step_name, is_outdated, is_validate_step))
+        
+        count = self.steps_list_widget.count()
+        for i, row in enumerate(rows):
+            if i < count:
+                list_item = self.steps_list_widget.item(i)
+                if list_item.data(StepItemDelegate.RowRole) == row:
+                    continue  # Untouched row
+                list_item.setText(row[0])
+            else:
+                list_item = QListWidgetItem(row[0])
+                self.steps_list_widget.addItem(list_item)
+            list_item.setData(StepItemDelegate.RowRole, row)
+        for _ in range(count - len(rows)):
+            self.steps_list_widget.takeItem(self.steps_list_widget.count() - 1)
             
         if 0 <= current_row < self.steps_list_widget.count():
             self.steps_list_widget.setCurrentRow(current_row)    
 
+    def step_list_name(self, step_index, step):
+        """Returns the name a step is listed under, e.g. 'Step 3: Special Key: [enter]'."""
+        step_type = step.get('type')
+        step_name = f"Step {step_index + 1}: "
+        if step_type == 'module_import':
+            step_name += step.get('module_name', 'Unknown Module')
+        elif step_type == 'special_key':
+            key_value = step.get('key_value', 'Unknown Key')
+            step_name += f"Special Key: {key_value}"
+        elif step_type == 'capture_screen_text':
+            step_name += "Capture Text Screenshot"
+        elif step_type == 'capture_screenshot':
+            step_name += "Capture Screenshot (DOCX)"
+        elif step_type == 'random_input':
+            row = step.get('row', '?')
+            col = step.get('column', '?')
+            value = step.get('value', '?')
+            step_name += f"Random Input (Row: {row}, Col: {col}, Value: {value})"
+        elif step_type == 'wait':
+            seconds = step.get('seconds', '?')
+            step_name += f"Wait: {seconds} second(s)"
+        elif step_type == 'break':
+            step_name += "Break: Review & Decision Point"
+        else:
+            step_name += "Unknown Step"
+        return step_name
+
+    def on_step_row_action(self, action, step_index):
+        """Runs a refresh or delete button click from the main steps list."""
+        if action == 'refresh':
+            self.refresh_step_module(step_index)
+        elif action == 'delete':
+            self.delete_step_by_index(step_index)
+
     def delete_single_test_step(self, step_name):
         """Deletes a single test step from the Added Test Steps list."""
         # ✅ FIXED: Find step by visual position, not by reconstructed name
@@ -8307,14 +8693,9 @@ class EditTestCaseDialog(QDialog):
         
         # Find which row was clicked by checking all items
         for i in range(self.steps_list_widget.count()):
-            item = self.steps_list_widget.item(i)
-            widget = self.steps_list_widget.itemWidget(item)
-            if widget:
-                # Check if this widget's label matches the step_name
-                label = widget.findChild(QLabel)
-                if label and label.text() == step_name:
-                    clicked_row = i
-                    break
+            if self.steps_list_widget.item(i).text() == step_name:
+                clicked_row = i
+                break
         
         if clicked_row == -1:
             return
@@ -8347,33 +8728,8 @@ class EditTestCaseDialog(QDialog):
         if step_index < 0 or step_index >= len(self.added_steps):
             return
         
-        step_data = self.added_steps[step_index]
-        step_type = step_data.get('type')
-        
         # Build step name for confirmation dialog
-        step_name = f"Step {step_index + 1}: "
-        if step_type == 'module_import':
-            module_name = step_data.get('module_name', 'Unknown Module')
-            step_name += module_name
-        elif step_type == 'special_key':
-            key_value = step_data.get('key_value', 'Unknown Key')
-            step_name += f"Special Key: {key_value}"
-        elif step_type == 'capture_screen_text':
-            step_name += "Capture Text Screenshot"
-        elif step_type == 'capture_screenshot':
-            step_name += "Capture Screenshot (DOCX)"
-        elif step_type == 'random_input':
-            row = step_data.get('row', '?')
-            col = step_data.get('column', '?')
-            value = step_data.get('value', '?')
-            step_name += f"Random Input (Row: {row}, Col: {col}, Value: {value})"
-        elif step_type == 'wait':
-            seconds = step_data.get('seconds', '?')
-            step_name += f"Wait: {seconds} second(s)"
-        elif step_type == 'break':
-            step_name += "Break: Review & Decision Point"
-        else:
-            step_name += "Unknown Step"
+        step_name = self.step_list_name(step_index, self.added_steps[step_index])
         
         # Confirm deletion
         reply = QMessageBox.question(
@@ -8945,14 +9301,10 @@ class EditTestCaseDialog(QDialog):
         
         try:
             import pythoncom
-            import win32com.client
             import time
             
-            pythoncom.CoInitialize()
-            autECLSession = win32com.client.Dispatch("PCOMM.autECLSession")
             connection_name = self.main_window.get_connection_name_from_title(self.main_window.pcomm_window_title)
-            autECLSession.SetConnectionByName(connection_name)
-            autECLPS = autECLSession.autECLPS
+            autECLSession, autECLPS = connect_pcomm_session(connection_name)  # ✅ CHANGED: See pcomm_core.session
             
             # ✅ NEW: Execute main steps from start to end
             # ✅ CHANGED: Use while loop to handle dynamic step list updates
@@ -9003,25 +9355,21 @@ class EditTestCaseDialog(QDialog):
                             value = str(field.get('value', '')).strip()
                             
                             if action_type == 'Input' and value:
-                                if module_name in self.modules:
-                                    module_data = self.modules[module_name]
-                                    labels = module_data.get('labels', [])
-                                    
+                                module_model = self.main_window.get_module_model(module_name)
+                                if module_model is not None:
                                     field_name = field.get('field_name')
-                                    for label in labels:
-                                        label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                        if label_name == field_name:
-                                            row = int(label.get('row', 1))
-                                            col = int(label.get('column', 1))
-                                            
-                                            # ✅ ADD: Substitute variables
-                                            substituted_value = self.substitute_execution_variables(value, self.test_case_name_input.text())
-                                            
-                                            autECLPS.SetCursorPos(row, col)
-                                            autECLPS.SendKeys(substituted_value)  # ✅ NOW SUBSTITUTED
-                                            time.sleep(0.2)
-                                            break
-                        
+                                    for label in module_model.labels_named(field_name):
+                                        row = label.row
+                                        col = label.column
+                                        
+                                        # ✅ ADD: Substitute variables
+                                        substituted_value = self.substitute_execution_variables(value, self.test_case_name_input.text())
+                                        
+                                        autECLPS.SetCursorPos(row, col)
+                                        autECLPS.SendKeys(substituted_value)  # ✅ NOW SUBSTITUTED
+                                        time.sleep(0.2)
+                                        break
+                    
                         # Process validation fields
                         for field in step.get('fields', []):
                             if self.execution_stop_flag:
@@ -9031,43 +9379,39 @@ class EditTestCaseDialog(QDialog):
                             value = str(field.get('value', '')).strip()
                             
                             if action_type == 'Validate' and value:
-                                if module_name in self.modules:
-                                    module_data = self.modules[module_name]
-                                    labels = module_data.get('labels', [])
-                                    
+                                module_model = self.main_window.get_module_model(module_name)
+                                if module_model is not None:
                                     field_name = field.get('field_name')
-                                    for label in labels:
-                                        label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                        if label_name == field_name:
-                                            row = int(label.get('row', 1))
-                                            col = int(label.get('column', 1))
-                                            length = int(label.get('length', len(value)))
-                                            
-                                            # ✅ ADD: Substitute variables in expected value
-                                            expected_value = self.main_window.substitute_execution_variables(value, self.test_case_name_input.text())
+                                    for label in module_model.labels_named(field_name):
+                                        row = label.row
+                                        col = label.column
+                                        length = label.length if label.length is not None else len(value)
+                                        
+                                        # ✅ ADD: Substitute variables in expected value
+                                        expected_value = self.main_window.substitute_execution_variables(value, self.test_case_name_input.text())
 
-                                            actual_value = autECLPS.GetText(row, col, length)
-                                            
-                                            # ✅ Use substituted expected_value
-                                            validation_passed = self.validate_field_value(actual_value, expected_value)
-                                            
-                                            if not validation_passed:
-                                                # ✅ ENHANCED: Better error message for {blank} validation
-                                                if expected_value.lower() == '{blank}':  # ✅ CHANGED from value
-                                                    QMessageBox.warning(self, "Validation Failed",
-                                                        f"Step {step_num}: Field '{field_name}'\n"
-                                                        f"Expected: <blank>\n"
-                                                        f"Actual: '{actual_value.strip()}' (not blank)")
-                                                else:
-                                                    QMessageBox.warning(self, "Validation Failed",
-                                                        f"Step {step_num}: Field '{field_name}'\n"
-                                                        f"Expected: '{expected_value}'\n"  # ✅ CHANGED from value
-                                                        f"Actual: '{actual_value.strip()}'")
-                                                self.execution_stop_flag = True
-                                            
-                                            time.sleep(0.1)
-                                            break
-                    
+                                        actual_value = autECLPS.GetText(row, col, length)
+                                        
+                                        # ✅ Use substituted expected_value
+                                        validation_passed = self.validate_field_value(actual_value, expected_value)
+                                        
+                                        if not validation_passed:
+                                            # ✅ ENHANCED: Better error message for {blank} validation
+                                            if expected_value.lower() == '{blank}':  # ✅ CHANGED from value
+                                                QMessageBox.warning(self, "Validation Failed",
+                                                    f"Step {step_num}: Field '{field_name}'\n"
+                                                    f"Expected: <blank>\n"
+                                                    f"Actual: '{actual_value.strip()}' (not blank)")
+                                            else:
+                                                QMessageBox.warning(self, "Validation Failed",
+                                                    f"Step {step_num}: Field '{field_name}'\n"
+                                                    f"Expected: '{expected_value}'\n"  # ✅ CHANGED from value
+                                                    f"Actual: '{actual_value.strip()}'")
+                                            self.execution_stop_flag = True
+                                        
+                                        time.sleep(0.1)
+                                        break
+                
                     elif step_type == 'special_key':
                         key_value = step.get('key_value', '')
                         key_mapping = {
@@ -9276,10 +9620,8 @@ class EditTestCaseDialog(QDialog):
                         
                         elif utility_type == 'module_import':
                             module_name = utility_step.get('module_name')
-                            if module_name in self.modules:
-                                module_data = self.modules[module_name]
-                                labels = module_data.get('labels', [])
-                                
+                            module_model = self.main_window.get_module_model(module_name)
+                            if module_model is not None:
                                 # ✅ FIXED: Process Input fields first
                                 for field in utility_step.get('fields', []):
                                     if self.execution_stop_flag:
@@ -9290,21 +9632,19 @@ class EditTestCaseDialog(QDialog):
                                     
                                     if action_type == 'Input' and value:
                                         field_name = field.get('field_name')
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get('row', 1))
-                                                col = int(label.get('column', 1))
-                                                
-                                                # ✅ ADD: Substitute variables
-                                                substituted_value = self.substitute_execution_variables(value, self.test_case_name_input.text())
-                                                
-                                                autECLPS.SetCursorPos(row, col)
-                                                autECLPS.SendKeys(substituted_value)  # ✅ NOW SUBSTITUTED
-                                                print(f"Utility Step {step_num}.{utility_idx + 1}: Sent input '{substituted_value}' to {field_name}")
-                                                time.sleep(0.2)
-                                                break
-                                
+                                        for label in module_model.labels_named(field_name):
+                                            row = label.row
+                                            col = label.column
+                                            
+                                            # ✅ ADD: Substitute variables
+                                            substituted_value = self.substitute_execution_variables(value, self.test_case_name_input.text())
+                                            
+                                            autECLPS.SetCursorPos(row, col)
+                                            autECLPS.SendKeys(substituted_value)  # ✅ NOW SUBSTITUTED
+                                            print(f"Utility Step {step_num}.{utility_idx + 1}: Sent input '{substituted_value}' to {field_name}")
+                                            time.sleep(0.2)
+                                            break
+                            
                                 # ✅ FIXED: Then process Validation fields
                                 for field in utility_step.get('fields', []):
                                     if self.execution_stop_flag:
@@ -9315,37 +9655,35 @@ class EditTestCaseDialog(QDialog):
                                     
                                     if action_type == 'Validate' and value:
                                         field_name = field.get('field_name')
-                                        for label in labels:
-                                            label_name = label.get('name') or label.get('label') or label.get('text', '')
-                                            if label_name == field_name:
-                                                row = int(label.get('row', 1))
-                                                col = int(label.get('column', 1))
-                                                length = int(label.get('length', len(value)))
-                                                
-                                                # ✅ ADD: Substitute variables in expected value
-                                                expected_value = self.main_window.substitute_execution_variables(value, self.test_case_name_input.text())
+                                        for label in module_model.labels_named(field_name):
+                                            row = label.row
+                                            col = label.column
+                                            length = label.length if label.length is not None else len(value)
+                                            
+                                            # ✅ ADD: Substitute variables in expected value
+                                            expected_value = self.main_window.substitute_execution_variables(value, self.test_case_name_input.text())
 
-                                                actual_value = autECLPS.GetText(row, col, length)
-                                                
-                                                # ✅ Use substituted expected_value
-                                                validation_passed = self.validate_field_value(actual_value, expected_value)
-                                                
-                                                if not validation_passed:
-                                                    if expected_value.lower() == '{blank}':  # ✅ CHANGED
-                                                        QMessageBox.warning(self, "Validation Failed",
-                                                            f"Utility Step {step_num}.{utility_idx + 1}: Field '{field_name}'\n"
-                                                            f"Expected: <blank>\n"
-                                                            f"Actual: '{actual_value.strip()}' (not blank)")
-                                                    else:
-                                                        QMessageBox.warning(self, "Validation Failed",
-                                                            f"Utility Step {step_num}.{utility_idx + 1}: Field '{field_name}'\n"
-                                                            f"Expected: '{expected_value}'\n"  # ✅ CHANGED
-                                                            f"Actual: '{actual_value.strip()}'")
-                                                    self.execution_stop_flag = True
-                                                
-                                                time.sleep(0.1)
-                                                break
-                        
+                                            actual_value = autECLPS.GetText(row, col, length)
+                                            
+                                            # ✅ Use substituted expected_value
+                                            validation_passed = self.validate_field_value(actual_value, expected_value)
+                                            
+                                            if not validation_passed:
+                                                if expected_value.lower() == '{blank}':  # ✅ CHANGED
+                                                    QMessageBox.warning(self, "Validation Failed",
+                                                        f"Utility Step {step_num}.{utility_idx + 1}: Field '{field_name}'\n"
+                                                        f"Expected: <blank>\n"
+                                                        f"Actual: '{actual_value.strip()}' (not blank)")
+                                                else:
+                                                    QMessageBox.warning(self, "Validation Failed",
+                                                        f"Utility Step {step_num}.{utility_idx + 1}: Field '{field_name}'\n"
+                                                        f"Expected: '{expected_value}'\n"  # ✅ CHANGED
+                                                        f"Actual: '{actual_value.strip()}'")
+                                                self.execution_stop_flag = True
+                                            
+                                            time.sleep(0.1)
+                                            break
+                    
                         elif utility_type == 'random_input':
                             row = int(utility_step.get('row', 1))
                             col = int(utility_step.get('column', 1))
@@ -9487,16 +9825,7 @@ class EditTestCaseDialog(QDialog):
         # ✅ Clear utility step reference when clicking on a main step
         self.current_utility_step = None
         
-        # Auto-save previous item if it exists
-        if previous_item:
-            # Remove bold from previous item
-            widget = self.steps_list_widget.itemWidget(previous_item)
-            if widget:
-                label = widget.findChild(QLabel)
-                if label:
-                    font = label.font()
-                    font.setBold(False)
-                    label.setFont(font)
+        # ✅ CHANGED: The current step is drawn in bold by StepItemDelegate
 
         # Clear table if multiple items are selected
         if len(self.steps_list_widget.selectedItems()) > 1:
@@ -9506,15 +9835,6 @@ class EditTestCaseDialog(QDialog):
         self.details_table.setRowCount(0)
         
         if current_item:
-            # Make current item bold
-            widget = self.steps_list_widget.itemWidget(current_item)
-            if widget:
-                label = widget.findChild(QLabel)
-                if label:
-                    font = label.font()
-                    font.setBold(True)
-                    label.setFont(font)
-            
             current_step_index = self.steps_list_widget.row(current_item)
             
             # ✅ CRITICAL FIX: If we were editing a utility step and clicked on the same main step,
@@ -10456,7 +10776,7 @@ class EditTestCaseDialog(QDialog):
                 "action_type": captured_action_type,
                 "fields": fields
             }
-            utility_step['module_version'] = self.module_versions.get(selected_item)
+            utility_step['module_version'] = self.main_window.module_index.version(selected_item)
             # Clear inputs
             self.dynamic_list_combobox.clearEditText()
             self.dynamic_list_combobox.setCurrentIndex(0)
@@ -10882,17 +11202,9 @@ class EditTestCaseDialog(QDialog):
                     is_validate_utility = True
                 
                 # ✅ NEW: Check if utility module is outdated
-                module_name = utility_step.get('module_name')
-                if module_name and module_name in self.modules:
-                    utility_version = utility_step.get('module_version')
-                    current_version = self.module_versions.get(module_name)
-                    if utility_version is None or utility_version != current_version:
-                        numbered_name += " ⚠️"
-                        is_outdated = True
-                    else:
-                        is_outdated = False
-                else:
-                    is_outdated = False
+                is_outdated = self.main_window.module_index.is_stale(utility_step)
+                if is_outdated:
+                    numbered_name += " ⚠️"
             else:
                 is_outdated = False
             
@@ -11058,7 +11370,7 @@ class EditTestCaseDialog(QDialog):
             "action_type": action_type,
             "fields": fields
         }
-        utility_step['module_version'] = self.module_versions.get(module_name)
+        utility_step['module_version'] = self.main_window.module_index.version(module_name)
         # Add to utility steps
         step_data['utility_steps'].append(utility_step)
         
@@ -12247,6 +12559,40 @@ class CustomPCOMMTextEdit(QTextEdit):
         super().__init__(parent)
         self.main_window = None
         self.is_selecting = False
+        # ✅ NEW: Plain text goes into this document; cached previews are shown with show_document()
+        self.own_document = QTextDocument(self)
+        self.setDocument(self.own_document)
+        # ✅ NEW: While the live screen mirror is on it keeps the edit; previews shown
+        # meanwhile are remembered and come back when the mirror stops
+        self.live_document = None
+        self.requested_document = self.own_document
+    
+    def show_document(self, document):
+        """Shows a prepared document (e.g. from PreviewDocumentCache) without copying it."""
+        self.requested_document = document
+        if self.live_document is None and self.document() is not document:
+            self.setDocument(document)
+    
+    def setText(self, text):
+        """Writes into the edit's own document, never into a cached preview."""
+        self.requested_document = self.own_document
+        if self.live_document is not None:
+            self.own_document.setPlainText(text)
+            return
+        if self.document() is not self.own_document:
+            self.setDocument(self.own_document)
+        super().setText(text)
+    
+    def set_live_document(self, document):
+        """
+        Shows the live screen mirror's document in place of the previews, or
+        with None, goes back to the last preview shown.
+        """
+        self.live_document = document
+        self.setExtraSelections([])
+        target = document if document is not None else self.requested_document
+        if self.document() is not target:
+            self.setDocument(target)
     
     def mousePressEvent(self, event):
         """Track when mouse button is pressed."""
@@ -12399,6 +12745,463 @@ class BreakExecutionDialog(QDialog):
         """Returns the selected action."""
         return self.result_action
 
+# --- NEW: Library Tree Action Buttons ---
+class LibraryTreeActionDelegate(QStyledItemDelegate):
+    """
+    Paints the save and delete buttons of the module and test case trees and
+    handles clicks on them, instead of a QWidget with two QPushButtons per
+    row. The icons are loaded from disk once and shared by every tree.
+    """
+
+    ActionsRole = Qt.ItemDataRole.UserRole + 2  # True on items that show the buttons
+    # (action, icon file, button size, icon size, hover color, tooltip)
+    BUTTONS = (
+        ('save', "save.png", 17, 13, '#e0e0e0', "Save '{}' to a file."),
+        ('delete', "bin.png", 20, 16, '#fee2e2', "Delete '{}'"),
+    )
+    SPACING = 5
+    RIGHT_MARGIN = 10
+    _icons = {}
+
+    def __init__(self, tree, on_action):
+        """
+        Args:
+            tree: The QTreeWidget; the buttons are painted in its column 1
+            on_action: Callable(action, name) run when 'save' or 'delete' is clicked
+        """
+        super().__init__(tree)
+        self.tree = tree
+        self.on_action = on_action
+        self._hover_rect = QRect()
+        tree.setMouseTracking(True)
+
+    @classmethod
+    def icon(cls, file_name):
+        """Returns the shared QIcon for an icon file, loading it on first use."""
+        icon = cls._icons.get(file_name)
+        if icon is None:
+            icon = cls._icons[file_name] = QIcon(file_name)
+        return icon
+
+    def button_rects(self, rect):
+        """Returns [(button, QRect)] laid out like the old button row."""
+        rects = []
+        left = rect.left()
+        for button in self.BUTTONS:
+            size = button[2]
+            rects.append((button, QRect(left, rect.center().y() - size // 2, size, size)))
+            left += size + self.SPACING
+        return rects
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        if index.column() != 1:
+            return size
+        width = sum(button[2] for button in self.BUTTONS) + self.SPACING * len(self.BUTTONS) + self.RIGHT_MARGIN
+        return QSize(width, max(size.height(), 20))
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if index.column() != 1 or not index.data(self.ActionsRole):
+            return
+        mouse = self.tree.viewport().mapFromGlobal(QCursor.pos())
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for (action, file_name, size, icon_size, hover_color, _), rect in self.button_rects(option.rect):
+            if rect.contains(mouse):
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor(hover_color))
+                painter.drawRoundedRect(rect, 4, 4)
+            margin = (size - icon_size) // 2
+            self.icon(file_name).paint(painter, rect.adjusted(margin, margin, -margin, -margin))
+        painter.restore()
+
+    def button_at(self, option, index, position):
+        if index.column() != 1 or not index.data(self.ActionsRole):
+            return None
+        return next((button for button, rect in self.button_rects(option.rect) if rect.contains(position)), None)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                                QEvent.Type.MouseButtonDblClick, QEvent.Type.MouseMove):
+            return False
+        button = self.button_at(option, index, event.position().toPoint())
+        if event.type() == QEvent.Type.MouseMove:
+            viewport = self.tree.viewport()
+            if button:
+                viewport.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                viewport.unsetCursor()
+            # Repaint the hover highlight of the row left and of the row entered
+            hover_rect = option.rect if index.column() == 1 else QRect()
+            if hover_rect != self._hover_rect:
+                viewport.update(self._hover_rect)
+                self._hover_rect = hover_rect
+            viewport.update(hover_rect)
+            return False
+        if button is None:
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            name = index.siblingAtColumn(0).data(Qt.ItemDataRole.UserRole)
+            # Run after the event returns: delete removes the clicked row
+            QTimer.singleShot(0, lambda: self.on_action(button[0], name))
+        # Presses on a button do not change the selection, like the old QPushButtons
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        button = self.button_at(option, index, event.pos())
+        if button is not None:
+            QToolTip.showText(event.globalPos(), button[5].format(index.siblingAtColumn(0).data()), view)
+            return True
+        return super().helpEvent(event, view, option, index)
+
+
+# --- NEW: Module Details Rendering ---
+class PreviewDocumentCache:
+    """
+    Keeps the rendered QTextDocument of the most recently shown previews, so
+    showing a module again only swaps documents instead of re-running the
+    highlighting and re-parsing and laying out the HTML. Documents are keyed
+    by the captured text itself, so edited modules never show a stale
+    rendering.
+    """
+
+    def __init__(self, text_edit, render, max_documents=32):
+        """
+        Args:
+            text_edit: The CustomPCOMMTextEdit the documents are shown in
+            render: Callable(text) returning the preview HTML
+            max_documents: Number of rendered previews kept
+        """
+        self.text_edit = text_edit
+        self.render = render
+        self.max_documents = max_documents
+        self._documents = {}  # {text: QTextDocument}, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def document(self, text):
+        """Returns the rendered document of a text, rendering it on a miss."""
+        document = self._documents.pop(text, None)
+        if document is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            document = QTextDocument(self.text_edit)
+            document.setDefaultFont(self.text_edit.font())
+            document.setHtml(self.render(text))
+            if len(self._documents) >= self.max_documents:
+                oldest = next(iter(self._documents))
+                evicted = self._documents.pop(oldest)
+                if not self.is_in_use(evicted):
+                    evicted.deleteLater()
+        self._documents[text] = document  # Most recently used last
+        return document
+
+    def clear(self):
+        """Drops every cached document except the one on screen."""
+        for document in self._documents.values():
+            if not self.is_in_use(document):
+                document.deleteLater()
+        self._documents = {}
+
+    def is_in_use(self, document):
+        """True for the document on screen, or the one shown again when the live mirror stops."""
+        return document is self.text_edit.document() or document is self.text_edit.requested_document
+
+
+class LabelsTableDelegate(QStyledItemDelegate):
+    """
+    Paints the delete button in the last column of the module labels table
+    and handles clicks on it, instead of a QPushButton per label.
+    """
+
+    DELETE_COLUMN = 4
+
+    def __init__(self, table, on_delete):
+        """
+        Args:
+            table: The labels QTableWidget
+            on_delete: Callable(row) run when a row's delete button is clicked
+        """
+        super().__init__(table)
+        self.table = table
+        self.on_delete = on_delete
+        self.bin_icon = QIcon("bin.png")
+        self._hover_rect = QRect()
+        table.setMouseTracking(True)
+
+    def button_rect(self, rect):
+        return QRect(rect.center().x() - 10, rect.center().y() - 10, 20, 20)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        if index.column() != self.DELETE_COLUMN:
+            return
+        rect = self.button_rect(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if rect.contains(self.table.viewport().mapFromGlobal(QCursor.pos())):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor('#fee2e2'))
+            painter.drawRoundedRect(rect, 3, 3)
+        self.bin_icon.paint(painter, rect.adjusted(2, 2, -2, -2))
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        if index.column() == self.DELETE_COLUMN:
+            return None
+        return super().createEditor(parent, option, index)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+                                QEvent.Type.MouseButtonDblClick, QEvent.Type.MouseMove):
+            return False
+        on_button = (index.column() == self.DELETE_COLUMN
+                     and self.button_rect(option.rect).contains(event.position().toPoint()))
+        if event.type() == QEvent.Type.MouseMove:
+            viewport = self.table.viewport()
+            if on_button:
+                viewport.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                viewport.unsetCursor()
+            hover_rect = option.rect if index.column() == self.DELETE_COLUMN else QRect()
+            if hover_rect != self._hover_rect:
+                viewport.update(self._hover_rect)
+                self._hover_rect = QRect(hover_rect)
+            viewport.update(hover_rect)
+            return False
+        if index.column() != self.DELETE_COLUMN:
+            return False
+        if on_button and event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            row = index.row()
+            # Run after the event returns: delete removes the clicked row
+            QTimer.singleShot(0, lambda: self.on_delete(row))
+        # The delete column never selects or edits, like the old button cell
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        if index.column() == self.DELETE_COLUMN and self.button_rect(option.rect).contains(event.pos()):
+            QToolTip.showText(event.globalPos(), "Delete label", view)
+            return True
+        return super().helpEvent(event, view, option, index)
+
+
+# --- NEW: Import File Parser Thread ---
+class ImportParseThread(QThread):
+    """
+    Parses and validates import files on a worker thread, in the order of
+    file_paths, so name conflicts resolve the same way on every run. Parsing
+    holds the GIL, so one worker is as fast as a pool would be; it only keeps
+    the GUI thread free to paint and handle input meanwhile.
+    
+    Signals:
+        progress(done, total): Emitted every 50 files and after the last one
+        parsed(entries, failed): [(name, record, file name), ...] and [failure message, ...]
+    """
+    progress = pyqtSignal(int, int)
+    parsed = pyqtSignal(list, list)
+    
+    def __init__(self, file_paths, kind, parent=None):
+        super().__init__(parent)
+        self.file_paths = list(file_paths)
+        self.kind = kind
+    
+    def run(self):
+        entries = []
+        failed = []
+        for done_count, file_path in enumerate(self.file_paths, start=1):
+            records, problems = parse_import_file(file_path, self.kind)
+            file_name = os.path.basename(file_path)
+            failed.extend(f"{file_name}: {problem}" for problem in problems)
+            entries.extend((name, record, file_name) for name, record in records.items())
+            if done_count % 50 == 0 or done_count == len(self.file_paths):
+                self.progress.emit(done_count, len(self.file_paths))
+        self.parsed.emit(entries, failed)
+
+
+# --- NEW: Live Screen Mirror ---
+class ScreenMirror:
+    """
+    Mirrors the host screen of the PCOMM session into the preview while it is
+    on. A coarse QTimer polls the session once per interval (one GetText and
+    the cursor position); ScreenFrameTracker tells which rows changed, and only
+    those blocks of the mirror document are rewritten, so an idle screen costs
+    one string compare per poll. The labels of the module being viewed and the
+    host cursor are drawn over the screen as extra selections.
+    """
+
+    DEFAULT_INTERVAL_MS = 250
+    MIN_INTERVAL_MS = 50
+    MAX_FAILURES = 3  # Consecutive failed reads before the mirror turns itself off
+
+    def __init__(self, text_edit, open_session, interval_ms=DEFAULT_INTERVAL_MS, rows=24, cols=80, on_error=None):
+        """
+        Args:
+            text_edit: The CustomPCOMMTextEdit the screen is mirrored into
+            open_session: Callable returning the autECLPS object to poll
+            interval_ms: Milliseconds between polls
+            rows: Number of screen rows (default 24)
+            cols: Number of screen columns (default 80)
+            on_error: Callable(message) run when the mirror stops on an error
+        """
+        self.text_edit = text_edit
+        self.open_session = open_session
+        self.on_error = on_error
+        self.rows = rows
+        self.cols = cols
+        self.tracker = ScreenFrameTracker(rows, cols)
+        self.session = None
+        self.labels = []
+        self.cursor_position = None
+        self.failures = 0
+        self.polls = 0
+        self.repainted_rows = 0
+        self.poll_seconds = 0.0
+
+        self.document = QTextDocument(text_edit)
+        self.document.setUndoRedoEnabled(False)  # Rows are rewritten for hours; keep no history
+
+        self.label_format = QTextCharFormat()
+        self.label_format.setBackground(QColor(107, 44, 145, 150))
+        self.label_format.setFontUnderline(True)
+        self.cursor_format = QTextCharFormat()
+        self.cursor_format.setBackground(QColor('#00ffff'))
+        self.cursor_format.setForeground(QColor('#1e1e1e'))
+
+        self.timer = QTimer(text_edit)
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.timer.timeout.connect(self.poll)
+        self.set_interval(interval_ms)
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def set_interval(self, interval_ms):
+        self.timer.setInterval(max(self.MIN_INTERVAL_MS, int(interval_ms)))
+
+    def start(self):
+        """Shows the mirror in the preview and starts polling."""
+        self.document.setDefaultFont(self.text_edit.font())
+        self.document.setPlainText('\n'.join([' ' * self.cols] * self.rows))
+        self.tracker.reset()
+        self.cursor_position = None
+        self.failures = 0
+        self.text_edit.set_live_document(self.document)
+        self.timer.start()
+        self.poll()
+
+    def stop(self):
+        """Stops polling and gives the preview back to the module previews."""
+        self.timer.stop()
+        self.session = None
+        if self.text_edit.live_document is self.document:
+            self.text_edit.set_live_document(None)
+
+    def reconnect(self):
+        """Opens the session again on the next poll (e.g. after the PCOMM window changed)."""
+        self.session = None
+        self.tracker.reset()
+
+    def set_labels(self, labels):
+        """Sets the labels drawn over the screen (the module being viewed)."""
+        self.labels = list(labels or [])
+        if self.is_running():
+            self.update_overlay()
+
+    def poll(self):
+        """Reads the screen once and repaints the rows that changed."""
+        if not self.text_edit.isVisible() or self.text_edit.window().isMinimized():
+            return
+        start = time.perf_counter()
+        if self.session is None:
+            try:
+                self.session = self.open_session()
+            except Exception as e:
+                self.fail(f"Could not connect to the PCOMM session: {e}")
+                return
+
+        screen_text = get_screen_content(self.session, self.rows, self.cols)
+        if screen_text is None:
+            # Reconnect on the next poll; give up if the session stays unreadable
+            self.session = None
+            self.failures += 1
+            if self.failures >= self.MAX_FAILURES:
+                self.fail("Lost the PCOMM session.")
+            return
+        self.failures = 0
+
+        changed = self.tracker.update(screen_text)
+        if changed:
+            self.repaint_rows(changed)
+        cursor_position = self.read_cursor()
+        # Rewritten rows drop the overlay on them, so it is redrawn after any change
+        if changed or cursor_position != self.cursor_position:
+            self.cursor_position = cursor_position
+            self.update_overlay()
+
+        self.polls += 1
+        self.poll_seconds += time.perf_counter() - start
+
+    def read_cursor(self):
+        """Returns the host cursor as 1-based (row, col), or None if the session does not tell."""
+        try:
+            return int(self.session.CursorPosRow), int(self.session.CursorPosCol)
+        except Exception:
+            return None
+
+    def repaint_rows(self, rows):
+        """Rewrites the given 0-based rows of the mirror document from the last frame."""
+        cursor = QTextCursor(self.document)
+        cursor.beginEditBlock()
+        for row in rows:
+            block = self.document.findBlockByNumber(row)
+            cursor.setPosition(block.position())
+            cursor.setPosition(block.position() + block.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(self.tracker.row_texts[row])
+        cursor.endEditBlock()
+        self.repainted_rows += len(rows)
+
+    def selection(self, row, column, length, text_format):
+        """Returns an extra selection of length characters at a 1-based row/column, or None if off screen."""
+        if not 1 <= row <= self.rows or not 1 <= column <= self.cols or length <= 0:
+            return None
+        block = self.document.findBlockByNumber(row - 1)
+        start = block.position() + column - 1
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = QTextCursor(self.document)
+        selection.cursor.setPosition(start)
+        selection.cursor.setPosition(min(start + length, block.position() + self.cols), QTextCursor.MoveMode.KeepAnchor)
+        selection.format = text_format
+        return selection
+
+    def update_overlay(self):
+        """Draws the labels and the host cursor over the mirrored screen."""
+        if self.text_edit.live_document is not self.document:
+            return
+        selections = []
+        for label in self.labels:
+            try:
+                selections.append(self.selection(int(label.get('row', 0)), int(label.get('column', 0)),
+                                                 int(label.get('length', 0)), self.label_format))
+            except (TypeError, ValueError):
+                continue
+        if self.cursor_position:
+            selections.append(self.selection(*self.cursor_position, 1, self.cursor_format))
+        self.text_edit.setExtraSelections([selection for selection in selections if selection is not None])
+
+    def fail(self, message):
+        print(f"Live screen mirror stopped: {message}", file=sys.__stdout__)  # Never part of a run log
+        self.stop()
+        if self.on_error:
+            self.on_error(message)
+
+    def report(self):
+        """Returns a one-line summary of the polling cost."""
+        average = self.poll_seconds * 1000 / self.polls if self.polls else 0.0
+        return f"{self.polls} poll(s), {self.repainted_rows} row(s) repainted, {average:.2f} ms per poll"
+
+
 class PCOMMMainFrame(QMainWindow):
     """
     The main window for the PCOMM desktop application,
@@ -12811,6 +13614,17 @@ class PCOMMMainFrame(QMainWindow):
         self.template_file = 'templates.json'
         self.template_tree_root = None
         
+        # ✅ NEW: Modules, test cases and templates are stored in SQLite (migrated once from the JSON files)
+        self.library_db_file = 'library.db'
+        self.library = LibraryRepository(self.library_db_file)
+        self.library.add_listener(self.on_library_written)  # ✅ NEW: Keeps active searches current
+        # ✅ NEW: Per-module label index, version hashes and module -> steps references
+        self.module_index = ModuleIndex(self.library, lambda: self.modules, lambda: self.test_cases)
+        
+        # ✅ NEW: Coalescing, atomic write-behind saves for configuration and execution state
+        self.persistence = PersistenceService()
+        self.persistence.save_failed.connect(self.on_save_failed)
+        
         self.document_config = {'text_elements': [], 'highlight_color': 'Yellow', 'generate_documentation': True}  # ✅ Updated default structure
         self.document_config_file = 'document_config.json'
         self.load_document_config()
@@ -12831,6 +13645,9 @@ class PCOMMMainFrame(QMainWindow):
         self.num_cols = 80
         self.module_tree_root = None
         self.test_case_tree_root = None
+        self.module_tree_items = {}  # ✅ NEW: {module name: tree item}, kept in step with the store
+        self.test_case_tree_items = {}  # ✅ NEW: {test case name: tree item}
+        self._deferred_trees = {}  # ✅ NEW: {tree: build} for library trees not shown yet
         self.current_selected_module = None
         self.libraries_dock = None
         self.bottom_dock = None
@@ -12866,9 +13683,11 @@ class PCOMMMainFrame(QMainWindow):
         self.create_dock_widgets()
         self.create_central_widget()
         self.setStatusBar(QStatusBar(self))
+        startup_profiler.mark('window constructed')  # ✅ NEW
         self.load_modules_from_file()
         self.load_test_cases_from_file()
         self.load_templates_from_file()
+        startup_profiler.mark('library loaded')  # ✅ NEW
         
         self.toggle_modules_button_action.toggled.connect(
             lambda checked: self.toggle_libraries_dock_and_tabs(checked, 'modules')
@@ -12885,6 +13704,9 @@ class PCOMMMainFrame(QMainWindow):
         self.bottom_dock.visibilityChanged.connect(self.toggle_properties_action.setChecked)
         
         self.libraries_tabs.tabCloseRequested.connect(self.close_library_tab)
+        # ✅ NEW: Library trees are filled when they are first shown
+        self.libraries_tabs.currentChanged.connect(lambda _: self.build_visible_trees())
+        self.libraries_dock.visibilityChanged.connect(lambda _: self.build_visible_trees())
         
         self._saved_libraries_state = False
         self._saved_properties_state = False
@@ -13060,6 +13882,34 @@ class PCOMMMainFrame(QMainWindow):
         
         file_menu.addSeparator()
         
+        # ✅ NEW: Move a whole library between machines as one file
+        export_bundle_action = QAction("Export Library Bundle...", self)
+        export_bundle_action.triggered.connect(lambda: self.export_library_bundle())
+        file_menu.addAction(export_bundle_action)
+        
+        import_bundle_action = QAction("Import Library Bundle...", self)
+        import_bundle_action.triggered.connect(self.import_library_bundle)
+        file_menu.addAction(import_bundle_action)
+        
+        file_menu.addSeparator()
+        
+        # ✅ NEW: Rebuild evidence documents from a recorded run
+        rerender_reports_action = QAction("Re-render Reports...", self)
+        rerender_reports_action.triggered.connect(self.rerender_reports)
+        file_menu.addAction(rerender_reports_action)
+        
+        # ✅ NEW: Golden-screen regression diff between two recorded runs
+        compare_runs_action = QAction("Compare Runs...", self)
+        compare_runs_action.triggered.connect(self.compare_runs)
+        file_menu.addAction(compare_runs_action)
+        
+        # ✅ NEW: Bulk refresh of steps built against an older module definition
+        refresh_stale_action = QAction("Refresh Stale Steps...", self)
+        refresh_stale_action.triggered.connect(self.refresh_stale_steps)
+        file_menu.addAction(refresh_stale_action)
+        
+        file_menu.addSeparator()
+        
         # Configure action
         configure_action = QAction("Configure...", self)
         configure_action.triggered.connect(self.open_settings_dialog)
@@ -13079,6 +13929,17 @@ class PCOMMMainFrame(QMainWindow):
         self.toggle_properties_action = QAction("Module & Properties", self, checkable=True)
         window_menu.addAction(self.toggle_properties_action)
 
+        # ✅ NEW: Live mirror of the PCOMM screen in the preview
+        window_menu.addSeparator()
+        self.toggle_mirror_action = QAction("Live Screen Mirror", self, checkable=True)
+        self.toggle_mirror_action.triggered.connect(self.toggle_screen_mirror)
+        window_menu.addAction(self.toggle_mirror_action)
+
+        # ✅ NEW: Run console over the run log
+        run_console_action = QAction("Run Console", self)
+        run_console_action.triggered.connect(self.show_run_console)
+        window_menu.addAction(run_console_action)
+
         # Show Toolbar option
         window_menu.addSeparator()
         self.toggle_toolbar_action = QAction("Show Toolbar", self, checkable=True)
@@ -13461,6 +14322,9 @@ class PCOMMMainFrame(QMainWindow):
         """)
 
         self.pcomm_canvas_text_edit.setText("PCOMM Screenshot Preview")
+        self.preview_cache = PreviewDocumentCache(self.pcomm_canvas_text_edit, self.preview_html)  # ✅ NEW
+        self.screen_mirror = ScreenMirror(self.pcomm_canvas_text_edit, self.open_mirror_session,  # ✅ NEW
+                                          self.mirror_interval_ms, on_error=self.on_screen_mirror_error)
         
         # FIXED: Add to layout with stretch factor to make it flexible
         layout.addWidget(self.pcomm_canvas_text_edit, 1)  # stretch factor = 1
@@ -13514,8 +14378,14 @@ class PCOMMMainFrame(QMainWindow):
         self.modules_widget = QWidget()
         modules_layout = QVBoxLayout(self.modules_widget)
         self.modules_search_bar = QLineEdit()
-        self.modules_search_bar.setPlaceholderText("Search modules...")
-        self.modules_search_bar.textChanged.connect(self.filter_modules)
+        self.modules_search_bar.setPlaceholderText("Search modules, labels...")
+        self.modules_search_bar.setToolTip(LIBRARY_SEARCH_HELP)
+        # ✅ CHANGED: Debounced indexed search instead of a scan per keystroke
+        self.modules_search_timer = QTimer(self)
+        self.modules_search_timer.setSingleShot(True)
+        self.modules_search_timer.setInterval(LIBRARY_SEARCH_DELAY_MS)
+        self.modules_search_timer.timeout.connect(lambda: self.filter_modules(self.modules_search_bar.text()))
+        self.modules_search_bar.textChanged.connect(lambda _: self.modules_search_timer.start())
         modules_layout.addWidget(self.modules_search_bar)
 
         self.module_tree = QTreeWidget()
@@ -13529,6 +14399,8 @@ class PCOMMMainFrame(QMainWindow):
         self.module_tree.itemClicked.connect(self.display_module_details_and_screenshot)
         self.module_tree.setEditTriggers(QTreeWidget.EditTrigger.DoubleClicked)
         self.module_tree.itemChanged.connect(self.handle_rename_finish)
+        # ✅ NEW: Save/delete buttons are painted by a delegate, not a widget per row
+        self.module_tree.setItemDelegate(LibraryTreeActionDelegate(self.module_tree, self.on_module_tree_action))
         self.module_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.module_tree.customContextMenuRequested.connect(self.show_context_menu)
         self.module_tree.installEventFilter(self)  # ✅ ADD THIS LINE
@@ -13538,8 +14410,13 @@ class PCOMMMainFrame(QMainWindow):
         self.test_cases_widget = QWidget()
         test_cases_layout = QVBoxLayout(self.test_cases_widget)
         self.test_cases_search_bar = QLineEdit()
-        self.test_cases_search_bar.setPlaceholderText("Search test cases...")
-        self.test_cases_search_bar.textChanged.connect(self.filter_test_cases)
+        self.test_cases_search_bar.setPlaceholderText("Search test cases, steps, fields, values...")
+        self.test_cases_search_bar.setToolTip(LIBRARY_SEARCH_HELP)
+        self.test_cases_search_timer = QTimer(self)
+        self.test_cases_search_timer.setSingleShot(True)
+        self.test_cases_search_timer.setInterval(LIBRARY_SEARCH_DELAY_MS)
+        self.test_cases_search_timer.timeout.connect(lambda: self.filter_test_cases(self.test_cases_search_bar.text()))
+        self.test_cases_search_bar.textChanged.connect(lambda _: self.test_cases_search_timer.start())
         test_cases_layout.addWidget(self.test_cases_search_bar)
 
         self.test_case_tree = QTreeWidget()
@@ -13553,6 +14430,8 @@ class PCOMMMainFrame(QMainWindow):
         self.test_case_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.test_case_tree.customContextMenuRequested.connect(self.show_test_case_context_menu)
         self.test_case_tree.itemDoubleClicked.connect(self.on_test_case_item_double_clicked)
+        self.test_case_tree.itemExpanded.connect(self.populate_test_case_tree_item)  # ✅ NEW: Lazy step children
+        self.test_case_tree.setItemDelegate(LibraryTreeActionDelegate(self.test_case_tree, self.on_test_case_tree_action))
         self.test_case_tree.installEventFilter(self)  # ✅ ADD THIS LINE
         test_cases_layout.addWidget(self.test_case_tree)
 
@@ -13824,9 +14703,8 @@ class PCOMMMainFrame(QMainWindow):
             self.test_cases[new_test_case_id] = new_test_case
             created_count += 1
         
-        # Save and update
+        # Save (the tree picks up the new test cases from the store)
         self.save_test_cases_to_file()
-        self.update_test_case_tree()
         
         # Ensure Test Cases tab is visible
         test_cases_tab_index = -1
@@ -13913,15 +14791,19 @@ class PCOMMMainFrame(QMainWindow):
                 additional_info_fields,
                 additional_info_values
             )
-            result = dialog.exec()
+            # ✅ NEW: The dialog edits the record's steps in place; keep that record hydrated
+            self.test_cases.pin(test_case_id)
+            try:
+                result = dialog.exec()
+            finally:
+                self.test_cases.unpin(test_case_id)
             
             # ✅ REMOVED: All the manual save logic below - the dialog already handles it in accept()
             # Just refresh the UI after the dialog closes
             if hasattr(self, 'populate_test_cases_list'):
                 self.populate_test_cases_list()
             
-            if hasattr(self, 'update_test_case_tree'):
-                self.update_test_case_tree()
+            # ✅ CHANGED: The dialog writes through the store, which updates the tree item
             
             # Force process events to ensure UI updates
             QApplication.processEvents()
@@ -13939,7 +14821,7 @@ class PCOMMMainFrame(QMainWindow):
             self.test_cases[test_case_id]['steps'].append(new_step)
             
             # Refresh the UI to show the new step
-            self.update_test_case_tree()
+            self.test_cases.touch(test_case_id)
             self.save_test_cases_to_file()
             QMessageBox.information(self, "Updated", f"Added '{module_name}' to test case '{test_case_id}'.")
         else:
@@ -14125,6 +15007,7 @@ class PCOMMMainFrame(QMainWindow):
         self.labels_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed)
         self.labels_table.horizontalHeader().setStretchLastSection(False)
         self.labels_table.setColumnWidth(4, 30)
+        self.labels_table.setItemDelegate(LabelsTableDelegate(self.labels_table, self.delete_label))  # ✅ NEW
         self.labels_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.labels_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
         self.labels_table.cellClicked.connect(self.display_selected_label_properties)
@@ -14286,43 +15169,46 @@ class PCOMMMainFrame(QMainWindow):
         """
         Filters the modules tree based on the search query.
         """
-        if not self.module_tree_root:
-            return
-            
-        query = query.strip().lower()
-        for i in range(self.module_tree_root.childCount()):
-            item = self.module_tree_root.child(i)
-            item_text = item.text(0).lower()
-            if query in item_text:
-                item.setHidden(False)
-            else:
-                item.setHidden(True)
+        # ✅ CHANGED: Answered by the library search index (see LibraryRepository.search)
+        self.filter_library_tree('modules', self.module_tree_items, query)
 
     def filter_test_cases(self, query: str):
         """
-        Filters the test case tree based on the search query.
-        This also filters the steps within each test case.
+        Filters the test case tree based on the search query. Matches names,
+        descriptions, step types, modules, fields and values.
+        """
+        # ✅ CHANGED: Answered by the library search index (see LibraryRepository.search)
+        self.filter_library_tree('test_cases', self.test_case_tree_items, query)
+    
+    def filter_library_tree(self, table, items, query):
+        """
+        Shows only the tree items matching a library search query.
+        
+        Args:
+            table: 'modules' or 'test_cases'
+            items: The {name: item} map of the tree
+            query: The search text (empty shows everything)
         """
-        if not self.test_case_tree_root:
+        if not query.strip():
+            for item in items.values():
+                item.setHidden(False)
             return
-
-        query = query.strip().lower()
-        for i in range(self.test_case_tree_root.childCount()):
-            test_case_item = self.test_case_tree_root.child(i)
-            found_match = False
-            
-            # Check the test case name itself
-            if query in test_case_item.text(0).lower():
-                found_match = True
-            
-            # Check the steps within the test case
-            for j in range(test_case_item.childCount()):
-                step_item = test_case_item.child(j)
-                step_text = step_item.text(0).lower()
-                if query in step_text:
-                    found_match = True
-                
-            test_case_item.setHidden(not found_match)
+        
+        start = time.perf_counter()
+        matches = self.library.search(table, query)
+        for name, item in items.items():
+            item.setHidden(name not in matches)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.statusBar().showMessage(f"{len(matches)} match(es) for '{query.strip()}' ({elapsed_ms:.0f} ms)", 5000)
+    
+    def on_library_written(self, table, changed, removed):
+        """Re-runs an active search when records of its table were written, so the index and the filter agree."""
+        if not hasattr(self, 'test_cases_search_timer'):
+            return  # Written before the UI exists
+        if table == 'modules' and self.modules_search_bar.text().strip():
+            self.modules_search_timer.start()
+        elif table == 'test_cases' and self.test_cases_search_bar.text().strip():
+            self.test_cases_search_timer.start()
 
     # --- NEW: Method to hide the PCOMM preview
     def hide_pcomm_preview(self):
@@ -14349,7 +15235,6 @@ class PCOMMMainFrame(QMainWindow):
                 "additional_info_values": {}       # ✅ ADD THIS
             }
             self.save_test_cases_to_file()
-            self.update_test_case_tree()
             self.statusBar().showMessage(f"Test case '{test_case_name}' created.", 5000)
 
     def show_test_case_context_menu(self, position: QPoint):
@@ -14397,6 +15282,14 @@ class PCOMMMainFrame(QMainWindow):
                 unlink_action.triggered.connect(lambda: self.unlink_data_source(test_case_name))
                 menu.addAction(unlink_action)
             
+            # ✅ NEW: Export the selected test cases (with the modules they use) as a bundle
+            menu.addSeparator()
+            test_case_names = [selected.text(0) for selected in self.test_case_tree.selectedItems()
+                               if selected.parent() is self.test_case_tree_root] or [test_case_name]
+            export_action = QAction("📦 Export Selected to Bundle...", self)
+            export_action.triggered.connect(lambda: self.export_library_bundle(test_case_names=test_case_names))
+            menu.addAction(export_action)
+            
             print("DEBUG CONTEXT MENU: Showing menu...")
             menu.exec(self.test_case_tree.viewport().mapToGlobal(position))
             print("DEBUG CONTEXT MENU: Menu closed")
@@ -14412,30 +15305,29 @@ class PCOMMMainFrame(QMainWindow):
         
         # Load existing execution data
         execution_data_file = 'test_execution_data.json'
+        self.persistence.flush()  # ✅ NEW: Make sure pending saves are on disk
         
         try:
             if os.path.exists(execution_data_file):
-                with open(execution_data_file, 'r') as f:
-                    execution_data = json.load(f)
+                execution_data = json_codec.read_file(execution_data_file)
             else:
                 execution_data = {
+                    'format': 2,
                     'projects': {},
                     'standalone': {}
                 }
             
-            # Get test case data and add it as standalone
-            test_case_data = copy.deepcopy(self.test_cases[test_case_name])
-            
-            # Add to standalone section
+            # ✅ CHANGED: Add it as standalone by reference (name + content hash) instead of a full copy
+            self.save_test_cases_to_file()  # The hash must match the stored record
             execution_data['standalone'][test_case_name] = {
                 'status': 'Not Run',
                 'selected_step': 0,
-                'test_case_data': test_case_data
+                '$ref': test_case_name,
+                'hash': self.library.record_digest('test_cases', test_case_name)
             }
             
             # Save back to file
-            with open(execution_data_file, 'w') as f:
-                json.dump(execution_data, f, indent=4)
+            atomic_write_json(execution_data_file, execution_data, indent=None)  # ✅ CHANGED: Atomic write
             
             # Show success message
             QMessageBox.information(
@@ -14507,6 +15399,15 @@ class PCOMMMainFrame(QMainWindow):
         self.toggle_test_cases_action.setChecked(is_visible)
 
 
+    def closeEvent(self, event):
+        """Writes any pending state before the application exits."""
+        if self.screen_mirror.is_running():  # ✅ NEW
+            self.toggle_screen_mirror(False)
+        # ✅ NEW: Flush write-behind saves
+        self.persistence.flush()
+        print(f"Persistence: {self.persistence.report()}")
+        super().closeEvent(event)
+
     def test_execution(self):
         """Handles the Test Execution workflow via a pop-up dialog."""
         dialog = TestExecutionDialog(self, test_cases_data=[])
@@ -14748,7 +15649,12 @@ class PCOMMMainFrame(QMainWindow):
         item = self.module_tree.itemAt(position)
         if item and item.parent() == self.module_tree_root:
             menu = QMenu()
-            # Only add other actions here if needed in the future
+            # ✅ NEW: Export the selected modules (with their screenshots) as a bundle
+            module_names = [selected.data(0, Qt.ItemDataRole.UserRole) for selected in self.module_tree.selectedItems()
+                            if selected.parent() == self.module_tree_root] or [item.data(0, Qt.ItemDataRole.UserRole)]
+            export_action = QAction("📦 Export Selected to Bundle...", self)
+            export_action.triggered.connect(lambda: self.export_library_bundle(module_names=module_names))
+            menu.addAction(export_action)
             menu.exec(self.module_tree.viewport().mapToGlobal(position))
 
     def scan_pcomm_screen(self):
@@ -14823,7 +15729,7 @@ class PCOMMMainFrame(QMainWindow):
             # Add other necessary data
             screenshot_dir = 'Modules Screenshots'
             module_data["screenshot"] = os.path.join(screenshot_dir, f"{module_name}.png")
-            module_data["captured_text"] = copied_text # Store the raw text for later display
+            module_data["captured_text"] = self.apply_masking_to_text(copied_text)  # ✅ CHANGED: Store the masked text for later display
 
             # Create the directory if it doesn't exist
             os.makedirs(screenshot_dir, exist_ok=True)
@@ -14834,7 +15740,6 @@ class PCOMMMainFrame(QMainWindow):
             self.modules[module_name] = module_data
             self.module_counter += 1
             self.save_modules_to_file()
-            self.update_module_tree()
             self.statusBar().showMessage(f"Scanned screen and created new module: {module_name}", 5000)
 
             # Update the central PCOMM preview canvas to show the text
@@ -14908,24 +15813,12 @@ class PCOMMMainFrame(QMainWindow):
         
         UPDATED: Now uses QTextEdit and highlights consecutive 'a' characters in red,
         but only if they are surrounded by spaces on both sides.
+        ✅ CHANGED: Rendered previews are cached (see PreviewDocumentCache), so
+        showing a module again only swaps in its document.
         """
         # Ensure the central widget is the QTextEdit before trying to set text
         if isinstance(self.centralWidget(), QFrame):
-            import re
-            
-            # Updated regex pattern to match 'a+' only if preceded and followed by a space
-            # Positive lookbehind (?<=\s) ensures there's a space before
-            # Positive lookahead (?=\s) ensures there's a space after
-            html_text = re.sub(
-                r'(?<=\s)(a+)(?=\s)', 
-                r'<span style="color: red;">\1</span>', 
-                text
-            )
-            
-            # Wrap in HTML with pre-formatted text to preserve spacing
-            html_content = f'<pre style="color: #00ffff; font-family: Courier New, monospace;">{html_text}</pre>'
-            
-            self.pcomm_canvas_text_edit.setHtml(html_content)
+            self.pcomm_canvas_text_edit.show_document(self.preview_cache.document(text))
             
             # Get the current text cursor
             cursor = self.pcomm_canvas_text_edit.textCursor()
@@ -14936,6 +15829,63 @@ class PCOMMMainFrame(QMainWindow):
             # Set the new cursor position and ensure it's visible
             self.pcomm_canvas_text_edit.setTextCursor(cursor)
     
+    @staticmethod
+    def preview_html(text):
+        """Returns the preview HTML of a captured text (rendered once per text by the preview cache)."""
+        import re
+        
+        # Updated regex pattern to match 'a+' only if preceded and followed by a space
+        # Positive lookbehind (?<=\s) ensures there's a space before
+        # Positive lookahead (?=\s) ensures there's a space after
+        html_text = re.sub(
+            r'(?<=\s)(a+)(?=\s)', 
+            r'<span style="color: red;">\1</span>', 
+            text
+        )
+        
+        # Wrap in HTML with pre-formatted text to preserve spacing
+        return f'<pre style="color: #00ffff; font-family: Courier New, monospace;">{html_text}</pre>'
+    
+    # --- NEW: Live Screen Mirror ---
+    def open_mirror_session(self):
+        """Opens the configured PCOMM session for the live mirror and returns its autECLPS."""
+        connection_name = self.get_connection_name_from_title(self.pcomm_window_title)
+        autECLSession, autECLPS = connect_pcomm_session(connection_name)
+        return autECLPS
+
+    def toggle_screen_mirror(self, checked):
+        """
+        Turns the live screen mirror on or off.
+        
+        Args:
+            checked: True to mirror the PCOMM screen in the preview
+        """
+        if checked:
+            self.central_frame.setVisible(True)
+            self.screen_mirror.start()
+            if self.screen_mirror.is_running():
+                self.statusBar().showMessage(
+                    f"Live screen mirror on (every {self.screen_mirror.timer.interval()} ms).", 3000)
+        else:
+            self.screen_mirror.stop()
+            print(f"Live screen mirror: {self.screen_mirror.report()}")
+            self.statusBar().showMessage("Live screen mirror off.", 3000)
+        self.toggle_mirror_action.setChecked(self.screen_mirror.is_running())
+
+    def on_screen_mirror_error(self, message):
+        """Unchecks the mirror action and reports why the mirror stopped."""
+        self.toggle_mirror_action.setChecked(False)
+        QMessageBox.warning(self, "Live Screen Mirror", message)
+
+    # --- NEW: Run Console ---
+    def show_run_console(self):
+        """Shows the run console, created on first use."""
+        if getattr(self, 'run_console', None) is None:
+            self.run_console = RunConsoleDialog(self)
+        self.run_console.show()
+        self.run_console.raise_()
+        self.run_console.activateWindow()
+
     def display_image_in_preview(self, image_path):
         """
         NOTE: This method is now obsolete as the central widget is a QTextEdit.
@@ -15090,212 +16040,232 @@ class PCOMMMainFrame(QMainWindow):
 
     def update_module_tree(self):
         """
-        Updates the module tree widget with the latest module data.
-        Ensures a clean slate before populating.
+        Rebuilds the module tree from the module store. Used when the whole
+        library is (re)loaded; single changes arrive through on_modules_changed.
+        While the tree is not shown the rebuild is deferred (see build_visible_trees).
         """
+        if self.defer_tree_build(self.module_tree, self.update_module_tree):
+            return
         # Clear the entire tree to remove all items.
         self.module_tree.clear()
+        self.module_tree_items = {}
 
         if self.modules:
             # Create the 'Modules' root item.
             self.module_tree_root = QTreeWidgetItem(self.module_tree, ["Modules"])
             self.module_tree_root.setExpanded(True)
-            
-            for module_name, module_data in self.modules.items():
-                module_item = QTreeWidgetItem(self.module_tree_root, [module_name])
-                module_item.setData(0, Qt.ItemDataRole.UserRole, module_name)
-                # Explicitly set the item to be editable
-                module_item.setFlags(module_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                
-                # Use a container widget to hold both buttons
-                button_widget = QWidget()
-                button_layout = QHBoxLayout(button_widget)
-                button_layout.setContentsMargins(0, 0, 0, 0)
-                button_layout.setSpacing(5)
-
-                save_button = QPushButton()
-
-                # Load the save.png icon
-                save_icon = QIcon("save.png")
-                save_button.setIcon(save_icon)
-                save_button.setIconSize(QSize(13, 13))  # Icon size slightly smaller than button
-
-                save_button.setFixedSize(17, 17)
-
-                save_button.setStyleSheet("""
-                    QPushButton {
-                        border: none;
-                        background-color: transparent;
-                        padding: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e0e0e0;
-                        border-radius: 4px;
-                    }
-                    QPushButton:pressed {
-                        background-color: #d0d0d0;
-                    }
-                """)
-                save_button.setCursor(Qt.CursorShape.PointingHandCursor)
-                save_button.setToolTip(f"Save '{module_name}' to a file.")
-                save_button.clicked.connect(lambda _, item=module_item: self.save_single_module(item.data(0, Qt.ItemDataRole.UserRole)))
-                button_layout.addWidget(save_button)
-                
-                # Example for module tree delete button
-                delete_button = QPushButton()
-
-                # Load the bin.png icon
-                bin_icon = QIcon("bin.png")
-                delete_button.setIcon(bin_icon)
-                delete_button.setIconSize(QSize(16, 16))  # Adjust icon size as needed
-
-                delete_button.setFixedSize(20, 20)
-                delete_button.setStyleSheet("""
-                    QPushButton {
-                        border: none;
-                        border-radius: 4px;
-                        background-color: transparent;
-                        padding: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: #fee2e2;
-                    }
-                    QPushButton:pressed {
-                        background-color: #fecaca;
-                    }
-                """)
-                delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-                delete_button.setToolTip(f"Delete '{module_name}'")
-                delete_button.clicked.connect(lambda _, item=module_item: self.delete_module(item))
-                button_layout.addWidget(delete_button)
-                
-                # MINIMAL CHANGE: Use the correct enum members for QSizePolicy
-                spacer = QSpacerItem(10, 0, QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Minimum)
-                button_layout.addItem(spacer)
-                
-                self.module_tree.setItemWidget(module_item, 1, button_widget)
+            # ✅ CHANGED: Items are created without widgets and added in one call
+            self.module_tree_root.addChildren([self.create_module_tree_item(name) for name in self.modules])
         else:
             # If no modules exist, reset the root reference.
             self.module_tree_root = None
+        if self.modules_search_bar.text().strip():
+            self.modules_search_timer.start()  # Re-apply the active search to the new items
+    
+    def create_module_tree_item(self, module_name):
+        """Creates the (unparented) tree item of a module and registers it by name."""
+        module_item = QTreeWidgetItem([module_name])
+        module_item.setData(0, Qt.ItemDataRole.UserRole, module_name)
+        module_item.setData(1, LibraryTreeActionDelegate.ActionsRole, True)
+        # Explicitly set the item to be editable
+        module_item.setFlags(module_item.flags() | Qt.ItemFlag.ItemIsEditable)
+        self.module_tree_items[module_name] = module_item
+        return module_item
+    
+    def on_module_tree_action(self, action, module_name):
+        """Runs a save or delete button click from the module tree."""
+        if action == 'save':
+            self.save_single_module(module_name)
+        elif module_name in self.module_tree_items:
+            self.delete_module(self.module_tree_items[module_name])
+    
+    def on_modules_changed(self, event, names):
+        """Applies a module store change to the module tree, touching only the affected items."""
+        if self.module_tree in self._deferred_trees:
+            return  # Not built yet: the deferred build reads the store as it is then
+        self.apply_library_tree_change(self.module_tree, self.module_tree_items, self.modules, event, names)
     
     # NEW: Method to update the test case tree
     def update_test_case_tree(self):
         """
-        Updates the test case tree widget with the latest test case data.
-        Shows all step types with descriptive names matching the Edit Test Case dialog.
+        Rebuilds the test case tree from the test case store. Used when the
+        whole library is (re)loaded; single changes arrive through
+        on_test_cases_changed. While the tree is not shown the rebuild is
+        deferred (see build_visible_trees).
         """
+        if self.defer_tree_build(self.test_case_tree, self.update_test_case_tree):
+            return
         self.test_case_tree.clear()
+        self.test_case_tree_items = {}
         
         if self.test_cases:
             self.test_case_tree_root = QTreeWidgetItem(self.test_case_tree, ["Test Cases"])
             self.test_case_tree_root.setExpanded(True)
-
-            for test_case_name, test_case_data in self.test_cases.items():
-                test_case_item = QTreeWidgetItem(self.test_case_tree_root, [test_case_name])
-                test_case_item.setData(0, Qt.ItemDataRole.UserRole, test_case_name)
-                
-                # Use a container widget to hold both buttons
-                button_widget = QWidget()
-                button_layout = QHBoxLayout(button_widget)
-                button_layout.setContentsMargins(0, 0, 0, 0)
-                button_layout.setSpacing(5)
-
-                # Load the save.png icon
-                save_icon = QIcon("save.png")
-                save_button = QPushButton()
-                save_button.setIcon(save_icon)
-                save_button.setIconSize(QSize(13, 13))  # Icon size slightly smaller than button
-                save_button.setFixedSize(17, 17)
-                save_button.setStyleSheet("""
-                    QPushButton {
-                        border: none;
-                        background-color: transparent;
-                        padding: 2px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e0e0e0;
-                        border-radius: 4px;
-                    }
-                    QPushButton:pressed {
-                        background-color: #d0d0d0;
-                    }
-                """)
-                save_button.setCursor(Qt.CursorShape.PointingHandCursor)
-                save_button.setToolTip(f"Save '{test_case_name}' to a file.")
-                save_button.clicked.connect(lambda _, name=test_case_name: self.save_single_test_case(name))
-                button_layout.addWidget(save_button)
-
-                delete_button = QPushButton()
-
-                # Load the bin.png icon
-                bin_icon = QIcon("bin.png")
-                delete_button.setIcon(bin_icon)
-                delete_button.setIconSize(QSize(16, 16))  # Icon size slightly smaller than button
-
-                delete_button.setFixedSize(20, 20)  # ✅ Slightly larger for consistency
-
-                delete_button.setStyleSheet("""
-                    QPushButton {
-                        border: none;
-                        border-radius: 4px;
-                        background-color: transparent;
-                        padding: 0px;
-                    }
-                    QPushButton:hover {
-                        background-color: #fee2e2;
-                    }
-                    QPushButton:pressed {
-                        background-color: #fecaca;
-                    }
-                """)
-                delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-                delete_button.setToolTip(f"Delete '{test_case_name}'.")
-                delete_button.clicked.connect(lambda _, item=test_case_item: self.delete_test_case(item))
-                button_layout.addWidget(delete_button)
-                
-                # MINIMAL CHANGE: Use the correct enum members for QSizePolicy
-                spacer = QSpacerItem(10, 0, QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Minimum)
-                button_layout.addItem(spacer)
-
-                self.test_case_tree.setItemWidget(test_case_item, 1, button_widget)
-
-                # Add existing steps as children items - using same logic as update_steps_list in EditTestCaseDialog
-                for i, step_data in enumerate(test_case_data.get("steps", []), 1):
-                    step_type = step_data.get("type", "")
-                    step_text = f"Step {i}: "
-                    
-                    if step_type == "module_import":
-                        module_name = step_data.get("module_name", "Unknown Module")
-                        step_text += module_name
-                    elif step_type == "special_key":
-                        key_value = step_data.get("key_value", "Unknown Key")
-                        step_text += f"Special Key: {key_value}"
-                    elif step_type == "capture_screen_text":
-                        step_text += "Capture Text Screenshot"
-                    elif step_type == "capture_screenshot":
-                        step_text += "Capture Screenshot (DOCX)"
-                    elif step_type == "random_input":
-                        row = step_data.get('row', '?')
-                        col = step_data.get('column', '?')
-                        value = step_data.get('value', '?')
-                        step_text += f"Random Input (Row: {row}, Col: {col}, Value: {value})"
-                    elif step_type == "wait":
-                        seconds = step_data.get('seconds', '?')
-                        step_text += f"Wait: {seconds} second(s)"
-                    elif step_type == "break":  # ✅ NEW
-                        step_text += "Break: Review & Decision Point"                        
-                    else:
-                        step_text += "Unknown Step"
-                    
-                    step_item = QTreeWidgetItem(test_case_item, [step_text])
-                    
-                    # Add field details only for module_import steps
-                    if step_type == "module_import" and 'fields' in step_data:
-                        for field in step_data['fields']:
-                            field_name = field.get('field_name', 'N/A')
-                            field_value = field.get('value', 'N/A')
-                            field_item = QTreeWidgetItem(step_item)
-                            field_item.setText(0, f"{field_name}: {field_value}")
+            # ✅ CHANGED: Items are created without widgets and added in one call
+            self.test_case_tree_root.addChildren([self.create_test_case_tree_item(name) for name in self.test_cases])
+        else:
+            self.test_case_tree_root = None
+        if self.test_cases_search_bar.text().strip():
+            self.test_cases_search_timer.start()  # Re-apply the active search to the new items
+    
+    # --- NEW: Deferred Library Tree Building ---
+    def defer_tree_build(self, tree, build):
+        """
+        Postpones filling a library tree until it is shown, so startup and
+        reloads do not pay for trees nobody is looking at.
+        
+        Args:
+            tree: The library QTreeWidget
+            build: The method that fills it (e.g. self.update_module_tree)
+        
+        Returns:
+            bool: True if the build was deferred, False if it should run now
+        """
+        if self.isVisible() and tree.isVisibleTo(self):
+            self._deferred_trees.pop(tree, None)
+            return False
+        self._deferred_trees[tree] = build
+        return True
+    
+    def build_visible_trees(self):
+        """Fills the deferred library trees that are now shown."""
+        for tree, build in list(self._deferred_trees.items()):
+            if self.isVisible() and tree.isVisibleTo(self):
+                start = time.perf_counter()
+                build()
+                print(f"Built library tree in {(time.perf_counter() - start) * 1000:.0f} ms")
+    
+    def showEvent(self, event):
+        """Fills the library tree on screen once the window is first shown."""
+        super().showEvent(event)
+        if self._deferred_trees:
+            QTimer.singleShot(0, self.build_visible_trees)
+    
+    def create_test_case_tree_item(self, test_case_name):
+        """Creates the (unparented) tree item of a test case and registers it by name."""
+        test_case_item = QTreeWidgetItem([test_case_name])
+        test_case_item.setData(0, Qt.ItemDataRole.UserRole, test_case_name)
+        test_case_item.setData(1, LibraryTreeActionDelegate.ActionsRole, True)
+        # ✅ CHANGED: Step children are added when the item is first expanded
+        test_case_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        self.test_case_tree_items[test_case_name] = test_case_item
+        return test_case_item
+    
+    def on_test_case_tree_action(self, action, test_case_name):
+        """Runs a save or delete button click from the test case tree."""
+        if action == 'save':
+            self.save_single_test_case(test_case_name)
+        elif test_case_name in self.test_case_tree_items:
+            self.delete_test_case(self.test_case_tree_items[test_case_name])
+    
+    def on_test_cases_changed(self, event, names):
+        """Applies a test case store change to the test case tree, touching only the affected items."""
+        if self.test_case_tree in self._deferred_trees:
+            return  # Not built yet: the deferred build reads the store as it is then
+        self.apply_library_tree_change(self.test_case_tree, self.test_case_tree_items, self.test_cases, event, names)
+        if event == 'changed':
+            # Steps are shown from the record: drop the stale children, they are rebuilt on expansion
+            for name in names:
+                item = self.test_case_tree_items.get(name)
+                if item is not None and item.childCount():
+                    item.takeChildren()
+                    item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                    if item.isExpanded():
+                        self.populate_test_case_tree_item(item)
+    
+    def apply_library_tree_change(self, tree, items, store, event, names):
+        """
+        Inserts, removes or renames only the tree items named in a store change.
+        
+        Args:
+            tree: self.module_tree or self.test_case_tree
+            items: The {name: item} map of that tree
+            store: The record store shown in the tree
+            event: 'added', 'changed', 'removed' or 'renamed' (see LazyRecordStore)
+            names: Names, or (old name, new name) pairs for 'renamed'
+        """
+        is_module_tree = tree is self.module_tree
+        root = self.module_tree_root if is_module_tree else self.test_case_tree_root
+        rebuild = self.update_module_tree if is_module_tree else self.update_test_case_tree
+        
+        if event == 'added':
+            if root is None or tree.indexOfTopLevelItem(root) < 0:
+                rebuild()
+                return
+            create = self.create_module_tree_item if is_module_tree else self.create_test_case_tree_item
+            root.addChildren([create(name) for name in names if name not in items])
+        elif event == 'removed':
+            if not store:
+                rebuild()  # The last item went: drop the root like a full rebuild does
+                return
+            for name in names:
+                item = items.pop(name, None)
+                if item is not None and item.parent() is not None:
+                    item.parent().removeChild(item)
+        elif event == 'renamed':
+            tree.blockSignals(True)  # The module tree reacts to itemChanged as a rename
+            try:
+                for old_name, new_name in names:
+                    item = items.pop(old_name, None)
+                    if item is not None:
+                        item.setText(0, new_name)
+                        item.setData(0, Qt.ItemDataRole.UserRole, new_name)
+                        items[new_name] = item
+            finally:
+                tree.blockSignals(False)
+            tree.viewport().update()
+    
+    def describe_test_case_step(self, index, step_data):
+        """Returns the tree text of a step - same logic as update_steps_list in EditTestCaseDialog."""
+        step_type = step_data.get("type", "")
+        step_text = f"Step {index}: "
+        
+        if step_type == "module_import":
+            module_name = step_data.get("module_name", "Unknown Module")
+            step_text += module_name
+        elif step_type == "special_key":
+            key_value = step_data.get("key_value", "Unknown Key")
+            step_text += f"Special Key: {key_value}"
+        elif step_type == "capture_screen_text":
+            step_text += "Capture Text Screenshot"
+        elif step_type == "capture_screenshot":
+            step_text += "Capture Screenshot (DOCX)"
+        elif step_type == "random_input":
+            row = step_data.get('row', '?')
+            col = step_data.get('column', '?')
+            value = step_data.get('value', '?')
+            step_text += f"Random Input (Row: {row}, Col: {col}, Value: {value})"
+        elif step_type == "wait":
+            seconds = step_data.get('seconds', '?')
+            step_text += f"Wait: {seconds} second(s)"
+        elif step_type == "break":  # ✅ NEW
+            step_text += "Break: Review & Decision Point"                        
+        else:
+            step_text += "Unknown Step"
+        return step_text
+    
+    def populate_test_case_tree_item(self, test_case_item):
+        """
+        Adds the step (and field) children of a test case tree item. The test
+        case is hydrated from the library here, the first time it is expanded.
+        """
+        if test_case_item.parent() is not self.test_case_tree_root or test_case_item.childCount() > 0:
+            return
+        test_case_data = self.test_cases.get(test_case_item.data(0, Qt.ItemDataRole.UserRole))
+        if not test_case_data:
+            test_case_item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless)
+            return
+        
+        for i, step_data in enumerate(test_case_data.get("steps", []), 1):
+            step_item = QTreeWidgetItem(test_case_item, [self.describe_test_case_step(i, step_data)])
+            
+            # Add field details only for module_import steps
+            if step_data.get("type", "") == "module_import" and 'fields' in step_data:
+                for field in step_data['fields']:
+                    field_name = field.get('field_name', 'N/A')
+                    field_value = field.get('value', 'N/A')
+                    field_item = QTreeWidgetItem(step_item)
+                    field_item.setText(0, f"{field_name}: {field_value}")
         
     # NEW helper method to delete a test case
     def delete_test_case(self, item):
@@ -15310,7 +16280,6 @@ class PCOMMMainFrame(QMainWindow):
             if test_case_name in self.test_cases:
                 del self.test_cases[test_case_name]
                 self.save_test_cases_to_file()
-                self.update_test_case_tree()
                 self.statusBar().showMessage(f"Test case '{test_case_name}' deleted.", 5000)
 
     # NEW helper method to handle saving from the tree item
@@ -15354,36 +16323,27 @@ class PCOMMMainFrame(QMainWindow):
         )
         
         if file_paths:
+            # ✅ CHANGED: Files are parsed and validated on a worker thread
+            entries, failed_imports = self.parse_import_files(file_paths, 'modules')
+            
+            # Merge the imported modules with the existing ones
+            imported = {}
             skipped_modules = []
+            for name, data, file_name in entries:
+                if name in self.modules or name in imported:
+                    skipped_modules.append(f"{file_name}: '{name}' already exists, skipped")
+                else:
+                    imported[name] = data
             
-            for file_path in file_paths:
-                try:
-                    with open(file_path, 'r') as f:
-                        imported_modules = json.load(f)
-                    
-                    # Merge the imported modules with the existing ones
-                    for name, data in imported_modules.items():
-                        if name in self.modules:
-                            skipped_modules.append(name)
-                        else:
-                            self.modules[name] = data
-                
-                except Exception as e:
-                    QMessageBox.critical(self, "Import Error", f"An error occurred while importing the file '{file_path}': {e}")
+            if imported:
+                # ✅ NEW: One transaction and one incremental tree update for the whole batch
+                self.commit_imported_records('modules', self.modules, imported)
             
             # Update the module counter to be the largest number plus one
             numeric_modules = [int(re.search(r'\d+', key).group()) for key in self.modules.keys() if re.search(r'\d+', key)]
             self.module_counter = max(numeric_modules) + 1 if numeric_modules else 0
-                    
-            self.save_modules_to_file()
-            self.update_module_tree()
             
-            if skipped_modules:
-                message = (f"Successfully imported modules. The following modules were skipped due to name conflicts: "
-                           f"{', '.join(skipped_modules)}")
-                QMessageBox.warning(self, "Import Warning", message)
-            else:
-                self.statusBar().showMessage("Successfully imported modules.", 5000)
+            self.show_import_summary("module", len(imported), len(file_paths), skipped_modules, failed_imports)
 
     def delete_module(self, item):
         """
@@ -15412,7 +16372,6 @@ class PCOMMMainFrame(QMainWindow):
 
                 del self.modules[module_name_to_delete]
                 self.save_modules_to_file()
-                self.update_module_tree()
                 self.labels_table.setRowCount(0)
                 self.properties_tree.clear()
                 self.pcomm_canvas_text_edit.setText("PCOMM Screenshot Preview")
@@ -15455,7 +16414,6 @@ class PCOMMMainFrame(QMainWindow):
                     del self.modules[module_name]
             
             self.save_modules_to_file()
-            self.update_module_tree()
             self.labels_table.setRowCount(0)
             self.properties_tree.clear()
             self.pcomm_canvas_text_edit.setText("PCOMM Screenshot Preview")
@@ -15490,7 +16448,6 @@ class PCOMMMainFrame(QMainWindow):
                     del self.test_cases[test_case_name]
             
             self.save_test_cases_to_file()
-            self.update_test_case_tree()
             self.statusBar().showMessage(f"{len(test_case_names)} {test_word} deleted.", 5000)                
 
     def display_module_details_and_screenshot(self, item, column):
@@ -15508,12 +16465,16 @@ class PCOMMMainFrame(QMainWindow):
             # If it's the root, clear the preview
             self.pcomm_canvas_text_edit.setText("PCOMM Screenshot Preview (24x80 Grid)")
             self.central_frame.setVisible(True) # Make sure the preview is visible
+            self.screen_mirror.set_labels([])  # ✅ NEW
             return
 
         module_name = item.data(0, Qt.ItemDataRole.UserRole)
         module_data = self.modules.get(module_name)
         
         if module_data:
+            # ✅ NEW: The live mirror shows where this module's labels fall on the host screen
+            self.screen_mirror.set_labels(module_data.get('labels', []))
+
             # Display the saved text
             captured_text = module_data.get('captured_text', "No captured text found.")
             # Ensure the central widget is the QTextEdit before trying to set text
@@ -15523,6 +16484,7 @@ class PCOMMMainFrame(QMainWindow):
             
             # Display labels and a delete button for each one
             if 'labels' in module_data:
+                self.labels_table.setUpdatesEnabled(False)
                 self.labels_table.setRowCount(len(module_data['labels']))
                 for i, label in enumerate(module_data['labels']):
                     # ✅ NEW: Create items without bold (will be made bold on selection)
@@ -15535,52 +16497,17 @@ class PCOMMMainFrame(QMainWindow):
                     self.labels_table.setItem(i, 1, row_item)
                     self.labels_table.setItem(i, 2, col_item)
                     self.labels_table.setItem(i, 3, length_item)
-                    
-                    delete_label_button = QPushButton()
-
-                    # Load the bin.png icon
-                    bin_icon = QIcon("bin.png")
-                    delete_label_button.setIcon(bin_icon)
-                    delete_label_button.setIconSize(QSize(16, 16))  # Icon size slightly smaller than button
-
-                    delete_label_button.setFixedSize(20, 20)
-                    
-                    delete_label_button.setStyleSheet("""
-                        QPushButton {
-                            border: none;
-                            border-radius: 3px;
-                            background-color: transparent;
-                            padding: 0px;
-                        }
-                        QPushButton:hover {
-                            background-color: #fee2e2;
-                        }
-                        QPushButton:pressed {
-                            background-color: #fecaca;
-                        }
-                    """)
-                    delete_label_button.setCursor(Qt.CursorShape.PointingHandCursor)
-                    
-                    # Connect the button to a new method that receives the button object itself
-                    delete_label_button.clicked.connect(lambda _, btn=delete_label_button: self.delete_label(btn))
-                    
-                    self.labels_table.setCellWidget(i, 4, delete_label_button)
+                    # ✅ CHANGED: The delete button is painted by LabelsTableDelegate
+                self.labels_table.setUpdatesEnabled(True)
 
-    def delete_label(self, button):
+    def delete_label(self, row_index):
         """
         Deletes a specific label from a module based on the button clicked.
-        FIXED: Now correctly identifies the row of the clicked button.
-        """
-        # Find the row index by iterating through all rows and checking which one contains this button
-        row_index = -1
-        for i in range(self.labels_table.rowCount()):
-            cell_widget = self.labels_table.cellWidget(i, 4)
-            if cell_widget == button:
-                row_index = i
-                break
         
-        # If we couldn't find the button, return
-        if row_index == -1:
+        Args:
+            row_index: Row of the label in the labels table (from LabelsTableDelegate)
+        """
+        if not 0 <= row_index < self.labels_table.rowCount():
             return
             
         selected_module_item = self.module_tree.currentItem()
@@ -15689,18 +16616,103 @@ class PCOMMMainFrame(QMainWindow):
                     print(f"Error renaming screenshot file: {e}")
                     new_path = old_path # Revert if renaming fails
 
-            self.modules[new_name] = self.modules.pop(old_name)
+            self.modules.rename(old_name, new_name)  # ✅ CHANGED: Re-keys the tree item in place
             self.modules[new_name]["screenshot"] = new_path # Update the path
-            item.setData(0, Qt.ItemDataRole.UserRole, new_name)
+            updated_steps = self.rename_module_references(old_name, new_name)  # ✅ NEW: Keep dependent steps pointing at the module
             self.save_modules_to_file()
-            self.statusBar().showMessage(f"Renamed module from '{old_name}' to '{new_name}'", 5000)
+            self.statusBar().showMessage(
+                f"Renamed module from '{old_name}' to '{new_name}' ({updated_steps} step(s) updated)", 5000
+            )
         elif new_name == old_name:
             # Name did not change, do nothing
             pass
         else:
             QMessageBox.warning(self, "Invalid Name", f"The name '{new_name}' is already in use or invalid.")
-            self.update_module_tree() # Revert the item back to the old name
+            # Revert the item back to the old name
+            self.module_tree.blockSignals(True)
+            item.setText(0, old_name)
+            self.module_tree.blockSignals(False)
+            
+    def refresh_stale_steps(self):
+        """
+        Bulk job: refreshes every module import step and utility step in the
+        library that was built against an older version of its module. Values
+        of the fields that still exist are kept. The stale steps come from one
+        indexed query, and the result is written in one transaction.
+        """
+        # Make the index reflect any unsaved edits first
+        self.save_test_cases_to_file()
+        stale = self.library.stale_steps()
+        if not stale:
+            QMessageBox.information(self, "Refresh Stale Steps", "All module import steps are up to date.")
+            return
+        
+        test_case_count = len({test_case_name for test_case_name, _, _, _ in stale})
+        reply = QMessageBox.question(
+            self,
+            "Refresh Stale Steps",
+            f"{len(stale)} step(s) in {test_case_count} test case(s) use an outdated module definition.\n\n"
+            f"Refresh them to the current module fields? Values of fields that still exist are kept.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        refreshed = 0
+        for test_case_name, step_index, utility_index, module_name in stale:
+            test_case_data = self.test_cases.get(test_case_name)
+            module_data = self.modules.get(module_name)
+            if not test_case_data or module_data is None:
+                continue
+            try:
+                step_data = test_case_data['steps'][step_index]
+                if utility_index is None:
+                    id_stem = f"{module_name}_M{step_index + 1}"
+                else:
+                    step_data = step_data['utility_steps'][utility_index]
+                    id_stem = f"U{step_index + 1}_{utility_index + 1}"
+            except (IndexError, KeyError):
+                continue
             
+            action_type = (step_data.get('fields') or [{}])[0].get('action_type', 'Input')
+            rebuild_module_step_fields(step_data, module_data, action_type, id_stem)
+            step_data['module_version'] = self.module_index.version(module_name)
+            refreshed += 1
+        
+        self.save_test_cases_to_file()
+        print(f"Refreshed {refreshed} stale step(s) in {test_case_count} test case(s)")
+        self.statusBar().showMessage(f"Refreshed {refreshed} stale step(s) in {test_case_count} test case(s)", 5000)
+
+    def rename_module_references(self, old_name, new_name):
+        """
+        Points every step and utility step using a renamed module at its new
+        name. Only the test cases found through the module reverse index are
+        opened.
+
+        Args:
+            old_name (str): Previous module name
+            new_name (str): New module name
+
+        Returns:
+            int: Number of updated steps
+        """
+        references = list(self.module_index.references(old_name))
+        for test_case_name, step_index, utility_index in references:
+            step = self.test_cases[test_case_name]['steps'][step_index]
+            if utility_index is not None:
+                step = step['utility_steps'][utility_index]
+            for key in ('module_name', 'reference_module'):
+                if step.get(key) == old_name:
+                    step[key] = new_name
+            if step.get('name') == f"Import Module: {old_name}":
+                step['name'] = f"Import Module: {new_name}"
+        
+        if references:
+            self.save_test_cases_to_file()
+            self.test_cases.touch(*{test_case_name for test_case_name, _, _ in references})
+        return len(references)
+
     def handle_label_edit_finish(self, row, column):
         """
         Handles the completion of a cell edit in the labels table,
@@ -15761,11 +16773,11 @@ class PCOMMMainFrame(QMainWindow):
     def save_pcomm_window_config(self):
         """Saves the PCOMM window title configuration."""
         config_file = 'pcomm_config.json'
-        try:
-            with open(config_file, 'w') as f:
-                json.dump({'window_title': self.pcomm_window_title}, f, indent=4)
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", f"Failed to save PCOMM configuration: {e}")
+        # ✅ CHANGED: Write failures are reported by on_save_failed()
+        self.persistence.request_save(config_file, lambda: {
+            'window_title': self.pcomm_window_title,
+            'mirror_interval_ms': self.mirror_interval_ms  # ✅ NEW
+        })
 
     def load_pcomm_window_config(self):
         """Loads the PCOMM window title configuration."""
@@ -15775,39 +16787,67 @@ class PCOMMMainFrame(QMainWindow):
                 with open(config_file, 'r') as f:
                     config = json.load(f)
                     self.pcomm_window_title = config.get('window_title', 'SessionA')
+                    self.mirror_interval_ms = config.get('mirror_interval_ms', ScreenMirror.DEFAULT_INTERVAL_MS)  # ✅ NEW
             except Exception as e:
                 print(f"Error loading PCOMM config: {e}")
                 self.pcomm_window_title = 'SessionA'
+                self.mirror_interval_ms = ScreenMirror.DEFAULT_INTERVAL_MS
         else:
             self.pcomm_window_title = 'SessionA'
+            self.mirror_interval_ms = ScreenMirror.DEFAULT_INTERVAL_MS
+        
+        # ✅ NEW: A running live mirror follows the (re)loaded settings
+        if hasattr(self, 'screen_mirror'):
+            self.screen_mirror.set_interval(self.mirror_interval_ms)
+            self.screen_mirror.reconnect()
+
+    def load_library_table(self, table, legacy_json_file, lazy=False):
+        """
+        Loads a library table, migrating the legacy JSON file on first use.
+        
+        Args:
+            table: 'modules', 'test_cases' or 'templates'
+            legacy_json_file: The JSON file the table used to be stored in
+            lazy: Load only the name index and hydrate records on access
+        
+        Returns:
+            dict or LazyRecordStore: {name: record}
+        """
+        try:
+            self.library.migrate_from_json(table, legacy_json_file)
+        except Exception as e:
+            print(f"Error migrating '{legacy_json_file}': {e}")
+        if lazy:
+            return LazyRecordStore(self.library, table)
+        return self.library.load_all(table)
 
     def save_modules_to_file(self):
-        """Saves the captured module data to a JSON file."""
-        with open(self.module_file, 'w') as f:
-            json.dump(self.modules, f, indent=4)
+        """Saves the changed modules to the library database."""
+        # ✅ CHANGED: Per-record upserts instead of rewriting the whole JSON file
+        self.library.sync('modules', self.modules)
         
-    def load_modules_from_file(self):
-        """Loads captured module data from a JSON file on startup."""
-        if os.path.exists(self.module_file):
-            with open(self.module_file, 'r') as f:
-                self.modules = json.load(f)
-            self.module_counter = len(self.modules)
-            self.update_module_tree()
+    def get_module_model(self, module_name):
+        """
+        Returns the typed Module record for a module, built once and kept
+        until the module is written again.
 
-    # --- NEW: Methods for Test Cases data persistence ---
-    def save_test_cases_to_file(self):
-        """Saves the test cases data to a JSON file."""
-        with open(self.test_case_file, 'w') as f:
-            json.dump(self.test_cases, f, indent=4)
+        Args:
+            module_name (str): Name of the module
+
+        Returns:
+            Module or None: The typed module, or None if it does not exist
+        """
+        return self.module_index.module(module_name)
+        
+    def load_modules_from_file(self):
+        """Loads captured module data from the library database on startup."""
+        self.module_index.clear()
+        self.modules = self.load_library_table('modules', self.module_file, lazy=True)
+        self.modules.add_listener(self.on_modules_changed)  # ✅ NEW: Incremental tree updates
+        if self.modules:
+            self.module_counter = len(self.modules)
+        self.update_module_tree()
 
-    def load_test_cases_from_file(self):
-        """Loads test cases from a JSON file on startup."""
-        if os.path.exists(self.test_case_file):
-            with open(self.test_case_file, 'r') as f:
-                self.test_cases = json.load(f)
-            self.test_case_counter = len(self.test_cases)
-            self.update_test_case_tree()
-            
     def save_single_test_case(self, test_case_name):
         """Saves a single test case to a file chosen by the user."""
         test_case_data = self.test_cases.get(test_case_name)
@@ -15832,16 +16872,16 @@ class PCOMMMainFrame(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to save test case: {e}")
 # --- NEW: Methods for Test Cases data persistence ---
     def save_test_cases_to_file(self):
-        """Saves the test cases data to a JSON file."""
-        with open(self.test_case_file, 'w') as f:
-            json.dump(self.test_cases, f, indent=4)
+        """Saves the changed test cases to the library database."""
+        # ✅ CHANGED: Per-record upserts instead of rewriting the whole JSON file
+        self.library.sync('test_cases', self.test_cases)
 
     def load_test_cases_from_file(self):
-        """Loads test cases from a JSON file on startup."""
-        if os.path.exists(self.test_case_file):
-            with open(self.test_case_file, 'r') as f:
-                self.test_cases = json.load(f)
-            self.update_test_case_tree()
+        """Loads test cases from the library database on startup."""
+        self.test_cases = self.load_library_table('test_cases', self.test_case_file, lazy=True)
+        self.test_cases.add_listener(self.on_test_cases_changed)  # ✅ NEW: Incremental tree updates
+        self.module_index.clear()
+        self.update_test_case_tree()
                 
     def import_test_cases(self):
         """
@@ -15860,77 +16900,301 @@ class PCOMMMainFrame(QMainWindow):
         if not file_paths:  # ✅ CHANGED: Check if list is empty
             return
         
-        total_imported = 0
-        failed_imports = []
+        # ✅ CHANGED: Files are parsed and validated on a worker thread
+        entries, failed_imports = self.parse_import_files(file_paths, 'test_cases')
+        
+        # Merge: add a unique suffix if a test case with the same name already exists
+        imported = {}
+        renamed = []
+        for test_case_name, test_case_data, file_name in entries:
+            new_name = test_case_name
+            if new_name in self.test_cases or new_name in imported:
+                suffix = 1
+                while f"{test_case_name} ({suffix})" in self.test_cases or f"{test_case_name} ({suffix})" in imported:
+                    suffix += 1
+                new_name = f"{test_case_name} ({suffix})"
+                if test_case_data.get('name') == test_case_name:
+                    test_case_data['name'] = new_name
+                renamed.append(f"{file_name}: '{test_case_name}' imported as '{new_name}'")
+            imported[new_name] = test_case_data
+        
+        # ✅ NEW: One transaction and one incremental tree update for the whole batch
+        if imported:
+            self.commit_imported_records('test_cases', self.test_cases, imported)
+        
+        self.show_import_summary("test case", len(imported), len(file_paths), renamed, failed_imports)
+    
+    def parse_import_files(self, file_paths, kind):
+        """
+        Parses and validates import files in the order of file_paths on an
+        ImportParseThread. The GUI thread runs a local event loop until the
+        entries come back, so it keeps painting and showing progress.
+
+        Args:
+            file_paths (list): JSON files to read
+            kind (str): 'test_cases' or 'modules'
+
+        Returns:
+            tuple: ([(name, record, file name), ...], [failure message, ...])
+        """
+        # ✅ CHANGED: Parsed one by one on a worker thread (parsing holds the GIL, so a pool
+        # was slower); the speedup of the import is the single write_changes transaction
+        results = {}
+        thread = ImportParseThread(file_paths, kind, self)
+        thread.progress.connect(
+            lambda done_count, total: self.statusBar().showMessage(f"Reading import files... {done_count}/{total}"))
+        thread.parsed.connect(lambda entries, failed: results.update(entries=entries, failed=failed))
+        
+        loop = QEventLoop()
+        thread.finished.connect(loop.quit)
+        thread.start()
+        loop.exec()
+        thread.wait()
+        thread.deleteLater()
+        
+        if 'entries' not in results:
+            return [], ["Reading the import files stopped unexpectedly"]
+        return results['entries'], results['failed']
+    
+    def commit_imported_records(self, table, store, records):
+        """
+        Writes imported records to the library in one transaction and adds
+        them to the in-memory store without hydrating them.
+        """
+        self.library.write_changes(table, records)
+        if isinstance(store, LazyRecordStore):
+            store.index_written(records)
+        else:
+            store.update(records)
+    
+    def show_import_summary(self, item_label, imported_count, file_count, conflicts, failed, parent=None):
+        """
+        Shows one summary for a bulk import. Conflicts and failures are listed
+        in the expandable details so thousands of files stay readable.
+        """
+        message = f"Imported {imported_count} {item_label}(s) from {file_count} file(s)."
+        if conflicts:
+            message += f"\n{len(conflicts)} name conflict(s) resolved."
+        if failed:
+            message += f"\n{len(failed)} problem(s) found, the affected records were skipped."
+        
+        details = []
+        if conflicts:
+            details += ["Name conflicts:"] + conflicts + [""]
+        if failed:
+            details += ["Problems:"] + failed
+        
+        if imported_count:
+            icon, title = QMessageBox.Icon.Information, "Import Complete"
+        else:
+            icon, title = QMessageBox.Icon.Warning, "Import Failed"
+        box = QMessageBox(icon, title, message, QMessageBox.StandardButton.Ok, parent or self)
+        if details:
+            box.setDetailedText("\n".join(details))
+        box.exec()
+        self.statusBar().showMessage(message.split("\n")[0], 5000)
+    
+    def library_config_files(self):
+        """Returns the configuration files that travel with a library bundle."""
+        return [self.document_config_file, self.masking_config_file,
+                'pcomm_config.json', 'default_additional_info_fields.json']
+    
+    def export_library_bundle(self, module_names=None, test_case_names=None):
+        """
+        Exports the library to a single bundle file. Without a selection the
+        whole project is exported (modules, test cases, templates, screenshots
+        and settings); otherwise the selected items plus the modules the
+        selected test cases use.
+
+        Args:
+            module_names (list): Modules to export
+            test_case_names (list): Test cases to export
+        """
+        whole_project = module_names is None and test_case_names is None
+        if whole_project:
+            selection = {'modules': None, 'test_cases': None, 'templates': None}
+            suggested_name = f"library_{datetime.now().strftime('%Y%m%d')}{LibraryBundle.EXTENSION}"
+        else:
+            modules = list(module_names or [])
+            for test_case_name in test_case_names or []:
+                test_case_data = self.test_cases.get(test_case_name)
+                if test_case_data:
+                    modules.extend(sorted(LibraryRepository.module_references(test_case_data)))
+            selection = {'modules': list(dict.fromkeys(modules)), 'test_cases': list(test_case_names or [])}
+            first_name = (test_case_names or module_names)[0]
+            suggested_name = f"{first_name}{LibraryBundle.EXTENSION}"
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Library Bundle", suggested_name,
+            f"Library Bundles (*{LibraryBundle.EXTENSION});;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        def progress(message):
+            self.statusBar().showMessage(message)
+            QApplication.processEvents()
         
-        for file_path in file_paths:  # ✅ NEW: Loop through all selected files
+        try:
+            # Unsaved edits must be in the database before it is streamed out
+            self.save_modules_to_file()
+            self.save_test_cases_to_file()
+            self.save_templates_to_file()
+            self.persistence.flush()
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
             try:
-                with open(file_path, 'r') as f:
-                    imported_data = json.load(f)
-                
-                imported_count = 0
-                
-                # Case 1: The file contains a single test case (saved from 'Save Test Case' button)
-                if isinstance(imported_data, dict) and 'name' in imported_data and 'steps' in imported_data:
-                    test_case_name = imported_data['name']
-                    # Add a unique suffix if a test case with the same name already exists
-                    if test_case_name in self.test_cases:
-                        suffix = 1
-                        while f"{test_case_name} ({suffix})" in self.test_cases:
-                            suffix += 1
-                        new_name = f"{test_case_name} ({suffix})"
-                        imported_data['name'] = new_name
-                        test_case_name = new_name
-                    
-                    self.test_cases[test_case_name] = imported_data
-                    imported_count = 1
-                
-                # Case 2: The file contains a dictionary of multiple test cases (saved as a library)
-                elif isinstance(imported_data, dict) and all(isinstance(v, dict) and 'name' in v and 'steps' in v for v in imported_data.values()):
-                    for test_case_name, test_case_data in imported_data.items():
-                        if test_case_name in self.test_cases:
-                            suffix = 1
-                            while f"{test_case_name} ({suffix})" in self.test_cases:
-                                suffix += 1
-                            new_name = f"{test_case_name} ({suffix})"
-                            self.test_cases[new_name] = test_case_data
-                        else:
-                            self.test_cases[test_case_name] = test_case_data
-                        imported_count += 1
-                
-                total_imported += imported_count
-                
-                # ✅ NEW: Track files with no valid test cases
-                if imported_count == 0:
-                    import os
-                    failed_imports.append(f"{os.path.basename(file_path)}: No valid test case data found")
-            
-            except json.JSONDecodeError:
-                import os
-                failed_imports.append(f"{os.path.basename(file_path)}: Invalid JSON format")
-            except Exception as e:
-                import os
-                failed_imports.append(f"{os.path.basename(file_path)}: {str(e)}")
+                summary = LibraryBundle.write(file_path, self.library, selection,
+                                              self.library_config_files() if whole_project else (), progress)
+            finally:
+                QApplication.restoreOverrideCursor()
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to export the library bundle:\n\n{e}")
+            return
+        
+        counts = summary['records']
+        message = (f"Exported {counts.get('modules', 0)} module(s), {counts.get('test_cases', 0)} test case(s)"
+                   f"{', %d template(s)' % counts['templates'] if 'templates' in counts else ''} "
+                   f"and {summary['files']} file(s) to '{os.path.basename(file_path)}'.")
+        box = QMessageBox(QMessageBox.Icon.Information, "Export Complete", message, QMessageBox.StandardButton.Ok, self)
+        if summary['missing_files']:
+            box.setInformativeText(f"{len(summary['missing_files'])} screenshot(s) could not be included.")
+            box.setDetailedText("\n".join(summary['missing_files']))
+        box.exec()
+        self.statusBar().showMessage(message, 5000)
+    
+    def import_library_bundle(self):
+        """
+        Imports a library bundle incrementally: records and files whose hash
+        matches what is already here are skipped without being read, new ones
+        are added, and differing ones are replaced only if the user agrees.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Library Bundle", "",
+            f"Library Bundles (*{LibraryBundle.EXTENSION});;All Files (*)"
+        )
+        if not file_path:
+            return
         
-        # ✅ NEW: Update UI and show results after processing all files
-        if total_imported > 0:
+        try:
+            bundle = LibraryBundle(file_path)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Import Error", str(e))
+            return
+        
+        with bundle:
+            # Local digests must reflect unsaved edits
+            self.save_modules_to_file()
             self.save_test_cases_to_file()
-            self.update_test_case_tree()
-            
-            # Build success message
-            message = f"Successfully imported {total_imported} test case(s) from {len(file_paths)} file(s)."
-            
-            if failed_imports:
-                message += f"\n\nFailed imports ({len(failed_imports)}):\n" + "\n".join(failed_imports)
+            self.save_templates_to_file()
+            self.persistence.flush()
+            
+            stores = {'modules': self.modules, 'test_cases': self.test_cases, 'templates': self.templates}
+            new_records = {table: [] for table in LibraryBundle.TABLES}
+            changed_records = {table: [] for table in LibraryBundle.TABLES}
+            unchanged = 0
+            for table in LibraryBundle.TABLES:
+                for name, digest in bundle.records(table).items():
+                    local_digest = self.library.record_digest(table, name)
+                    if local_digest == digest:
+                        unchanged += 1
+                    elif local_digest is None:
+                        new_records[table].append((name, digest))
+                    else:
+                        changed_records[table].append((name, digest))
+            
+            new_files = []
+            changed_files = []
+            unsafe_files = []
+            for relative, digest in list(bundle.files().items()) + list(bundle.config_files().items()):
+                # ✅ CHANGED: Entries that could leave the working folder are never read or written
+                portable = LibraryBundle.bundle_path(relative)
+                if portable is None:
+                    unsafe_files.append(f"{relative}: outside the working folder, not extracted")
+                    continue
+                target = os.path.normpath(portable)
+                if not os.path.exists(target):
+                    new_files.append((target, digest))
+                elif LibraryBundle.file_digest(target) != digest:
+                    changed_files.append((target, digest))
+                else:
+                    unchanged += 1
+            
+            replace = False
+            conflicts = [f"{table.replace('_', ' ')[:-1]} '{name}'" for table in LibraryBundle.TABLES
+                         for name, _ in changed_records[table]] + [f"file '{target}'" for target, _ in changed_files]
+            if conflicts:
+                box = QMessageBox(QMessageBox.Icon.Question, "Import Library Bundle",
+                                  f"{len(conflicts)} item(s) in the bundle differ from this library.\n\n"
+                                  "Replace them with the bundle version?",
+                                  QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No |
+                                  QMessageBox.StandardButton.Cancel, self)
+                box.setDetailedText("\n".join(conflicts))
+                answer = box.exec()
+                if answer == QMessageBox.StandardButton.Cancel:
+                    return
+                replace = answer == QMessageBox.StandardButton.Yes
             
-            QMessageBox.information(self, "Import Complete", message)
-        else:
-            # All imports failed
-            if failed_imports:
-                error_msg = "All imports failed:\n\n" + "\n".join(failed_imports)
-                QMessageBox.critical(self, "Import Failed", error_msg)
-            else:
-                QMessageBox.warning(self, "Import Failed", "No valid test case data found in selected files.")
+            imported = 0
+            failed = list(unsafe_files)
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                validators = {'modules': validate_module_record, 'test_cases': validate_test_case_record}
+                for table in LibraryBundle.TABLES:
+                    pending = new_records[table] + (changed_records[table] if replace else [])
+                    # Committed in batches so a large bundle is never fully in memory
+                    for start in range(0, len(pending), 500):
+                        batch = {}
+                        for name, digest in pending[start:start + 500]:
+                            # ✅ NEW: A corrupt or truncated object only skips its record
+                            try:
+                                record = bundle.read_record(digest)
+                                problems = validators[table](record) if table in validators else []
+                            except Exception as e:
+                                failed.append(f"'{name}': unreadable in the bundle ({e})")
+                                continue
+                            if problems:
+                                failed.append(f"'{name}': " + "; ".join(problems[:3]))
+                            else:
+                                batch[name] = record
+                        if batch:
+                            self.commit_imported_records(table, stores[table], batch)
+                            imported += len(batch)
+                        self.statusBar().showMessage(f"Importing {table.replace('_', ' ')}... {start + len(pending[start:start + 500])}/{len(pending)}")
+                        QApplication.processEvents()
+                
+                config_written = False
+                for target, digest in new_files + (changed_files if replace else []):
+                    try:
+                        bundle.extract_file(digest, target)
+                        imported += 1
+                        config_written = config_written or target in self.library_config_files()
+                    except Exception as e:
+                        failed.append(f"{target}: {e}")
+            finally:
+                QApplication.restoreOverrideCursor()
+        
+        if config_written:
+            self.load_document_config()
+            self.load_masking_config()
+            self.load_pcomm_window_config()
+        
+        self.module_index.clear()
+        numeric_modules = [int(re.search(r'\d+', key).group()) for key in self.modules.keys() if re.search(r'\d+', key)]
+        self.module_counter = max(numeric_modules) + 1 if numeric_modules else 0
+        # The module and test case trees were updated item by item as the batches were committed
+        self.update_template_tree()
+        
+        skipped = 0 if replace else sum(len(entries) for entries in changed_records.values()) + len(changed_files)
+        message = f"Imported {imported} item(s) from '{os.path.basename(file_path)}'; {unchanged} already up to date."
+        if skipped:
+            message += f"\n{skipped} differing item(s) kept as they were."
+        if failed:
+            message += f"\n{len(failed)} problem(s) found, the affected items were skipped."
+        box = QMessageBox(QMessageBox.Icon.Information, "Import Complete", message, QMessageBox.StandardButton.Ok, self)
+        if failed:
+            box.setDetailedText("Problems:\n" + "\n".join(failed))
+        box.exec()
+        self.statusBar().showMessage(message.split("\n")[0], 5000)
             
     # Insert this function into your PCOMMMainFrame class or as a standalone helper
     def get_pcomm_session(window_title="Session A"):
@@ -16020,11 +17284,8 @@ class PCOMMMainFrame(QMainWindow):
     
     def save_document_config(self):
         """Saves the document configuration to a JSON file."""
-        try:
-            with open(self.document_config_file, 'w') as f:
-                json.dump(self.document_config, f, indent=4)
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", f"Failed to save configuration: {e}")
+        # ✅ CHANGED: Write failures are reported by on_save_failed()
+        self.persistence.request_save(self.document_config_file, lambda: self.document_config)
     
     def load_document_config(self):
         """Loads the document configuration from a JSON file."""
@@ -16053,6 +17314,10 @@ class PCOMMMainFrame(QMainWindow):
                         self.document_config['generate_documentation'] = True
                     if 'capture_screen_flow' not in self.document_config:  # ✅ NEW
                         self.document_config['capture_screen_flow'] = False  # ✅ NEW
+                    if 'consolidated_report' not in self.document_config:  # ✅ NEW
+                        self.document_config['consolidated_report'] = False  # ✅ NEW
+                    if 'volatile_patterns' not in self.document_config:  # ✅ NEW
+                        self.document_config['volatile_patterns'] = list(DEFAULT_VOLATILE_PATTERNS)  # ✅ NEW
             except Exception as e:
                 print(f"Error loading document config: {e}")
                 self.document_config = {'text_elements': [], 'highlight_color': 'Yellow', 'generate_documentation': True, 'capture_screen_flow': False}  # ✅ UPDATED
@@ -16088,263 +17353,295 @@ class PCOMMMainFrame(QMainWindow):
         # Also set as the application icon (for taskbar)
         QApplication.setWindowIcon(app_icon)
 
-    def create_test_case_docx(self, test_case_name, screenshots_data):
+    def create_test_case_docx(self, test_case_name, screenshots_data, output_path=None, test_description=None):
         """
         Creates a single DOCX document for a test case with all screenshots.
         UPDATED: Now highlights fields marked for highlighting in yellow.
+        If output_path is given the document is written there instead of a new
+        timestamped file under Results (used when re-rendering a recorded run).
+        test_description, when given, is used instead of looking the test case
+        up in the library (so worker threads never touch the library store).
+        """
+        try:
+            from datetime import datetime
+            
+            if test_description is None:
+                test_description = ""
+                if test_case_name in self.test_cases:
+                    test_description = self.test_cases[test_case_name].get('description', '')
+            
+            # ✅ NEW: Re-rendered documents keep the date/time of the original capture
+            capture_time = capture_time_of(screenshots_data) if output_path else None
+            
+            if not output_path:
+                # Determine output directory
+                project_name = getattr(self, 'current_project_id', None)
+                if project_name and hasattr(self, 'projects') and project_name in self.projects:
+                    project_name = self.projects[project_name]['name']
+                
+                output_dir = os.path.join(self.default_results_location, 'Results', project_name if project_name else 'Master')
+                
+                # ✅ NEW: Add timestamp to filename
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                output_path = os.path.join(output_dir, f"{test_case_name}_{timestamp}.docx")
+            
+            # ✅ CHANGED: The document itself is built by pcomm_core.reports
+            return build_test_case_docx(
+                test_case_name,
+                screenshots_data,
+                output_path,
+                self.document_config,
+                test_description=test_description,
+                now=capture_time,
+                mask_text=self.apply_masking_to_text if self.masking_enabled else None,
+                masking_version=self.masking_version()
+            )
+            
+        except Exception as e:
+            print(f"Error creating DOCX: {e}")
+            raise
+
+    def create_execution_summary_docx(self, execution_results, timestamp, output_dir=None):
+        """
+        Creates a DOCX file with test execution summary.
+        
+        Args:
+            execution_results: List of dicts with test case results
+            timestamp: Timestamp string for the filename
+            output_dir: Folder for the summary (defaults to 'Test Execution Summary')
+        """
+        try:
+            if output_dir is None:
+                output_dir = os.path.join(self.default_results_location, 'Test Execution Summary')
+            # ✅ CHANGED: Built by pcomm_core.reports
+            return build_execution_summary_docx(execution_results, timestamp, output_dir)
+            
+        except Exception as e:
+            print(f"Error creating execution summary DOCX: {e}")
+            return None
+
+    def create_consolidated_report_writer(self, timestamp, output_dir=None):
+        """
+        Creates the streaming writer for a consolidated suite report.
+        
+        Args:
+            timestamp: Execution timestamp used in the title and filename
+            output_dir: Folder for the report (defaults to 'Test Execution Summary')
+        
+        Returns:
+            ConsolidatedReportWriter: The writer; call add_test() per test and close() at the end
+        """
+        if output_dir is None:
+            output_dir = os.path.join(self.default_results_location, 'Test Execution Summary')
+        return consolidated_report_writer(
+            output_dir,
+            timestamp,
+            self.document_config,
+            mask_text=self.apply_masking_to_text,
+            masking_version=self.masking_version()
+        )
+
+
+    def compare_runs(self):
+        """
+        Compares the screens of a recorded run against a baseline (golden) run
+        and writes a diff report of the changed screens. Volatile fields
+        configured in the document layout are ignored.
+        """
+        run_data_root = os.path.join(self.default_results_location, 'Run Data')
+        start_dir = run_data_root if os.path.isdir(run_data_root) else self.default_results_location
+        baseline_dir = QFileDialog.getExistingDirectory(self, "Select Baseline Run", start_dir)
+        if not baseline_dir:
+            return
+        current_dir = QFileDialog.getExistingDirectory(self, "Select Run to Compare", start_dir)
+        if not current_dir:
+            return
+        
+        _, baseline_records, baseline_failed = load_run_data(baseline_dir)
+        _, current_records, current_failed = load_run_data(current_dir)
+        if not baseline_records or not current_records:
+            QMessageBox.warning(self, "Compare Runs", "Both folders must contain recorded run data.")
+            return
+        
+        self.statusBar().showMessage("Comparing screens...")
+        QApplication.processEvents()
+        
+        start_time = time.perf_counter()
+        engine = ScreenDiffEngine(self.document_config.get('volatile_patterns', DEFAULT_VOLATILE_PATTERNS))
+        # ✅ CHANGED: Aligned on (project, test, step); a test name is only unique within its project
+        diff = engine.diff_runs(
+            {(record.get('project'), record['name']): record['screenshots'] for record in baseline_records},
+            {(record.get('project'), record['name']): record['screenshots'] for record in current_records}
+        )
+        elapsed = time.perf_counter() - start_time
+        print(f"Compared {diff['compared']} screen pair(s) in {elapsed:.2f}s")
+        
+        baseline_name = os.path.basename(os.path.normpath(baseline_dir))
+        current_name = os.path.basename(os.path.normpath(current_dir))
+        report_path = self.create_screen_diff_docx(diff, baseline_name, current_name)
+        self.statusBar().showMessage(f"Compared {diff['compared']} screen pair(s).", 5000)
+        
+        message = (f"Compared {diff['compared']} screen pair(s) in {elapsed:.2f}s\n\n"
+                   f"Identical: {diff['identical']}\n"
+                   f"Changed: {len(diff['changed'])}\n"
+                   f"Only in baseline: {len(diff['missing'])}\n"
+                   f"Only in compared run: {len(diff['added'])}")
+        if report_path:
+            message += f"\n\nDiff report saved to:\n{report_path}"
+        failed = baseline_failed + current_failed
+        if failed:
+            message += f"\n\nCould not load ({len(failed)}):\n" + "\n".join(failed)
+        
+        if diff['changed'] or diff['missing'] or diff['added'] or failed:
+            QMessageBox.warning(self, "Compare Runs", message)
+        else:
+            QMessageBox.information(self, "Compare Runs", message)
+
+    def create_screen_diff_docx(self, diff, baseline_name, current_name):
+        """
+        Creates a compact DOCX report of a run comparison. Only changed rows
+        are listed, with the changed columns highlighted.
+        
+        Args:
+            diff: Result of ScreenDiffEngine.diff_runs()
+            baseline_name: Name of the baseline run
+            current_name: Name of the compared run
+        
+        Returns:
+            str: Path of the report, or None on error
         """
         try:
             from docx import Document
             from docx.shared import Pt, Inches, RGBColor
             from docx.enum.text import WD_ALIGN_PARAGRAPH
-            from datetime import datetime
             
-            # Create a new document
             doc = Document()
-            
-            # Set document margins (narrower for better space usage)
-            sections = doc.sections
-            for section in sections:
+            for section in doc.sections:
                 section.top_margin = Inches(0.5)
                 section.bottom_margin = Inches(0.5)
-                section.left_margin = Inches(0.75)
-                section.right_margin = Inches(0.75)
-            
-            # Add configured text elements at the top
-            text_elements = self.document_config.get('text_elements', [])
-            if text_elements:
-                for config_item in text_elements:
-                    if config_item.get('type') == 'blank_line':
-                        doc.add_paragraph()
-                        continue
-                    
-                    paragraph = doc.add_paragraph()
-                    original_text = config_item.get('text', '')
-                    substituted_text = self.substitute_variables(
-                        original_text, 
-                        test_case_name, 
-                        len(screenshots_data)
-                    )
-                    
-                    run = paragraph.add_run(substituted_text)
-                    font = run.font
-                    font.name = config_item.get('font_name', 'Arial')
-                    font.size = Pt(config_item.get('font_size', 12))
-                    font.bold = config_item.get('bold', False)
-                    font.italic = config_item.get('italic', False)
-                    
-                    paragraph_format = paragraph.paragraph_format
-                    paragraph.style.font.name = config_item.get('font_name', 'Arial')
-                    
-                    alignment_map = {
-                        'Left': WD_ALIGN_PARAGRAPH.LEFT,
-                        'Center': WD_ALIGN_PARAGRAPH.CENTER,
-                        'Right': WD_ALIGN_PARAGRAPH.RIGHT,
-                        'Justify': WD_ALIGN_PARAGRAPH.JUSTIFY
-                    }
-                    alignment = config_item.get('alignment', 'Left')
-                    paragraph.alignment = alignment_map.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
-                    paragraph.paragraph_format.space_after = Pt(6)
-
-            # ✅ NEW: Get the configured highlight color
-            highlight_color_name = self.document_config.get('highlight_color', 'Yellow')
-            color_index_map = {
-                'Yellow': 7,
-                'Bright Green': 4,
-                'Turquoise': 3,
-                'Pink': 5,
-                'Blue': 2,
-                'Red': 6,
-                'Dark Blue': 9,
-                'Dark Cyan': 10,
-                'Dark Green': 11,
-                'Dark Magenta': 12,
-                'Dark Red': 13,
-                'Dark Yellow': 14,
-                'Gray 25%': 16,
-                'Gray 50%': 15
-            }
-            highlight_color_index = color_index_map.get(highlight_color_name, 7)
+                section.left_margin = Inches(0.5)
+                section.right_margin = Inches(0.5)
             
-            # Add screenshots with highlighting
-            from docx.oxml.shared import OxmlElement
-            from docx.oxml.ns import qn
+            title = doc.add_paragraph()
+            title_run = title.add_run("Screen Regression Diff")
+            title_run.font.size = Pt(18)
+            title_run.font.bold = True
+            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
-            for idx, screenshot in enumerate(screenshots_data):
-                screen_text = screenshot['screen_text']
-                
-                # ✅ APPLY MASKING IF ENABLED
-                if self.masking_enabled:
-                    screen_text = self.apply_masking_to_text(screen_text)
-                
-                highlight_info = screenshot.get('highlight_info', {})
-                
-                if idx > 0 and idx % 2 == 0:
-                    doc.add_page_break()
-                
-                if idx > 0 and idx % 2 != 0:
-                    doc.add_paragraph()
-                    doc.add_paragraph()
-                
-                # Format the screen text into lines (24 rows x 80 columns)
-                screen_rows = 24
-                screen_cols = 80
+            info_para = doc.add_paragraph()
+            info_para.add_run(f"Baseline: {baseline_name}\nCompared: {current_name}\n")
+            info_para.add_run(
+                f"Screens compared: {diff['compared']}  |  Identical: {diff['identical']}  |  "
+                f"Changed: {len(diff['changed'])}  |  Only in baseline: {len(diff['missing'])}  |  "
+                f"Only in compared run: {len(diff['added'])}"
+            ).font.bold = True
+            
+            highlight_color_index = 7  # Yellow
+            for entry in diff['changed']:
+                heading = doc.add_paragraph()
+                project_info = f"[Project: {entry['project']}] " if entry['project'] else ""
+                heading_run = heading.add_run(f"{project_info}{entry['test']} - Step {entry['step']}")
+                heading_run.font.bold = True
+                heading_run.font.size = Pt(11)
+                heading.paragraph_format.space_before = Pt(10)
+                heading.paragraph_format.space_after = Pt(2)
                 
-                screen_lines = []
-                for row_num in range(screen_rows):
-                    start_idx = row_num * screen_cols
-                    end_idx = start_idx + screen_cols
-                    if start_idx < len(screen_text):
-                        line = screen_text[start_idx:end_idx]
-                        screen_lines.append(line)
-                    else:
-                        screen_lines.append(' ' * screen_cols)
-                
-                # ✅ FIXED: Create paragraph with character-level highlighting
-                screen_para = doc.add_paragraph()
-
-                # Convert highlight info to line-based positions (accounting for newlines)
-                highlight_ranges = []
-                for field_name, field_info in highlight_info.items():
-                    row = field_info['row'] - 1  # Convert to 0-based
-                    col = field_info['column'] - 1
-                    length = field_info['length']
-                    
-                    # Calculate the start position in the text WITH newlines
-                    # Each line is screen_cols chars + 1 newline char
-                    start_pos = (row * (screen_cols + 1)) + col
-                    end_pos = start_pos + length
-                    
-                    highlight_ranges.append((start_pos, end_pos))
-
-                # Merge overlapping ranges and sort them
-                highlight_ranges.sort()
-                merged_ranges = []
-                for start, end in highlight_ranges:
-                    if merged_ranges and start <= merged_ranges[-1][1]:
-                        # Overlapping or adjacent, merge them
-                        merged_ranges[-1] = (merged_ranges[-1][0], max(merged_ranges[-1][1], end))
-                    else:
-                        merged_ranges.append((start, end))
-
-                # Build the paragraph with highlighting
-                full_text = '\n'.join(screen_lines)
-
-                if not merged_ranges:
-                    # No highlighting needed, add entire text as one run
-                    run = screen_para.add_run(full_text)
-                    run.font.name = 'Courier New'
-                    run.font.size = Pt(8)
-                else:
-                    # Add text in segments with appropriate highlighting
-                    current_pos = 0
-                    
-                    for start, end in merged_ranges:
-                        # Add non-highlighted text before this range
-                        if current_pos < start:
-                            run = screen_para.add_run(full_text[current_pos:start])
-                            run.font.name = 'Courier New'
-                            run.font.size = Pt(8)
-                        
-                        # Add highlighted text
-                        run = screen_para.add_run(full_text[start:end])
-                        run.font.name = 'Courier New'
-                        run.font.size = Pt(8)
-                        run.font.highlight_color = highlight_color_index  # ✅ Use configured color instead of hardcoded 7
+                for row, spans in entry['changes']:
+                    for label, screen_text, color in (('-', entry['baseline'], RGBColor(139, 0, 0)),
+                                                      ('+', entry['current'], RGBColor(0, 100, 0))):
+                        line = screen_text[row * 80:(row + 1) * 80]
+                        row_para = doc.add_paragraph()
+                        row_para.paragraph_format.space_after = Pt(0)
+                        prefix = row_para.add_run(f"{label} {row + 1:02d} |")
+                        prefix.font.name = 'Courier New'
+                        prefix.font.size = Pt(7)
+                        prefix.font.color.rgb = color
                         
-                        current_pos = end
-                    
-                    # Add any remaining non-highlighted text
-                    if current_pos < len(full_text):
-                        run = screen_para.add_run(full_text[current_pos:])
-                        run.font.name = 'Courier New'
-                        run.font.size = Pt(8)
-
-                # Add border to the paragraph
-                pPr = screen_para._element.get_or_add_pPr()
-                pBdr = OxmlElement('w:pBdr')
-
-                for border_name in ['top', 'left', 'bottom', 'right']:
-                    border = OxmlElement(f'w:{border_name}')
-                    border.set(qn('w:val'), 'single')
-                    border.set(qn('w:sz'), '12')
-                    border.set(qn('w:space'), '4')
-                    border.set(qn('w:color'), '808080')
-                    pBdr.append(border)
-
-                pPr.append(pBdr)
-
-                # Add shading
-                shading_elm = OxmlElement('w:shd')
-                shading_elm.set(qn('w:fill'), 'F0F0F0')
-                pPr.append(shading_elm)
-
-                screen_para.paragraph_format.space_before = Pt(0)
-                screen_para.paragraph_format.space_after = Pt(0)
-                screen_para.paragraph_format.left_indent = Inches(0.2)
-                screen_para.paragraph_format.right_indent = Inches(0.2)
-            
-            # Determine output directory
-
-            # Determine output directory
-            project_name = getattr(self, 'current_project_id', None)
-            if project_name and hasattr(self, 'projects') and project_name in self.projects:
-                project_name = self.projects[project_name]['name']
-
-            output_dir = os.path.join(self.default_results_location, 'Results', project_name if project_name else 'Master')
+                        position = 0
+                        for start, end in spans + [(80, 80)]:
+                            for segment, highlighted in ((line[position:start], False), (line[start:end], True)):
+                                if not segment:
+                                    continue
+                                run = row_para.add_run(segment)
+                                run.font.name = 'Courier New'
+                                run.font.size = Pt(7)
+                                if highlighted:
+                                    run.font.highlight_color = highlight_color_index
+                            position = end
+            
+            for label, keys in (("Only in baseline", diff['missing']), ("Only in compared run", diff['added'])):
+                if not keys:
+                    continue
+                heading = doc.add_paragraph()
+                heading.add_run(f"{label}:").font.bold = True
+                heading.paragraph_format.space_before = Pt(10)
+                for project, test_case_name, step in keys:
+                    project_info = f"[Project: {project}] " if project else ""
+                    doc.add_paragraph(f"{project_info}{test_case_name} - Step {step}").paragraph_format.space_after = Pt(0)
+            
+            output_dir = os.path.join(self.default_results_location, 'Screen Diffs')
             os.makedirs(output_dir, exist_ok=True)
-
-            # ✅ NEW: Add timestamp to filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = os.path.join(output_dir, f"{test_case_name}_{timestamp}.docx")
+            filename = os.path.join(output_dir, f"Screen Diff - {baseline_name} vs {current_name}.docx")
             doc.save(filename)
-            
             return filename
             
         except Exception as e:
-            print(f"Error creating DOCX: {e}")
-            raise
+            print(f"Error creating screen diff DOCX: {e}")
+            return None
 
-    def substitute_variables(self, text, test_case_name, total_screenshots):
+    def rerender_reports(self):
         """
-        Substitutes variables in text with actual values.
-        
-        Args:
-            text: Text containing variables like {test_case_id}
-            test_case_name: Name of the test case
-            total_screenshots: Number of screenshots in the test case
-        
-        Returns:
-            str: Text with variables replaced
+        Rebuilds the evidence documents and the execution summary of a recorded
+        run from its stored captures, using the current document layout and
+        masking configuration. PCOMM is not touched.
         """
-        from datetime import datetime
+        run_data_root = os.path.join(self.default_results_location, 'Run Data')
+        start_dir = run_data_root if os.path.isdir(run_data_root) else self.default_results_location
+        run_dir = QFileDialog.getExistingDirectory(self, "Select Recorded Run", start_dir)
+        if not run_dir:
+            return
         
-        # Get current date and time
-        now = datetime.now()
+        manifest, records, failed = load_run_data(run_dir)
         
-        # Get test case description
-        test_description = ""
-        if test_case_name in self.test_cases:
-            test_description = self.test_cases[test_case_name].get('description', '')
+        if manifest is None and not records:
+            QMessageBox.warning(self, "Re-render Reports", 
+                                f"No recorded run data found in:\n{run_dir}")
+            return
         
-        # Define variable mappings
-        variables = {
-            'test_case_id': test_case_name,
-            'test_description': test_description,
-            'date': now.strftime('%Y-%m-%d'),
-            'time': now.strftime('%H:%M:%S'),
-            'datetime': now.strftime('%Y-%m-%d %H:%M:%S'),
-            'total_screenshots': str(total_screenshots),
-            'space': ' '  # Single space character
-        }
+        # ✅ CHANGED: Descriptions are read here, on the UI thread; the workers never
+        # touch the library store or its database connection
+        descriptions = {}
+        for record in records:
+            if record['name'] in self.test_cases:
+                descriptions[record['name']] = self.test_cases[record['name']].get('description', '')
         
-        # Replace each variable in the text
-        result = text
-        for var_name, var_value in variables.items():
-            placeholder = '{' + var_name + '}'
-            result = result.replace(placeholder, var_value)
+        def show_progress(done_count, total):
+            self.statusBar().showMessage(f"Re-rendering reports... {done_count}/{total}")
+            QApplication.processEvents()
         
-        return result
+        # ✅ CHANGED: The rebuild itself is pcomm_core.rundata (also run by 'python -m pcomm_core rerender')
+        rendered, summary_path, report_path, render_failed = rerender_run(
+            run_dir, manifest, records, self.default_results_location, self.document_config,
+            descriptions=descriptions,
+            mask_text=self.apply_masking_to_text if self.masking_enabled else None,
+            masking_version=self.masking_version(),
+            progress=show_progress
+        )
+        failed.extend(render_failed)
+        
+        self.statusBar().showMessage(f"Re-rendered {len(rendered)} report(s).", 5000)
+        
+        message = f"Re-rendered {len(rendered)} test case document(s)."
+        if summary_path:
+            message += f"\n\nExecution summary saved to:\n{summary_path}"
+        if report_path:
+            message += f"\n\nConsolidated report saved to:\n{report_path}"
+        if failed:
+            message += f"\n\nFailed ({len(failed)}):\n" + "\n".join(failed)
+            QMessageBox.warning(self, "Re-render Reports", message)
+        else:
+            QMessageBox.information(self, "Re-render Reports", message)
+
            
     def convert_combo_key_to_pcomm(self, combo_key):
         """
@@ -16455,44 +17752,41 @@ class PCOMMMainFrame(QMainWindow):
 
     def save_masking_config(self):
         """Saves masking configuration to file."""
-        try:
-            config = {
-                'enabled': self.masking_enabled,
-                'patterns': self.masking_patterns
-            }
-            with open(self.masking_config_file, 'w') as f:
-                json.dump(config, f, indent=4)
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", f"Failed to save masking configuration: {e}")
+        # ✅ CHANGED: Write failures are reported by on_save_failed()
+        self.persistence.request_save(self.masking_config_file, lambda: {
+            'enabled': self.masking_enabled,
+            'patterns': self.masking_patterns
+        })
 
     def apply_masking_to_text(self, text):
         """Applies masking patterns to text if masking is enabled."""
         if not self.masking_enabled or not self.masking_patterns:
             return text
         
-        masked_text = text
-        
-        for pattern_obj in self.masking_patterns:
-            regex = pattern_obj.get('regex')
-            mask_indices = pattern_obj.get('mask_indices')
-            
-            if not regex or not mask_indices:
-                continue
-            
-            try:
-                def mask_match(match):
-                    original = match.group(0)
-                    masked = list(original)
-                    for idx in mask_indices:
-                        if 0 <= idx < len(masked):
-                            masked[idx] = 'x'
-                    return ''.join(masked)
-                
-                masked_text = re.sub(regex, mask_match, masked_text)
-            except re.error:
-                continue
+        # ✅ CHANGED: Single pass with the compiled (and cached) masking engine
+        return MaskingEngine.for_patterns(self.masking_patterns).apply(text)
+
+    def masking_version(self):
+        """
+        Returns the hash of the masking patterns apply_masking_to_text() applies,
+        or None when it leaves text unmasked.
+        """
+        if not self.masking_enabled or not self.masking_patterns:
+            return None
+        return MaskingEngine.for_patterns(self.masking_patterns).version
+
+    def mask_screen_text(self, text):
+        """
+        Masks text and reports the patterns used, read from one configuration.
         
-        return masked_text
+        Returns:
+            tuple: (masked text, masking version or None if unmasked)
+        """
+        patterns = self.masking_patterns
+        if not self.masking_enabled or not patterns:
+            return text, None
+        engine = MaskingEngine.for_patterns(patterns)
+        return engine.apply(text), engine.version
 
     def open_settings_dialog(self):
         """Opens the unified settings dialog."""
@@ -16511,23 +17805,16 @@ class PCOMMMainFrame(QMainWindow):
         if not self.pcomm_canvas_text_edit or length <= 0:
             return
         
-        # Get the text cursor
-        cursor = self.pcomm_canvas_text_edit.textCursor()
-        
-        # Move to the start of the document
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-        
-        # Move down to the correct row (row is 1-based, so row-1 moves)
-        for _ in range(row - 1):
-            cursor.movePosition(QTextCursor.MoveOperation.Down)
+        # ✅ CHANGED: Select by absolute document position instead of one cursor move per character.
+        # Each screen row is a block of the preview document.
+        document = self.pcomm_canvas_text_edit.document()
+        last_position = document.characterCount() - 1
+        block = document.findBlockByNumber(min(max(row, 1), document.blockCount()) - 1)
+        start = min(block.position() + max(column - 1, 0), last_position)
         
-        # Move right to the correct column (column is 1-based, so column-1 moves)
-        for _ in range(column - 1):
-            cursor.movePosition(QTextCursor.MoveOperation.Right)
-        
-        # Select the text for the given length
-        for _ in range(length):
-            cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor)
+        cursor = self.pcomm_canvas_text_edit.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(min(start + length, last_position), QTextCursor.MoveMode.KeepAnchor)
         
         # Set the cursor with selection
         self.pcomm_canvas_text_edit.setTextCursor(cursor)
@@ -16550,12 +17837,27 @@ class PCOMMMainFrame(QMainWindow):
 
     def save_default_location_config(self):
         """Saves the default results location to file."""
-        try:
-            config = {'location': self.default_results_location}
-            with open(self.default_results_location_file, 'w') as f:
-                json.dump(config, f, indent=4)
-        except Exception as e:
-            QMessageBox.warning(self, "Save Error", f"Failed to save default location configuration: {e}")
+        # ✅ CHANGED: Write failures are reported by on_save_failed()
+        self.persistence.request_save(self.default_results_location_file,
+                                      lambda: {'location': self.default_results_location})
+
+    def on_save_failed(self, path, error):
+        """
+        Shows a failed background save (PersistenceService.save_failed).
+        
+        Args:
+            path: The file that could not be written
+            error: The error message
+        """
+        descriptions = {
+            'pcomm_config.json': "PCOMM configuration",
+            self.document_config_file: "configuration",
+            self.masking_config_file: "masking configuration",
+            self.default_results_location_file: "default location configuration",
+            'test_execution_data.json': "test execution data",
+        }
+        what = descriptions.get(path, f"'{path}'")
+        QMessageBox.warning(self, "Save Error", f"Failed to save {what}: {error}")
             
     def set_initial_dock_sizes(self):
         """Sets the initial sizes of dock widgets to be equal on startup."""
@@ -16568,16 +17870,36 @@ class PCOMMMainFrame(QMainWindow):
         # Resize the left dock
         self.resizeDocks([self.libraries_dock], [left_width], Qt.Orientation.Horizontal)  
 
-    def capture_pcomm_screen_as_jpeg(self, output_path):
+    def capture_pcomm_screen_as_jpeg(self, output_path, autECLPS=None, rows=24, cols=80):
         """
         Captures the PCOMM screen and saves it as JPEG.
         
+        When masking is enabled and the screen contains masked values, the
+        JPEG is rendered from the masked screen text instead of the window
+        pixels, so unmasked host data is never written to disk.
+        
         Args:
             output_path: Full path where the JPEG should be saved
+            autECLPS: Optional PCOMM presentation space used to read the screen text
+            rows: Number of screen rows (default 24)
+            cols: Number of screen columns (default 80)
         
         Returns:
             bool: True if successful, False otherwise
         """
+        # ✅ NEW: Capture-time masking for Screen Flow images
+        if autECLPS is not None and self.masking_enabled and self.masking_patterns:
+            try:
+                screen_text = autECLPS.GetText(1, rows * cols)
+                masked_text = self.apply_masking_to_text(screen_text)
+                if masked_text != screen_text:
+                    im = self.render_screen_text_as_image(masked_text, rows, cols)
+                    im.save(output_path, 'JPEG', quality=95)
+                    return True
+            except Exception as e:
+                print(f"Error capturing masked PCOMM screen: {e}")
+                return False
+        
         try:
             pcomm_window = gw.getWindowsWithTitle(self.pcomm_window_title)[0]
             
@@ -16632,6 +17954,37 @@ class PCOMMMainFrame(QMainWindow):
             print(f"Error capturing PCOMM screen: {e}")
             return False        
 
+    def render_screen_text_as_image(self, screen_text, rows=24, cols=80):
+        """
+        Renders screen text as a green-on-black terminal image.
+        
+        Args:
+            screen_text: The screen content (rows * cols characters)
+            rows: Number of screen rows (default 24)
+            cols: Number of screen columns (default 80)
+        
+        Returns:
+            PIL.Image.Image: The rendered screen
+        """
+        from PIL import ImageDraw, ImageFont
+        
+        try:
+            font = ImageFont.truetype("consola.ttf", 16)
+        except OSError:
+            font = ImageFont.load_default()
+        
+        left, top, right, bottom = font.getbbox("M")
+        cell_width = max(right - left, 1) + 1
+        cell_height = max(bottom - top, 1) + 6
+        padding = 8
+        
+        im = Image.new('RGB', (cols * cell_width + 2 * padding, rows * cell_height + 2 * padding), (0, 0, 0))
+        draw = ImageDraw.Draw(im)
+        for row in range(rows):
+            line = screen_text[row * cols:(row + 1) * cols]
+            draw.text((padding, padding + row * cell_height), line, font=font, fill=(0, 255, 0))
+        return im
+
 
     def convert_to_template(self):
         """Opens dialog to select a test case and convert it to an Excel template."""
@@ -17043,23 +18396,21 @@ class PCOMMMainFrame(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to create template:\n\n{str(e)}")
     
     def save_templates_to_file(self):
-        """Saves templates to JSON file."""
+        """Saves the changed templates to the library database."""
         try:
-            with open(self.template_file, 'w') as f:
-                json.dump(self.templates, f, indent=4)
+            self.library.sync('templates', self.templates)
         except Exception as e:
             print(f"Error saving templates: {e}")
 
     def load_templates_from_file(self):
-        """Loads templates from JSON file."""
-        if os.path.exists(self.template_file):
-            try:
-                with open(self.template_file, 'r') as f:
-                    self.templates = json.load(f)
+        """Loads templates from the library database."""
+        try:
+            self.templates = self.load_library_table('templates', self.template_file)
+            if self.templates:
                 self.update_template_tree()
-            except Exception as e:
-                print(f"Error loading templates: {e}")
-                self.templates = {}    
+        except Exception as e:
+            print(f"Error loading templates: {e}")
+            self.templates = {}    
     
     def filter_templates(self, query: str):
         """Filters templates based on search query."""
@@ -17410,22 +18761,25 @@ class LinkDataSourceDialog(QDialog):
 if __name__ == "__main__":
     import os
     os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "0"
+    startup_profiler.mark('imports')  # ✅ NEW
     app = QApplication(sys.argv)
     
+    # ✅ NEW: Warnings and errors of the run log (see the Run Console) are echoed to the console
+    run_log.echo = sys.stdout
+    
     # Show splash screen
     splash = SplashScreen()
     splash.show()
+    app.processEvents()  # ✅ NEW: Paint the splash before the window is built
     
     # Create main window but don't show it yet
     window = PCOMMMainFrame()
     
-    # Timer to close splash and show main window after 3 seconds
-    def show_main_window():
-        splash.close()
-        window.showMaximized()  # Show maximized
-        # Set equal dock sizes after window is shown and maximized
-        QTimer.singleShot(200, window.set_initial_dock_sizes)
-    
-    QTimer.singleShot(3000, show_main_window)  # 3000ms = 3 seconds
+    # ✅ CHANGED: The window is shown as soon as it is ready instead of after a fixed 3 seconds
+    splash.close()
+    window.showMaximized()  # Show maximized
+    # Set equal dock sizes after window is shown and maximized
+    QTimer.singleShot(200, window.set_initial_dock_sizes)
+    QTimer.singleShot(0, startup_profiler.finish)  # ✅ NEW: Runs once the first paint is queued
     
     sys.exit(app.exec())
\ No newline at end of file
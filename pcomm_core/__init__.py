@@ -0,0 +1,25 @@
+"""
+Core engine of the PCOMM test automation tool: the logic that needs no GUI.
+
+Nothing in this package imports Qt or win32 when it is loaded, so it can be
+imported, profiled and benchmarked on any platform. The Qt application in
+capture.py and the command line (python -m pcomm_core) are front ends over
+it; the PCOMM COM objects are only created when a session is opened
+(session.connect_pcomm_session).
+
+The step executor and the plan compiler still live in the Qt execution
+dialog of capture.py, interleaved with its widgets; they are not part of
+this package yet.
+
+Modules:
+    session   PCOMM session backends and host screen waits
+    masking   Masking of sensitive values in captured text
+    reports   Evidence, summary and streaming consolidated DOCX report builders
+    screen    Golden-screen regression diff and live frame tracking
+    codec     JSON codec and atomic file writes
+    model     Typed step and module records, module versions and lookups
+    storage   SQLite library repository, lazy record stores, bulk import, bundles
+    runlog    Bounded run log with step durations and the slowest steps
+    rundata   Recorded run files and the headless re-render of their reports
+    synthetic Synthetic large libraries for scalability benchmarks
+"""
@@ -0,0 +1,122 @@
+"""
+Command line front end of the core engine.
+
+Rebuilds the evidence documents of a recorded run without the GUI or PCOMM,
+from the same configuration files the application writes:
+
+    python -m pcomm_core rerender "<results>/Run Data/<timestamp>"
+        [--results DIR] [--document-config document_config.json]
+        [--masking-config masking_config.json] [--library library.db]
+"""
+import argparse
+import json
+import os
+import sys
+
+from .masking import MaskingEngine
+from .rundata import load_run_data, rerender_run
+
+
+def read_document_config(path):
+    """Reads the document layout configuration (old list format included)."""
+    if not os.path.exists(path):
+        return {'text_elements': [], 'highlight_color': 'Yellow'}
+    with open(path, 'r') as f:
+        config = json.load(f)
+    if isinstance(config, list):
+        return {'text_elements': config, 'highlight_color': 'Yellow'}
+    return config
+
+
+def read_masking_engine(path):
+    """Returns the masking engine of an enabled masking configuration, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        config = json.load(f)
+    if not config.get('enabled', False) or not config.get('patterns'):
+        return None
+    return MaskingEngine.for_patterns(config['patterns'])
+
+
+def read_descriptions(db_path, names):
+    """Returns the library descriptions of the given test cases."""
+    from .storage import LibraryRepository
+
+    descriptions = {}
+    if not os.path.exists(db_path):
+        return descriptions
+    library = LibraryRepository(db_path)
+    try:
+        for name in names:
+            record = library.load_record('test_cases', name)
+            if record is not None:
+                descriptions[name] = record.get('description', '')
+    finally:
+        library.close()
+    return descriptions
+
+
+def rerender(args):
+    run_dir = os.path.normpath(args.run_dir)
+    if not os.path.isdir(run_dir):
+        print(f"Not a folder: {run_dir}")
+        return 2
+
+    # A run lives in '<results>/Run Data/<timestamp>'
+    results_location = args.results
+    if results_location is None:
+        parent = os.path.dirname(run_dir)
+        results_location = os.path.dirname(parent) if os.path.basename(parent) == 'Run Data' else os.getcwd()
+
+    manifest, records, failed = load_run_data(run_dir)
+    if manifest is None and not records:
+        print(f"No recorded run data found in: {run_dir}")
+        return 2
+
+    document_config = read_document_config(args.document_config)
+    engine = read_masking_engine(args.masking_config)
+    descriptions = read_descriptions(args.library, {record['name'] for record in records})
+
+    rendered, summary_path, report_path, render_failed = rerender_run(
+        run_dir, manifest, records, results_location, document_config,
+        descriptions=descriptions,
+        mask_text=engine.apply if engine else None,
+        masking_version=engine.version if engine else None,
+        max_workers=args.workers,
+        progress=lambda done, total: print(f"Re-rendering reports... {done}/{total}", end='\r')
+    )
+    failed.extend(render_failed)
+    if records:
+        print()
+
+    print(f"Re-rendered {len(rendered)} test case document(s).")
+    if summary_path:
+        print(f"Execution summary saved to: {summary_path}")
+    if report_path:
+        print(f"Consolidated report saved to: {report_path}")
+    for failure in failed:
+        print(f"Failed: {failure}")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pcomm_core', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rerender_parser = commands.add_parser('rerender', help='Rebuild the documents of a recorded run')
+    rerender_parser.add_argument('run_dir', help="The run folder ('Run Data/<timestamp>')")
+    rerender_parser.add_argument('--results', help="Results location (default: the folder holding 'Run Data')")
+    rerender_parser.add_argument('--document-config', default='document_config.json')
+    rerender_parser.add_argument('--masking-config', default='masking_config.json')
+    rerender_parser.add_argument('--library', default='library.db', help='Library database for test descriptions')
+    rerender_parser.add_argument('--workers', type=int, default=None)
+    rerender_parser.set_defaults(handler=rerender)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
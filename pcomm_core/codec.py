@@ -0,0 +1,148 @@
+"""
+JSON encoding and decoding with the fastest available backend, and atomic
+file writes shared by every persisted file.
+"""
+import json
+import os
+import threading
+
+
+# --- NEW: JSON Codec ---
+class JsonCodec:
+    """
+    Pluggable JSON serialization for the persisted state.
+
+    Uses the fastest registered backend that can be imported (orjson when
+    installed, the standard json module otherwise). Compact output (no
+    indentation) is the default; pretty output is kept for files people
+    edit by hand. Files can optionally be gzip-compressed, and reading
+    detects compression from the file content, so pretty-printed, compact
+    and compressed files all load the same way.
+    """
+
+    GZIP_MAGIC = b'\x1f\x8b'
+    PREFERRED = ('orjson', 'stdlib')
+    _backends = {}
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: Name of a registered backend (default: fastest available)
+        """
+        if backend is None:
+            backend = next(name for name in self.PREFERRED if self.load_backend(name))
+        elif not self.load_backend(backend):
+            raise ValueError(f"JSON backend '{backend}' is not available")
+        self.backend = backend
+        self._dumps, self._loads = self._backends[backend]
+
+    @classmethod
+    def register_backend(cls, name, dumps, loads):
+        """
+        Registers a backend.
+
+        Args:
+            name: Backend name
+            dumps: Callable(data) returning compact JSON as str or bytes;
+                   raises TypeError for data it cannot serialize
+            loads: Callable(str or bytes) returning the parsed data
+        """
+        cls._backends[name] = (dumps, loads)
+
+    @classmethod
+    def load_backend(cls, name):
+        """Imports a built-in backend on first use. Returns True if it is available."""
+        if name in cls._backends:
+            return True
+        if name == 'stdlib':
+            cls.register_backend('stdlib', json.dumps, json.loads)
+        elif name == 'orjson':
+            try:
+                import orjson
+            except ImportError:
+                return False
+            cls.register_backend('orjson', orjson.dumps, orjson.loads)
+        else:
+            return False
+        return True
+
+    def dumps(self, data, indent=None):
+        """
+        Serializes data to a JSON string.
+
+        Args:
+            data: JSON-serializable data
+            indent: Indentation for pretty output (None for compact output)
+        """
+        if indent is None and self.backend != 'stdlib':
+            try:
+                text = self._dumps(data)
+                return text.decode('utf-8') if isinstance(text, bytes) else text
+            except TypeError:
+                pass  # e.g. non-string keys, which the standard module converts
+        return json.dumps(data, indent=indent)
+
+    def loads(self, text):
+        """Parses JSON from a str or bytes."""
+        return self._loads(text)
+
+    def read_file(self, path):
+        """Reads a JSON file, compressed or not."""
+        import gzip
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:2] == self.GZIP_MAGIC:
+            data = gzip.decompress(data)
+        return self._loads(data)
+
+    def write_file(self, path, data, indent=None, compress=False):
+        """
+        Writes a JSON file atomically.
+
+        Args:
+            path: Target file
+            data: JSON-serializable data
+            indent: Indentation for pretty output (None for compact output)
+            compress: gzip the file
+        """
+        import gzip
+
+        payload = self.dumps(data, indent=indent).encode('utf-8')
+        if compress:
+            payload = gzip.compress(payload, compresslevel=6)
+        atomic_write_bytes(path, payload)
+
+
+json_codec = JsonCodec()
+
+
+# --- NEW: Atomic File Writes ---
+def atomic_write_bytes(path, data):
+    """
+    Writes bytes to a file atomically: the data goes to a temporary file in
+    the same folder, which then replaces the target in one rename. A crash
+    mid-write leaves the previous file intact.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def atomic_write_text(path, text):
+    """Writes text (UTF-8) to a file atomically."""
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def atomic_write_json(path, data, indent=4):
+    """Serializes data to JSON and writes it atomically."""
+    atomic_write_text(path, json_codec.dumps(data, indent=indent))
@@ -0,0 +1,157 @@
+"""
+Masking of sensitive values (account numbers, names, ...) in captured screen
+text before it is written to evidence documents.
+"""
+import functools
+import hashlib
+import re
+
+
+# --- NEW: Compiled Masking Engine ---
+class MaskingEngine:
+    """
+    Applies the configured masking patterns to screen text.
+    
+    The patterns are compiled once, with their mask indices precomputed, and
+    engines are cached by pattern configuration so repeated calls reuse them.
+    
+    Rules generated by the masking dialog are structural (digit runs and
+    literal characters between word boundaries), so each one only ever matches
+    a single "digit shape" - e.g. '000000-0000000'. A text is projected to its
+    digit shape in one pass and a rule is only run when its shape occurs in it.
+    Rules that are applied still run in configuration order on the progressively
+    masked text, so the result is identical to applying every rule in turn.
+    """
+    _cache = {}
+    _cache_size = 8
+    _max_direct_candidates = 16
+    _digit_shape = bytes.maketrans(b'0123456789', b'0000000000')
+    _structural_token = re.compile(r'\\d\{(\d+)\}|\\([^0-9A-Za-z])|([^\\()\[\]{}?*+|^$.0-9x])')
+    
+    def __init__(self, patterns):
+        self.signature = self.pattern_signature(patterns)
+        self.version = self.signature_version(self.signature)
+        self.rules = []
+        
+        for regex, mask_indices in self.signature:
+            if not regex or not mask_indices:
+                continue
+            try:
+                compiled = re.compile(regex)
+            except re.error:
+                continue
+            shape = self.shape_of_regex(regex)
+            replace = functools.partial(self.mask_by_indices, mask_indices)
+            self.rules.append((compiled, shape.encode('ascii') if shape else None, replace))
+    
+    @staticmethod
+    def pattern_signature(patterns):
+        """Returns a hashable (regex, mask indices) key for a pattern list."""
+        return tuple(
+            (pattern_obj.get('regex'),
+             tuple(idx for idx in (pattern_obj.get('mask_indices') or ()) if idx >= 0))
+            for pattern_obj in patterns
+        )
+    
+    @staticmethod
+    def signature_version(signature):
+        """
+        Returns a short hash identifying a pattern signature, stored with
+        screens masked at capture time so a change of patterns is detected.
+        """
+        return hashlib.blake2b(repr(signature).encode('utf-8'), digest_size=8).hexdigest()
+    
+    @classmethod
+    def for_patterns(cls, patterns):
+        """Returns a cached engine for the given pattern configuration."""
+        signature = cls.pattern_signature(patterns)
+        engine = cls._cache.get(signature)
+        if engine is None:
+            engine = cls(patterns)
+            if len(cls._cache) >= cls._cache_size:
+                cls._cache.pop(next(iter(cls._cache)))
+            cls._cache[signature] = engine
+        return engine
+    
+    @classmethod
+    def shape_of_regex(cls, regex):
+        """
+        Returns the digit shape matched by a structural regex such as
+        '\\b\\d{6}\\-\\d{7}\\b' ('000000-0000000'), or None for any other regex.
+        Rules containing a literal 'x' are not structural, since masked
+        characters become 'x'.
+        """
+        if not (regex.startswith(r'\b') and regex.endswith(r'\b')):
+            return None
+        
+        body = regex[2:-2]
+        shape = []
+        pos = 0
+        while pos < len(body):
+            match = cls._structural_token.match(body, pos)
+            if not match:
+                return None
+            digit_count, escaped_char, plain_char = match.groups()
+            if digit_count is not None:
+                shape.append('0' * int(digit_count))
+            else:
+                shape.append(escaped_char if escaped_char is not None else plain_char)
+            pos = match.end()
+        
+        shape = ''.join(shape)
+        return shape if shape and shape.isascii() else None
+    
+    @staticmethod
+    def mask_by_indices(mask_indices, match):
+        """Replaces the characters of a match at the given indices with 'x'."""
+        masked = list(match.group())
+        length = len(masked)
+        for idx in mask_indices:
+            if idx < length:
+                masked[idx] = 'x'
+        return ''.join(masked)
+    
+    def apply(self, text):
+        """Returns the text with all masking rules applied."""
+        if not text or not self.rules:
+            return text
+        
+        # Non-ASCII text may contain other Unicode digits, so run every rule
+        if not text.isascii():
+            for compiled, _, replace in self.rules:
+                text = compiled.sub(replace, text)
+            return text
+        
+        text_shape = text.encode('ascii').translate(self._digit_shape)
+        for compiled, shape, replace in self.rules:
+            if shape is None:
+                text = compiled.sub(replace, text)
+                continue
+            
+            # A structural rule can only match where its shape occurs
+            candidates = []
+            pos = text_shape.find(shape)
+            while pos >= 0 and len(candidates) <= self._max_direct_candidates:
+                candidates.append(pos)
+                pos = text_shape.find(shape, pos + 1)
+            
+            if not candidates:
+                continue
+            if len(candidates) > self._max_direct_candidates:
+                text = compiled.sub(replace, text)
+                continue
+            
+            pieces = []
+            last_end = 0
+            for pos in candidates:
+                if pos < last_end:
+                    continue
+                match = compiled.match(text, pos)
+                if match:
+                    pieces.append(text[last_end:pos])
+                    pieces.append(replace(match))
+                    last_end = match.end()
+            if pieces:
+                pieces.append(text[last_end:])
+                text = ''.join(pieces)
+        return text
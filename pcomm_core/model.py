@@ -0,0 +1,365 @@
+"""
+Typed views of the stored records (labels, fields, steps, modules), module
+version hashes and the maintained module lookups used by the executor.
+"""
+import dataclasses
+import hashlib
+import json
+import time
+
+
+# --- NEW: Module Versions ---
+def module_version_hash(module_data):
+    """
+    Returns the short version hash of a module's field names and positions.
+    Steps store it as 'module_version' to detect outdated module imports.
+    """
+    field_signature = json.dumps([
+        {
+            'name': label.get('name') or label.get('label') or label.get('text', ''),
+            'row': label.get('row'),
+            'col': label.get('column')
+        }
+        for label in module_data.get('labels', [])
+    ], sort_keys=True)
+    return hashlib.md5(field_signature.encode()).hexdigest()[:8]
+
+
+def rebuild_module_step_fields(step_data, module_data, action_type, id_stem):
+    """
+    Rebuilds a module import step's fields from the current module labels,
+    keeping the values of the fields whose names still exist.
+
+    Args:
+        step_data (dict): Step or utility step, updated in place
+        module_data (dict): Current module record
+        action_type (str): Action type of the new fields
+        id_stem (str): Middle part of the generated internal field ids
+
+    Returns:
+        tuple: (new fields, {field name: previous value})
+    """
+    import random
+    
+    existing_values = {}
+    for field in step_data.get('fields', []):
+        field_name = field.get('field_name')
+        if field_name:
+            existing_values[field_name] = field.get('value', '')
+    
+    new_fields = []
+    for idx, label_data in enumerate(module_data.get('labels', [])):
+        field_name = label_data.get('label') or label_data.get('text') or label_data.get('name', 'N/A')
+        
+        # Generate unique ID
+        unique_timestamp = int(time.time() * 1000000)
+        random_suffix = random.randint(100000, 999999)
+        new_fields.append({
+            "field_name": field_name,
+            "internal_field_id": f"{field_name}_{id_stem}_REFRESH_{unique_timestamp}_{random_suffix}_{idx}",
+            "action_type": action_type,
+            "value": existing_values.get(field_name, ''),
+        })
+    
+    step_data['fields'] = new_fields
+    return new_fields, existing_values
+
+
+# ✅ NEW: Typed in-memory records for the execution hot paths
+def _to_int(value, default):
+    """Converts a stored coordinate to int, falling back to default."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclasses.dataclass(slots=True)
+class Label:
+    """A named field position on a captured module screen."""
+    name: str
+    row: int = 1
+    column: int = 1
+    length: int | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a label from its stored dict, resolving the legacy name aliases.
+
+        Args:
+            data (dict): Stored label with 'name' (or 'label'/'text'), 'row', 'column', 'length'
+
+        Returns:
+            Label: The typed label
+        """
+        length = data.get('length')
+        return cls(
+            name=data.get('name') or data.get('label') or data.get('text', ''),
+            row=_to_int(data.get('row', 1), 1),
+            column=_to_int(data.get('column', 1), 1),
+            length=None if length is None else _to_int(length, None)
+        )
+
+    def to_dict(self):
+        data = {'name': self.name, 'row': self.row, 'column': self.column}
+        if self.length is not None:
+            data['length'] = self.length
+        return data
+
+
+@dataclasses.dataclass(slots=True)
+class Field:
+    """An input or validation value bound to a module label."""
+    field_name: str
+    internal_field_id: str = ''
+    action_type: str = 'Input'
+    value: str = ''
+    highlight: bool = False
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a field from its stored dict. The value is stringified and stripped once here.
+
+        Args:
+            data (dict): Stored field with 'field_name', 'action_type', 'value', 'highlight'
+
+        Returns:
+            Field: The typed field
+        """
+        return cls(
+            field_name=data.get('field_name') or '',
+            internal_field_id=data.get('internal_field_id') or '',
+            action_type=data.get('action_type') or 'Input',
+            value=str(data.get('value', '')).strip(),
+            highlight=bool(data.get('highlight', False))
+        )
+
+    def to_dict(self):
+        return {
+            'field_name': self.field_name,
+            'internal_field_id': self.internal_field_id,
+            'action_type': self.action_type,
+            'value': self.value,
+            'highlight': self.highlight
+        }
+
+
+@dataclasses.dataclass(slots=True)
+class UtilityStep:
+    """A utility step (special key, wait, capture, random input or module import)."""
+    type: str
+    name: str = ''
+    module_name: str | None = None
+    reference_module: str | None = None
+    module_version: str | None = None
+    fields: list = dataclasses.field(default_factory=list)
+    key_value: str = ''
+    seconds: float = 0.0
+    row: int = 1
+    column: int = 1
+    value: str = ''
+    is_special_key: bool = False
+    message: str = ''
+
+    @classmethod
+    def _common_kwargs(cls, data):
+        try:
+            seconds = float(data.get('seconds', 0))
+        except (TypeError, ValueError):
+            seconds = 0.0
+        return {
+            'type': data.get('type') or '',
+            'name': data.get('name', ''),
+            'module_name': data.get('module_name'),
+            'reference_module': data.get('reference_module'),
+            'module_version': data.get('module_version'),
+            'fields': [Field.from_dict(field) for field in data.get('fields', [])],
+            'key_value': data.get('key_value', ''),
+            'seconds': seconds,
+            'row': _to_int(data.get('row', 1), 1),
+            'column': _to_int(data.get('column', 1), 1),
+            'value': str(data.get('value', '')).strip(),
+            'is_special_key': bool(data.get('is_special_key', False)),
+            'message': data.get('message', '')
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a typed step from its stored dict.
+
+        Args:
+            data (dict): Stored step dict
+
+        Returns:
+            UtilityStep: The typed step
+        """
+        return cls(**cls._common_kwargs(data))
+
+
+@dataclasses.dataclass(slots=True)
+class Step(UtilityStep):
+    """A main test case step, which can carry its own utility steps."""
+    utility_steps: list = dataclasses.field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a typed step and its utility steps from the stored dict.
+
+        Args:
+            data (dict): Stored step dict
+
+        Returns:
+            Step: The typed step
+        """
+        return cls(
+            utility_steps=[UtilityStep.from_dict(utility) for utility in data.get('utility_steps', [])],
+            **cls._common_kwargs(data)
+        )
+
+
+@dataclasses.dataclass(slots=True)
+class Module:
+    """A captured module screen with its labels indexed by name."""
+    name: str
+    labels: list = dataclasses.field(default_factory=list)
+    labels_by_name: dict = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """
+        Builds a module from its stored dict.
+
+        Args:
+            name (str): Module name
+            data (dict): Stored module dict with a 'labels' list
+
+        Returns:
+            Module: The typed module
+        """
+        labels = [Label.from_dict(label) for label in data.get('labels', [])]
+        labels_by_name = {}
+        for label in labels:
+            # The executors always used the first label with a given name
+            labels_by_name.setdefault(label.name, label)
+        return cls(name=name, labels=labels, labels_by_name=labels_by_name)
+
+    def label(self, name):
+        """Returns the label called name, or None."""
+        return self.labels_by_name.get(name)
+
+    def labels_named(self, name):
+        """
+        Returns the label called name as a tuple of zero or one labels, so a
+        former linear scan over all labels keeps its loop and break structure.
+        """
+        label = self.labels_by_name.get(name)
+        return (label,) if label is not None else ()
+
+
+# ✅ NEW: Maintained module lookups (labels, versions, referencing steps)
+class ModuleIndex:
+    """
+    Indexes over the module library, built per module on first use:
+    
+    - module -> typed Module record (label name -> position)
+    - module -> [(test case, step index, utility step index or None)]
+    
+    Entries are dropped per name when the LibraryRepository reports a write,
+    so editing one module never rescans the others. Version hashes come from
+    the repository, which maintains them at write time.
+    """
+    
+    def __init__(self, repository, get_modules, get_test_cases):
+        """
+        Args:
+            repository: The LibraryRepository holding the library
+            get_modules: Callable returning the current modules mapping
+            get_test_cases: Callable returning the current test cases mapping
+        """
+        self.repository = repository
+        self._get_modules = get_modules
+        self._get_test_cases = get_test_cases
+        self._models = {}
+        self._references = {}
+        repository.add_listener(self._on_change)
+    
+    def module(self, module_name):
+        """Returns the typed Module record, or None if the module does not exist."""
+        model = self._models.get(module_name)
+        if model is None:
+            module_data = self._get_modules().get(module_name)
+            if module_data is None:
+                return None
+            model = Module.from_dict(module_name, module_data)
+            self._models[module_name] = model
+        return model
+    
+    def label(self, module_name, label_name):
+        """Returns the Label called label_name in a module, or None."""
+        model = self.module(module_name)
+        return model.label(label_name) if model is not None else None
+    
+    def version(self, module_name):
+        """Returns the current version hash of a module, or None if it does not exist."""
+        version = self.repository.module_versions.get(module_name)
+        if version is None and module_name in self._get_modules():
+            # Not written yet: hash the in-memory record
+            version = module_version_hash(self._get_modules()[module_name])
+        return version
+    
+    def is_stale(self, step_data):
+        """
+        Returns True if a module import step was built against an older
+        version of its module (or has no version), False otherwise.
+        """
+        if step_data.get('type') != 'module_import':
+            return False
+        module_name = step_data.get('module_name')
+        if not module_name or module_name not in self._get_modules():
+            return False
+        step_version = step_data.get('module_version')
+        return step_version is None or step_version != self.version(module_name)
+    
+    def references(self, module_name):
+        """
+        Returns the steps using a module, found through the indexed test case
+        -> module table, so only the test cases that reference it are opened.
+        
+        Returns:
+            list: [(test case name, step index, utility step index or None)]
+        """
+        references = self._references.get(module_name)
+        if references is None:
+            references = []
+            test_cases = self._get_test_cases()
+            for test_case_name in self.repository.test_cases_using_module(module_name):
+                test_case_data = test_cases.get(test_case_name)
+                if not test_case_data:
+                    continue
+                for step_index, step in enumerate(test_case_data.get('steps', [])):
+                    if module_name in (step.get('module_name'), step.get('reference_module')):
+                        references.append((test_case_name, step_index, None))
+                    for utility_index, utility_step in enumerate(step.get('utility_steps', [])):
+                        if module_name in (utility_step.get('module_name'), utility_step.get('reference_module')):
+                            references.append((test_case_name, step_index, utility_index))
+            self._references[module_name] = references
+        return references
+    
+    def clear(self):
+        self._models.clear()
+        self._references.clear()
+    
+    def _on_change(self, table, changed, removed):
+        """Repository listener: drops the entries of the written records."""
+        if table == 'modules':
+            for name in list(changed) + list(removed):
+                self._models.pop(name, None)
+            for name in removed:
+                self._references.pop(name, None)
+        elif table == 'test_cases':
+            # Rebuilding one module's references is an indexed query
+            self._references.clear()
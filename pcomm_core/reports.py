@@ -0,0 +1,642 @@
+"""
+Report builders that need no GUI: the per-test evidence document, the
+execution summary (both with python-docx) and the streaming consolidated
+evidence report written as raw WordprocessingML.
+"""
+import os
+import re
+
+
+# Word highlight color indices of the document layout color names
+HIGHLIGHT_COLOR_INDEX = {
+    'Yellow': 7,
+    'Bright Green': 4,
+    'Turquoise': 3,
+    'Pink': 5,
+    'Blue': 2,
+    'Red': 6,
+    'Dark Blue': 9,
+    'Dark Cyan': 10,
+    'Dark Green': 11,
+    'Dark Magenta': 12,
+    'Dark Red': 13,
+    'Dark Yellow': 14,
+    'Gray 25%': 16,
+    'Gray 50%': 15
+}
+
+
+def substitute_variables(text, test_case_name, total_screenshots, now=None, test_description=''):
+    """
+    Substitutes variables in text with actual values.
+    
+    Args:
+        text: Text containing variables like {test_case_id}
+        test_case_name: Name of the test case
+        total_screenshots: Number of screenshots in the test case
+        now: Date/time to substitute (defaults to the current time)
+        test_description: Description of the test case
+    
+    Returns:
+        str: Text with variables replaced
+    """
+    from datetime import datetime
+    
+    if now is None:
+        now = datetime.now()
+    
+    variables = {
+        'test_case_id': test_case_name,
+        'test_description': test_description,
+        'date': now.strftime('%Y-%m-%d'),
+        'time': now.strftime('%H:%M:%S'),
+        'datetime': now.strftime('%Y-%m-%d %H:%M:%S'),
+        'total_screenshots': str(total_screenshots),
+        'space': ' '  # Single space character
+    }
+    
+    result = text
+    for var_name, var_value in variables.items():
+        result = result.replace('{' + var_name + '}', var_value)
+    return result
+
+
+def capture_time_of(screenshots_data):
+    """Returns the capture date/time of the first screenshot, or None."""
+    from datetime import datetime
+    
+    if screenshots_data and screenshots_data[0].get('timestamp'):
+        try:
+            return datetime.strptime(screenshots_data[0]['timestamp'], '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return None
+    return None
+
+
+def build_test_case_docx(test_case_name, screenshots_data, output_path, document_config,
+                         test_description='', now=None, mask_text=None, masking_version=None):
+    """
+    Writes the evidence document of one test case: the configured text
+    elements, then every screenshot as a bordered 24x80 block with the marked
+    fields highlighted.
+    
+    Args:
+        test_case_name: Name of the test case
+        screenshots_data: The DOCX screenshot records captured for the test
+        output_path: Full path of the document
+        document_config: The document layout configuration
+        test_description: Description substituted for {test_description}
+        now: Date/time substituted for {date}/{time} (defaults to the current time)
+        mask_text: Callable used for screens not masked with the current patterns
+        masking_version: Version of the current patterns (MaskingEngine.version)
+    
+    Returns:
+        str: output_path
+    """
+    from docx import Document
+    from docx.shared import Pt, Inches
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.oxml.shared import OxmlElement
+    from docx.oxml.ns import qn
+    
+    doc = Document()
+    
+    # Narrower margins for better space usage
+    for section in doc.sections:
+        section.top_margin = Inches(0.5)
+        section.bottom_margin = Inches(0.5)
+        section.left_margin = Inches(0.75)
+        section.right_margin = Inches(0.75)
+    
+    # Configured text elements at the top
+    alignment_map = {
+        'Left': WD_ALIGN_PARAGRAPH.LEFT,
+        'Center': WD_ALIGN_PARAGRAPH.CENTER,
+        'Right': WD_ALIGN_PARAGRAPH.RIGHT,
+        'Justify': WD_ALIGN_PARAGRAPH.JUSTIFY
+    }
+    for config_item in document_config.get('text_elements', []):
+        if config_item.get('type') == 'blank_line':
+            doc.add_paragraph()
+            continue
+        
+        paragraph = doc.add_paragraph()
+        substituted_text = substitute_variables(
+            config_item.get('text', ''),
+            test_case_name,
+            len(screenshots_data),
+            now=now,
+            test_description=test_description
+        )
+        
+        run = paragraph.add_run(substituted_text)
+        font = run.font
+        font.name = config_item.get('font_name', 'Arial')
+        font.size = Pt(config_item.get('font_size', 12))
+        font.bold = config_item.get('bold', False)
+        font.italic = config_item.get('italic', False)
+        
+        paragraph.style.font.name = config_item.get('font_name', 'Arial')
+        paragraph.alignment = alignment_map.get(config_item.get('alignment', 'Left'), WD_ALIGN_PARAGRAPH.LEFT)
+        paragraph.paragraph_format.space_after = Pt(6)
+    
+    highlight_color_index = HIGHLIGHT_COLOR_INDEX.get(document_config.get('highlight_color', 'Yellow'), 7)
+    screen_rows = 24
+    screen_cols = 80
+    
+    for idx, screenshot in enumerate(screenshots_data):
+        screen_text = screenshot['screen_text']
+        
+        # Screens not masked with the current patterns are masked now
+        if mask_text and screenshot.get('masking') != masking_version:
+            screen_text = mask_text(screen_text)
+        
+        highlight_info = screenshot.get('highlight_info', {})
+        
+        if idx > 0 and idx % 2 == 0:
+            doc.add_page_break()
+        
+        if idx > 0 and idx % 2 != 0:
+            doc.add_paragraph()
+            doc.add_paragraph()
+        
+        # Format the screen text into lines (24 rows x 80 columns)
+        screen_lines = []
+        for row_num in range(screen_rows):
+            start_idx = row_num * screen_cols
+            if start_idx < len(screen_text):
+                screen_lines.append(screen_text[start_idx:start_idx + screen_cols])
+            else:
+                screen_lines.append(' ' * screen_cols)
+        
+        screen_para = doc.add_paragraph()
+        
+        # Highlight positions in the text WITH newlines (each line is screen_cols + 1 chars)
+        highlight_ranges = []
+        for field_info in highlight_info.values():
+            start_pos = (field_info['row'] - 1) * (screen_cols + 1) + field_info['column'] - 1
+            highlight_ranges.append((start_pos, start_pos + field_info['length']))
+        
+        # Merge overlapping ranges
+        highlight_ranges.sort()
+        merged_ranges = []
+        for start, end in highlight_ranges:
+            if merged_ranges and start <= merged_ranges[-1][1]:
+                merged_ranges[-1] = (merged_ranges[-1][0], max(merged_ranges[-1][1], end))
+            else:
+                merged_ranges.append((start, end))
+        
+        full_text = '\n'.join(screen_lines)
+        
+        def add_screen_run(text, highlighted=False):
+            run = screen_para.add_run(text)
+            run.font.name = 'Courier New'
+            run.font.size = Pt(8)
+            if highlighted:
+                run.font.highlight_color = highlight_color_index
+        
+        current_pos = 0
+        for start, end in merged_ranges:
+            if current_pos < start:
+                add_screen_run(full_text[current_pos:start])
+            add_screen_run(full_text[start:end], highlighted=True)
+            current_pos = end
+        if current_pos < len(full_text) or not merged_ranges:
+            add_screen_run(full_text[current_pos:])
+        
+        # Border and shading
+        pPr = screen_para._element.get_or_add_pPr()
+        pBdr = OxmlElement('w:pBdr')
+        for border_name in ['top', 'left', 'bottom', 'right']:
+            border = OxmlElement(f'w:{border_name}')
+            border.set(qn('w:val'), 'single')
+            border.set(qn('w:sz'), '12')
+            border.set(qn('w:space'), '4')
+            border.set(qn('w:color'), '808080')
+            pBdr.append(border)
+        pPr.append(pBdr)
+        
+        shading_elm = OxmlElement('w:shd')
+        shading_elm.set(qn('w:fill'), 'F0F0F0')
+        pPr.append(shading_elm)
+        
+        screen_para.paragraph_format.space_before = Pt(0)
+        screen_para.paragraph_format.space_after = Pt(0)
+        screen_para.paragraph_format.left_indent = Inches(0.2)
+        screen_para.paragraph_format.right_indent = Inches(0.2)
+    
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    doc.save(output_path)
+    return output_path
+
+
+def build_execution_summary_docx(execution_results, timestamp, output_dir):
+    """
+    Writes the execution summary document of a run.
+    
+    Args:
+        execution_results: List of dicts with test case results
+        timestamp: Execution timestamp shown in the title and filename
+        output_dir: Folder for the summary
+    
+    Returns:
+        str: Path of the summary
+    """
+    from docx import Document
+    from docx.shared import Pt, Inches, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    
+    doc = Document()
+    
+    for section in doc.sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1)
+        section.right_margin = Inches(1)
+    
+    title = doc.add_paragraph()
+    title_run = title.add_run("Test Execution Summary")
+    title_run.font.size = Pt(18)
+    title_run.font.bold = True
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title.paragraph_format.space_after = Pt(12)
+    
+    time_para = doc.add_paragraph()
+    time_run = time_para.add_run(f"Execution Time: {timestamp}")
+    time_run.font.size = Pt(12)
+    time_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    time_para.paragraph_format.space_after = Pt(20)
+    
+    total_tests = len(execution_results)
+    passed_tests = sum(1 for r in execution_results if r['status'] == 'Passed')
+    failed_tests = sum(1 for r in execution_results if r['status'] == 'Failed')
+    
+    summary_para = doc.add_paragraph()
+    summary_para.add_run("Summary:\n").font.bold = True
+    summary_para.add_run(f"Total Test Cases: {total_tests}\n")
+    
+    passed_run = summary_para.add_run(f"Passed: {passed_tests}\n")
+    passed_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
+    passed_run.font.bold = True
+    
+    failed_run = summary_para.add_run(f"Failed: {failed_tests}\n")
+    failed_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
+    failed_run.font.bold = True
+    
+    summary_para.paragraph_format.space_after = Pt(20)
+    
+    details_heading = doc.add_paragraph()
+    details_heading.add_run("Detailed Results:").font.bold = True
+    details_heading.paragraph_format.space_after = Pt(10)
+    
+    for idx, result in enumerate(execution_results, 1):
+        result_para = doc.add_paragraph()
+        
+        project_info = f"[Project: {result['project']}] " if result.get('project') else ""
+        result_para.add_run(f"{idx}. {project_info}{result['name']}: ").font.bold = True
+        
+        status_run = result_para.add_run(result['status'])
+        status_run.font.bold = True
+        if result['status'] == 'Passed':
+            status_run.font.color.rgb = RGBColor(0, 128, 0)  # Green
+        else:
+            status_run.font.color.rgb = RGBColor(255, 0, 0)  # Red
+        
+        if 'start_time' in result and 'end_time' in result and 'duration' in result:
+            time_para = doc.add_paragraph()
+            time_para.paragraph_format.left_indent = Inches(0.5)
+            time_run = time_para.add_run(
+                f"Start Time: {result['start_time']}  |  "
+                f"End Time: {result['end_time']}  |  "
+                f"Duration: {result['duration']}"
+            )
+            time_run.font.size = Pt(9)
+            time_run.font.italic = True
+            time_run.font.color.rgb = RGBColor(75, 85, 99)  # Gray
+        
+        if result['status'] == 'Failed' and 'error' in result:
+            error_para = doc.add_paragraph()
+            error_para.paragraph_format.left_indent = Inches(0.5)
+            error_run = error_para.add_run(f"Error: {result['error']}")
+            error_run.font.size = Pt(10)
+            error_run.font.color.rgb = RGBColor(139, 0, 0)  # Dark red
+        
+        if result.get('validation_failures'):
+            failures_para = doc.add_paragraph()
+            failures_para.paragraph_format.left_indent = Inches(0.5)
+            failures_para.add_run("Validation Failures:\n").font.bold = True
+            
+            for failure in result['validation_failures']:
+                failure_detail = doc.add_paragraph()
+                failure_detail.paragraph_format.left_indent = Inches(0.75)
+                failure_detail.add_run(
+                    f"Step {failure['step']} - {failure['field']}:\n"
+                    f"  Expected: '{failure['expected']}'\n"
+                    f"  Actual: '{failure['actual']}'\n"
+                ).font.size = Pt(9)
+        
+        result_para.paragraph_format.space_after = Pt(12)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, f"Test Execution - {timestamp}.docx")
+    doc.save(filename)
+    return filename
+
+
+def consolidated_report_writer(output_dir, timestamp, document_config, mask_text=None, masking_version=None):
+    """
+    Creates the streaming writer for a consolidated suite report.
+    
+    Args:
+        output_dir: Folder for the report
+        timestamp: Execution timestamp used in the title and filename
+        document_config: The document layout configuration
+        mask_text: Callable used for screens not masked with the current patterns
+        masking_version: Version of the current patterns (MaskingEngine.version)
+    
+    Returns:
+        ConsolidatedReportWriter: The writer; call add_test() per test and close() at the end
+    """
+    return ConsolidatedReportWriter(
+        os.path.join(output_dir, f"Test Execution Report - {timestamp}.docx"),
+        "Test Execution Report",
+        timestamp,
+        highlight_color=document_config.get('highlight_color', 'Yellow'),
+        mask_text=mask_text,
+        masking_version=masking_version
+    )
+
+
+# --- NEW: Streaming Consolidated Report ---
+class ConsolidatedReportWriter:
+    """
+    Writes one consolidated evidence report (DOCX) for a whole suite.
+    
+    Evidence sections are streamed to a temporary file as each test finishes,
+    so only the summary rows are kept in memory. close() writes the summary
+    table (linked to the evidence sections) followed by the streamed sections
+    into the final document.
+    """
+    
+    _word_ns = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+                'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"')
+    _content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    _package_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    _highlight_names = {
+        'Yellow': 'yellow', 'Bright Green': 'green', 'Turquoise': 'cyan', 'Pink': 'magenta',
+        'Blue': 'blue', 'Red': 'red', 'Dark Blue': 'darkBlue', 'Dark Cyan': 'darkCyan',
+        'Dark Green': 'darkGreen', 'Dark Magenta': 'darkMagenta', 'Dark Red': 'darkRed',
+        'Dark Yellow': 'darkYellow', 'Gray 25%': 'lightGray', 'Gray 50%': 'darkGray'
+    }
+    _invalid_xml_chars = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+    
+    def __init__(self, output_path, title, timestamp, highlight_color='Yellow', mask_text=None,
+                 masking_version=None):
+        """
+        Args:
+            output_path: Full path of the consolidated DOCX
+            title: Report title
+            timestamp: Execution timestamp shown under the title
+            highlight_color: Highlight color name from the document layout
+            mask_text: Callable used for screens not masked with the current patterns
+            masking_version: Version of the current patterns (MaskingEngine.version)
+        """
+        import tempfile
+        
+        self.output_path = output_path
+        self.title = title
+        self.timestamp = timestamp
+        self.highlight = self._highlight_names.get(highlight_color, 'yellow')
+        self.mask_text = mask_text
+        self.masking_version = masking_version
+        self.rows = []
+        self.section_count = 0
+        self._body = tempfile.TemporaryFile()
+    
+    @classmethod
+    def _escape(cls, text):
+        from xml.sax.saxutils import escape
+        return escape(cls._invalid_xml_chars.sub(' ', str(text)))
+    
+    @classmethod
+    def _run(cls, text, bold=False, size=None, color=None, font=None, highlight=None, italic=False):
+        """Returns a w:r element; newlines in the text become line breaks."""
+        props = ''
+        if font:
+            props += f'<w:rFonts w:ascii="{font}" w:hAnsi="{font}" w:cs="{font}"/>'
+        if bold:
+            props += '<w:b/>'
+        if italic:
+            props += '<w:i/>'
+        if color:
+            props += f'<w:color w:val="{color}"/>'
+        if size:
+            props += f'<w:sz w:val="{int(size * 2)}"/>'
+        if highlight:
+            props += f'<w:highlight w:val="{highlight}"/>'
+        parts = [f'<w:t xml:space="preserve">{cls._escape(line)}</w:t>' for line in str(text).split('\n')]
+        return f'<w:r><w:rPr>{props}</w:rPr>' + '<w:br/>'.join(parts) + '</w:r>'
+    
+    @staticmethod
+    def _paragraph(content, align=None, indent=None, space_after=None, page_break=False):
+        props = ''
+        if page_break:
+            props += '<w:pageBreakBefore/>'
+        if space_after is not None:
+            props += f'<w:spacing w:after="{int(space_after * 20)}"/>'
+        if indent is not None:
+            props += f'<w:ind w:left="{int(indent * 1440)}"/>'
+        if align:
+            props += f'<w:jc w:val="{align}"/>'
+        return f'<w:p><w:pPr>{props}</w:pPr>{content}</w:p>'
+    
+    @staticmethod
+    def _status_color(status):
+        return '008000' if status == 'Passed' else 'FF0000'
+    
+    def _screen_paragraph(self, screen_text, highlight_info, rows=24, cols=80):
+        """Returns the bordered, shaded paragraph for one 24x80 screen."""
+        lines = [screen_text[r * cols:(r + 1) * cols].ljust(cols) for r in range(rows)]
+        full_text = '\n'.join(lines)
+        
+        ranges = []
+        for field_info in highlight_info.values():
+            start = (int(field_info['row']) - 1) * (cols + 1) + int(field_info['column']) - 1
+            ranges.append((start, start + int(field_info['length'])))
+        ranges.sort()
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        
+        runs = []
+        pos = 0
+        for start, end in merged:
+            if pos < start:
+                runs.append(self._run(full_text[pos:start], size=8, font='Courier New'))
+            runs.append(self._run(full_text[start:end], size=8, font='Courier New', highlight=self.highlight))
+            pos = max(pos, end)
+        if pos < len(full_text):
+            runs.append(self._run(full_text[pos:], size=8, font='Courier New'))
+        
+        borders = ''.join(
+            f'<w:{side} w:val="single" w:sz="12" w:space="4" w:color="808080"/>'
+            for side in ('top', 'left', 'bottom', 'right')
+        )
+        return (f'<w:p><w:pPr><w:pBdr>{borders}</w:pBdr><w:shd w:val="clear" w:color="auto" w:fill="F0F0F0"/>'
+                f'<w:spacing w:before="0" w:after="240"/><w:ind w:left="288" w:right="288"/></w:pPr>'
+                + ''.join(runs) + '</w:p>')
+    
+    def add_test(self, result, screenshots=None):
+        """
+        Streams the evidence section of one finished test to disk.
+        
+        Args:
+            result: The execution result dict of the test
+            screenshots: The DOCX screenshot records captured for the test
+        """
+        self.section_count += 1
+        anchor = f"evidence_{self.section_count}"
+        self.rows.append((dict(result), anchor))
+        
+        heading = (f'<w:bookmarkStart w:id="{self.section_count}" w:name="{anchor}"/>'
+                   + self._run(f"{self.section_count}. {result.get('name', '')}", bold=True, size=14)
+                   + f'<w:bookmarkEnd w:id="{self.section_count}"/>')
+        parts = [self._paragraph(heading, space_after=6, page_break=True)]
+        
+        status = result.get('status', '')
+        details = self._run("Status: ", bold=True) + self._run(status, bold=True, color=self._status_color(status))
+        if result.get('project'):
+            details += self._run(f"   |   Project: {result['project']}")
+        if result.get('duration'):
+            details += self._run(f"   |   Duration: {result['duration']}")
+        parts.append(self._paragraph(details, space_after=6))
+        
+        if result.get('error'):
+            parts.append(self._paragraph(self._run(f"Error: {result['error']}", size=10, color='8B0000'), space_after=6))
+        for failure in result.get('validation_failures') or []:
+            parts.append(self._paragraph(self._run(
+                f"Step {failure['step']} - {failure['field']}: "
+                f"Expected '{failure['expected']}', Actual '{failure['actual']}'",
+                size=9, color='8B0000'), indent=0.25, space_after=3))
+        
+        for screenshot in screenshots or []:
+            screen_text = screenshot.get('screen_text', '')
+            if self.mask_text and screenshot.get('masking') != self.masking_version:
+                screen_text = self.mask_text(screen_text)
+            parts.append(self._paragraph(
+                self._run(f"Step {screenshot.get('step', '')}  ({screenshot.get('timestamp', '')})", size=8, italic=True),
+                space_after=2))
+            parts.append(self._screen_paragraph(screen_text, screenshot.get('highlight_info', {})))
+        
+        self._body.write(''.join(parts).encode('utf-8'))
+    
+    def _summary_xml(self, execution_results):
+        """Returns the title, statistics and linked summary table."""
+        total = len(execution_results)
+        passed = sum(1 for r in execution_results if r.get('status') == 'Passed')
+        failed = sum(1 for r in execution_results if r.get('status') == 'Failed')
+        stopped = total - passed - failed
+        
+        parts = [
+            self._paragraph(self._run(self.title, bold=True, size=18), align='center', space_after=12),
+            self._paragraph(self._run(f"Execution Time: {self.timestamp}", size=12), align='center', space_after=20),
+            self._paragraph(
+                self._run(f"Total Test Cases: {total}   ") +
+                self._run(f"Passed: {passed}   ", bold=True, color='008000') +
+                self._run(f"Failed: {failed}   ", bold=True, color='FF0000') +
+                self._run(f"Stopped: {stopped}", bold=True),
+                space_after=12),
+            self._paragraph(self._run("Contents", bold=True, size=14), space_after=6),
+        ]
+        
+        # Tests without evidence (skipped, not found) are still listed, unlinked. Keyed by
+        # project too: the same test run in two projects links to its own section
+        anchors = {}
+        for result, anchor in self.rows:
+            anchors.setdefault((result.get('name'), result.get('project')), anchor)
+        
+        def cell(content, width, shade=None):
+            shading = f'<w:shd w:val="clear" w:color="auto" w:fill="{shade}"/>' if shade else ''
+            return (f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{shading}</w:tcPr>'
+                    f'<w:p>{content}</w:p></w:tc>')
+        
+        widths = (600, 4200, 2000, 1200, 1400)
+        borders = ''.join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="A0A0A0"/>'
+                          for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'))
+        table = [f'<w:tbl><w:tblPr><w:tblW w:w="{sum(widths)}" w:type="dxa"/><w:tblBorders>{borders}</w:tblBorders></w:tblPr>'
+                 '<w:tblGrid>' + ''.join(f'<w:gridCol w:w="{w}"/>' for w in widths) + '</w:tblGrid>']
+        headers = ('#', 'Test Case', 'Project', 'Status', 'Duration')
+        table.append('<w:tr>' + ''.join(cell(self._run(h, bold=True, size=10), w, 'D9D9D9')
+                                        for h, w in zip(headers, widths)) + '</w:tr>')
+        for idx, result in enumerate(execution_results, 1):
+            name = result.get('name', '')
+            anchor = anchors.get((result.get('name'), result.get('project')))
+            name_run = self._run(name, size=10, color='0563C1' if anchor else None)
+            if anchor:
+                name_run = f'<w:hyperlink w:anchor="{anchor}" w:history="1">{name_run}</w:hyperlink>'
+            status = result.get('status', '')
+            values = (
+                self._run(str(idx), size=10),
+                name_run,
+                self._run(result.get('project') or '', size=10),
+                self._run(status, bold=True, size=10, color=self._status_color(status)),
+                self._run(result.get('duration', ''), size=10),
+            )
+            table.append('<w:tr>' + ''.join(cell(v, w) for v, w in zip(values, widths)) + '</w:tr>')
+        table.append('</w:tbl>')
+        parts.append(''.join(table))
+        return ''.join(parts)
+    
+    def close(self, execution_results):
+        """
+        Writes the final document and discards the temporary section stream.
+        
+        Args:
+            execution_results: All execution results of the suite (summary rows)
+        
+        Returns:
+            str: Path of the consolidated report
+        """
+        import shutil
+        import zipfile
+        
+        os.makedirs(os.path.dirname(self.output_path) or '.', exist_ok=True)
+        temp_path = self.output_path + '.tmp'
+        try:
+            with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as package:
+                package.writestr('[Content_Types].xml', self._content_types)
+                package.writestr('_rels/.rels', self._package_rels)
+                with package.open('word/document.xml', 'w') as document:
+                    document.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                                    f'<w:document {self._word_ns}><w:body>').encode('utf-8'))
+                    document.write(self._summary_xml(execution_results).encode('utf-8'))
+                    self._body.seek(0)
+                    shutil.copyfileobj(self._body, document, 1024 * 1024)
+                    document.write(('<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+                                    '<w:pgMar w:top="720" w:right="1080" w:bottom="720" w:left="1080" '
+                                    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+                                    '</w:body></w:document>').encode('utf-8'))
+            os.replace(temp_path, self.output_path)
+        finally:
+            self._body.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return self.output_path
@@ -0,0 +1,155 @@
+"""
+Recorded run data: the per-test capture files and the run manifest written
+under 'Run Data/<timestamp>' during an execution, and the headless rebuild of
+the evidence documents of a recorded run from them.
+"""
+import hashlib
+import os
+import re
+
+from .codec import json_codec
+from .reports import (build_execution_summary_docx, build_test_case_docx, capture_time_of,
+                      consolidated_report_writer)
+
+
+def run_file_name(test_case_name, test_project=None):
+    """
+    Returns the run data file name (without extension) of a test case: its
+    name with the characters a file name cannot hold replaced, plus a short
+    hash of the project and the exact name. A test named 'run', names that
+    differ only in case or in replaced characters, and the same test in two
+    projects never share a file.
+    """
+    safe_name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', test_case_name).strip(' .')[:80] or 'test'
+    key = f"{test_project or ''}\0{test_case_name}".encode('utf-8')
+    return f"{safe_name}-{hashlib.blake2b(key, digest_size=4).hexdigest()}"
+
+
+def load_run_data(run_dir):
+    """
+    Loads a recorded run from its Run Data folder.
+
+    Args:
+        run_dir: The folder of the run
+
+    Returns:
+        tuple: (manifest or None, list of per-test capture records, list of load errors)
+    """
+    manifest = None
+    records = []
+    failed = []
+
+    for file_name in sorted(os.listdir(run_dir)):
+        if not file_name.endswith(('.json', '.json.gz')):
+            continue
+        try:
+            data = json_codec.read_file(os.path.join(run_dir, file_name))
+        except Exception as e:
+            failed.append(f"{file_name}: {e}")
+            continue
+        if not isinstance(data, dict):
+            failed.append(f"{file_name}: not a run data object")
+            continue
+
+        if file_name in ('run.json', 'run.json.gz'):
+            manifest = data
+        elif data.get('screenshots'):
+            if not isinstance(data['screenshots'], list) or not isinstance(data.get('name'), str):
+                failed.append(f"{file_name}: not a run data object")
+                continue
+            records.append((file_name, data))
+
+    # The manifest says which test case a file belongs to (file names are sanitized)
+    files = (manifest or {}).get('files')
+    files = files if isinstance(files, dict) else {}
+    for file_name, data in records:
+        if isinstance(files.get(file_name), dict):
+            data.update(files[file_name])
+
+    return manifest, [data for _, data in records], failed
+
+
+def rerender_run(run_dir, manifest, records, results_location, document_config, descriptions=None,
+                 mask_text=None, masking_version=None, max_workers=None, progress=None):
+    """
+    Rebuilds the evidence documents, the execution summary and (when enabled
+    in the document layout) the consolidated report of a recorded run.
+
+    Only plain data is handed to the worker threads: descriptions must be
+    resolved by the caller, which may own a library store that is not safe
+    to share between threads.
+
+    Args:
+        run_dir: The folder of the run (its name is the default timestamp)
+        manifest: The run manifest from load_run_data(), or None
+        records: The capture records from load_run_data()
+        results_location: Root folder of the Results and summary folders
+        document_config: The document layout configuration
+        descriptions: Test case name -> description substituted in the documents
+        mask_text: Callable used for screens not masked with the current patterns
+        masking_version: Version of the current patterns (MaskingEngine.version)
+        max_workers: Threads building documents (defaults to the CPU count)
+        progress: Called as progress(done, total) after each document
+
+    Returns:
+        tuple: (rendered document paths, summary path or None, consolidated report path or None, errors)
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    descriptions = descriptions or {}
+    run_timestamp = os.path.basename(os.path.normpath(run_dir))
+
+    jobs = []
+    for record in records:
+        output_path = record.get('docx_path')
+        if not output_path:
+            output_path = os.path.join(results_location, 'Results', 'Master',
+                                       f"{run_file_name(record['name'], record.get('project'))}_{run_timestamp}.docx")
+        jobs.append((record['name'], record['screenshots'], output_path, descriptions.get(record['name'], '')))
+
+    def render(job):
+        name, screenshots, output_path, description = job
+        return build_test_case_docx(name, screenshots, output_path, document_config,
+                                    test_description=description, now=capture_time_of(screenshots),
+                                    mask_text=mask_text, masking_version=masking_version)
+
+    rendered = []
+    failed = []
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count() or 4)) as executor:
+            futures = {executor.submit(render, job): job[0] for job in jobs}
+            for done_count, future in enumerate(as_completed(futures), start=1):
+                try:
+                    rendered.append(future.result())
+                except Exception as e:
+                    failed.append(f"{futures[future]}: {e}")
+                if progress:
+                    progress(done_count, len(jobs))
+
+    summary_path = None
+    report_path = None
+    if manifest is not None:
+        timestamp = manifest.get('timestamp', run_timestamp)
+        try:
+            summary_path = build_execution_summary_docx(
+                manifest.get('results', []), timestamp,
+                os.path.join(results_location, 'Test Execution Summary'))
+        except Exception as e:
+            failed.append(f"Execution summary: {e}")
+
+        # The consolidated report follows the order of the recorded results
+        if document_config.get('consolidated_report', False):
+            try:
+                # Keyed by project too, so the same test in two projects keeps its captures
+                records_by_key = {(record['name'], record.get('project')): record for record in records}
+                report_writer = consolidated_report_writer(
+                    os.path.join(results_location, 'Test Execution Summary'), timestamp, document_config,
+                    mask_text=mask_text, masking_version=masking_version)
+                for result in manifest.get('results', []):
+                    record = records_by_key.get((result.get('name'), result.get('project')), {})
+                    report_writer.add_test(result, record.get('screenshots', []))
+                report_path = report_writer.close(manifest.get('results', []))
+            except Exception as e:
+                failed.append(f"Consolidated report: {e}")
+
+    return rendered, summary_path, report_path, failed
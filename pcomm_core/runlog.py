@@ -0,0 +1,303 @@
+"""
+Run log: a fixed-size, thread-safe record of what the executors and the
+host screen waits report during a run, with per-step durations and an
+incrementally maintained list of the slowest steps. The executors write to
+it with RunLog.log(); the application shows it in its run console.
+"""
+import collections
+import heapq
+import itertools
+import re
+import sys
+import threading
+import time
+
+
+# --- NEW: Run Log ---
+SEVERITIES = ('debug', 'info', 'warning', 'error')
+STEP_PATTERN = re.compile(r'\b[Ss]tep (\d+(?:\.\d+)?)')
+
+
+class RunLogEntry:
+    """One line of the run log."""
+
+    __slots__ = ('seq', 'timestamp', 'severity', 'test', 'step', 'message', 'duration')
+
+    def __init__(self, seq, timestamp, severity, test, step, message, duration):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.severity = severity
+        self.test = test
+        self.step = step
+        self.message = message
+        self.duration = duration
+
+    def __repr__(self):
+        return f"RunLogEntry({self.seq}, {self.severity!r}, {self.test!r}, {self.step!r}, {self.message!r})"
+
+
+class RunLog:
+    """
+    Keeps the last capacity entries in a ring buffer, so a 10-hour run never
+    grows memory. Appending is a deque append and, for timed steps, one heap
+    push under a lock that readers hold only to copy references; nothing is
+    formatted, written or repainted on the executor's side. Readers (the run
+    console) poll with entries(since=...) and only look at what is new.
+
+    The slowest steps of the whole run are kept in a min-heap of a fixed size,
+    updated as each step finishes, so they survive the ring buffer wrapping.
+    """
+
+    DEFAULT_CAPACITY = 20000
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, slowest=50, echo=None, echo_severity='warning'):
+        """
+        Args:
+            capacity: Number of entries kept
+            slowest: Number of slowest steps kept
+            echo: Stream that also gets entries of echo_severity and above (e.g. the console)
+            echo_severity: Minimum severity echoed
+        """
+        self.capacity = capacity
+        self.slowest_size = slowest
+        self.echo = echo
+        self.echo_level = SEVERITIES.index(echo_severity)
+        self.lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.clear()
+
+    def clear(self):
+        """Drops every entry and the slowest steps."""
+        with self.lock:
+            self._entries = collections.deque(maxlen=self.capacity)
+            self._slowest = []  # Min-heap of (duration, seq, entry)
+            self._test_counts = collections.Counter()  # Entries per test still in the buffer
+            self.last_seq = 0
+            self.dropped = 0
+            self.test = None
+            self.step = None
+            self._test_started = None
+            self._step_started = None
+
+    def append(self, message, severity='info', test=None, step=None, duration=None):
+        """
+        Adds an entry. The current test and step are used unless given.
+
+        Returns:
+            RunLogEntry: The new entry
+        """
+        entry = RunLogEntry(next(self._seq), time.time(), severity, test or self.test,
+                            step if step is not None else self.step, message, duration)
+        with self.lock:
+            self._add(entry)
+        if self.echo is not None and SEVERITIES.index(severity) >= self.echo_level:
+            try:
+                self.echo.write(f"{message}\n")
+            except Exception:
+                pass
+        return entry
+
+    def log(self, level, message, step=None, duration=None):
+        """
+        Logs a message of an explicit severity for the current test and step;
+        this is how the executors report.
+
+        Args:
+            level: 'debug', 'info', 'warning' or 'error'
+            message: The message
+            step: The step, when it is not the current one (e.g. a utility step '3.1')
+            duration: Seconds taken, for timed entries
+
+        Returns:
+            RunLogEntry: The new entry
+        """
+        if level not in SEVERITIES:
+            raise ValueError(f"Unknown severity: {level!r}")
+        return self.append(message, level, step=step, duration=duration)
+
+    def _add(self, entry):
+        if len(self._entries) == self.capacity:
+            evicted = self._entries[0]
+            self.dropped += 1
+            if evicted.test is not None:
+                self._test_counts[evicted.test] -= 1
+                if not self._test_counts[evicted.test]:
+                    del self._test_counts[evicted.test]
+        self._entries.append(entry)
+        if entry.test is not None:
+            self._test_counts[entry.test] += 1
+        self.last_seq = entry.seq
+
+    def begin_test(self, test):
+        """Starts a test; the open step, if any, is finished first."""
+        self.finish_step()
+        self.test = test
+        self.step = None
+        self._test_started = time.perf_counter()
+
+    def end_test(self, test=None, status=None):
+        """
+        Finishes the current test (only if it is test, when given) and logs
+        its duration and status.
+        """
+        if self.test is None or (test is not None and test != self.test):
+            return
+        self.finish_step()
+        duration = time.perf_counter() - self._test_started if self._test_started else None
+        severity = 'error' if status == 'Failed' else 'warning' if status == 'Stopped' else 'info'
+        self.append(f"Test '{self.test}' {status or 'finished'}"
+                    + (f" in {duration:.2f}s" if duration is not None else ""), severity, duration=duration)
+        self.test = None
+        self._test_started = None
+
+    def begin_step(self, step):
+        """Starts a step of the current test; the previous one is finished and timed."""
+        self.finish_step()
+        self.step = str(step)
+        self._step_started = time.perf_counter()
+
+    def finish_step(self):
+        """Logs the duration of the open step and adds it to the slowest steps."""
+        if self._step_started is None:
+            return
+        duration = time.perf_counter() - self._step_started
+        self._step_started = None
+        entry = RunLogEntry(next(self._seq), time.time(), 'info', self.test, self.step,
+                            f"Step {self.step} took {duration:.2f}s", duration)
+        with self.lock:
+            self._add(entry)
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, (duration, entry.seq, entry))
+            elif duration > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (duration, entry.seq, entry))
+
+    def entries(self, test=None, step=None, min_severity=None, min_duration=None, since=0):
+        """
+        Returns the buffered entries matching every given filter, oldest first.
+
+        Args:
+            test: Only this test
+            step: Only this step and its utility steps ('3' matches '3' and '3.1')
+            min_severity: Only this severity and above
+            min_duration: Only timed entries at least this many seconds long
+            since: Only entries after this sequence number (see last_seq)
+        """
+        with self.lock:
+            if since and self._entries and self._entries[0].seq <= since:
+                # Only the tail is new: walk back from the end instead of copying the buffer
+                new = []
+                for entry in reversed(self._entries):
+                    if entry.seq <= since:
+                        break
+                    new.append(entry)
+                new.reverse()
+            else:
+                new = list(self._entries)
+
+        level = SEVERITIES.index(min_severity) if min_severity else 0
+        step_prefix = f"{step}." if step else None
+        return [
+            entry for entry in new
+            if (test is None or entry.test == test)
+            and (not step or entry.step == step or (entry.step or '').startswith(step_prefix))
+            and (not level or SEVERITIES.index(entry.severity) >= level)
+            and (not min_duration or (entry.duration is not None and entry.duration >= min_duration))
+        ]
+
+    def slowest_steps(self):
+        """Returns the slowest steps of the run, slowest first."""
+        with self.lock:
+            slowest = list(self._slowest)
+        return [entry for _, _, entry in sorted(slowest, key=lambda item: (-item[0], item[1]))]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def tests(self):
+        """Returns the tests with entries in the buffer, in first-seen order."""
+        with self.lock:
+            return list(self._test_counts)
+
+
+class RunLogStream:
+    """
+    File-like adapter that turns the print() output of one thread into run log
+    entries, one per line, while a run is active. The executors report with
+    RunLog.log(); this only catches the prints of the helpers they call, so it
+    is installed as sys.stdout for the duration of a run only:
+
+        with RunLogStream(run_log):
+            ...
+
+    Writes from any other thread (the persistence writer, timers of other
+    windows) go to the stream it replaced. A line is 'info' unless it starts
+    with an explicit marker (❌ error, ⚠️ warning); its text is not guessed at.
+    The step is taken from the text ('Step 3.1: ...') when it names one.
+    """
+
+    def __init__(self, run_log):
+        self.run_log = run_log
+        self.thread = threading.current_thread()
+        self.target = None
+        self._partial = ''
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Replaces sys.stdout for the prints of the calling thread."""
+        self.thread = threading.current_thread()
+        self.target = sys.stdout
+        sys.stdout = self
+        return self
+
+    def uninstall(self):
+        """Logs a pending partial line and restores the replaced stream."""
+        with self._lock:
+            partial, self._partial = self._partial, ''
+        self._log_lines([partial])
+        if sys.stdout is self:
+            sys.stdout = self.target
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+        return False
+
+    @staticmethod
+    def severity(line):
+        marker = line.lstrip()
+        if marker.startswith('❌'):
+            return 'error'
+        if marker.startswith('⚠'):
+            return 'warning'
+        return 'info'
+
+    def write(self, text):
+        if threading.current_thread() is not self.thread:
+            if self.target is not None:
+                return self.target.write(text)
+            return len(text)
+        with self._lock:
+            lines = (self._partial + text).split('\n')
+            self._partial = lines.pop()
+        self._log_lines(lines)
+        return len(text)
+
+    def _log_lines(self, lines):
+        for line in lines:
+            line = line.rstrip()
+            if not line.strip() or not line.strip('=-'):
+                continue  # Blank lines and separators
+            match = STEP_PATTERN.search(line)
+            self.run_log.append(line, self.severity(line), step=match.group(1) if match else None)
+
+    def flush(self):
+        if self.target is not None and threading.current_thread() is not self.thread:
+            self.target.flush()
+
+    def isatty(self):
+        return False
+
+
+run_log = RunLog()
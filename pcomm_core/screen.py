@@ -0,0 +1,237 @@
+"""
+Golden-screen regression diff: compares captured host screens against a
+baseline, ignoring volatile regions such as dates and times. Also tracks the
+frames polled from a live session for the screen mirror.
+"""
+import re
+
+
+# --- NEW: Golden-Screen Regression Diff ---
+DEFAULT_VOLATILE_PATTERNS = [
+    r'\b\d{1,4}[/.-]\d{1,2}[/.-]\d{2,4}\b',   # Dates
+    r'\b\d{1,2}:\d{2}(?::\d{2})?\b',           # Times
+]
+
+
+class ScreenDiffEngine:
+    """
+    Compares the screens captured by two runs, aligned by (test, step).
+    
+    Volatile fields (dates, times, sequence numbers...) are matched within a
+    row and blanked out with a placeholder before comparing, so they never
+    show up as changes. Identical screens are skipped with one string compare;
+    otherwise rows are compared by hash and only the rows that differ are
+    normalized and scanned column by column.
+    """
+    
+    _placeholder = '\x07'
+    
+    def __init__(self, volatile_patterns=None, rows=24, cols=80):
+        """
+        Args:
+            volatile_patterns: Regexes of fields to ignore (defaults to dates and times)
+            rows: Number of screen rows (default 24)
+            cols: Number of screen columns (default 80)
+        """
+        if volatile_patterns is None:
+            volatile_patterns = DEFAULT_VOLATILE_PATTERNS
+        self.rows = rows
+        self.cols = cols
+        
+        valid_patterns = []
+        for pattern in volatile_patterns:
+            if not pattern:
+                continue
+            try:
+                re.compile(pattern)
+                valid_patterns.append(f'(?:{pattern})')
+            except re.error as e:
+                print(f"Ignoring invalid volatile pattern '{pattern}': {e}")
+        self._volatile = re.compile('|'.join(valid_patterns)) if valid_patterns else None
+    
+    def pad(self, screen_text):
+        """Returns the screen cut or padded to exactly rows * cols characters."""
+        size = self.rows * self.cols
+        return (screen_text or '')[:size].ljust(size)
+    
+    def normalize_row(self, row_text):
+        """Returns one screen row with volatile fields blanked out."""
+        if self._volatile is None:
+            return row_text
+        return self._volatile.sub(lambda m: self._placeholder * len(m.group(0)), row_text)
+    
+    def normalize(self, screen_text):
+        """Returns the padded screen with volatile fields blanked out row by row."""
+        screen_text = self.pad(screen_text)
+        cols = self.cols
+        return ''.join(self.normalize_row(screen_text[start:start + cols])
+                       for start in range(0, self.rows * cols, cols))
+    
+    def row_hashes(self, screen_text):
+        """Returns one hash per row of a padded screen."""
+        cols = self.cols
+        return [hash(screen_text[start:start + cols]) for start in range(0, self.rows * cols, cols)]
+    
+    def diff_screens(self, baseline_text, current_text):
+        """
+        Compares two screens.
+        
+        Returns:
+            list: (row, [(start_col, end_col), ...]) for every changed row,
+                  0-based with exclusive end; empty if the screens match
+        """
+        if baseline_text == current_text:
+            return []
+        
+        baseline = self.pad(baseline_text)
+        current = self.pad(current_text)
+        cols = self.cols
+        changes = []
+        baseline_hashes = self.row_hashes(baseline)
+        current_hashes = self.row_hashes(current)
+        for row, (baseline_hash, current_hash) in enumerate(zip(baseline_hashes, current_hashes)):
+            start = row * cols
+            baseline_row = baseline[start:start + cols]
+            current_row = current[start:start + cols]
+            if baseline_hash == current_hash and baseline_row == current_row:
+                continue
+            
+            # Only rows that differ pay for the volatile field patterns
+            baseline_row = self.normalize_row(baseline_row)
+            current_row = self.normalize_row(current_row)
+            if baseline_row == current_row:
+                continue
+            
+            spans = []
+            span_start = None
+            for col in range(cols):
+                if baseline_row[col] != current_row[col]:
+                    if span_start is None:
+                        span_start = col
+                elif span_start is not None:
+                    spans.append((span_start, col))
+                    span_start = None
+            if span_start is not None:
+                spans.append((span_start, cols))
+            changes.append((row, spans))
+        return changes
+    
+    @staticmethod
+    def index_captures(records):
+        """
+        Indexes recorded captures by (project, test, step): a test name is
+        only unique within its project.
+        
+        Args:
+            records: {(project, test_case_name) or test_case_name: [screenshot, ...]}
+                     as recorded in Run Data
+        
+        Returns:
+            dict: {(project or '', test_case_name, str(step)): screen_text}
+        """
+        index = {}
+        for test_key, screenshots in records.items():
+            project, test_case_name = test_key if isinstance(test_key, tuple) else (None, test_key)
+            for screenshot in screenshots:
+                index[(project or '', test_case_name, str(screenshot.get('step', '')))] = screenshot.get('screen_text', '')
+        return index
+    
+    def diff_runs(self, baseline_records, current_records):
+        """
+        Compares every screen of two recorded runs.
+        
+        Args:
+            baseline_records: {(project, test_case_name): [screenshot, ...]} of the golden run
+            current_records: {(project, test_case_name): [screenshot, ...]} of the run to check
+        
+        Returns:
+            dict: 'compared' and 'identical' counts, 'changed' list of
+                  {project, test, step, baseline, current, changes}, and 'missing' /
+                  'added' lists of (project, test, step) keys present in only one run
+        """
+        baseline_index = self.index_captures(baseline_records)
+        current_index = self.index_captures(current_records)
+        
+        changed = []
+        identical = 0
+        for key, baseline_text in baseline_index.items():
+            if key not in current_index:
+                continue
+            current_text = current_index[key]
+            changes = self.diff_screens(baseline_text, current_text)
+            if changes:
+                changed.append({
+                    'project': key[0],
+                    'test': key[1],
+                    'step': key[2],
+                    'baseline': self.pad(baseline_text),
+                    'current': self.pad(current_text),
+                    'changes': changes
+                })
+            else:
+                identical += 1
+        
+        return {
+            'compared': identical + len(changed),
+            'identical': identical,
+            'changed': changed,
+            'missing': sorted(key for key in baseline_index if key not in current_index),
+            'added': sorted(key for key in current_index if key not in baseline_index)
+        }
+
+
+# --- NEW: Live Screen Mirror ---
+class ScreenFrameTracker:
+    """
+    Keeps the last frame polled from a live session and tells which rows
+    changed since, so a mirror only repaints those. An unchanged frame costs
+    one string compare; otherwise rows are compared by hash.
+    """
+    
+    def __init__(self, rows=24, cols=80):
+        """
+        Args:
+            rows: Number of screen rows (default 24)
+            cols: Number of screen columns (default 80)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.reset()
+    
+    def reset(self):
+        """Forgets the last frame, so the next update reports every row."""
+        self.frame = None
+        self.row_texts = [''] * self.rows
+        self._row_hashes = [None] * self.rows
+    
+    def update(self, screen_text):
+        """
+        Takes a new frame.
+        
+        Args:
+            screen_text: The screen as read from the session (rows * cols characters)
+        
+        Returns:
+            list: 0-based numbers of the rows that differ from the last frame
+        """
+        if screen_text == self.frame:
+            return []
+        self.frame = screen_text
+        
+        size = self.rows * self.cols
+        screen_text = (screen_text or '')[:size].ljust(size)
+        cols = self.cols
+        changed = []
+        for row in range(self.rows):
+            row_text = screen_text[row * cols:(row + 1) * cols]
+            row_hash = hash(row_text)
+            if row_hash == self._row_hashes[row] and row_text == self.row_texts[row]:
+                continue
+            self._row_hashes[row] = row_hash
+            self.row_texts[row] = row_text
+            changed.append(row)
+        return changed
+    
+    def text(self):
+        """Returns the last frame as rows joined by newlines."""
+        return '\n'.join(self.row_texts)
@@ -0,0 +1,184 @@
+"""
+PCOMM session access: connecting to a PCOMM session through its COM
+automation objects and waiting for the host screen to settle after an action.
+
+The COM modules are imported when a session is opened, never at load time, so
+everything else here (and any code driving a ScreenBufferSession) runs
+without Windows.
+"""
+import time
+
+from .runlog import run_log
+
+
+# --- NEW: Smart PCOMM Wait Functions ---
+def get_screen_content(autECLPS, rows=24, cols=80):
+    """
+    Gets the current screen content as a string.
+    
+    Args:
+        autECLPS: The PCOMM session object
+        rows: Number of rows (default 24)
+        cols: Number of columns (default 80)
+    
+    Returns:
+        str: Screen content or None if error
+    """
+    try:
+        screen_size = rows * cols
+        screen_text = autECLPS.GetText(1, screen_size)
+        return screen_text
+    except Exception as e:
+        print(f"Error reading screen: {e}")
+        return None
+
+
+def wait_for_screen_change(autECLPS, initial_screen, timeout=30, min_wait=0.3, check_interval=0.1):
+    """
+    Waits for the screen content to change (indicates PCOMM finished processing).
+    
+    Args:
+        autECLPS: The PCOMM session object
+        initial_screen: The screen content before sending the command
+        timeout: Maximum seconds to wait (default 30)
+        min_wait: Minimum seconds to wait before checking (default 0.3)
+        check_interval: How often to check in seconds (default 0.1)
+    
+    Returns:
+        tuple: (bool: success, float: elapsed_time)
+    """
+    import time
+    
+    start_time = time.time()
+    
+    # Wait minimum time first (let PCOMM start processing)
+    time.sleep(min_wait)
+    
+    while time.time() - start_time < timeout:
+        current_screen = get_screen_content(autECLPS)
+        
+        if current_screen is None:
+            return False, time.time() - start_time
+        
+        # Check if screen has changed
+        if current_screen != initial_screen:
+            elapsed = time.time() - start_time
+            return True, elapsed
+        
+        time.sleep(check_interval)
+    
+    # Timeout
+    return False, time.time() - start_time
+
+
+def wait_for_pcomm_ready_smart(autECLPS, action_description="", timeout=30):
+    """
+    Smart wait that captures screen before/after and waits for changes.
+    Use this BEFORE sending keys that will change the screen.
+    
+    Args:
+        autECLPS: The PCOMM session object
+        action_description: Description for logging (e.g., "Enter Key")
+        timeout: Maximum seconds to wait
+    
+    Returns:
+        tuple: (before_screen, success, elapsed_time)
+    """
+    # Capture screen before action
+    before_screen = get_screen_content(autECLPS)
+    return before_screen
+
+
+def complete_pcomm_wait(autECLPS, before_screen, action_description="", timeout=30):
+    """
+    Completes the wait after an action was performed.
+    Use this AFTER sending keys.
+    
+    Args:
+        autECLPS: The PCOMM session object
+        before_screen: Screen content captured before the action
+        action_description: Description for logging  # ✅ Must be named parameter
+        timeout: Maximum seconds to wait
+    
+    Returns:
+        tuple: (bool: success, float: elapsed_time)
+    """
+    if before_screen is None:
+        run_log.log('warning', f"⚠️ Could not capture screen before {action_description}, using fixed wait")
+        time.sleep(2.0)
+        return True, 2.0
+    
+    success, elapsed = wait_for_screen_change(autECLPS, before_screen, timeout)
+    
+    # ✅ CHANGED: Logged to the run log with the wait's duration instead of printed
+    if success:
+        run_log.log('info', f"✅ {action_description} completed in {elapsed:.2f}s", duration=elapsed)
+    else:
+        run_log.log('warning', f"⚠️ {action_description} timeout after {elapsed:.2f}s", duration=elapsed)
+    
+    return success, elapsed
+
+
+# --- NEW: Session Backends ---
+def connect_pcomm_session(connection_name):
+    """
+    Opens the PCOMM COM session of a connection on the calling thread.
+    
+    Args:
+        connection_name: The PCOMM connection (session) letter, e.g. 'A'
+    
+    Returns:
+        tuple: (autECLSession, autECLPS)
+    """
+    import pythoncom
+    import win32com.client
+    
+    pythoncom.CoInitialize()
+    autECLSession = win32com.client.Dispatch("PCOMM.autECLSession")
+    autECLSession.SetConnectionByName(connection_name)
+    return autECLSession, autECLSession.autECLPS
+
+
+class ScreenBufferSession:
+    """
+    An in-memory presentation space with the subset of the autECLPS interface
+    the screen helpers and the live mirror use (GetText, SetText, SetCursorPos,
+    CursorPosRow/CursorPosCol), for driving the core without PCOMM
+    (benchmarks, tests, replaying captured screens).
+    """
+    
+    def __init__(self, rows=24, cols=80, text=""):
+        self.NumRows = rows
+        self.NumCols = cols
+        self.Started = True
+        self.cursor = (1, 1)
+        self._buffer = list(text.ljust(rows * cols)[:rows * cols])
+    
+    def GetText(self, position=1, length=None):
+        """Returns length characters starting at the 1-based linear position."""
+        start = position - 1
+        end = len(self._buffer) if length is None else start + length
+        return ''.join(self._buffer[start:end])
+    
+    def SetText(self, text, row=None, col=None):
+        """Writes text at row/col (1-based), or at the cursor."""
+        if row is None or col is None:
+            row, col = self.cursor
+        start = (row - 1) * self.NumCols + (col - 1)
+        text = text[:max(0, len(self._buffer) - start)]
+        self._buffer[start:start + len(text)] = text
+    
+    def SetCursorPos(self, row, col):
+        self.cursor = (row, col)
+    
+    @property
+    def CursorPosRow(self):
+        return self.cursor[0]
+    
+    @property
+    def CursorPosCol(self):
+        return self.cursor[1]
+    
+    def load_screen(self, text):
+        """Replaces the whole screen (e.g. with a captured one)."""
+        self._buffer = list(text.ljust(len(self._buffer))[:len(self._buffer)])
@@ -0,0 +1,1106 @@
+"""
+Library storage: the SQLite library repository with its search index, lazily
+loaded record stores, bulk import parsing and single-file library bundles.
+"""
+import collections.abc
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from .codec import json_codec
+from .model import module_version_hash
+
+
+# --- NEW: SQLite Library Repository ---
+LIBRARY_SEARCH_HELP = (
+    "Every word must match the start of a name, label, description, step type, module, field or value.\n"
+    "label:acct - only label names (also name:, description:, step:, module:, field:, value:)\n"
+    "acct=0012345 - test cases typing 0012345 into the ACCT field\n"
+    "validate:login - test cases validating fields of a module starting with 'login'\n"
+    "\"login screen\" - quotes keep spaces"
+)
+
+
+class LibraryRepository:
+    """
+    Embedded SQLite store for modules, test cases and templates.
+    
+    Each record is stored as one JSON row keyed by name, so a save only
+    upserts the records whose content changed (in one transaction) instead of
+    rewriting the whole library. The database runs in WAL mode, so a crash
+    mid-write never corrupts committed data. Test case -> module references,
+    module version hashes and the module version each module import step was
+    built against are kept in indexed tables, maintained at write time. So is
+    the full-text search index (SQLite FTS5) used by search().
+    """
+    
+    TABLES = ('modules', 'test_cases', 'templates')
+    # Tags of the indexed search terms; a query part 'tag:text' only matches that tag
+    SEARCH_TAGS = ('name', 'label', 'description', 'step', 'module', 'field', 'value', 'action')
+    
+    def __init__(self, db_path='library.db'):
+        """
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        import sqlite3
+        
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self._digests = {table: {} for table in self.TABLES}
+        self._listeners = []
+        self.module_versions = {}  # {module name: version hash}, kept in step with the module_versions table
+        self._create_schema()
+        self._index_versions()
+        self._index_search()
+        with self.lock:
+            self.module_versions = dict(self.conn.execute("SELECT name, version FROM module_versions"))
+    
+    def _create_schema(self):
+        import sqlite3
+        
+        with self.lock, self.conn:
+            for table in self.TABLES:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "name TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated ON {table}(updated_at)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS test_case_modules ("
+                "test_case TEXT NOT NULL, module TEXT NOT NULL, PRIMARY KEY (test_case, module))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_test_case_modules_module ON test_case_modules(module)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS module_versions (name TEXT PRIMARY KEY, version TEXT NOT NULL)"
+            )
+            # utility is -1 for a main step
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS step_modules ("
+                "test_case TEXT NOT NULL, step INTEGER NOT NULL, utility INTEGER NOT NULL, "
+                "module TEXT NOT NULL, version TEXT, PRIMARY KEY (test_case, step, utility))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_step_modules_module ON step_modules(module)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            # The rowid of search_docs is the FTS document id of a record
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_docs (kind TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (kind, name))"
+            )
+        try:
+            with self.lock, self.conn:
+                # One column per search tag; '=', ':', '_', '-' and '.' stay inside terms
+                self.conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5({', '.join(self.SEARCH_TAGS)}, "
+                    "tokenize=\"unicode61 tokenchars '=:_-.'\", prefix='2 3')"
+                )
+            self.search_indexed = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: search() scans the records instead
+            print(f"Library search index unavailable ({e}), searches will scan the library")
+            self.search_indexed = False
+    
+    def _index_versions(self):
+        """One-time fill of the version tables for libraries created before they existed."""
+        if self.get_meta('version_index'):
+            return
+        with self.lock, self.conn:
+            for table in ('modules', 'test_cases'):
+                for name, data in self.conn.execute(f"SELECT name, data FROM {table}").fetchall():
+                    self._write_derived(table, name, json_codec.loads(data))
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version_index', '1')")
+    
+    def _index_search(self):
+        """One-time fill of the search index for libraries created before it existed."""
+        if not self.search_indexed or self.get_meta('search_index'):
+            return
+        with self.lock, self.conn:
+            for table in ('modules', 'test_cases'):
+                for name, data in self.conn.execute(f"SELECT name, data FROM {table}").fetchall():
+                    self._write_search_document(table, name, json_codec.loads(data))
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_index', '1')")
+    
+    def add_listener(self, callback):
+        """
+        Registers callback(table, changed_names, removed_names), called after
+        every write that changed or deleted records.
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, table, changed, removed):
+        for callback in self._listeners:
+            try:
+                callback(table, changed, removed)
+            except Exception as e:
+                print(f"Library listener error: {e}")
+    
+    @staticmethod
+    def _digest(text):
+        # Records are always written with json.dumps (not the fastest codec) so
+        # their text, and therefore this digest, is the same on every machine
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    @staticmethod
+    def module_references(test_case_data):
+        """Returns the names of all modules used by a test case's steps and utility steps."""
+        references = set()
+        for step in test_case_data.get('steps', []) if isinstance(test_case_data, dict) else []:
+            for item in [step] + list(step.get('utility_steps', [])):
+                for key in ('module_name', 'reference_module'):
+                    if item.get(key):
+                        references.add(item[key])
+        return references
+    
+    @staticmethod
+    def module_import_steps(test_case_data):
+        """
+        Yields (step index, utility index or -1, module name, stored version)
+        for every module import step and utility step of a test case.
+        """
+        for step_index, step in enumerate(test_case_data.get('steps', []) if isinstance(test_case_data, dict) else []):
+            for utility_index, item in [(-1, step)] + list(enumerate(step.get('utility_steps', []))):
+                if item.get('type') == 'module_import' and item.get('module_name'):
+                    yield step_index, utility_index, item['module_name'], item.get('module_version')
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def search_tokens(text):
+        """
+        Returns the search terms of a piece of text: the whole text (for
+        prefix queries on full names and values) and each alphanumeric word,
+        all lower-cased. Cached, since labels, fields and values repeat a lot.
+        """
+        text = text.strip().lower()
+        if not text:
+            return frozenset()
+        tokens = set(re.findall(r'[^\W_]+', text))
+        if len(text) <= 80:
+            tokens.add(text)
+        return frozenset(tokens)
+    
+    @classmethod
+    def search_document(cls, table, name, record):
+        """
+        Returns the text indexed for a record, one string per SEARCH_TAGS column.
+        
+        Modules: name and label names. Test cases: name, description, step
+        types, modules used, field names and values, plus 'field=value' for
+        every field value and 'action:module' (e.g. 'validate:login') for the
+        action types used on each imported module.
+        """
+        columns = {tag: set() for tag in cls.SEARCH_TAGS}
+        columns['name'].update(cls.search_tokens(name))
+        if table == 'modules' and isinstance(record, dict):
+            for label in record.get('labels', []):
+                columns['label'].update(cls.search_tokens(str(label.get('name', ''))))
+        elif table == 'test_cases' and isinstance(record, dict):
+            columns['description'].update(cls.search_tokens(str(record.get('description', ''))))
+            for step in record.get('steps', []):
+                for item in [step] + list(step.get('utility_steps', [])):
+                    if item.get('type'):
+                        columns['step'].add(item['type'].lower())
+                    modules = [item[key] for key in ('module_name', 'reference_module') if item.get(key)]
+                    for module in modules:
+                        columns['module'].update(cls.search_tokens(module))
+                    for field in item.get('fields', []):
+                        field_name = str(field.get('field_name') or '').strip().lower()
+                        value = str(field.get('value', '')).strip().lower()
+                        action = str(field.get('action_type') or '').strip().lower()
+                        columns['field'].update(cls.search_tokens(field_name))
+                        if value:
+                            columns['value'].update(cls.search_tokens(value))
+                            columns['field'].add(f"{field_name}={value}"[:120])
+                        if action:
+                            columns['step'].add(action)
+                            columns['action'].update(f"{action}:{module.lower()}" for module in modules)
+        # Sorted so the same record always gives the same text
+        return tuple(' '.join(sorted(columns[tag])) for tag in cls.SEARCH_TAGS)
+    
+    def _write_search_document(self, table, name, record):
+        if not self.search_indexed:
+            return
+        row = self.conn.execute("SELECT rowid FROM search_docs WHERE kind = ? AND name = ?", (table, name)).fetchone()
+        if row is not None:
+            doc_id = row[0]
+            self.conn.execute("DELETE FROM search_index WHERE rowid = ?", (doc_id,))
+        else:
+            doc_id = self.conn.execute("INSERT INTO search_docs (kind, name) VALUES (?, ?)", (table, name)).lastrowid
+        self.conn.execute(
+            f"INSERT INTO search_index (rowid, {', '.join(self.SEARCH_TAGS)}) "
+            f"VALUES (?{', ?' * len(self.SEARCH_TAGS)})",
+            (doc_id,) + self.search_document(table, name, record)
+        )
+    
+    def _delete_search_documents(self, table, names):
+        if not self.search_indexed:
+            return
+        for name in names:
+            row = self.conn.execute("SELECT rowid FROM search_docs WHERE kind = ? AND name = ?", (table, name)).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM search_index WHERE rowid = ?", (row[0],))
+                self.conn.execute("DELETE FROM search_docs WHERE rowid = ?", (row[0],))
+    
+    @classmethod
+    def parse_search_query(cls, query):
+        """
+        Splits a search query into [(tag or None, lower-cased text)]. Parts
+        are separated by whitespace; quotes keep spaces; 'tag:text' limits a
+        part to one of SEARCH_TAGS.
+        """
+        import shlex
+        
+        try:
+            parts = shlex.split(query.lower())
+        except ValueError:  # Unbalanced quotes while typing
+            parts = query.lower().replace('"', ' ').replace("'", ' ').split()
+        parsed = []
+        for part in parts:
+            tag, _, text = part.partition(':')
+            parsed.append((tag, text) if text and tag in cls.SEARCH_TAGS else (None, part))
+        return parsed
+    
+    def search(self, table, query):
+        """
+        Finds the records matching every part of a query with one full-text
+        index lookup, without loading any record.
+        
+        Each part is a prefix: 'acct' matches names, labels, descriptions,
+        step types, modules, fields and values starting with it; 'label:acct'
+        only matches label names; 'acct=0012345' matches that value typed into
+        the ACCT field; 'validate:login' matches test cases validating fields
+        of a module starting with 'login'.
+        
+        Args:
+            table: 'modules' or 'test_cases'
+            query: The query text
+        
+        Returns:
+            set: Names of the matching records (every record if the query is empty)
+        """
+        import sqlite3
+        
+        parts = self.parse_search_query(query)
+        if not parts:
+            return set(self.load_index(table))
+        if not self.search_indexed:
+            return self.search_scan(table, query)
+        
+        expression = ' AND '.join(
+            (f"{tag} : " if tag else '') + '"' + text.replace('"', '""') + '"*' for tag, text in parts
+        )
+        try:
+            with self.lock:
+                # The subquery makes SQLite run the full-text lookup first, then fetch the names
+                rows = self.conn.execute(
+                    "SELECT name FROM search_docs WHERE kind = ? AND rowid IN "
+                    "(SELECT rowid FROM search_index WHERE search_index MATCH ?)", (table, expression)
+                ).fetchall()
+        except sqlite3.OperationalError:  # A part with nothing searchable in it, e.g. '/'
+            return set()
+        return {row[0] for row in rows}
+    
+    def search_scan(self, table, query):
+        """
+        Answers a query by reading every record: the fallback when SQLite has
+        no FTS5, and the reference the search index is checked against.
+        """
+        def tokens(text):
+            return re.findall(r'(?:[^\W_]|[=:_.\-])+', text)
+        
+        parts = [(tag, tokens(text)) for tag, text in self.parse_search_query(query)]
+        columns = {tag: index for index, tag in enumerate(self.SEARCH_TAGS)}
+        matches = set()
+        for name, data, _ in self.iter_raw(table):
+            document = [tokens(text) for text in self.search_document(table, name, json_codec.loads(data))]
+            for tag, phrase in parts:
+                if not phrase:
+                    break
+                found = False
+                for column in ([document[columns[tag]]] if tag else document):
+                    for start in range(len(column) - len(phrase) + 1):
+                        if column[start:start + len(phrase) - 1] == phrase[:-1] and \
+                                column[start + len(phrase) - 1].startswith(phrase[-1]):
+                            found = True
+                            break
+                    if found:
+                        break
+                if not found:
+                    break
+            else:
+                matches.add(name)
+        return matches
+    
+    def _write_derived(self, table, name, record):
+        """Writes the indexed data derived from a record (inside the caller's transaction)."""
+        if table in ('modules', 'test_cases'):
+            self._write_search_document(table, name, record)
+        if table == 'modules':
+            version = module_version_hash(record)
+            self.conn.execute("INSERT OR REPLACE INTO module_versions (name, version) VALUES (?, ?)", (name, version))
+            self.module_versions[name] = version
+        elif table == 'test_cases':
+            self.conn.execute("DELETE FROM test_case_modules WHERE test_case = ?", (name,))
+            self.conn.executemany(
+                "INSERT INTO test_case_modules (test_case, module) VALUES (?, ?)",
+                [(name, module) for module in sorted(self.module_references(record))]
+            )
+            self.conn.execute("DELETE FROM step_modules WHERE test_case = ?", (name,))
+            self.conn.executemany(
+                "INSERT INTO step_modules (test_case, step, utility, module, version) VALUES (?, ?, ?, ?, ?)",
+                [(name,) + entry for entry in self.module_import_steps(record)]
+            )
+    
+    def _delete_derived(self, table, names):
+        """Deletes the indexed data of removed records (inside the caller's transaction)."""
+        names = [(name,) for name in names]
+        if table in ('modules', 'test_cases'):
+            self._delete_search_documents(table, [name for (name,) in names])
+        if table == 'modules':
+            self.conn.executemany("DELETE FROM module_versions WHERE name = ?", names)
+            for (name,) in names:
+                self.module_versions.pop(name, None)
+        elif table == 'test_cases':
+            self.conn.executemany("DELETE FROM test_case_modules WHERE test_case = ?", names)
+            self.conn.executemany("DELETE FROM step_modules WHERE test_case = ?", names)
+    
+    def load_all(self, table):
+        """
+        Loads every record of a table.
+        
+        Returns:
+            dict: {name: record}
+        """
+        records = {}
+        digests = {}
+        with self.lock:
+            for name, data in self.conn.execute(f"SELECT name, data FROM {table} ORDER BY rowid"):
+                records[name] = json_codec.loads(data)
+                digests[name] = self._digest(data)
+        self._digests[table] = digests
+        return records
+    
+    def upsert(self, table, name, record):
+        """Inserts or updates a single record."""
+        data = json.dumps(record)
+        digest = self._digest(data)
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"INSERT INTO {table} (name, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (name, data, time.time())
+            )
+            self._write_derived(table, name, record)
+        self._digests[table][name] = digest
+        self._notify(table, [name], [])
+    
+    def delete(self, table, name):
+        """Deletes a single record."""
+        with self.lock, self.conn:
+            self.conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+            self._delete_derived(table, [name])
+        self._digests[table].pop(name, None)
+        self._notify(table, [], [name])
+    
+    def load_index(self, table):
+        """
+        Loads the lightweight index of a table without parsing any record.
+        
+        Returns:
+            dict: {name: updated_at} in storage order
+        """
+        with self.lock:
+            return dict(self.conn.execute(f"SELECT name, updated_at FROM {table} ORDER BY rowid"))
+    
+    def load_record(self, table, name):
+        """
+        Loads (hydrates) a single record.
+        
+        Returns:
+            dict: The record, or None if it does not exist
+        """
+        with self.lock:
+            row = self.conn.execute(f"SELECT data FROM {table} WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        self._digests[table][name] = self._digest(row[0])
+        return json_codec.loads(row[0])
+    
+    def record_digest(self, table, name):
+        """
+        Returns the content hash (hex) of a stored record without parsing it,
+        or None if it does not exist.
+        """
+        digest = self._digests[table].get(name)
+        if digest is None:
+            with self.lock:
+                row = self.conn.execute(f"SELECT data FROM {table} WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return None
+            digest = self._digest(row[0])
+            self._digests[table][name] = digest
+        return digest.hex()
+    
+    def is_changed(self, table, name, record):
+        """Returns True if a record's JSON differs from what was last loaded or written."""
+        return self._digests[table].get(name) != self._digest(json.dumps(record))
+    
+    def write_changes(self, table, records, removed=()):
+        """
+        Upserts the given records whose JSON changed since they were loaded or
+        last written, and deletes the removed names, in one transaction.
+        
+        Args:
+            table: One of TABLES
+            records: {name: record} to check
+            removed: Names to delete
+        
+        Returns:
+            tuple: (number of upserted records, number of deleted records)
+        """
+        known = self._digests[table]
+        changed = []
+        for name, record in records.items():
+            data = json.dumps(record)
+            digest = self._digest(data)
+            if known.get(name) != digest:
+                changed.append((name, record, data, digest))
+        removed = list(removed)
+        
+        if changed or removed:
+            now = time.time()
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO {table} (name, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    [(name, data, now) for name, _, data, _ in changed]
+                )
+                self.conn.executemany(f"DELETE FROM {table} WHERE name = ?", [(name,) for name in removed])
+                for name, record, _, _ in changed:
+                    self._write_derived(table, name, record)
+                self._delete_derived(table, removed)
+        
+        for name, _, _, digest in changed:
+            known[name] = digest
+        for name in removed:
+            known.pop(name, None)
+        if changed or removed:
+            self._notify(table, [name for name, _, _, _ in changed], removed)
+        return len(changed), len(removed)
+    
+    def sync(self, table, records):
+        """
+        Makes a table match the given records in one transaction. Only the
+        records whose JSON changed since the last load/sync are written.
+        
+        Args:
+            table: One of TABLES
+            records: {name: record} as held in memory, or a LazyRecordStore
+        
+        Returns:
+            tuple: (number of upserted records, number of deleted records)
+        """
+        if isinstance(records, LazyRecordStore):
+            return records.sync()
+        removed = [name for name in self._digests[table] if name not in records]
+        return self.write_changes(table, records, removed)
+    
+    def test_cases_using_module(self, module_name):
+        """Returns the names of the test cases referencing a module (indexed lookup)."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT test_case FROM test_case_modules WHERE module = ? ORDER BY test_case", (module_name,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def stale_steps(self, test_case=None):
+        """
+        Finds the module import steps whose stored module_version differs
+        from the current version of their module, with one indexed query and
+        without loading any record.
+        
+        Args:
+            test_case: Limit the query to one test case (default: whole library)
+        
+        Returns:
+            list: [(test case, step index, utility index or None, module name)]
+        """
+        query = (
+            "SELECT s.test_case, s.step, s.utility, s.module FROM step_modules s "
+            "JOIN module_versions v ON v.name = s.module "
+            "WHERE (s.version IS NULL OR s.version != v.version)"
+        )
+        params = ()
+        if test_case is not None:
+            query += " AND s.test_case = ?"
+            params = (test_case,)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY s.test_case, s.step, s.utility", params).fetchall()
+        return [(name, step, None if utility < 0 else utility, module) for name, step, utility, module in rows]
+
+    def iter_raw(self, table, names=None, batch_size=200):
+        """
+        Yields (name, stored JSON text, content hash) for records without
+        parsing them, reading a batch at a time so a large table is never held
+        in memory at once.
+
+        Args:
+            table: One of TABLES
+            names: Names to read (default: the whole table in storage order);
+                   names that do not exist are skipped
+            batch_size: Number of records per query
+        """
+        if names is None:
+            with self.lock:
+                names = [row[0] for row in self.conn.execute(f"SELECT name FROM {table} ORDER BY rowid")]
+        names = list(names)
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            placeholders = ','.join('?' * len(batch))
+            with self.lock:
+                rows = dict(self.conn.execute(f"SELECT name, data FROM {table} WHERE name IN ({placeholders})", batch))
+            for name in batch:
+                if name in rows:
+                    yield name, rows[name], self._digest(rows[name]).hex()
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value))
+            )
+    
+    def migrate_from_json(self, table, json_path):
+        """
+        One-time import of a legacy JSON library file into a table. The JSON
+        file is left in place (renamed to '.migrated') as a backup.
+        
+        Returns:
+            int: Number of migrated records (0 if already migrated or no file)
+        """
+        meta_key = f"migrated_{table}"
+        if self.get_meta(meta_key) or not os.path.exists(json_path):
+            return 0
+        
+        records = json_codec.read_file(json_path)
+        
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (name, data, updated_at) VALUES (?, ?, ?)",
+                [(name, json.dumps(record), now) for name, record in records.items()]
+            )
+            for name, record in records.items():
+                self._write_derived(table, name, record)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (meta_key, json_path)
+            )
+        
+        try:
+            os.replace(json_path, json_path + '.migrated')
+        except OSError as e:
+            print(f"Could not rename migrated file '{json_path}': {e}")
+        print(f"Migrated {len(records)} record(s) from '{json_path}' into '{self.db_path}'")
+        return len(records)
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# --- NEW: Lazy Library Loading ---
+class LazyRecordStore(collections.abc.MutableMapping):
+    """
+    Dictionary-like view of a library table that loads records on demand.
+    
+    Only the name index is read at startup. A record is parsed the first time
+    it is accessed and kept in a bounded LRU cache. Records are handed out by
+    reference, so callers can keep editing them in place as before. Eviction
+    never writes: records with unsaved changes (assigned, or edited in place)
+    stay hydrated until sync() writes them, and so do records pinned with
+    pin() by views that hold on to them; only clean, unpinned records are
+    dropped.
+    
+    Listeners added with add_listener() are called as callback(event, names)
+    after every change, so views can update only the affected items:
+    'added', 'changed' and 'removed' pass a list of names, 'renamed' passes a
+    list of (old name, new name) pairs. Records edited in place are reported
+    with touch().
+    """
+    
+    def __init__(self, repository, table, cache_size=256):
+        """
+        Args:
+            repository: The LibraryRepository holding the table
+            table: 'modules' or 'test_cases'
+            cache_size: Maximum number of clean, unpinned records kept hydrated
+        """
+        self.repository = repository
+        self.table = table
+        self.cache_size = cache_size
+        self._index = repository.load_index(table)
+        self._cache = collections.OrderedDict()
+        self._removed = set()
+        self._dirty = set()  # Names assigned since the last sync
+        self._pins = collections.Counter()
+        self._listeners = []
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def __iter__(self):
+        return iter(list(self._index))
+    
+    def __contains__(self, name):
+        return name in self._index
+    
+    def __getitem__(self, name):
+        record = self._cache.get(name)
+        if record is not None:
+            self._cache.move_to_end(name)
+            self.hits += 1
+            return record
+        if name not in self._index:
+            raise KeyError(name)
+        
+        self.misses += 1
+        record = self.repository.load_record(self.table, name)
+        if record is None:
+            raise KeyError(name)
+        self._cache[name] = record
+        self._evict()
+        return record
+    
+    def __setitem__(self, name, record):
+        added = name not in self._index
+        self._put(name, record)
+        self._notify('added' if added else 'changed', [name])
+    
+    def __delitem__(self, name):
+        self._remove(name)
+        self._notify('removed', [name])
+    
+    def _put(self, name, record):
+        if name not in self._index:
+            self._index[name] = time.time()
+        self._removed.discard(name)
+        self._dirty.add(name)
+        self._cache[name] = record
+        self._cache.move_to_end(name)
+        self._evict()
+    
+    def _remove(self, name):
+        if name not in self._index:
+            raise KeyError(name)
+        del self._index[name]
+        self._cache.pop(name, None)
+        self._dirty.discard(name)
+        self._removed.add(name)
+    
+    def rename(self, old_name, new_name):
+        """Moves a record to a new name; listeners get a single 'renamed' event."""
+        record = self[old_name]
+        self._remove(old_name)
+        self._put(new_name, record)
+        self._notify('renamed', [(old_name, new_name)])
+        return record
+    
+    def touch(self, *names):
+        """Reports records that were edited in place to the listeners."""
+        self._notify('changed', [name for name in names if name in self._index])
+    
+    def pin(self, name):
+        """
+        Keeps a record hydrated (and the same object) until unpin(), for views
+        that hold on to it, such as an open editor. Pins are counted.
+        """
+        self._pins[name] += 1
+    
+    def unpin(self, name):
+        self._pins[name] -= 1
+        if self._pins[name] <= 0:
+            del self._pins[name]
+            self._evict()
+    
+    def add_listener(self, callback):
+        """Registers callback(event, names), called after every change."""
+        self._listeners.append(callback)
+    
+    def _notify(self, event, names):
+        if names:
+            for callback in self._listeners:
+                callback(event, names)
+    
+    def _evict(self):
+        """Drops least recently used records that are neither pinned nor changed. Never writes."""
+        if len(self._cache) <= self.cache_size:
+            return
+        for name in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if name in self._pins or name in self._dirty:
+                continue
+            if self.repository.is_changed(self.table, name, self._cache[name]):
+                continue  # Edited in place and not saved yet
+            del self._cache[name]
+    
+    def index_written(self, names):
+        """Adds names of records written directly to the repository, without hydrating them."""
+        now = time.time()
+        added, changed = [], []
+        for name in names:
+            (changed if name in self._index else added).append(name)
+            self._index.setdefault(name, now)
+            self._removed.discard(name)
+            self._dirty.discard(name)
+            self._cache.pop(name, None)
+        self._notify('added', added)
+        self._notify('changed', changed)
+    
+    def sync(self):
+        """Writes the changed hydrated records and the deletions in one transaction."""
+        removed, self._removed = self._removed, set()
+        result = self.repository.write_changes(self.table, dict(self._cache), removed)
+        self._dirty.clear()
+        self._evict()
+        return result
+    
+    def cache_info(self):
+        """Returns a one-line summary of the cache usage."""
+        return (f"{self.table}: {len(self._index)} indexed, {len(self._cache)} hydrated, "
+                f"{self.hits} hit(s), {self.misses} miss(es)")
+
+
+# --- NEW: Bulk Import ---
+def validate_test_case_record(data):
+    """
+    Checks the structure of an imported test case.
+
+    Returns:
+        list: Problems found (empty if the test case is valid)
+    """
+    if not isinstance(data, dict):
+        return ["not a JSON object"]
+    steps = data.get('steps')
+    if not isinstance(steps, list):
+        return ["'steps' is missing or not a list"]
+    
+    problems = []
+    for step_number, step in enumerate(steps, 1):
+        items = [(f"step {step_number}", step)]
+        if isinstance(step, dict):
+            utility_steps = step.get('utility_steps', [])
+            if not isinstance(utility_steps, list):
+                problems.append(f"step {step_number}: 'utility_steps' is not a list")
+                utility_steps = []
+            items += [(f"step {step_number}.{sub_number}", utility) for sub_number, utility in enumerate(utility_steps, 1)]
+        for where, item in items:
+            if not isinstance(item, dict):
+                problems.append(f"{where}: not a JSON object")
+            elif not isinstance(item.get('type'), str):
+                problems.append(f"{where}: 'type' is missing")
+            elif not isinstance(item.get('fields', []), list) or not all(
+                    isinstance(field, dict) and 'field_name' in field for field in item.get('fields', [])):
+                problems.append(f"{where}: 'fields' must be a list of objects with a 'field_name'")
+    return problems
+
+
+def validate_module_record(data):
+    """
+    Checks the structure of an imported module.
+
+    Returns:
+        list: Problems found (empty if the module is valid)
+    """
+    if not isinstance(data, dict):
+        return ["not a JSON object"]
+    labels = data.get('labels', [])
+    if not isinstance(labels, list):
+        return ["'labels' is not a list"]
+    
+    problems = []
+    for label_number, label in enumerate(labels, 1):
+        if not isinstance(label, dict):
+            problems.append(f"label {label_number}: not a JSON object")
+            continue
+        for key in ('row', 'column'):
+            try:
+                int(label.get(key, 1))
+            except (TypeError, ValueError):
+                problems.append(f"label {label_number}: '{key}' is not a number")
+    return problems
+
+
+def parse_import_file(file_path, kind):
+    """
+    Reads and validates one import file. Never raises: problems are returned
+    with the result.
+
+    Args:
+        file_path (str): JSON file to read
+        kind (str): 'test_cases' or 'modules'
+
+    Returns:
+        tuple: ({name: record} of the valid records in file order, [problem, ...])
+    """
+    try:
+        imported_data = json_codec.read_file(file_path)
+    except json.JSONDecodeError:
+        return {}, ["Invalid JSON format"]
+    except Exception as e:
+        return {}, [str(e)]
+    
+    if not isinstance(imported_data, dict):
+        return {}, ["No valid data found"]
+    
+    if kind == 'test_cases':
+        validate = validate_test_case_record
+        # A single test case (saved from 'Save Test Case') or a library of test cases
+        if 'name' in imported_data and 'steps' in imported_data:
+            candidates = {imported_data['name']: imported_data}
+        else:
+            candidates = imported_data
+    else:
+        validate = validate_module_record
+        candidates = imported_data
+    
+    records = {}
+    problems = []
+    for name, record in candidates.items():
+        record_problems = validate(record)
+        if record_problems:
+            problems.append(f"'{name}': " + "; ".join(record_problems[:3]))
+        else:
+            records[name] = record
+    if not records and not problems:
+        problems.append("No valid data found")
+    return records, problems
+
+
+# --- NEW: Library Bundles ---
+class LibraryBundle:
+    """
+    Single-file, versioned export of a library (or a selection of it).
+
+    A bundle is a zip archive with a manifest.json and content-addressed
+    entries: every record (as stored in the library) and every file is saved
+    once under objects/<hash>, so identical content is stored once. The
+    manifest maps names and paths to those hashes. Hashes use the same
+    digest as LibraryRepository, so on import a record whose hash matches
+    the local one is skipped without being read. Records and files are
+    streamed one at a time in both directions, so memory use does not grow
+    with the size of the library.
+    """
+
+    FORMAT = 'pcomm-library-bundle'
+    VERSION = 1
+    EXTENSION = '.pclib'
+    TABLES = ('modules', 'test_cases', 'templates')
+
+    def __init__(self, path):
+        """
+        Opens a bundle for reading.
+
+        Raises:
+            ValueError: If the file is not a bundle or was written by a newer version
+        """
+        import zipfile
+
+        self.path = path
+        try:
+            self.archive = zipfile.ZipFile(path, 'r')
+        except zipfile.BadZipFile:
+            raise ValueError("The file is not a library bundle.")
+        try:
+            manifest = json.loads(self.archive.read('manifest.json'))
+        except (KeyError, json.JSONDecodeError):
+            self.archive.close()
+            raise ValueError("The bundle has no readable manifest.")
+        if not isinstance(manifest, dict) or manifest.get('format') != self.FORMAT:
+            self.archive.close()
+            raise ValueError("The file is not a library bundle.")
+        if manifest.get('version', 0) > self.VERSION:
+            self.archive.close()
+            raise ValueError(f"The bundle was created by a newer version (format {manifest.get('version')}).")
+        self.manifest = manifest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    @staticmethod
+    def file_digest(path, chunk_size=1024 * 1024):
+        """Returns the content hash (hex) of a file, read in chunks."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def bundle_path(path):
+        """
+        Returns the portable (relative, '/'-separated) form of a file path, or
+        None for paths that could leave the working folder, which are neither
+        bundled nor extracted: absolute or drive paths (including
+        drive-relative 'C:x') and paths with any '..' part, with either
+        separator.
+        """
+        from pathlib import PureWindowsPath
+
+        if not path:
+            return None
+        # Windows parsing treats both '/' and '\\' as separators and finds drives and roots
+        windows_path = PureWindowsPath(path)
+        if windows_path.drive or windows_path.root or os.path.isabs(path):
+            return None
+        parts = [part for part in windows_path.parts if part != '.']
+        if not parts or '..' in parts:
+            return None
+        return '/'.join(parts)
+
+    @classmethod
+    def write(cls, path, repository, selection, config_files=(), progress=None):
+        """
+        Writes a bundle atomically (to a temporary file that replaces the target).
+
+        Args:
+            path: Target bundle file
+            repository: LibraryRepository the records are read from
+            selection: {table: list of names, or None for the whole table}
+            config_files: Configuration files to include (missing ones are skipped)
+            progress: Optional callable(message) called periodically
+
+        Returns:
+            dict: Counts of the written records and files, and the list of
+                  screenshots that could not be included
+        """
+        import zipfile
+
+        manifest = {
+            'format': cls.FORMAT,
+            'version': cls.VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'records': {},
+            'files': {},
+            'config': {}
+        }
+        written = set()
+        missing_files = []
+        temp_path = f"{path}.{os.getpid()}.tmp"
+
+        def add_object(archive, digest, source=None, text=None):
+            if digest in written:
+                return
+            name = f"objects/{digest}"
+            if text is not None:
+                archive.writestr(name, text)
+            else:
+                # Screenshots are already compressed
+                compression = zipfile.ZIP_STORED if source.lower().endswith('.png') else zipfile.ZIP_DEFLATED
+                archive.write(source, name, compress_type=compression)
+            written.add(digest)
+
+        try:
+            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for table in cls.TABLES:
+                    if table not in selection:
+                        continue
+                    entries = manifest['records'][table] = {}
+                    for count, (name, data, digest) in enumerate(repository.iter_raw(table, selection[table]), start=1):
+                        add_object(archive, digest, text=data)
+                        entries[name] = digest
+
+                        if table == 'modules':
+                            screenshot = json_codec.loads(data).get('screenshot')
+                            relative = cls.bundle_path(screenshot)
+                            if relative is None or not os.path.isfile(screenshot):
+                                if screenshot:
+                                    missing_files.append(screenshot)
+                            elif relative not in manifest['files']:
+                                file_digest = cls.file_digest(screenshot)
+                                add_object(archive, file_digest, source=screenshot)
+                                manifest['files'][relative] = file_digest
+
+                        if progress and count % 200 == 0:
+                            progress(f"Exporting {table.replace('_', ' ')}... {count}")
+
+                for config_file in config_files:
+                    if os.path.isfile(config_file):
+                        file_digest = cls.file_digest(config_file)
+                        add_object(archive, file_digest, source=config_file)
+                        manifest['config'][os.path.basename(config_file)] = file_digest
+
+                # Written last: it is only complete once every entry is in
+                archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return {
+            'records': {table: len(entries) for table, entries in manifest['records'].items()},
+            'files': len(manifest['files']) + len(manifest['config']),
+            'missing_files': missing_files
+        }
+
+    def records(self, table):
+        """Returns {name: hash} of the records of a table in the bundle."""
+        return self.manifest.get('records', {}).get(table, {})
+
+    def files(self):
+        """Returns {relative path: hash} of the bundled screenshots."""
+        return self.manifest.get('files', {})
+
+    def config_files(self):
+        """Returns {file name: hash} of the bundled configuration files."""
+        return self.manifest.get('config', {})
+
+    def read_record(self, digest):
+        """Reads and parses one record."""
+        return json_codec.loads(self.archive.read(f"objects/{digest}"))
+
+    def extract_file(self, digest, target_path, root=None):
+        """
+        Streams one bundled file to target_path (relative to root, by default
+        the working folder) atomically.
+
+        Raises:
+            ValueError: If the target is outside the root folder
+        """
+        import shutil
+
+        relative = self.bundle_path(target_path)
+        root = os.path.realpath(root or os.getcwd())
+        resolved = os.path.realpath(os.path.join(root, *relative.split('/'))) if relative else root
+        # Also catches links inside the root that point out of it
+        if resolved == root or os.path.commonpath([root, resolved]) != root:
+            raise ValueError(f"Refusing to write outside the working folder: {target_path}")
+        target_path = resolved
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        temp_path = f"{target_path}.{os.getpid()}.tmp"
+        try:
+            with self.archive.open(f"objects/{digest}") as source, open(temp_path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            os.replace(temp_path, target_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,269 @@
+"""
+Synthetic libraries at production scale: realistic captured_modules.json,
+captured_test_cases.json, templates.json and test_execution_data.json files
+for reproducing the slowdowns of big libraries outside production.
+"""
+import json
+import os
+import random
+
+from .codec import atomic_write_json, json_codec
+from .model import module_version_hash
+from .storage import LibraryRepository
+
+
+# --- NEW: Synthetic Library Generator ---
+LABEL_NAMES = [
+    'ACCT_NO', 'CUST_NAME', 'BRANCH', 'TRAN_CODE', 'AMOUNT', 'EFF_DATE', 'STATUS', 'PRODUCT', 'RATE', 'TERM',
+    'BALANCE', 'ADDR_LINE', 'CITY', 'ZIP', 'PHONE', 'OPTION', 'MESSAGE', 'USER_ID', 'REF_NO', 'COMMAND'
+]
+SCREEN_TITLES = ['CUSTOMER INQUIRY', 'ACCOUNT MAINTENANCE', 'LOAN SETUP', 'PAYMENT ENTRY', 'SIGN ON', 'MAIN MENU']
+SPECIAL_KEYS = ['Enter Key', 'Clear Key', 'End Key']
+STATUSES = ['Not Run', 'Passed', 'Failed', 'Stopped']
+
+
+class SyntheticLibrary:
+    """
+    Generates a library shaped like the ones the application builds: 24x80
+    captured screens with labels, test cases stepping through consecutive
+    screens with module import steps (one field per module label, a few of
+    them filled), special key steps and utility steps, Excel templates with
+    their broken-out test cases, and execution projects and standalone runs.
+    The same seed always gives the same library.
+    """
+
+    ROWS = 24
+    COLS = 80
+
+    def __init__(self, modules=500, labels=20, test_cases=1000, steps=15, utility_steps=2, projects=10,
+                 tests_per_project=20, standalone=50, templates=20, template_rows=10, reference_ratio=0.8, seed=1):
+        """
+        Args:
+            modules: Number of captured modules
+            labels: Labels per module
+            test_cases: Number of library test cases
+            steps: Main steps per test case
+            utility_steps: Utility steps per module import step
+            projects: Execution projects
+            tests_per_project: Test cases listed in each project
+            standalone: Standalone test cases in the execution list
+            templates: Excel templates linked to test cases
+            template_rows: Broken-out test cases per template
+            reference_ratio: Share of execution entries stored as library
+                             references (the rest are diverged snapshots)
+            seed: Random seed
+        """
+        self.module_count = modules
+        self.label_count = labels
+        self.test_case_count = test_cases
+        self.step_count = steps
+        self.utility_step_count = utility_steps
+        self.project_count = projects
+        self.tests_per_project = tests_per_project
+        self.standalone_count = standalone
+        self.template_count = templates
+        self.template_rows = template_rows
+        self.reference_ratio = reference_ratio
+        self.seed = seed
+        self._modules = None
+        self._test_cases = None
+
+    @staticmethod
+    def module_name(index):
+        return f"Module_{index}"
+
+    @staticmethod
+    def test_case_name(index):
+        return f"TC_{index:05d}"
+
+    @staticmethod
+    def label_name(index):
+        name = LABEL_NAMES[index % len(LABEL_NAMES)]
+        return name if index < len(LABEL_NAMES) else f"{name}_{index // len(LABEL_NAMES)}"
+
+    def label_position(self, index):
+        """Returns the 1-based (row, column, length) of a label: two columns of fields below the title."""
+        group = (index // (self.ROWS - 4)) % 2
+        return 3 + index % (self.ROWS - 4), 22 + group * 40, 12
+
+    def make_module(self, index, rng):
+        """Returns a module record: its labels and the captured screen they were defined on."""
+        grid = [[' '] * self.COLS for _ in range(self.ROWS)]
+
+        def write(row, column, text):
+            for offset, char in enumerate(text[:self.COLS - column + 1]):
+                grid[row - 1][column - 1 + offset] = char
+
+        write(1, 2, f"TR{index % 1000:03d}")
+        write(1, 28, f"{SCREEN_TITLES[index % len(SCREEN_TITLES)]} {index:05d}")
+        write(1, 70, f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/25")
+        labels = []
+        for n in range(self.label_count):
+            row, column, length = self.label_position(n)
+            name = self.label_name(n)
+            write(row, column - 20, f"{name.replace('_', ' ')} . . :")
+            write(row, column, rng.choice(['_' * length, f"{rng.randint(0, 10 ** 8):0{length}d}"]))
+            labels.append({'name': name, 'row': row, 'column': column, 'length': length})
+        write(self.ROWS, 2, "F3=EXIT  F7=BACK  F8=FORWARD  ENTER=PROCESS")
+
+        return {
+            'labels': labels,
+            'screenshot': os.path.join('Modules Screenshots', f"{self.module_name(index)}.png"),
+            'captured_text': '\n'.join(''.join(row) for row in grid)
+        }
+
+    def make_utility_step(self, n, rng):
+        kind = n % 4
+        if kind == 0:
+            seconds = rng.randint(1, 3)
+            return {'name': f"Wait: {seconds} second(s)", 'type': 'wait', 'seconds': seconds}
+        if kind == 1:
+            key = rng.choice(SPECIAL_KEYS)
+            return {'name': f"Special Key: {key}", 'type': 'special_key', 'key_value': key}
+        if kind == 2:
+            return {'name': "Capture Screenshot (DOCX)", 'type': 'capture_screenshot', 'fields': [],
+                    'reference_module': None}
+        return {'name': "Capture Text Screenshot", 'type': 'capture_screen_text', 'fields': []}
+
+    def make_step(self, test_index, step_index, module_index, rng):
+        """Returns a main step: a special key every sixth step, a module import otherwise."""
+        if step_index % 6 == 5:
+            key = rng.choice(SPECIAL_KEYS)
+            return {
+                'name': f"Special Key: {key}",
+                'type': 'special_key',
+                'key_value': key,
+                'fields': [{'field_name': 'special_key', 'action_type': 'Input', 'value': ""}],
+                'utility_steps': [{'name': "Wait: 1 second(s)", 'type': 'wait', 'seconds': 1}]
+            }
+
+        module_name = self.module_name(module_index)
+        module = self.modules()[module_name]
+        action_type = 'Validate' if step_index % 4 == 3 else 'Input'
+        filled = set(rng.sample(range(len(module['labels'])), min(3, len(module['labels']))))
+        fields = []
+        for n, label in enumerate(module['labels']):
+            fields.append({
+                'field_name': label['name'],
+                'internal_field_id': f"{label['name']}_{module_name}_M{step_index + 1}_{test_index}_{n}",
+                'action_type': action_type,
+                'value': f"{rng.randint(0, 10 ** 7):07d}" if n in filled else ""
+            })
+        return {
+            'name': f"Import Module: {module_name}",
+            'type': 'module_import',
+            'module_name': module_name,
+            'fields': fields,
+            'utility_steps': [self.make_utility_step(n, rng) for n in range(self.utility_step_count)],
+            'module_version': module_version_hash(module)
+        }
+
+    def make_test_case(self, index, rng):
+        """Returns a test case stepping through consecutive screens from a random start."""
+        first_module = rng.randrange(max(self.module_count, 1))
+        return {
+            'steps': [self.make_step(index, n, (first_module + n) % self.module_count, rng)
+                      for n in range(self.step_count)] if self.module_count else [],
+            'description': f"Test case {index} opens account {index:07d} and posts a payment",
+            'assumptions': "Host region available; user signed on",
+            'prerequisites': [],
+            'additional_info_fields': [],
+            'additional_info_values': {}
+        }
+
+    def modules(self):
+        """Returns {name: module record} (generated once)."""
+        if self._modules is None:
+            rng = random.Random(self.seed)
+            self._modules = {self.module_name(i): self.make_module(i, rng) for i in range(self.module_count)}
+        return self._modules
+
+    def test_cases(self):
+        """Returns {name: test case record} (generated once)."""
+        if self._test_cases is None:
+            rng = random.Random(self.seed + 1)
+            self._test_cases = {self.test_case_name(i): self.make_test_case(i, rng)
+                                for i in range(self.test_case_count)}
+        return self._test_cases
+
+    def templates(self):
+        """Returns {name: template record}, each already broken into test cases."""
+        rng = random.Random(self.seed + 2)
+        test_case_names = list(self.test_cases())
+        templates = {}
+        for i in range(self.template_count if test_case_names else 0):
+            base = test_case_names[i % len(test_case_names)]
+            field_names = [field['field_name'] for step in self.test_cases()[base]['steps'][:2]
+                           for field in step.get('fields', [])]
+            templates[f"Template_{i}"] = {
+                'excel_path': os.path.join('C:\\', 'Templates', f"Template_{i}.xlsx"),
+                'sheet_name': "Test Data",
+                'base_test_case': base,
+                'test_cases': [
+                    {'test_case_id': f"{base}_T{i}_{n}",
+                     'data': {name: f"{rng.randint(0, 10 ** 7):07d}" for name in field_names}}
+                    for n in range(self.template_rows)
+                ],
+                'expanded': False,
+                'linked_date': f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d} 09:00:00"
+            }
+        return templates
+
+    def execution_entry(self, name, rng):
+        """Returns the saved form of a listed test case: a library reference or a diverged snapshot."""
+        record = self.test_cases()[name]
+        if rng.random() < self.reference_ratio:
+            # The same content hash LibraryRepository.record_digest gives the migrated record
+            return {'$ref': name, 'hash': LibraryRepository._digest(json.dumps(record)).hex()}
+        snapshot = json.loads(json.dumps(record))
+        snapshot['description'] += " (edited in execution)"
+        return snapshot
+
+    def execution_data(self):
+        """Returns the test_execution_data.json content: projects and standalone test cases."""
+        rng = random.Random(self.seed + 3)
+        test_case_names = list(self.test_cases())
+        projects = {}
+        for p in range(self.project_count if test_case_names else 0):
+            names = rng.sample(test_case_names, min(self.tests_per_project, len(test_case_names)))
+            projects[f"Project_{p}"] = {
+                'test_cases': {name: self.execution_entry(name, rng) for name in names},
+                'expanded': p % 2 == 0,
+                'status_data': {name: {'status': rng.choice(STATUSES), 'selected_step': 0} for name in names}
+            }
+        standalone = {}
+        for name in rng.sample(test_case_names, min(self.standalone_count, len(test_case_names))):
+            entry = {'status': rng.choice(STATUSES), 'selected_step': 0}
+            saved = self.execution_entry(name, rng)
+            if '$ref' in saved:
+                entry.update(saved)
+            else:
+                entry['test_case_data'] = saved
+            standalone[name] = entry
+        return {'format': 2, 'projects': projects, 'standalone': standalone}
+
+    def write(self, directory):
+        """
+        Writes the four library files into a directory, as the application
+        finds them before its first start (the library tables are migrated
+        from them into library.db on first use).
+
+        Returns:
+            dict: {file name: size in bytes}
+        """
+        os.makedirs(directory, exist_ok=True)
+        files = {
+            'captured_modules.json': self.modules(),
+            'captured_test_cases.json': self.test_cases(),
+            'templates.json': self.templates(),
+        }
+        sizes = {}
+        for file_name, data in files.items():
+            path = os.path.join(directory, file_name)
+            atomic_write_json(path, data)
+            sizes[file_name] = os.path.getsize(path)
+        # Saved by the application in compact form
+        path = os.path.join(directory, 'test_execution_data.json')
+        json_codec.write_file(path, self.execution_data())
+        sizes['test_execution_data.json'] = os.path.getsize(path)
+        return sizes